@@ -0,0 +1,74 @@
+"""
+Classification accuracy benchmark for Forge.
+
+Compares evaluating accuracy the way the MLP example used to (reading both
+prediction and one-hot label arrays back with .list() and taking a Python max
+over every row) against argmax, == and mean on the device, which reads back a
+single scalar.
+"""
+
+import time
+from typing import Callable
+
+import Forge
+import numpy as np
+from Forge import Array
+
+
+def time_fn(fn: Callable, warmup: int = 2, iterations: int = 10) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_ms, std_ms)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, device_t: float, python_t: float):
+    speedup = python_t / device_t if device_t > 0 else float("inf")
+    print(
+        f"  {name:<24} | Device: {device_t:8.3f}ms | "
+        f"Python: {python_t:9.3f}ms | Speedup: {speedup:7.1f}x"
+    )
+
+
+def python_accuracy(Ps, GTs):
+    acc = [
+        max(range(10), key=lambda k: i[k]) == max(range(10), key=lambda k: j[k])
+        for i, j in zip(Ps.list(), GTs.list())
+    ]
+    return sum(acc) / len(acc)
+
+
+def device_accuracy(Ps, GTs):
+    hits = Forge.argmax(Ps, axis=1) == Forge.argmax(GTs, axis=1)
+    return hits.mean().item()
+
+
+def benchmark_accuracy(rows: int):
+    print_header(f"ACCURACY ({rows}x10 float32)")
+    Ps = Forge.softmax(Forge.rand(rows, 10), axis=1)
+    labels = np.random.randint(0, 10, size=rows)
+    GTs = Array(np.eye(10, dtype=np.float32)[labels].tolist())
+
+    assert abs(python_accuracy(Ps, GTs) - device_accuracy(Ps, GTs)) < 1e-6
+    device_t, _ = time_fn(lambda: device_accuracy(Ps, GTs))
+    python_t, _ = time_fn(lambda: python_accuracy(Ps, GTs), iterations=3)
+    print_result("accuracy(Ps, GTs)", device_t, python_t)
+
+
+if __name__ == "__main__":
+    for rows in [1000, 10000, 60000]:
+        benchmark_accuracy(rows)
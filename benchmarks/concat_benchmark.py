@@ -0,0 +1,88 @@
+"""
+Concatenate / stack / split benchmarks for Forge.
+
+concatenate copies every input into its slab of the result with one strided
+copy dispatch each, all in one command buffer; split and chunk only make
+views. Both are compared against the old route of going through Python lists.
+"""
+
+import time
+from typing import Callable
+
+import Forge
+import numpy as np
+
+
+def time_fn(fn: Callable, warmup: int = 3, iterations: int = 20) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_ms, std_ms)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, forge_t: float, list_t: float):
+    speedup = list_t / forge_t if forge_t > 0 else float("inf")
+    print(
+        f"  {name:<32} | Forge: {forge_t:8.3f}ms | "
+        f"Lists: {list_t:9.3f}ms | Speedup: {speedup:6.2f}x"
+    )
+
+
+def benchmark_concatenate(n: int, k: int):
+    print_header(f"CONCATENATE ({k} x ({n}, {n}) float32)")
+    parts = [Forge.rand(n, n) for _ in range(k)]
+    transposed = [p.T for p in parts]
+
+    # Reading one element back waits for the copies
+    forge_t, _ = time_fn(lambda: Forge.concatenate(parts)[0, 0])
+    list_t, _ = time_fn(lambda: Forge.Array(sum((p.list() for p in parts), []))[0, 0])
+    print_result("axis 0", forge_t, list_t)
+
+    forge_t, _ = time_fn(lambda: Forge.concatenate(parts, axis=1)[0, 0])
+    list_t, _ = time_fn(
+        lambda: Forge.Array(
+            [sum(rows, []) for rows in zip(*(p.list() for p in parts))]
+        )[0, 0]
+    )
+    print_result("axis 1", forge_t, list_t)
+
+    forge_t, _ = time_fn(lambda: Forge.concatenate(transposed)[0, 0])
+    list_t, _ = time_fn(
+        lambda: Forge.Array(sum((p.list() for p in transposed), []))[0, 0]
+    )
+    print_result("axis 0, transposed inputs", forge_t, list_t)
+
+    forge_t, _ = time_fn(lambda: Forge.stack(parts)[0, 0, 0])
+    list_t, _ = time_fn(lambda: Forge.Array([p.list() for p in parts])[0, 0, 0])
+    print_result("stack", forge_t, list_t)
+
+
+def benchmark_split(n: int, k: int):
+    print_header(f"SPLIT ({k * n}, {n}) float32 into {k}")
+    x = Forge.rand(k * n, n)
+
+    forge_t, _ = time_fn(lambda: Forge.split(x, k))
+    list_t, _ = time_fn(
+        lambda: [Forge.Array(r.tolist()) for r in np.split(np.array(x.list()), k)]
+    )
+    print_result("split", forge_t, list_t)
+
+
+if __name__ == "__main__":
+    for n in [256, 1024]:
+        benchmark_concatenate(n, 8)
+        benchmark_split(n, 8)
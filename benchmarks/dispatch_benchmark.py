@@ -0,0 +1,100 @@
+"""
+Per-op Python overhead benchmarks for Forge.
+
+Times `a + b` on tiny Arrays, where launching the kernel is cheap and the Python
+wrapper dominates, and metadata reads. Compares against the previous wrapper, which
+read the shape from the backend for every result (`array_shape`, copied into a
+list and then a tuple) and crossed into C++ on every strides/offset access.
+Results are not waited on.
+"""
+
+import time
+from typing import Callable
+
+import numpy as np
+from Forge import Array, _backend
+
+
+def time_fn(
+    fn: Callable, warmup: int = 50, iterations: int = 2000
+) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_us, std_us)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1e6)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, new_t: float, old_t: float):
+    speedup = old_t / new_t if new_t > 0 else float("inf")
+    print(
+        f"  {name:<26} | Cached: {new_t:8.2f}us | Previous: {old_t:8.2f}us | "
+        f"Speedup: {speedup:6.2f}x"
+    )
+
+
+class PreviousArray:
+    """The previous wrapper's per-result work, for comparison."""
+
+    def __init__(self, handle):
+        self._handle = handle
+        self.shape = tuple(_backend.array_shape(handle))
+
+    @property
+    def strides(self):
+        return self._handle.strides
+
+    @property
+    def offset(self):
+        return self._handle.offset
+
+    def __add__(self, other):
+        return PreviousArray(_backend.add(self._handle, other._handle))
+
+
+def benchmark_binary_ops():
+    print_header("a + b DISPATCH (no sync)")
+    for shape in [(1,), (4, 4), (16, 16, 4)]:
+        a, b = Array.from_handle(_backend.rand(list(shape))), Array([1.0])
+        old_a, old_b = PreviousArray(a._handle), PreviousArray(b._handle)
+
+        new_t, _ = time_fn(lambda: a + b)
+        old_t, _ = time_fn(lambda: old_a + old_b)
+        print_result(f"shape={shape}", new_t, old_t)
+
+        new_t, _ = time_fn(lambda: (a + b) + b)
+        old_t, _ = time_fn(lambda: (old_a + old_b) + old_b)
+        print_result(f"chain of 2, shape={shape}", new_t, old_t)
+
+
+def benchmark_metadata():
+    print_header("METADATA READS")
+    a = Array.from_handle(_backend.rand([8, 8]))
+    old = PreviousArray(a._handle)
+    a.shape
+
+    new_t, _ = time_fn(lambda: (a.shape, a.strides, a.offset))
+    old_t, _ = time_fn(lambda: (old.shape, old.strides, old.offset))
+    print_result("shape + strides + offset", new_t, old_t)
+
+    new_t, _ = time_fn(lambda: a.dtype)
+    old_t, _ = time_fn(lambda: old._handle.dtype)
+    print_result("dtype", new_t, old_t)
+
+
+if __name__ == "__main__":
+    benchmark_binary_ops()
+    benchmark_metadata()
@@ -0,0 +1,83 @@
+"""
+Reduced precision benchmarks for Forge.
+
+Compares float16 and bfloat16 against float32 for bandwidth bound elementwise
+ops, softmax and matmul, and reports the device memory held by each input.
+"""
+
+import time
+from typing import Callable
+
+import Forge
+import numpy as np
+from Forge import Array
+
+
+def time_fn(fn: Callable, warmup: int = 5, iterations: int = 50) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_us, std_us)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1e6)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, dtype: str, t: float, base_t: float, nbytes: int):
+    speedup = base_t / t if t > 0 else float("inf")
+    print(
+        f"  {name:<18} | {dtype:<9} | {t:10.1f}us | {nbytes / 2**20:8.1f} MiB | "
+        f"vs float32: {speedup:5.2f}x"
+    )
+
+
+def make(shape, dtype):
+    x = Array.from_buffer(np.random.randn(*shape).astype(np.float32), shape=shape)
+    return x.astype(dtype)
+
+
+ITEMSIZES = {"float32": 4, "float16": 2, "bfloat16": 2}
+
+
+def run(name, shape, fn):
+    base_t = None
+    for dtype, size in ITEMSIZES.items():
+        x = make(shape, dtype)
+        t, _ = time_fn(lambda: fn(x)[0].list())
+        base_t = base_t or t
+        print_result(name, dtype, t, base_t, int(np.prod(shape)) * size)
+
+
+def benchmark_elementwise():
+    print_header("ELEMENTWISE: x * x + x (synced)")
+    for n in [1 << 16, 1 << 20, 1 << 24]:
+        run(f"n={n}", (n,), lambda x: x * x + x)
+
+
+def benchmark_softmax():
+    print_header("SOFTMAX axis=1")
+    for rows, cols in [(1024, 1024), (4096, 4096)]:
+        run(f"{rows}x{cols}", (rows, cols), lambda x: Forge.softmax(x, axis=1))
+
+
+def benchmark_matmul():
+    print_header("MATMUL x @ x")
+    for n in [512, 2048]:
+        run(f"{n}x{n}", (n, n), lambda x: x @ x)
+
+
+if __name__ == "__main__":
+    benchmark_elementwise()
+    benchmark_softmax()
+    benchmark_matmul()
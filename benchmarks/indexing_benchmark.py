@@ -0,0 +1,101 @@
+"""
+Index op benchmarks for Forge.
+
+Compares the device-side take / index_add kernels against what selecting rows
+with an index list used to need: reading the array back with .list(), indexing
+in Python and building a new Array (and the same round trip for accumulating
+gradients back into an embedding table).
+"""
+
+import time
+from typing import Callable
+
+import Forge
+import numpy as np
+from Forge import Array
+
+
+def time_fn(fn: Callable, warmup: int = 2, iterations: int = 10) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_ms, std_ms)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, device_t: float, roundtrip_t: float):
+    speedup = roundtrip_t / device_t if device_t > 0 else float("inf")
+    print(
+        f"  {name:<32} | Device: {device_t:8.3f}ms | "
+        f"Round-trip: {roundtrip_t:9.3f}ms | Speedup: {speedup:7.1f}x"
+    )
+
+
+def benchmark_take(rows: int, dim: int, batch: int):
+    print_header(f"ROW SELECTION ({rows}x{dim} float32, batch {batch})")
+    table = Forge.rand(rows, dim)
+    idx_list = np.random.randint(0, rows, size=batch).tolist()
+    idx = Array(idx_list, dtype="int32")
+
+    def device():
+        # Reading one element back waits for the kernel
+        table[idx][0, 0]
+
+    def roundtrip():
+        data = table.list()
+        Array([data[i] for i in idx_list])[0, 0]
+
+    print_result("table[idx]", time_fn(device)[0], time_fn(roundtrip)[0])
+
+    cols = Array(np.random.randint(0, dim, size=dim // 2).tolist(), dtype="int32")
+    col_list = cols.list()
+
+    def device_cols():
+        table[:, cols][0, 0]
+
+    def roundtrip_cols():
+        Array([[row[j] for j in col_list] for row in table.list()])[0, 0]
+
+    print_result("table[:, cols]", time_fn(device_cols)[0], time_fn(roundtrip_cols)[0])
+
+
+def benchmark_index_add(rows: int, dim: int, batch: int):
+    print_header(f"EMBEDDING BACKWARD ({rows}x{dim} float32, batch {batch})")
+    grad_table = Forge.zeros(rows, dim)
+    grad_out = Forge.rand(batch, dim)
+    idx_list = np.random.randint(0, rows, size=batch).tolist()
+    idx = Array(idx_list, dtype="int32")
+
+    def device():
+        grad_table.index_add(idx, grad_out)[0, 0]
+
+    def roundtrip():
+        acc = grad_table.list()
+        for i, g in zip(idx_list, grad_out.list()):
+            row = acc[i]
+            for j, v in enumerate(g):
+                row[j] += v
+        Array(acc)[0, 0]
+
+    print_result(
+        "table.index_add(idx, grad)", time_fn(device)[0], time_fn(roundtrip)[0]
+    )
+
+
+if __name__ == "__main__":
+    for rows, dim, batch in [(1000, 64, 256), (10000, 128, 1024), (50000, 256, 4096)]:
+        benchmark_take(rows, dim, batch)
+        benchmark_index_add(rows, dim, batch)
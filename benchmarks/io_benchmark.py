@@ -0,0 +1,120 @@
+"""
+Dataset ingestion benchmarks for Forge.
+
+Loads an MNIST-format file (12-byte header, uint8 pixels, uint8 labels) into
+normalized float32 images and one-hot float32 labels, comparing:
+  - Python: array('B') reads, per-pixel float generators and a one-hot generator
+  - Forge.io: mmap via from_file, then normalize / one_hot kernels on the device
+Each loader runs in a fresh process so its peak RSS is reported on its own.
+"""
+
+import array
+import os
+import resource
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+NUM_CLASSES = 10
+
+
+def write_dataset(path: str, n: int, rows: int = 28, cols: int = 28):
+    rng = np.random.default_rng(0)
+    with open(path, "wb") as f:
+        f.write(struct.pack("III", n, rows, cols))
+        f.write(rng.integers(0, 256, n * rows * cols, dtype=np.uint8).tobytes())
+        f.write(rng.integers(0, NUM_CLASSES, n, dtype=np.uint8).tobytes())
+
+
+def load_python(path: str):
+    from Forge import Array
+
+    with open(path, "rb") as f:
+        num_items, rows, cols = struct.unpack("III", f.read(12))
+        images = array.array("B")
+        images.fromfile(f, num_items * rows * cols)
+        labels = array.array("B")
+        labels.fromfile(f, num_items)
+
+    pixels = array.array("f", (float(x) / 255.0 for x in images))
+    one_hot = array.array(
+        "f", (1.0 if i == y else 0.0 for y in labels for i in range(NUM_CLASSES))
+    )
+    x = Array(pixels).reshape((num_items, -1))
+    y = Array(one_hot).reshape((num_items, -1))
+    return x, y
+
+
+def load_forge(path: str):
+    import Forge
+
+    with open(path, "rb") as f:
+        num_items, rows, cols = struct.unpack("III", f.read(12))
+    pixels = Forge.io.from_file(path, (num_items, rows * cols), offset=12)
+    labels = Forge.io.from_file(path, num_items, offset=12 + num_items * rows * cols)
+    x = Forge.io.normalize(pixels, 1.0 / 255.0)
+    y = Forge.io.one_hot(labels, NUM_CLASSES)
+    return x, y
+
+
+LOADERS = {"python": load_python, "forge": load_forge}
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def run_child(loader: str, path: str):
+    """Runs one load in this process and prints `seconds peak_rss_mb`."""
+    import Forge  # noqa: F401 (keep import cost and device setup out of the timing)
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    x, y = LOADERS[loader](path)
+    _ = (x[0, 0], y[0, 0])  # wait for the device work
+    elapsed = time.perf_counter() - start
+    print(elapsed, peak_rss_mb() - baseline)
+
+
+def measure(loader: str, path: str):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", loader, path],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return float(out[0]), float(out[1])
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def benchmark_load():
+    print_header("MNIST-FORMAT LOAD: float32 images + one-hot labels")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in [1000, 10000, 60000]:
+            path = os.path.join(tmp, f"data_{n}.bin")
+            write_dataset(path, n)
+            py_t, py_rss = measure("python", path)
+            fg_t, fg_rss = measure("forge", path)
+            print(
+                f"  n={n:<6} | Python: {py_t * 1e3:9.1f}ms {py_rss:7.1f}MB | "
+                f"Forge.io: {fg_t * 1e3:8.1f}ms {fg_rss:7.1f}MB | "
+                f"Speedup: {py_t / fg_t:7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        benchmark_load()
@@ -0,0 +1,81 @@
+"""
+Fused linear layer benchmarks for Forge.
+
+Compares Forge.linear(x, W, b, activation="tanh"), where the bias add and the
+activation run as a single in-place pass over the matmul output, against the
+unfused tanh(x @ W.T + b) of three separate kernels, over MLP-sized layers.
+"""
+
+import time
+from typing import Callable
+
+import Forge
+import numpy as np
+
+
+def time_fn(fn: Callable, warmup: int = 3, iterations: int = 20) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_ms, std_ms)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, fused_t: float, unfused_t: float, correct: bool):
+    speedup = unfused_t / fused_t if fused_t > 0 else float("inf")
+    status = "OK" if correct else "MISMATCH"
+    print(
+        f"  {name:<28} | Fused: {fused_t:8.3f}ms | Unfused: {unfused_t:8.3f}ms | "
+        f"Speedup: {speedup:5.2f}x | {status}"
+    )
+
+
+def benchmark_layers():
+    print_header("LINEAR + BIAS + TANH (synced)")
+    for batch, n_in, n_out in [(500, 784, 64), (500, 64, 64), (4096, 1024, 1024)]:
+        x = Forge.rand(batch, n_in) - 0.5
+        w = (Forge.rand(n_out, n_in) - 0.5) * 0.1
+        b = Forge.rand(n_out) - 0.5
+
+        def fused():
+            return Forge.linear(x, w, b, activation="tanh")
+
+        def unfused():
+            return Forge.tanh(x @ w.T + b)
+
+        correct = np.allclose(fused().list(), unfused().list(), atol=1e-5)
+        # Reading one element back waits for the whole layer
+        fused_t, _ = time_fn(lambda: fused()[0, 0])
+        unfused_t, _ = time_fn(lambda: unfused()[0, 0])
+        print_result(f"({batch}x{n_in}) -> {n_out}", fused_t, unfused_t, correct)
+
+
+def benchmark_accumulate():
+    print_header("ACCUMULATE INTO OUTPUT: out = x @ W + out")
+    for n in [256, 1024, 2048]:
+        x = Forge.rand(n, n)
+        w = Forge.rand(n, n)
+        out = Forge.zeros(n, n)
+
+        fused_t, _ = time_fn(lambda: Forge.matmul(x, w, beta=1.0, out=out)[0, 0])
+
+        unfused_t, _ = time_fn(lambda: (x @ w + out)[0, 0])
+        print_result(f"{n}x{n}", fused_t, unfused_t, True)
+
+
+if __name__ == "__main__":
+    benchmark_layers()
+    benchmark_accumulate()
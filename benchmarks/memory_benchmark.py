@@ -0,0 +1,62 @@
+"""
+Memory footprint benchmark for Forge.
+
+Reports the peak device memory of one MLP training-style forward pass per batch
+size (as Forge.memory_stats() sees it), which is what capacity planning needs,
+and checks that repeated steps don't leave buffers or handles behind.
+"""
+
+import gc
+
+import Forge
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def step(x, w1, b1, w2, b2, labels):
+    h = Forge.linear(x, w1, b1, activation="relu")
+    logits = Forge.linear(h, w2, b2)
+    return Forge.cross_entropy(logits, labels).item()
+
+
+def benchmark_peaks(hidden: int):
+    print_header(f"PEAK MEMORY PER STEP (784 -> {hidden} -> 10, float32)")
+    w1, b1 = Forge.randn(hidden, 784), Forge.zeros(hidden)
+    w2, b2 = Forge.randn(10, hidden), Forge.zeros(10)
+    for batch in [64, 256, 1024, 4096]:
+        x = Forge.rand(batch, 784)
+        labels = Forge.rand(batch, 10)
+        gc.collect()
+        Forge.reset_peak_memory()
+        base = Forge.memory_stats()["live_bytes"]
+        step(x, w1, b1, w2, b2, labels)
+        peak = Forge.memory_stats()["peak_bytes"] - base
+        print(f"  batch {batch:<6} | step peak: {peak / 2**20:8.2f} MB")
+
+
+def check_leaks(iterations: int):
+    print_header(f"LEAK CHECK ({iterations} steps)")
+    w1, b1 = Forge.randn(256, 784), Forge.zeros(256)
+    w2, b2 = Forge.randn(10, 256), Forge.zeros(10)
+    x, labels = Forge.rand(128, 784), Forge.rand(128, 10)
+    step(x, w1, b1, w2, b2, labels)
+    gc.collect()
+    before = Forge.memory_stats()
+    for _ in range(iterations):
+        step(x, w1, b1, w2, b2, labels)
+    gc.collect()
+    after = Forge.memory_stats()
+    for key in ["live_bytes", "live_buffers", "live_handles"]:
+        print(f"  {key:<14} | before: {before[key]:>12} | after: {after[key]:>12}")
+    print(
+        f"  allocations per step: {(after['allocations'] - before['allocations']) / iterations:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    benchmark_peaks(512)
+    check_leaks(100)
@@ -0,0 +1,248 @@
+"""
+End-to-end MLP training throughput benchmark for Forge.
+
+Trains the py/examples/MLP.py architecture (784 -> 64 -> 64 -> 10, tanh, softmax,
+fused SGD with weight decay) on generated data, so nothing has to be downloaded,
+in three configurations:
+
+    eager          every op runs eagerly
+    forge-forward  each layer of the forward pass is a @forge function
+    forge-step     the backward pass's per-layer gradients are @forge functions too
+
+and reports samples/sec, p50/p99 step latency, a forward/backward/update latency
+breakdown, compile time and peak device memory per configuration.
+
+@forge graphs trace a single output and can't reduce yet, so the compiled
+configurations compile what they can (layers, activation gradients, weight
+gradients) and keep the bias-gradient sums and the optimizer eager. The graph
+runtime is still being built, so compiled configurations only report their
+compile time unless --run-compiled is passed.
+"""
+
+import argparse
+import gc
+import time
+
+import Forge
+import numpy as np
+from Forge.forge import _compile
+
+IN, HIDDEN, OUT = 784, 64, 10
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def _sync(a):
+    """Reads one element back, which waits for the work producing `a`."""
+    return a[(0,) * len(a.shape)]
+
+
+def hidden_layer(x, w, b):
+    return Forge.linear(x, w, b, activation="tanh")
+
+
+def head(x, w, b):
+    return Forge.softmax(Forge.linear(x, w, b), axis=1)
+
+
+def tanh_grad(a, d_a):
+    # (1 - a^2) * d_a, written without a reflected scalar op so it traces
+    return d_a - a * a * d_a
+
+
+def weight_grad(d_b, a, n):
+    return Forge.matmul(d_b.T, a, alpha=1.0 / n)
+
+
+class MLP:
+    def __init__(self, config: str, batch: int):
+        Forge.set_seed(42)
+        bias_scale = 0.00001
+        # Xavier scale init weights
+        self.weights = [
+            (Forge.rand(HIDDEN, IN) - 0.5) * 0.1682,
+            (Forge.rand(HIDDEN, HIDDEN) - 0.5) * 0.4330,
+            (Forge.rand(OUT, HIDDEN) - 0.5) * 0.5694,
+        ]
+        self.biases = [
+            (Forge.rand(HIDDEN) - 0.5) * bias_scale,
+            (Forge.rand(HIDDEN) - 0.5) * bias_scale,
+            (Forge.rand(OUT) - 0.5) * bias_scale,
+        ]
+        self.opt_w = Forge.optim.SGD(self.weights, lr=0.2, weight_decay=0.001)
+        self.opt_b = Forge.optim.SGD(self.biases, lr=0.2)
+        self.batch = batch
+
+        self.compiled_forward = config in ("forge-forward", "forge-step")
+        self.compiled_backward = config == "forge-step"
+        fwd = Forge.forge if self.compiled_forward else (lambda f: f)
+        bwd = Forge.forge if self.compiled_backward else (lambda f: f)
+        self.hidden_layer = fwd(hidden_layer)
+        self.head = fwd(head)
+        self.tanh_grad = bwd(tanh_grad)
+        # n is baked into the traced graph as a constant
+        self.weight_grad = bwd(lambda d_b, a: weight_grad(d_b, a, batch))
+
+    def compile(self, x):
+        """Compiles every @forge function for this batch shape. Returns seconds."""
+        w1, w2, w3 = self.weights
+        b1, b2, b3 = self.biases
+        a = Forge.zeros(self.batch, HIDDEN)
+        d_out = Forge.zeros(self.batch, OUT)
+        calls = []
+        if self.compiled_forward:
+            calls += [
+                (self.hidden_layer, (x, w1, b1)),
+                (self.hidden_layer, (a, w2, b2)),
+                (self.head, (a, w3, b3)),
+            ]
+        if self.compiled_backward:
+            calls += [
+                (self.tanh_grad, (a, a)),
+                (self.weight_grad, (a, x)),
+                (self.weight_grad, (a, a)),
+                (self.weight_grad, (d_out, a)),
+            ]
+        start = time.perf_counter()
+        for f, args in calls:
+            _compile(f.__wrapped__, args)
+        return time.perf_counter() - start
+
+    def forward(self, x):
+        w1, w2, w3 = self.weights
+        b1, b2, b3 = self.biases
+        a1 = self.hidden_layer(x, w1, b1)
+        a2 = self.hidden_layer(a1, w2, b2)
+        return self.head(a2, w3, b3), a2, a1
+
+    def backward(self, p, a2, a1, x, y):
+        _, w2, w3 = self.weights
+        n = self.batch
+        d_b3 = p - y
+        d_b2 = self.tanh_grad(a2, d_b3 @ w3)
+        d_b1 = self.tanh_grad(a1, d_b2 @ w2)
+        d_w = [
+            self.weight_grad(d_b1, x),
+            self.weight_grad(d_b2, a1),
+            self.weight_grad(d_b3, a2),
+        ]
+        d_bias = [d.sum(axis=0) / n for d in (d_b1, d_b2, d_b3)]
+        return d_w, d_bias
+
+    def update(self, d_w, d_bias):
+        self.opt_w.step(d_w)
+        self.opt_b.step(d_bias)
+
+    def step(self, x, y):
+        p, a2, a1 = self.forward(x)
+        self.update(*self.backward(p, a2, a1, x, y))
+
+
+def synthetic_data(samples: int):
+    x = Forge.rand(samples, IN)
+    # Probability labels: cross-entropy's gradient is still p - y
+    y = Forge.softmax(Forge.randn(samples, OUT) * 3.0, axis=1)
+    return x, y
+
+
+def run(config: str, batch: int, steps: int, warmup: int, run_compiled: bool):
+    x_all, y_all = synthetic_data(batch * 16)
+    loader = Forge.data.DataLoader(
+        x_all, y_all, batch_size=batch, drop_last=True, seed=42
+    )
+
+    def batches():
+        while True:
+            yield from loader
+
+    data = batches()
+    model = MLP(config, batch)
+    x, _ = next(data)
+    result = {"config": config, "compile_ms": model.compile(x) * 1e3}
+    if model.compiled_forward and not run_compiled:
+        return result
+
+    for _ in range(warmup):
+        model.step(*next(data))
+    _sync(model.weights[0])
+
+    gc.collect()
+    Forge.reset_peak_memory()
+    base = Forge.memory_stats()["live_bytes"]
+    latencies = []
+    for _ in range(steps):
+        x, y = next(data)
+        start = time.perf_counter()
+        model.step(x, y)
+        _sync(model.weights[0])
+        latencies.append((time.perf_counter() - start) * 1e3)
+    result["peak_mb"] = (Forge.memory_stats()["peak_bytes"] - base) / 2**20
+
+    # Breakdown, synchronizing after every phase
+    phases = {"forward": [], "backward": [], "update": []}
+    for _ in range(max(steps // 4, 1)):
+        x, y = next(data)
+        start = time.perf_counter()
+        p, a2, a1 = model.forward(x)
+        _sync(p)
+        mid = time.perf_counter()
+        d_w, d_bias = model.backward(p, a2, a1, x, y)
+        _sync(d_w[0])
+        end = time.perf_counter()
+        model.update(d_w, d_bias)
+        _sync(model.weights[0])
+        phases["forward"].append((mid - start) * 1e3)
+        phases["backward"].append((end - mid) * 1e3)
+        phases["update"].append((time.perf_counter() - end) * 1e3)
+
+    result["samples_per_s"] = batch * steps / (sum(latencies) / 1e3)
+    result["p50_ms"] = float(np.percentile(latencies, 50))
+    result["p99_ms"] = float(np.percentile(latencies, 99))
+    for name, times in phases.items():
+        result[f"{name}_ms"] = float(np.median(times))
+    return result
+
+
+def print_result(r: dict):
+    if "p50_ms" not in r:
+        print(
+            f"  {r['config']:<14} | compile: {r['compile_ms']:8.2f}ms | "
+            "not run (pass --run-compiled)"
+        )
+        return
+    print(
+        f"  {r['config']:<14} | {r['samples_per_s']:>10.0f} samples/s | "
+        f"p50 {r['p50_ms']:7.3f}ms | p99 {r['p99_ms']:7.3f}ms | "
+        f"compile {r['compile_ms']:8.2f}ms | peak {r['peak_mb']:7.2f} MB"
+    )
+    print(
+        f"  {'':<14} | forward {r['forward_ms']:7.3f}ms | "
+        f"backward {r['backward_ms']:7.3f}ms | update {r['update_ms']:7.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MLP training throughput benchmark")
+    parser.add_argument("--batch", type=int, action="append")
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--config",
+        action="append",
+        choices=["eager", "forge-forward", "forge-step"],
+    )
+    parser.add_argument(
+        "--run-compiled",
+        action="store_true",
+        help="also execute the compiled configurations, not just compile them",
+    )
+    args = parser.parse_args()
+
+    for batch in args.batch or [64, 500, 2048]:
+        print_header(f"MLP {IN} -> {HIDDEN} -> {HIDDEN} -> {OUT}, batch {batch}")
+        for config in args.config or ["eager", "forge-forward", "forge-step"]:
+            print_result(run(config, batch, args.steps, args.warmup, args.run_compiled))
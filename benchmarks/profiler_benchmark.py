@@ -0,0 +1,83 @@
+"""
+Profiler overhead benchmark for Forge.
+
+Times a chain of small elementwise ops (where per-op overhead dominates) with
+no profiler, then inside Forge.profiler, and prints the profile of one MLP-like
+forward pass. Without an active profiler each hook is a single atomic load, so
+the first two columns should match closely.
+"""
+
+import time
+from typing import Callable
+
+import Forge
+import numpy as np
+
+
+def time_fn(fn: Callable, warmup: int = 3, iterations: int = 20) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_ms, std_ms)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, off_t: float, on_t: float):
+    overhead = (on_t / off_t - 1) * 100 if off_t > 0 else float("inf")
+    print(
+        f"  {name:<28} | Off: {off_t:8.3f}ms | On: {on_t:8.3f}ms | "
+        f"Overhead: {overhead:6.1f}%"
+    )
+
+
+def benchmark_overhead(n: int, ops: int):
+    print_header(f"OVERHEAD ({ops} chained ops on {n} floats)")
+    x = Forge.rand(n)
+
+    def chain():
+        y = x
+        for _ in range(ops):
+            y = y * 1.0001
+        y[0]
+
+    def profiled_chain():
+        with Forge.profiler():
+            chain()
+
+    off_t, _ = time_fn(chain)
+    on_t, _ = time_fn(profiled_chain)
+    print_result(f"x * c, {ops} times", off_t, on_t)
+
+
+def profile_forward(batch: int, hidden: int):
+    print_header(f"PROFILE (forward pass, batch {batch}, hidden {hidden})")
+    x = Forge.rand(batch, 784)
+    w1, b1 = Forge.randn(hidden, 784), Forge.zeros(hidden)
+    w2, b2 = Forge.randn(10, hidden), Forge.zeros(10)
+    labels = Forge.rand(batch, 10)
+
+    with Forge.profiler() as prof:
+        h = Forge.linear(x, w1, b1, activation="relu")
+        logits = Forge.linear(h, w2, b2)
+        loss = (Forge.softmax(logits, axis=1) - labels).sum()
+        loss.item()
+    print(prof.table(limit=10))
+
+
+if __name__ == "__main__":
+    for n in [1024, 1 << 20]:
+        benchmark_overhead(n, 100)
+    profile_forward(256, 512)
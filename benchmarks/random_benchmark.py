@@ -0,0 +1,89 @@
+"""
+Random number generation benchmarks for Forge.
+
+Times the Philox-4x32 generator on the device (one thread per counter block of
+four values) and on the host with 1 to N threads, reported as GB/s of float32
+written. NumPy's default generator is the reference.
+"""
+
+import os
+import time
+from typing import Callable
+
+import numpy as np
+from Forge import random
+
+
+def time_fn(fn: Callable, warmup: int = 3, iterations: int = 20) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_ms, std_ms)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, t: float, numpy_t: float, nbytes: int):
+    speedup = numpy_t / t if t > 0 else float("inf")
+    gbps = nbytes / (t * 1e6)
+    print(
+        f"  {name:<28} | {t:8.3f}ms ({gbps:6.1f} GB/s) | "
+        f"NumPy: {numpy_t:8.3f}ms | Speedup: {speedup:5.2f}x"
+    )
+
+
+def benchmark_device(n: int):
+    print_header(f"DEVICE ({n} float32, synced)")
+    g = random.Generator(seed=0)
+    rng = np.random.default_rng(0)
+    nbytes = 4 * n
+
+    # Reading one element back waits for the kernel
+    numpy_t, _ = time_fn(lambda: rng.random(n, dtype=np.float32))
+    t, _ = time_fn(lambda: g.uniform(n)[0])
+    print_result("uniform", t, numpy_t, nbytes)
+
+    numpy_t, _ = time_fn(lambda: rng.standard_normal(n, dtype=np.float32))
+    t, _ = time_fn(lambda: g.normal(n)[0])
+    print_result("normal", t, numpy_t, nbytes)
+
+    numpy_t, _ = time_fn(lambda: (rng.random(n, dtype=np.float32) >= 0.1) / 0.9)
+    t, _ = time_fn(lambda: g.dropout_mask(n, p=0.1)[0])
+    print_result("dropout mask p=0.1", t, numpy_t, nbytes)
+
+
+def benchmark_host(n: int):
+    print_header(f"HOST FILL ({n} float32)")
+    g = random.Generator(seed=0)
+    rng = np.random.default_rng(0)
+    out = np.empty(n, dtype=np.float32)
+    nbytes = 4 * n
+
+    numpy_t, _ = time_fn(lambda: rng.random(out=out, dtype=np.float32))
+    threads = 1
+    while threads <= (os.cpu_count() or 1):
+        t, _ = time_fn(lambda: g.fill(out, threads=threads))
+        print_result(f"uniform, {threads} threads", t, numpy_t, nbytes)
+        threads *= 2
+
+    numpy_t, _ = time_fn(lambda: rng.standard_normal(out=out, dtype=np.float32))
+    t, _ = time_fn(lambda: g.fill(out, "normal"))
+    print_result("normal, all threads", t, numpy_t, nbytes)
+
+
+if __name__ == "__main__":
+    for n in [1 << 16, 1 << 20, 1 << 24]:
+        benchmark_device(n)
+        benchmark_host(n)
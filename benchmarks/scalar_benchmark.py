@@ -0,0 +1,93 @@
+"""
+Scalar operand benchmarks for Forge.
+
+Compares scalar-tensor expressions such as `x * 0.5 + 1.0`, where the scalar
+is passed to the kernel as a constant, against the previous path that wrapped
+every Python scalar in a 1-element device Array.
+"""
+
+import time
+from typing import Callable
+
+import numpy as np
+from Forge import Array
+
+
+def time_fn(
+    fn: Callable, warmup: int = 5, iterations: int = 200
+) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_us, std_us)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1e6)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, new_t: float, old_t: float):
+    speedup = old_t / new_t if new_t > 0 else float("inf")
+    print(
+        f"  {name:<22} | Immediate: {new_t:9.1f}us | 1-elem Array: {old_t:9.1f}us | "
+        f"Speedup: {speedup:6.2f}x"
+    )
+
+
+def benchmark_dispatch():
+    """Python + encode overhead only: results are not waited on."""
+    print_header("DISPATCH OVERHEAD: x * 0.5 + 1.0 (no sync)")
+    for n in [1, 1024, 1 << 20]:
+        x = Array(np.random.randn(n).astype(np.float32).tolist())
+
+        new_t, _ = time_fn(lambda: x * 0.5 + 1.0)
+        old_t, _ = time_fn(lambda: x * Array([0.5]) + Array([1.0]))
+        print_result(f"n={n}", new_t, old_t)
+
+
+def benchmark_end_to_end():
+    """Includes waiting for the GPU by reading one element back."""
+    print_header("END TO END: x * 0.5 + 1.0 (synced)")
+    for n in [1, 1024, 1 << 20]:
+        x = Array(np.random.randn(n).astype(np.float32).tolist())
+
+        new_t, _ = time_fn(lambda: (x * 0.5 + 1.0)[0])
+        old_t, _ = time_fn(lambda: (x * Array([0.5]) + Array([1.0]))[0])
+        print_result(f"n={n}", new_t, old_t)
+
+
+def benchmark_neg_and_fill():
+    print_header("NEGATION AND SCALAR ASSIGNMENT")
+    x = Array(np.random.randn(256, 256).astype(np.float32).tolist())
+
+    new_t, _ = time_fn(lambda: (-x)[0, 0])
+    old_t, _ = time_fn(lambda: (Array([0]) - x)[0, 0])
+    print_result("-x", new_t, old_t)
+
+    def fill_new():
+        x[::2, 1:] = 3.0
+        return x[0, 0]
+
+    def fill_old():
+        x[::2, 1:] = Array([3.0])
+        return x[0, 0]
+
+    new_t, _ = time_fn(fill_new)
+    old_t, _ = time_fn(fill_old)
+    print_result("x[::2, 1:] = 3.0", new_t, old_t)
+
+
+if __name__ == "__main__":
+    benchmark_dispatch()
+    benchmark_end_to_end()
+    benchmark_neg_and_fill()
@@ -0,0 +1,96 @@
+"""
+Fused softmax / cross-entropy benchmarks for Forge.
+
+Compares the fused row-wise kernels against the composed versions
+used before they existed (exp -> sum -> divide, log -> multiply -> sum).
+"""
+
+import time
+from typing import Callable
+
+import Forge
+import numpy as np
+from Forge import Array
+
+
+def time_fn(fn: Callable, warmup: int = 2, iterations: int = 10) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_ms, std_ms)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, fused_t: float, composed_t: float, correct: bool):
+    speedup = composed_t / fused_t if fused_t > 0 else float("inf")
+    status = "PASS" if correct else "FAIL"
+    print(
+        f"  {name:<22} | Fused: {fused_t:8.3f}ms | Composed: {composed_t:8.3f}ms | "
+        f"Speedup: {speedup:6.2f}x | {status}"
+    )
+
+
+def composed_softmax(x: Array) -> Array:
+    exp_x = Forge.exp(x)
+    return exp_x / exp_x.sum(axis=1, keepdims=True)
+
+
+def composed_cross_entropy(x: Array, y: Array) -> Array:
+    p = composed_softmax(x)
+    return (-y * (p + 1e-9).log()).sum()
+
+
+def np_softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - x.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+def benchmark_softmax():
+    print_header("SOFTMAX (rows x classes)")
+    for rows, cols in [(500, 10), (10000, 10), (4096, 1024), (60000, 10)]:
+        x_np = np.random.randn(rows, cols).astype(np.float32)
+        x = Array.from_buffer(x_np, x_np.shape)
+
+        # Sync by reading one element back
+        fused_t, _ = time_fn(lambda: Forge.softmax(x, axis=1)[0, 0])
+        composed_t, _ = time_fn(lambda: composed_softmax(x)[0, 0])
+
+        result = np.array(Forge.softmax(x, axis=1).list(), dtype=np.float32)
+        correct = np.allclose(result, np_softmax(x_np), atol=1e-5)
+        print_result(f"{rows}x{cols}", fused_t, composed_t, correct)
+
+
+def benchmark_cross_entropy():
+    print_header("CROSS-ENTROPY (one-hot labels, mean over rows)")
+    for rows, cols in [(500, 10), (10000, 10), (60000, 10), (4096, 1024)]:
+        x_np = np.random.randn(rows, cols).astype(np.float32)
+        y_np = np.eye(cols, dtype=np.float32)[np.random.randint(0, cols, rows)]
+        x = Array.from_buffer(x_np, x_np.shape)
+        y = Array.from_buffer(y_np, y_np.shape)
+
+        fused_t, _ = time_fn(lambda: Forge.cross_entropy(x, y, axis=1).list())
+        composed_t, _ = time_fn(lambda: composed_cross_entropy(x, y).list() / rows)
+
+        expected = -(y_np * np.log(np_softmax(x_np))).sum() / rows
+        correct = np.isclose(
+            Forge.cross_entropy(x, y, axis=1).list(), expected, rtol=1e-4
+        )
+        print_result(f"{rows}x{cols}", fused_t, composed_t, correct)
+
+
+if __name__ == "__main__":
+    benchmark_softmax()
+    benchmark_cross_entropy()
@@ -0,0 +1,369 @@
+"""
+Op-level benchmark suite for Forge with JSON results and regression checks.
+
+Covers every op family: construction, elementwise ops across layouts, reductions
+per axis, matmul shapes, indexing, copies and @forge tracing/compilation. Each
+case times Forge (synchronized by reading one element back) next to the same op
+in NumPy, the only other dependency. Results are written as JSON; given a
+baseline JSON from an earlier run, every case whose median time grew by more
+than its threshold is listed and the script exits with status 1, so it can gate
+a release:
+
+    python benchmarks/suite.py --out baseline.json
+    python benchmarks/suite.py --baseline baseline.json --threshold 0.15 \\
+        --family-threshold matmul=0.25 --out current.json
+
+Without the Metal backend (e.g. on a Linux CI machine) only the NumPy references
+run, which still exercises the harness and the baseline format. @forge graph
+execution is still being built, so the forge family times tracing/compiling and
+the graph cache lookup a call goes through, not the run itself.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+    import Forge
+except ImportError:
+    Forge = None
+
+FAMILIES = [
+    "construction",
+    "elementwise",
+    "reduction",
+    "matmul",
+    "indexing",
+    "copy",
+    "forge",
+]
+
+
+def time_fn(fn: Callable, warmup: int = 3, iterations: int = 20) -> dict:
+    """Time a function with warmup iterations. Returns stats in milliseconds."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return {
+        "median_ms": float(np.median(times)),
+        "mean_ms": float(np.mean(times)),
+        "std_ms": float(np.std(times)),
+        "min_ms": float(np.min(times)),
+    }
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, forge_stats: Optional[dict], numpy_stats: dict):
+    numpy_t = numpy_stats["median_ms"]
+    if forge_stats is None:
+        print(f"  {name:<34} | Forge:        n/a | NumPy: {numpy_t:8.3f}ms")
+        return
+    forge_t = forge_stats["median_ms"]
+    speedup = numpy_t / forge_t if forge_t > 0 else float("inf")
+    print(
+        f"  {name:<34} | Forge: {forge_t:8.3f}ms | NumPy: {numpy_t:8.3f}ms | "
+        f"Speedup: {speedup:6.2f}x"
+    )
+
+
+def _sync(a):
+    """Reads one element back, which waits for the work producing `a`."""
+    return a[(0,) * len(a.shape)] if a.shape else a.item()
+
+
+def _cases(n: int):
+    """
+    Yields (family, name, forge_fn, numpy_fn). forge_fn is None without the
+    backend. `n` scales the sizes (n x n matrices).
+    """
+    rng = np.random.default_rng(0)
+    x_np = rng.random((n, n), dtype=np.float32)
+    y_np = rng.random((n, n), dtype=np.float32)
+    row_np = rng.random(n, dtype=np.float32)
+    idx_np = rng.integers(0, n, n // 2).astype(np.int32)
+    have = Forge is not None
+    if have:
+        x = Forge.Array.from_buffer(x_np, x_np.shape)
+        y = Forge.Array.from_buffer(y_np, y_np.shape)
+        row = Forge.Array.from_buffer(row_np, row_np.shape)
+        idx = Forge.Array.from_buffer(idx_np, idx_np.shape)
+
+    def case(family, name, forge_fn, numpy_fn):
+        return family, name, forge_fn if have else None, numpy_fn
+
+    # construction
+    small = x_np[:64].tolist()
+    yield case(
+        "construction",
+        "Array(list) 64xN",
+        lambda: _sync(Forge.Array(small)),
+        lambda: np.array(small, dtype=np.float32),
+    )
+    yield case(
+        "construction",
+        "from_buffer NxN",
+        lambda: _sync(Forge.Array.from_buffer(x_np, x_np.shape)),
+        lambda: x_np.copy(),
+    )
+    yield case(
+        "construction",
+        "zeros NxN",
+        lambda: _sync(Forge.zeros(n, n)),
+        lambda: np.zeros((n, n), dtype=np.float32),
+    )
+    yield case(
+        "construction",
+        "rand NxN",
+        lambda: _sync(Forge.rand(n, n)),
+        lambda: rng.random((n, n), dtype=np.float32),
+    )
+
+    # elementwise, one case per kernel layout
+    yield case("elementwise", "x + y", lambda: _sync(x + y), lambda: x_np + y_np)
+    yield case("elementwise", "x * 0.5", lambda: _sync(x * 0.5), lambda: x_np * 0.5)
+    yield case("elementwise", "x + row", lambda: _sync(x + row), lambda: x_np + row_np)
+    yield case("elementwise", "x.T + y", lambda: _sync(x.T + y), lambda: x_np.T + y_np)
+    yield case(
+        "elementwise",
+        "x[:, ::2] + 1",
+        lambda: _sync(x[:, ::2] + 1.0),
+        lambda: x_np[:, ::2] + 1.0,
+    )
+    yield case(
+        "elementwise", "exp(x)", lambda: _sync(Forge.exp(x)), lambda: np.exp(x_np)
+    )
+    yield case(
+        "elementwise",
+        "x.astype(float16)",
+        lambda: _sync(x.astype(Forge.float16)),
+        lambda: x_np.astype(np.float16),
+    )
+
+    # reductions
+    yield case("reduction", "sum()", lambda: _sync(x.sum()), lambda: x_np.sum())
+    for axis in (0, 1):
+        yield case(
+            "reduction",
+            f"sum(axis={axis})",
+            lambda axis=axis: _sync(x.sum(axis=axis)),
+            lambda axis=axis: x_np.sum(axis=axis),
+        )
+    yield case(
+        "reduction",
+        "argmax(axis=1)",
+        lambda: _sync(x.argmax(axis=1)),
+        lambda: x_np.argmax(axis=1),
+    )
+    yield case(
+        "reduction",
+        "softmax(axis=1)",
+        lambda: _sync(Forge.softmax(x, axis=1)),
+        lambda: np.exp(x_np - x_np.max(axis=1, keepdims=True))
+        / np.exp(x_np - x_np.max(axis=1, keepdims=True)).sum(axis=1, keepdims=True),
+    )
+
+    # matmul shapes
+    yield case("matmul", "NxN @ NxN", lambda: _sync(x @ y), lambda: x_np @ y_np)
+    yield case("matmul", "NxN @ (NxN).T", lambda: _sync(x @ y.T), lambda: x_np @ y_np.T)
+    yield case(
+        "matmul",
+        "(N/4)xN @ NxN",
+        lambda: _sync(x[: n // 4] @ y),
+        lambda: x_np[: n // 4] @ y_np,
+    )
+    yield case(
+        "matmul",
+        "NxN @ N",
+        lambda: _sync(x @ row),
+        lambda: x_np @ row_np,
+    )
+    yield case(
+        "matmul",
+        "linear relu",
+        lambda: _sync(Forge.linear(x, y, row, activation="relu")),
+        lambda: np.maximum(x_np @ y_np.T + row_np, 0),
+    )
+
+    # indexing
+    yield case("indexing", "x[i, j]", lambda: x[1, 2], lambda: x_np[1, 2])
+    yield case(
+        "indexing",
+        "x[1:-1:2] view",
+        lambda: x[1:-1:2],
+        lambda: x_np[1:-1:2],
+    )
+    yield case(
+        "indexing",
+        "take rows",
+        lambda: _sync(Forge.take(x, idx, axis=0)),
+        lambda: np.take(x_np, idx_np, axis=0),
+    )
+
+    # copies
+    yield case(
+        "copy",
+        "x.T.reshape(-1)",
+        lambda: _sync(x.T.reshape(-1)),
+        lambda: x_np.T.reshape(-1),
+    )
+    yield case(
+        "copy",
+        "concatenate axis 0",
+        lambda: _sync(Forge.concatenate([x, y])),
+        lambda: np.concatenate([x_np, y_np]),
+    )
+
+    def assign():
+        x[: n // 2] = y[: n // 2]
+        _sync(x)
+
+    def assign_np():
+        x_np[: n // 2] = y_np[: n // 2]
+
+    yield case("copy", "x[:N/2] = y[:N/2]", assign, assign_np)
+
+    # @forge
+    if have:
+        forge_module = sys.modules["Forge.forge"]
+
+        def step(a, b):
+            return Forge.softmax(a @ b.T + 1.0, axis=1)
+
+        forge_module._compile(step, (x, y))
+
+    yield case(
+        "forge",
+        "trace + compile",
+        lambda: forge_module._compile(lambda a, b: step(a, b), (x, y)),
+        lambda: None,
+    )
+    yield case(
+        "forge",
+        "cached graph lookup",
+        lambda: forge_module._compile(step, (x, y)),
+        lambda: None,
+    )
+
+
+def run(n: int, families, iterations: int) -> dict:
+    results = {}
+    current = None
+    for family, name, forge_fn, numpy_fn in _cases(n):
+        if family not in families:
+            continue
+        if family != current:
+            print_header(f"{family.upper()} (N={n})")
+            current = family
+        forge_stats = time_fn(forge_fn, iterations=iterations) if forge_fn else None
+        numpy_stats = time_fn(numpy_fn, iterations=iterations)
+        print_result(name, forge_stats, numpy_stats)
+        results[f"{family}/{name}"] = {
+            "family": family,
+            "forge": forge_stats,
+            "numpy": numpy_stats,
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, family_thresholds):
+    """Cases whose Forge median grew past their threshold, as (key, old, new, limit)."""
+    regressions = []
+    for key, entry in results.items():
+        old = baseline.get("results", {}).get(key, {}).get("forge")
+        new = entry["forge"]
+        if not old or not new:
+            continue
+        limit = family_thresholds.get(entry["family"], threshold)
+        if new["median_ms"] > old["median_ms"] * (1 + limit):
+            regressions.append((key, old["median_ms"], new["median_ms"], limit))
+    return regressions
+
+
+def _family_threshold(text: str):
+    family, _, value = text.partition("=")
+    if family not in FAMILIES or not value:
+        raise argparse.ArgumentTypeError(f"expected FAMILY=FRACTION, got {text!r}")
+    return family, float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1024, help="N of the NxN inputs")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument(
+        "--family", action="append", choices=FAMILIES, help="run only these families"
+    )
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="allowed slowdown against the baseline, as a fraction (default 0.10)",
+    )
+    parser.add_argument(
+        "--family-threshold",
+        action="append",
+        type=_family_threshold,
+        default=[],
+        metavar="FAMILY=FRACTION",
+        help="per-family override of --threshold",
+    )
+    args = parser.parse_args(argv)
+
+    if Forge is None:
+        print("Forge backend unavailable: running the NumPy references only")
+    results = run(args.size, args.family or FAMILIES, args.iterations)
+    report = {
+        "meta": {
+            "size": args.size,
+            "iterations": args.iterations,
+            "forge": getattr(Forge, "__version__", None),
+            "numpy": np.__version__,
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(
+        results, baseline, args.threshold, dict(args.family_threshold)
+    )
+    print_header("REGRESSIONS AGAINST BASELINE")
+    for key, old, new, limit in regressions:
+        print(
+            f"  {key:<44} | {old:8.3f}ms -> {new:8.3f}ms "
+            f"(+{(new / old - 1) * 100:5.1f}%, limit {limit * 100:.0f}%)"
+        )
+    if not regressions:
+        print("  none")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
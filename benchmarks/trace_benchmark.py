@@ -0,0 +1,80 @@
+"""
+Graph construction benchmarks for Forge.
+
+Compiles traced graphs of a few thousand nodes both ways: flattening the traced
+Python nodes to tuples that the backend converts field by field (make_graph), and
+handing over the int64 arrays the tracer fills as it goes, read in place
+(make_graph_packed). Tracing is timed separately since both share it.
+"""
+
+import time
+from typing import Callable
+
+import Forge
+import numpy as np
+from Forge import _backend
+from Forge.forge import _flatten, _trace_graph
+
+
+def time_fn(fn: Callable, warmup: int = 2, iterations: int = 10) -> tuple[float, float]:
+    """Time a function with warmup iterations. Returns (mean_ms, std_ms)."""
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1000)
+
+    return np.mean(times), np.std(times)
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(f" {title}")
+    print("=" * 80)
+
+
+def print_result(name: str, packed_t: float, tuples_t: float):
+    speedup = tuples_t / packed_t if packed_t > 0 else float("inf")
+    print(
+        f"  {name:<28} | Packed: {packed_t:8.3f}ms | Tuples: {tuples_t:8.3f}ms | "
+        f"Speedup: {speedup:5.2f}x"
+    )
+
+
+def make_chain(depth: int):
+    def fn(x, w):
+        for _ in range(depth):
+            x = (x @ w) * 0.5 + x
+            x[0] = 1.0
+        return Forge.softmax(x, axis=1)
+
+    return fn
+
+
+def benchmark_graph(depth: int):
+    fn = make_chain(depth)
+    x, w = Forge.rand(16, 16), Forge.rand(16, 16)
+    g, out = _trace_graph(fn, (x, w))
+    print_header(f"{len(g.nodes)} NODES")
+
+    trace_t, _ = time_fn(lambda: _trace_graph(fn, (x, w)))
+    print(f"  {'trace':<28} | {trace_t:8.3f}ms")
+
+    def packed():
+        _backend.make_graph_packed(g.packed.buffers(), out.node.index)
+
+    def tuples():
+        _backend.make_graph(*_flatten(g, out))
+
+    packed_t, _ = time_fn(packed)
+    tuples_t, _ = time_fn(tuples)
+    print_result("hand-off + make_graph", packed_t, tuples_t)
+
+
+if __name__ == "__main__":
+    for depth in [100, 500, 2000]:
+        benchmark_graph(depth)
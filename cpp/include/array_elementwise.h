@@ -5,9 +5,16 @@
 #include <vector>
 
 #include "array_handle.h"
+#include "philox.h"
 
 std::shared_ptr<ArrayHandle> array_nullaryops(const std::vector<int64_t>& shape,
-                                              const std::string& op_name);
+                                              const std::string& op_name,
+                                              DType dtype = DType::float32);
+
+// Random values of `dist` (see philox.h) from `generator`, or the default generator when null.
+std::shared_ptr<ArrayHandle> array_random(const std::vector<int64_t>& shape, Distribution dist,
+                                          float p = 0.0f, Generator* generator = nullptr,
+                                          DType dtype = DType::float32);
 
 std::shared_ptr<ArrayHandle> array_unaryops(const std::shared_ptr<ArrayHandle>& A,
                                             const std::string& op_name);
@@ -19,3 +26,38 @@ std::shared_ptr<ArrayHandle> array_binops(const std::shared_ptr<ArrayHandle>& A,
 std::shared_ptr<ArrayHandle> array_inplaceops(const std::shared_ptr<ArrayHandle>& A,
                                               const std::shared_ptr<ArrayHandle>& B,
                                               const std::string& op_name);
+
+// Elementwise `A op B` into a new uint8 mask (1 where it holds), broadcasting like the
+// binary ops. op_name is one of eq, ne, lt, le, gt, ge.
+std::shared_ptr<ArrayHandle> array_compare(const std::shared_ptr<ArrayHandle>& A,
+                                           const std::shared_ptr<ArrayHandle>& B,
+                                           const std::string& op_name);
+
+// `A op scalar` into a uint8 mask, compared in float.
+std::shared_ptr<ArrayHandle> array_compare_scalar(const std::shared_ptr<ArrayHandle>& A,
+                                                  float scalar, const std::string& op_name);
+
+// cond ? A : B elementwise, broadcasting all three. A nonzero cond of any dtype selects A.
+std::shared_ptr<ArrayHandle> array_where(const std::shared_ptr<ArrayHandle>& cond,
+                                         const std::shared_ptr<ArrayHandle>& A,
+                                         const std::shared_ptr<ArrayHandle>& B);
+
+// Scalars take A's dtype: float for float dtypes, truncated to an exact int for integer ones.
+std::shared_ptr<ArrayHandle> array_scalarops(const std::shared_ptr<ArrayHandle>& A, double scalar,
+                                             const std::string& op_name);
+
+std::shared_ptr<ArrayHandle> array_inplace_scalarops(const std::shared_ptr<ArrayHandle>& A,
+                                                     double scalar, const std::string& op_name);
+
+void array_fill_view(const std::shared_ptr<ArrayHandle>& A, double value,
+                     std::vector<int64_t> shape, std::vector<int64_t> strides, size_t offset);
+
+std::shared_ptr<ArrayHandle> array_astype(const std::shared_ptr<ArrayHandle>& A, DType dtype);
+
+// (A * scale + shift) converted to `dtype` in one kernel, computed in float.
+std::shared_ptr<ArrayHandle> array_astype_scaled(const std::shared_ptr<ArrayHandle>& A, DType dtype,
+                                                 float scale, float shift);
+
+// One-hot encodes class indices into a new trailing axis of size num_classes.
+std::shared_ptr<ArrayHandle> array_one_hot(const std::shared_ptr<ArrayHandle>& labels,
+                                           int64_t num_classes, DType dtype);
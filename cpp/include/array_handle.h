@@ -2,9 +2,11 @@
 #include <cstdint>
 #include <memory>
 #include <mutex>
+#include <optional>
 #include <span>
 #include <vector>
 
+#include "common.h"
 #include "forge_handle.h"
 
 #ifdef __OBJC__
@@ -19,21 +21,37 @@ class ArrayHandle {
     std::vector<int64_t> shape_;
     std::vector<int64_t> strides_;
     size_t offset_;
+    DType dtype_;
     std::shared_ptr<ArrayStorage> storage_;
 
    public:
     // CONSTRUCTORS //
     ArrayHandle(std::vector<int64_t> shape, void* dev = nullptr, bool zero = false);
+    ArrayHandle(std::vector<int64_t> shape, DType dtype, void* dev = nullptr, bool zero = false);
     ArrayHandle(const float* src_data, std::vector<int64_t> shape, void* dev = nullptr);
+    ArrayHandle(const void* src_data, std::vector<int64_t> shape, DType dtype, void* dev = nullptr);
     ArrayHandle(const std::shared_ptr<ArrayHandle>& parent, std::vector<int64_t> new_shape,
                 std::vector<int64_t> new_strides, size_t new_offset);
+#ifdef __OBJC__
+    // Dense array over an existing buffer (e.g. a memory-mapped file), starting `offset` elements
+    // in
+    ArrayHandle(id<MTLBuffer> buffer, std::vector<int64_t> shape, DType dtype, size_t offset = 0);
+#endif
+    // Handles are shared through shared_ptr (views get their own handle over the same storage)
+    ArrayHandle(const ArrayHandle&) = delete;
+    ArrayHandle& operator=(const ArrayHandle&) = delete;
+    ~ArrayHandle();
 
     // ACCESSORS //
     const std::vector<int64_t>& shape() const { return shape_; }
     const std::vector<int64_t>& strides() const { return strides_; }
     size_t offset() const { return offset_; }
+    DType dtype() const { return dtype_; }
+    size_t itemsize() const { return dtype_size(dtype_); }
+    // float32 views of the storage; throw for other dtypes (use raw_data + load_element)
     std::span<const float> data() const;
     std::span<float> data();
+    void* raw_data() const;
 
 #ifdef __OBJC__
     id<MTLBuffer> metal_buffer() const;
@@ -69,14 +87,43 @@ inline size_t numel_from_shape(const std::vector<int64_t>& shape) {
     return n;
 }
 
+inline bool is_contiguous(const std::vector<int64_t>& shape, const std::vector<int64_t>& strides) {
+    int64_t z = 1;
+    for (int i = shape.size() - 1; i >= 0; --i) {
+        if (strides[i] != z) return false;
+        z *= shape[i];
+    }
+    return true;
+}
+
+// Strides that let an array of (shape, strides) be viewed as new_shape without copying, or
+// nullopt when the reshape splits or merges dims that aren't laid out contiguously.
+// Follows NumPy's no-copy reshape attempt; also used for traced reshapes (symbolic.py).
+std::optional<std::vector<int64_t>> reshape_view_strides(const std::vector<int64_t>& shape,
+                                                         const std::vector<int64_t>& strides,
+                                                         const std::vector<int64_t>& new_shape);
+
 std::vector<int64_t> array_shape(const std::shared_ptr<ArrayHandle>& h);
 
 std::shared_ptr<ArrayHandle> array_reshape(const std::shared_ptr<ArrayHandle>& h,
                                            std::vector<int64_t> shape);
 
+// Joins `inputs` (same dtype and rank, same shape except along `axis`) into a new dense array.
+// Each input is written straight into its slab of the output by the strided copy_view kernel,
+// all of them encoded into one command buffer.
+std::shared_ptr<ArrayHandle> array_concatenate(
+    const std::vector<std::shared_ptr<ArrayHandle>>& inputs, int axis);
+
 std::vector<int64_t> broadcast_shapes(std::span<const int64_t>&& a_shape,
                                       std::span<const int64_t>&& b_shape);
 
 std::vector<int64_t> get_bcast_strides(const std::vector<int64_t>& shape,
                                        const std::vector<int64_t>& strides,
                                        const std::vector<int64_t>& final_shape);
+
+// Drops size-1 dims from `shape` and merges each dim into the one before it when every
+// operand's strides are contiguous across the pair. `strides` holds one (already broadcast)
+// stride vector per operand and is rewritten in place; the dense element order is unchanged.
+// A shape with no dims left collapses to [1] with unit strides.
+std::vector<int64_t> coalesce_dims(const std::vector<int64_t>& shape,
+                                   std::vector<std::vector<int64_t>>& strides);
@@ -0,0 +1,37 @@
+#pragma once
+#include <memory>
+
+#include "array_handle.h"
+
+// Gathers rows A[indices[b]] along the first axis into the preallocated dense `out`
+// (shape: len(indices) followed by A's trailing dims), in place on the device.
+// `indices` is a 1-d int32 array; every index must be a valid row of A.
+void array_gather_rows(const std::shared_ptr<ArrayHandle>& out,
+                       const std::shared_ptr<ArrayHandle>& A,
+                       const std::shared_ptr<ArrayHandle>& indices);
+
+// Index kernels below take int32 `indices` of any layout. Negative indices count from the
+// end of the axis; indices still out of range read as 0 and are skipped by the adds (the
+// device can't raise).
+
+// A.take(indices, axis): shape A.shape[:axis] + indices.shape + A.shape[axis + 1:].
+std::shared_ptr<ArrayHandle> array_take(const std::shared_ptr<ArrayHandle>& A,
+                                        const std::shared_ptr<ArrayHandle>& indices, int axis);
+
+// out[p] = A[p with coordinate `axis` replaced by indices[p]] over indices' shape, which has
+// A's rank and no dim (other than `axis`) larger than A's (take_along_axis / torch.gather).
+std::shared_ptr<ArrayHandle> array_gather(const std::shared_ptr<ArrayHandle>& A,
+                                          const std::shared_ptr<ArrayHandle>& indices, int axis);
+
+// target[..., indices[j], ...] += updates[..., j, ...] along `axis`, in place: the reverse of
+// take (and the backward pass of an embedding lookup). Repeated indices accumulate.
+std::shared_ptr<ArrayHandle> array_index_add(const std::shared_ptr<ArrayHandle>& target,
+                                             const std::shared_ptr<ArrayHandle>& indices,
+                                             const std::shared_ptr<ArrayHandle>& updates, int axis);
+
+// target[p with coordinate `axis` replaced by indices[p]] += updates[p], in place: the reverse
+// of gather. `updates` has indices' shape. Repeated indices accumulate.
+std::shared_ptr<ArrayHandle> array_scatter_add(const std::shared_ptr<ArrayHandle>& target,
+                                               const std::shared_ptr<ArrayHandle>& indices,
+                                               const std::shared_ptr<ArrayHandle>& updates,
+                                               int axis);
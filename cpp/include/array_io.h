@@ -0,0 +1,13 @@
+#pragma once
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "array_handle.h"
+
+// Memory-maps `path` and returns the `shape` elements of `dtype` starting `offset` bytes in.
+// The mapping backs the Metal buffer directly (no copy); it is private, so writes to the
+// array never reach the file.
+std::shared_ptr<ArrayHandle> array_from_file(const std::string& path, std::vector<int64_t> shape,
+                                             DType dtype, size_t offset);
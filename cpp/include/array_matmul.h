@@ -1,7 +1,45 @@
 #pragma once
 #include <memory>
+#include <string>
 
 #include "array_handle.h"
 
+// Activations the fused matmul epilogue can apply. Mirrored by Forge.utils._ACTIVATIONS.
+enum class Activation : int { none = 0, relu = 1, tanh = 2, sigmoid = 3, gelu = 4 };
+
+// Kernel name stem of an activation ("relu", ...), throws for unknown values.
+const char* activation_name(Activation activation);
+
+// Applied to the product before it is returned: act(alpha * (A @ B) + beta * out + bias).
+// alpha and beta are folded into the GEMM itself; bias and the activation run as one
+// in-place pass over the product. `bias` must broadcast to the result's shape (usually
+// (N,)). `out`, if given, must be a dense array of the result's shape and dtype that
+// shares no buffer with either operand (checked); it is accumulated into (scaled by beta)
+// and returned.
+struct MatmulEpilogue {
+    std::shared_ptr<ArrayHandle> bias;
+    std::shared_ptr<ArrayHandle> out;
+    float alpha = 1.0f;
+    float beta = 0.0f;
+    Activation activation = Activation::none;
+};
+
+// How an operand is passed to MPS: its last two dims as a row-major matrix (or the transpose
+// of one when `transposed`) with rows `ld` elements apart. The stored matrix starts `col`
+// columns into its rows, so MPS is given the parent rows (from handle->offset() - col) and
+// reads from that column origin.
+struct MatmulOperand {
+    std::shared_ptr<ArrayHandle> handle;
+    bool transposed;
+    int64_t ld;
+    int64_t col = 0;
+};
+
+MatmulOperand prepare(const std::shared_ptr<ArrayHandle>& h);
+
+// Number of operands matmul has copied into dense buffers so far (layouts MPS can't read).
+size_t matmul_copy_count();
+
 std::shared_ptr<ArrayHandle> array_matmul(const std::shared_ptr<ArrayHandle>& A,
-                                          const std::shared_ptr<ArrayHandle>& B);
+                                          const std::shared_ptr<ArrayHandle>& B,
+                                          const MatmulEpilogue& epilogue = {});
@@ -0,0 +1,19 @@
+#pragma once
+#include <cstdint>
+#include <memory>
+#include <vector>
+
+#include "array_handle.h"
+
+// Multi-tensor optimizer steps. Every parameter (and its state) is updated in place,
+// all tensors are encoded into a single command buffer and scalars are immediates.
+void sgd_step(const std::vector<std::shared_ptr<ArrayHandle>>& params,
+              const std::vector<std::shared_ptr<ArrayHandle>>& grads,
+              const std::vector<std::shared_ptr<ArrayHandle>>& momentum_bufs, float lr,
+              float momentum, float dampening, float weight_decay, bool nesterov, bool first_step);
+
+void adam_step(const std::vector<std::shared_ptr<ArrayHandle>>& params,
+               const std::vector<std::shared_ptr<ArrayHandle>>& grads,
+               const std::vector<std::shared_ptr<ArrayHandle>>& exp_avgs,
+               const std::vector<std::shared_ptr<ArrayHandle>>& exp_avg_sqs, float lr, float beta1,
+               float beta2, float eps, float weight_decay, int64_t step);
@@ -1,6 +1,7 @@
 #pragma once
 #include <map>
 #include <memory>
+#include <string>
 
 #include "array_handle.h"
 
@@ -8,3 +9,19 @@ std::shared_ptr<ArrayHandle> sum_global(const std::shared_ptr<ArrayHandle>& A, b
 
 std::shared_ptr<ArrayHandle> sum_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis,
                                       bool keepdims);
+
+// op_name is max or min (the extremum, in A's dtype) or argmax or argmin (its int32 position
+// along `axis`, the first one on ties). Throws for an empty axis.
+std::shared_ptr<ArrayHandle> extremum_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis,
+                                           bool keepdims, const std::string& op_name);
+
+std::shared_ptr<ArrayHandle> softmax_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis);
+
+std::shared_ptr<ArrayHandle> log_softmax_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis);
+
+std::shared_ptr<ArrayHandle> logsumexp_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis,
+                                            bool keepdims);
+
+std::shared_ptr<ArrayHandle> cross_entropy(const std::shared_ptr<ArrayHandle>& logits,
+                                           const std::shared_ptr<ArrayHandle>& labels, size_t axis,
+                                           const std::string& reduction);
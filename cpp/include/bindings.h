@@ -1,7 +1,10 @@
 #pragma once
 #include <nanobind/nanobind.h>
 #include <nanobind/ndarray.h>
+#include <nanobind/stl/optional.h>
 #include <nanobind/stl/shared_ptr.h>
+#include <nanobind/stl/string.h>
+#include <nanobind/stl/tuple.h>
 #include <nanobind/stl/vector.h>
 
 #include "array_handle.h"
@@ -10,11 +13,35 @@
 namespace nb = nanobind;
 
 std::shared_ptr<ArrayHandle> create_array_from_buffer_py(
-    nb::ndarray<float, nb::numpy, nb::c_contig, nb::device::cpu> arr, std::vector<int64_t> shape,
+    nb::ndarray<nb::numpy, nb::c_contig, nb::device::cpu> arr, std::vector<int64_t> shape,
     ForgeHandle* FH);
 
+nb::object element_to_py(const ArrayHandle& h, size_t idx);
+
 nb::object array_to_list(const ArrayHandle& h);
 
+// The view of (shape, strides, offset) selected by a basic indexing key: ints, slices, None
+// and at most one Ellipsis, alone or in a tuple. Returns the view's shape, strides and offset;
+// raises IndexError/ValueError/TypeError for invalid keys. Views are memoized per shape,
+// strides and key.
+std::tuple<std::vector<int64_t>, std::vector<int64_t>, int64_t> index_view(
+    const std::vector<int64_t>& shape, const std::vector<int64_t>& strides, int64_t offset,
+    nb::handle key);
+
+// h[key] as a view sharing h's storage, or the element as a Python scalar when the key
+// selects a single element (waits for the device).
+nb::object array_index(const std::shared_ptr<ArrayHandle>& h, nb::handle key);
+
 std::vector<Node> parse_nodes(nb::list flat_nodes);
 
-std::shared_ptr<Graph> make_graph(nb::list flat_nodes, int output_index);
+std::shared_ptr<Graph> make_graph(nb::list flat_nodes, int output_index,
+                                  uint64_t memory_budget = 0);
+
+// One int64 array of Forge.graph.PackedNodes, read in place
+using PackedColumn = nb::ndarray<const int64_t, nb::ndim<1>, nb::c_contig, nb::device::cpu>;
+
+// Nodes from the structure-of-arrays encoding built while tracing (see PackedNodes)
+std::vector<Node> parse_packed_nodes(const std::vector<PackedColumn>& columns);
+
+std::shared_ptr<Graph> make_graph_packed(const std::vector<PackedColumn>& columns, int output_index,
+                                         uint64_t memory_budget = 0);
@@ -1,4 +1,8 @@
 #pragma once
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <stdexcept>
 
 enum class OpCode : int {
     INPUT = 0,
@@ -12,5 +16,104 @@ enum class OpCode : int {
     VIEW = 8,
     UPDATE = 9,
     CONSTANT = 10,
-    COPY = 11
+    COPY = 11,
+    SOFTMAX = 12,
+    LOG_SOFTMAX = 13,
+    LOGSUMEXP = 14,
+    CROSS_ENTROPY = 15,
+    CAST = 16,
+    TAKE = 17,
+    GATHER = 18,
+    INDEX_ADD = 19,
+    SCATTER_ADD = 20,
+    CONCAT = 21
 };
+
+// Element type of an ArrayHandle's storage. Mirrored by Forge.DType on the Python side.
+// Compute happens in float for the floating-point types (and for reductions / matmul).
+enum class DType : int { float32 = 0, float16 = 1, bfloat16 = 2, int32 = 3, uint8 = 4 };
+
+inline size_t dtype_size(DType dtype) {
+    switch (dtype) {
+        case DType::float32:
+        case DType::int32:
+            return 4;
+        case DType::float16:
+        case DType::bfloat16:
+            return 2;
+        case DType::uint8:
+            return 1;
+    }
+    throw std::runtime_error("dtype_size: unknown dtype");
+}
+
+// Also the suffix of the per-dtype kernel names in metal_source.h, e.g. "add_float16".
+inline const char* dtype_name(DType dtype) {
+    switch (dtype) {
+        case DType::float32:
+            return "float32";
+        case DType::float16:
+            return "float16";
+        case DType::bfloat16:
+            return "bfloat16";
+        case DType::int32:
+            return "int32";
+        case DType::uint8:
+            return "uint8";
+    }
+    throw std::runtime_error("dtype_name: unknown dtype");
+}
+
+inline bool dtype_is_float(DType dtype) {
+    return dtype == DType::float32 || dtype == DType::float16 || dtype == DType::bfloat16;
+}
+
+// Host-side reads of 16-bit float storage (for list() / item()).
+inline float half_to_float(uint16_t h) {
+    uint32_t sign = (uint32_t)(h & 0x8000) << 16;
+    uint32_t exp = (h >> 10) & 0x1f;
+    uint32_t mant = h & 0x3ff;
+    uint32_t bits;
+    if (exp == 0x1f) {
+        bits = sign | 0x7f800000 | (mant << 13);
+    } else if (exp != 0) {
+        bits = sign | ((exp + 112) << 23) | (mant << 13);
+    } else if (mant == 0) {
+        bits = sign;
+    } else {
+        // Subnormal half: renormalize into a float exponent
+        exp = 113;
+        while (!(mant & 0x400)) {
+            mant <<= 1;
+            exp--;
+        }
+        bits = sign | (exp << 23) | ((mant & 0x3ff) << 13);
+    }
+    float f;
+    std::memcpy(&f, &bits, sizeof(f));
+    return f;
+}
+
+inline float bfloat16_to_float(uint16_t b) {
+    uint32_t bits = (uint32_t)b << 16;
+    float f;
+    std::memcpy(&f, &bits, sizeof(f));
+    return f;
+}
+
+// Element `idx` of a raw storage buffer, widened to double.
+inline double load_element(const void* data, DType dtype, size_t idx) {
+    switch (dtype) {
+        case DType::float32:
+            return ((const float*)data)[idx];
+        case DType::float16:
+            return half_to_float(((const uint16_t*)data)[idx]);
+        case DType::bfloat16:
+            return bfloat16_to_float(((const uint16_t*)data)[idx]);
+        case DType::int32:
+            return ((const int32_t*)data)[idx];
+        case DType::uint8:
+            return ((const uint8_t*)data)[idx];
+    }
+    throw std::runtime_error("load_element: unknown dtype");
+}
@@ -6,3 +6,9 @@ std::vector<Node> optimize_graph(std::vector<Node> raw_nodes);
 void generateKernels(Graph& graph);
 
 void compile_metal(Graph& graph);
+
+// Shrinks the graph's arena towards `memory_budget` bytes by recomputing cheap nodes
+// (elementwise ops and casts, with the views read through them) right before late consumers,
+// instead of keeping their value alive in between. Rebuilds graph.arena and records what it
+// did in graph.remat_*; stops when no recomputation helps, so the budget may not be reached.
+void rematerialize(Graph& graph, uint64_t memory_budget);
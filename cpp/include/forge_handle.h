@@ -2,6 +2,8 @@
 #include <memory>
 #include <string>
 
+#include "philox.h"
+
 class ForgeHandle {
    private:
     struct Impl;
@@ -19,5 +21,7 @@ class ForgeHandle {
     void* device_ptr() const;
     void* queue_ptr() const;
     uint32_t get_seed() const;
+    // Restarts the default generator (used by rand/randn without a Generator) on seed s
     void set_seed(uint32_t s);
+    Generator& generator();
 };
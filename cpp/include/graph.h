@@ -12,6 +12,7 @@ struct Node {
     std::vector<int64_t> shape;
     std::vector<int64_t> strides;
     int64_t offset;
+    DType dtype = DType::float32;
 
     // Flatten args
     std::vector<int64_t> args;
@@ -38,6 +39,14 @@ class Graph {
 
     std::vector<void*> pipelines;
 
+    // Kernel nodes grouped into waves of mutually independent nodes (see schedule_waves)
+    std::vector<std::vector<int>> waves;
+
+    // Rematerialization under a memory budget: nodes recomputed, FLOPs they add, arena bytes saved
+    int64_t remat_nodes = 0;
+    int64_t remat_flops = 0;
+    int64_t remat_bytes_saved = 0;
+
     // CONSTRUCTORS //
     Graph(std::vector<Node> nodes, int output_index)
         : nodes(std::move(nodes)), output_index(output_index) {}
@@ -45,4 +54,10 @@ class Graph {
     ~Graph();
 
     std::shared_ptr<ArrayHandle> execute(std::vector<std::shared_ptr<ArrayHandle>> inputs);
+    // Runs the graph `iterations` times in one command buffer with one arena. The output of each
+    // iteration is input `carry_input` of the next, and input k is advanced by input_steps[k]
+    // elements per iteration (e.g. the next row of a batch). Returns the last output.
+    std::shared_ptr<ArrayHandle> execute_loop(std::vector<std::shared_ptr<ArrayHandle>> inputs,
+                                              int64_t iterations, int carry_input,
+                                              std::vector<int64_t> input_steps);
 };
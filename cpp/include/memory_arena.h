@@ -9,11 +9,13 @@ class MemoryArena {
     uint64_t total_bytes;
     std::vector<uint64_t> node_offsets;
     std::vector<uint64_t> roots;
+    std::vector<int> placed_in;
 
    public:
     // CONSTRUCTORS //
     MemoryArena();
-    MemoryArena(const Graph& graph, uint64_t element_size = 4);
+    // Node sizes come from each node's dtype, rounded up to 4 bytes to keep offsets aligned
+    MemoryArena(const Graph& graph);
 
     // ACCESSORS //
     const uint64_t get_total_bytes() const { return total_bytes; }
@@ -21,4 +23,7 @@ class MemoryArena {
     const std::vector<uint64_t> get_roots() const { return roots; }
     uint64_t get_offset(int node_index) const { return node_offsets[node_index]; }
     uint64_t get_root(int node_index) const { return roots[node_index]; }
+    // CONCAT node whose output buffer this node is computed directly into (-1 if none); such
+    // inputs are already in place and the CONCAT doesn't need to copy them.
+    int get_placed_in(int node_index) const { return placed_in[node_index]; }
 };
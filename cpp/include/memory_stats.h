@@ -0,0 +1,24 @@
+#pragma once
+#include <cstdint>
+
+// Process-wide accounting of the device buffers Forge allocates: ArrayHandle storage
+// (shared by all views of it) and the per-execute graph arenas. Buffers Forge didn't
+// allocate, such as memory-mapped files, aren't counted.
+struct MemoryStats {
+    uint64_t live_bytes = 0;   // storage + arenas currently held
+    uint64_t peak_bytes = 0;   // highest live_bytes since start or the last reset_peak_memory
+    uint64_t arena_bytes = 0;  // part of live_bytes held by graph arenas still executing
+    uint64_t allocations = 0;
+    uint64_t frees = 0;
+    uint64_t live_buffers = 0;
+    uint64_t live_handles = 0;  // ArrayHandles alive, views included
+};
+
+void record_alloc(uint64_t nbytes, bool arena = false);
+void record_free(uint64_t nbytes, bool arena = false);
+void record_handle(int delta);
+
+MemoryStats memory_stats();
+
+// Restarts peak tracking from the current live bytes.
+void reset_peak_memory();
@@ -23,47 +23,137 @@ uint get_strided_index(uint gid,
     return physical_idx;
 }
 
-inline uint hash(uint seed) {
-    seed = (seed ^ 61) ^ (seed >> 16);
-    seed *= 9;
-    seed = seed ^ (seed >> 4);
-    seed *= 0x27d4eb2d;
-    seed = seed ^ (seed >> 15);
-    return seed;
-}
+// Index mode of the elementwise kernels, fixed per pipeline through function constant 0
+// (see get_pipeline). The host coalesces dims before launching, so most calls land in one
+// of the fast modes, which also handle ELEMS_PER_THREAD consecutive elements per thread:
+//   0 strided:    any rank, a div and mod per dim (also the default when unspecialized)
+//   1 contiguous: one dim, unit strides
+//   2 strided_1d: one dim, any stride (0 for a broadcast scalar)
+//   3 strided_2d: two dims (row broadcast, transposes)
+constant uint layout_fc [[ function_constant(0) ]];
+constant uint LAYOUT = is_function_constant_defined(layout_fc) ? layout_fc : 0;
+constant uint ELEMS_PER_THREAD = LAYOUT == 0 ? 1 : 4;
 
-inline float rand_uniform(uint gid, uint base_seed) {
-    uint random_int = hash(base_seed + gid);
+inline uint elem_index(uint gid,
+                       constant long* shape,
+                       constant long* strides,
+                       constant long& offset,
+                       uint ndim)
+{
+    if (LAYOUT == 1) return offset + gid;
+    if (LAYOUT == 2) return offset + gid * strides[0];
+    if (LAYOUT == 3) {
+        uint row = gid / shape[1];
+        return offset + row * strides[0] + (gid - row * shape[1]) * strides[1];
+    }
+    return get_strided_index(gid, shape, strides, offset, ndim);
+}
 
-    return float(random_int) / 4294967295.0;
+// The strided mode is dispatched with exactly one thread per element and needs no bound.
+inline uint layout_numel(constant long* shape) {
+    if (LAYOUT == 1 || LAYOUT == 2) return uint(shape[0]);
+    if (LAYOUT == 3) return uint(shape[0] * shape[1]);
+    return 0xFFFFFFFFu;
 }
 
-inline float rand_normal(uint gid, uint base_seed) {
-    float u1 = max(rand_uniform(gid * 2, base_seed), 1e-7f);
-    float u2 = rand_uniform(gid * 2 + 1, base_seed);
+// Loops `gid` over the dense output elements owned by thread `tid`.
+#define FOR_EACH_ELEM(tid, shape) \
+    for (uint gid = tid * ELEMS_PER_THREAD, \
+              end_ = min(gid + ELEMS_PER_THREAD, layout_numel(shape)); \
+         gid < end_; ++gid)
 
-    float r = sqrt(-2.0 * log(u1));
-    float theta = 2.0 * 3.14159265359 * u2;
+// Philox-4x32-10 counter-based generator: the same rounds and transforms as
+// philox_fill_host in philox.cpp (see philox.h). Each thread generates one counter
+// block, i.e. four values.
+struct PhiloxParams {
+    uint2 key;
+    uint2 counter;
+    uint2 stream;
+    uint numel;
+    uint dist;
+    float p;
+    float scale;
+};
 
-    return r * cos(theta);
+inline uint4 philox4x32(uint4 c, uint2 k) {
+    for (int r = 0; r < 10; ++r) {
+        uint hi0 = mulhi(0xD2511F53u, c.x);
+        uint lo0 = 0xD2511F53u * c.x;
+        uint hi1 = mulhi(0xCD9E8D57u, c.z);
+        uint lo1 = 0xCD9E8D57u * c.z;
+        c = uint4(hi1 ^ c.y ^ k.x, lo1, hi0 ^ c.w ^ k.y, lo0);
+        k += uint2(0x9E3779B9u, 0xBB67AE85u);
+    }
+    return c;
 }
 
-#define NULLARY_OP(NAME0, OP0) \
-kernel void NAME0( \
-    device float* Out           [[ buffer(0) ]], \
-    constant uint& seed         [[ buffer(1) ]], \
-    \
-    uint gid                    [[ thread_position_in_grid ]]) \
-{ \
-    Out[gid] = OP0(gid, seed); \
+// 24 random bits to [0, 1)
+inline float4 philox_unit(uint4 x) {
+    return float4(x >> 8) * 5.9604644775390625e-8f;
+}
+
+kernel void philox_fill(
+    device float* Out           [[ buffer(0) ]],
+    constant PhiloxParams& P    [[ buffer(1) ]],
+    uint gid                    [[ thread_position_in_grid ]])
+{
+    ulong block = ((ulong(P.counter.y) << 32) | P.counter.x) + gid;
+    uint4 x = philox4x32(uint4(uint(block), uint(block >> 32), P.stream.x, P.stream.y), P.key);
+    float4 u = philox_unit(x);
+    float4 v;
+    if (P.dist == 0) {
+        v = u;
+    } else if (P.dist == 1) {
+        // Box-Muller on (x, y) and (z, w); u1 in (0, 1] keeps log finite
+        float2 u1 = u.xz + 5.9604644775390625e-8f;
+        float2 theta = 6.2831853071795864f * u.yw;
+        float2 r = sqrt(-2.0f * log(u1));
+        v = float4(r.x * cos(theta.x), r.x * sin(theta.x), r.y * cos(theta.y), r.y * sin(theta.y));
+    } else if (P.dist == 2) {
+        v = select(float4(0.0f), float4(1.0f), u < P.p);
+    } else {
+        v = select(float4(P.scale), float4(0.0f), u < P.p);
+    }
+    uint base = gid * 4;
+    for (uint i = 0; i < 4 && base + i < P.numel; ++i) {
+        Out[base + i] = v[i];
+    }
 }
-NULLARY_OP(rand, rand_uniform)
-NULLARY_OP(randn, rand_normal)
 
-#define INPLACE_OP(NAME10, OP10) \
-kernel void NAME10( \
-    device float* A       [[ buffer(0) ]], \
-    const device float* B       [[ buffer(1) ]], \
+// Per-dtype kernels are generated by FOR_EACH_DTYPE(M, args...), which expands
+// M(args..., T, C, SUFFIX) for every DType in common.h: T is the storage type,
+// C the type arithmetic happens in (float for floating-point storage) and SUFFIX
+// the kernel name suffix, e.g. add_float16. bfloat needs Metal 3.1.
+#if __METAL_VERSION__ >= 310
+#define BFLOAT16_ENTRY(M, ...) M(__VA_ARGS__, bfloat, float, bfloat16)
+#define BFLOAT16_ENTRY_INNER(M, ...) M(__VA_ARGS__, bfloat, float, bfloat16)
+#else
+#define BFLOAT16_ENTRY(M, ...)
+#define BFLOAT16_ENTRY_INNER(M, ...)
+#endif
+
+#define FOR_EACH_FLOAT_DTYPE(M, ...) \
+    M(__VA_ARGS__, float, float, float32) \
+    M(__VA_ARGS__, half, float, float16) \
+    BFLOAT16_ENTRY(M, __VA_ARGS__)
+
+#define FOR_EACH_DTYPE(M, ...) \
+    FOR_EACH_FLOAT_DTYPE(M, __VA_ARGS__) \
+    M(__VA_ARGS__, int, int, int32) \
+    M(__VA_ARGS__, uchar, uint, uint8)
+
+// Second copy of the list for nesting inside FOR_EACH_DTYPE (casts).
+#define FOR_EACH_DTYPE_INNER(M, ...) \
+    M(__VA_ARGS__, float, float, float32) \
+    M(__VA_ARGS__, half, float, float16) \
+    BFLOAT16_ENTRY_INNER(M, __VA_ARGS__) \
+    M(__VA_ARGS__, int, int, int32) \
+    M(__VA_ARGS__, uchar, uint, uint8)
+
+#define INPLACE_OP(NAME10, OP10, T, C, SUF) \
+kernel void NAME10##_##SUF( \
+    device T* A                 [[ buffer(0) ]], \
+    const device T* B           [[ buffer(1) ]], \
     constant long* shape        [[ buffer(2) ]], \
     constant long* strides_A    [[ buffer(3) ]], \
     constant long& offset_A     [[ buffer(4) ]], \
@@ -71,23 +161,114 @@ kernel void NAME10( \
     constant long& offset_B     [[ buffer(6) ]], \
     constant uint& ndim         [[ buffer(7) ]], \
     \
-    uint gid                    [[ thread_position_in_grid ]]) \
+    uint tid                    [[ thread_position_in_grid ]]) \
 { \
-    /* Calculate Read Locations */ \
-    uint idx_a = get_strided_index(gid, shape, strides_A, offset_A, ndim); \
-    uint idx_b = get_strided_index(gid, shape, strides_B, offset_B, ndim); \
+    FOR_EACH_ELEM(tid, shape) { \
+        /* Calculate Read Locations */ \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        uint idx_b = elem_index(gid, shape, strides_B, offset_B, ndim); \
+        \
+        A[idx_a] = T(C(A[idx_a]) OP10 C(B[idx_b])); \
+    } \
+}
+FOR_EACH_DTYPE(INPLACE_OP, iadd, +)
+FOR_EACH_DTYPE(INPLACE_OP, isub, -)
+FOR_EACH_DTYPE(INPLACE_OP, imul, *)
+FOR_EACH_DTYPE(INPLACE_OP, idiv, /)
+
+#define UNARY_OP(NAME1, OP1, T, C, SUF) \
+kernel void NAME1##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    device T* Out               [[ buffer(1) ]], \
+    constant long* shape        [[ buffer(2) ]], \
+    constant long* strides_A    [[ buffer(3) ]], \
+    constant long& offset_A     [[ buffer(4) ]], \
+    constant uint& ndim         [[ buffer(5) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        /* Calculate Read Locations */ \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        \
+        Out[gid] = T(OP1(C(A[idx_a]))); \
+    } \
+}
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, exp, exp)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, exp2, exp2)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, exp10, exp10)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, log, log)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, log2, log2)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, log10, log10)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, sqrt, sqrt)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, rsqrt, rsqrt)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, abs, abs)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, sign, sign)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, ceil, ceil)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, floor, floor)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, round, round)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, trunc, trunc)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, fract, fract)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, sin, sin)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, cos, cos)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, tan, tan)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, asin, asin)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, acos, acos)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, atan, atan)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, sinh, sinh)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, cosh, cosh)
+FOR_EACH_FLOAT_DTYPE(UNARY_OP, tanh, tanh)
+
+// astype_<src>_<dst>: strided read, dense write, converting through the compute types.
+#define CAST_OP(SRC_T, SRC_C, SRC_SUF, T, C, SUF) \
+kernel void astype_##SRC_SUF##_##SUF( \
+    const device SRC_T* A       [[ buffer(0) ]], \
+    device T* Out               [[ buffer(1) ]], \
+    constant long* shape        [[ buffer(2) ]], \
+    constant long* strides_A    [[ buffer(3) ]], \
+    constant long& offset_A     [[ buffer(4) ]], \
+    constant uint& ndim         [[ buffer(5) ]], \
     \
-    A[idx_a] = A[idx_a] OP10 B[idx_b]; \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        \
+        Out[gid] = T(C(SRC_C(A[idx_a]))); \
+    } \
 }
-INPLACE_OP(iadd, +)
-INPLACE_OP(isub, -)
-INPLACE_OP(imul, *)
-INPLACE_OP(idiv, /)
+#define CAST_FROM(NAME, T, C, SUF) FOR_EACH_DTYPE_INNER(CAST_OP, T, C, SUF)
+FOR_EACH_DTYPE(CAST_FROM, astype)
 
-#define UNARY_OP(NAME1, OP1) \
-kernel void NAME1( \
-    const device float* A       [[ buffer(0) ]], \
-    device float* Out           [[ buffer(1) ]], \
+// astype_scaled_<src>_<dst>: like astype, but applies A * scale + shift (affine = (scale, shift))
+// in float on the way, e.g. uint8 pixels to normalized float32 in a single pass.
+#define SCALED_CAST_OP(SRC_T, SRC_C, SRC_SUF, T, C, SUF) \
+kernel void astype_scaled_##SRC_SUF##_##SUF( \
+    const device SRC_T* A       [[ buffer(0) ]], \
+    device T* Out               [[ buffer(1) ]], \
+    constant long* shape        [[ buffer(2) ]], \
+    constant long* strides_A    [[ buffer(3) ]], \
+    constant long& offset_A     [[ buffer(4) ]], \
+    constant uint& ndim         [[ buffer(5) ]], \
+    constant float2& affine     [[ buffer(6) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        \
+        Out[gid] = T(float(A[idx_a]) * affine.x + affine.y); \
+    } \
+}
+#define SCALED_CAST_FROM(NAME, T, C, SUF) FOR_EACH_DTYPE_INNER(SCALED_CAST_OP, T, C, SUF)
+FOR_EACH_DTYPE(SCALED_CAST_FROM, astype_scaled)
+
+// one_hot_<src>_<dst>: Labels are broadcast along a trailing class axis (stride 0) of size
+// shape[ndim - 1]; each output element is 1 where its class index equals the label.
+#define ONE_HOT_OP(SRC_T, SRC_C, SRC_SUF, T, C, SUF) \
+kernel void one_hot_##SRC_SUF##_##SUF( \
+    const device SRC_T* Labels  [[ buffer(0) ]], \
+    device T* Out               [[ buffer(1) ]], \
     constant long* shape        [[ buffer(2) ]], \
     constant long* strides_A    [[ buffer(3) ]], \
     constant long& offset_A     [[ buffer(4) ]], \
@@ -95,42 +276,19 @@ kernel void NAME1( \
     \
     uint gid                    [[ thread_position_in_grid ]]) \
 { \
-    /* Calculate Read Locations */ \
     uint idx_a = get_strided_index(gid, shape, strides_A, offset_A, ndim); \
+    uint k = gid % shape[ndim - 1]; \
     \
-    Out[gid] = OP1(A[idx_a]); \
-}
-UNARY_OP(exp, exp)
-UNARY_OP(exp2, exp2)
-UNARY_OP(exp10, exp10)
-UNARY_OP(log, log)
-UNARY_OP(log2, log2)
-UNARY_OP(log10, log10)
-UNARY_OP(sqrt, sqrt)
-UNARY_OP(rsqrt, rsqrt)
-UNARY_OP(abs, abs)
-UNARY_OP(sign, sign)
-UNARY_OP(ceil, ceil)
-UNARY_OP(floor, floor)
-UNARY_OP(round, round)
-UNARY_OP(trunc, trunc)
-UNARY_OP(fract, fract)
-UNARY_OP(sin, sin)
-UNARY_OP(cos, cos)
-UNARY_OP(tan, tan)
-UNARY_OP(asin, asin)
-UNARY_OP(acos, acos)
-UNARY_OP(atan, atan)
-UNARY_OP(sinh, sinh)
-UNARY_OP(cosh, cosh)
-UNARY_OP(tanh, tanh)
-
-
-#define BINARY_OP(NAME2, OP2) \
-kernel void NAME2( \
-    const device float* A       [[ buffer(0) ]], \
-    const device float* B       [[ buffer(1) ]], \
-    device float* Out           [[ buffer(2) ]], \
+    Out[gid] = T(SRC_C(Labels[idx_a]) == SRC_C(k) ? 1 : 0); \
+}
+#define ONE_HOT_FROM(NAME, T, C, SUF) FOR_EACH_DTYPE_INNER(ONE_HOT_OP, T, C, SUF)
+FOR_EACH_DTYPE(ONE_HOT_FROM, one_hot)
+
+#define BINARY_OP(NAME2, OP2, T, C, SUF) \
+kernel void NAME2##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    const device T* B           [[ buffer(1) ]], \
+    device T* Out               [[ buffer(2) ]], \
     constant long* shape        [[ buffer(3) ]], \
     constant long* strides_A    [[ buffer(4) ]], \
     constant long& offset_A     [[ buffer(5) ]], \
@@ -138,94 +296,779 @@ kernel void NAME2( \
     constant long& offset_B     [[ buffer(7) ]], \
     constant uint& ndim         [[ buffer(8) ]], \
     \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        /* Calculate Read Locations */ \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        uint idx_b = elem_index(gid, shape, strides_B, offset_B, ndim); \
+        \
+        Out[gid] = T(C(A[idx_a]) OP2 C(B[idx_b])); \
+    } \
+}
+FOR_EACH_DTYPE(BINARY_OP, add, +)
+FOR_EACH_DTYPE(BINARY_OP, sub, -)
+FOR_EACH_DTYPE(BINARY_OP, mul, *)
+FOR_EACH_DTYPE(BINARY_OP, div, /)
+
+// Scalar operand passed as a kernel constant (setBytes) instead of a
+// broadcast 1-element buffer. rsub/rdiv compute `s OP a`. The scalar and the
+// arithmetic use the compute type C: float for float dtypes, and int / uint
+// for integer ones so that values past 2^24 stay exact.
+#define SCALAR_OP(NAME4, EXPR4, T, C, SUF) \
+kernel void NAME4##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    device T* Out               [[ buffer(1) ]], \
+    constant long* shape        [[ buffer(2) ]], \
+    constant long* strides_A    [[ buffer(3) ]], \
+    constant long& offset_A     [[ buffer(4) ]], \
+    constant uint& ndim         [[ buffer(5) ]], \
+    constant C& s               [[ buffer(6) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        \
+        Out[gid] = T(EXPR4); \
+    } \
+}
+FOR_EACH_DTYPE(SCALAR_OP, add_scalar, C(A[idx_a]) + s)
+FOR_EACH_DTYPE(SCALAR_OP, sub_scalar, C(A[idx_a]) - s)
+FOR_EACH_DTYPE(SCALAR_OP, rsub_scalar, s - C(A[idx_a]))
+FOR_EACH_DTYPE(SCALAR_OP, mul_scalar, C(A[idx_a]) * s)
+FOR_EACH_DTYPE(SCALAR_OP, div_scalar, C(A[idx_a]) / s)
+FOR_EACH_DTYPE(SCALAR_OP, rdiv_scalar, s / C(A[idx_a]))
+
+#define INPLACE_SCALAR_OP(NAME5, EXPR5, T, C, SUF) \
+kernel void NAME5##_##SUF( \
+    device T* A                 [[ buffer(0) ]], \
+    constant long* shape        [[ buffer(1) ]], \
+    constant long* strides_A    [[ buffer(2) ]], \
+    constant long& offset_A     [[ buffer(3) ]], \
+    constant uint& ndim         [[ buffer(4) ]], \
+    constant C& s               [[ buffer(5) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        \
+        A[idx_a] = T(EXPR5); \
+    } \
+}
+FOR_EACH_DTYPE(INPLACE_SCALAR_OP, iadd_scalar, C(A[idx_a]) + s)
+FOR_EACH_DTYPE(INPLACE_SCALAR_OP, isub_scalar, C(A[idx_a]) - s)
+FOR_EACH_DTYPE(INPLACE_SCALAR_OP, imul_scalar, C(A[idx_a]) * s)
+FOR_EACH_DTYPE(INPLACE_SCALAR_OP, idiv_scalar, C(A[idx_a]) / s)
+FOR_EACH_DTYPE(INPLACE_SCALAR_OP, fill_view, s)
+
+// Comparisons write uint8 masks (1 where the comparison holds), in the BINARY_OP / SCALAR_OP
+// layouts. Array operands compare in C, scalars in float like the other scalar ops.
+#define COMPARE_OP(NAME17, OP17, T, C, SUF) \
+kernel void NAME17##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    const device T* B           [[ buffer(1) ]], \
+    device uchar* Out           [[ buffer(2) ]], \
+    constant long* shape        [[ buffer(3) ]], \
+    constant long* strides_A    [[ buffer(4) ]], \
+    constant long& offset_A     [[ buffer(5) ]], \
+    constant long* strides_B    [[ buffer(6) ]], \
+    constant long& offset_B     [[ buffer(7) ]], \
+    constant uint& ndim         [[ buffer(8) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        uint idx_b = elem_index(gid, shape, strides_B, offset_B, ndim); \
+        \
+        Out[gid] = uchar(C(A[idx_a]) OP17 C(B[idx_b])); \
+    } \
+}
+
+#define COMPARE_SCALAR_OP(NAME18, OP18, T, C, SUF) \
+kernel void NAME18##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    device uchar* Out           [[ buffer(1) ]], \
+    constant long* shape        [[ buffer(2) ]], \
+    constant long* strides_A    [[ buffer(3) ]], \
+    constant long& offset_A     [[ buffer(4) ]], \
+    constant uint& ndim         [[ buffer(5) ]], \
+    constant float& s           [[ buffer(6) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        \
+        Out[gid] = uchar(float(A[idx_a]) OP18 s); \
+    } \
+}
+#define COMPARE_OPS(NAME, OP, T, C, SUF) \
+    COMPARE_OP(NAME, OP, T, C, SUF) \
+    COMPARE_SCALAR_OP(NAME##_scalar, OP, T, C, SUF)
+FOR_EACH_DTYPE(COMPARE_OPS, eq, ==)
+FOR_EACH_DTYPE(COMPARE_OPS, ne, !=)
+FOR_EACH_DTYPE(COMPARE_OPS, lt, <)
+FOR_EACH_DTYPE(COMPARE_OPS, le, <=)
+FOR_EACH_DTYPE(COMPARE_OPS, gt, >)
+FOR_EACH_DTYPE(COMPARE_OPS, ge, >=)
+
+// maximum / minimum: BINARY_OP with a function instead of an operator.
+#define BINARY_FN_OP(NAME19, FN19, T, C, SUF) \
+kernel void NAME19##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    const device T* B           [[ buffer(1) ]], \
+    device T* Out               [[ buffer(2) ]], \
+    constant long* shape        [[ buffer(3) ]], \
+    constant long* strides_A    [[ buffer(4) ]], \
+    constant long& offset_A     [[ buffer(5) ]], \
+    constant long* strides_B    [[ buffer(6) ]], \
+    constant long& offset_B     [[ buffer(7) ]], \
+    constant uint& ndim         [[ buffer(8) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        uint idx_b = elem_index(gid, shape, strides_B, offset_B, ndim); \
+        \
+        Out[gid] = T(FN19(C(A[idx_a]), C(B[idx_b]))); \
+    } \
+}
+FOR_EACH_DTYPE(BINARY_FN_OP, maximum, max)
+FOR_EACH_DTYPE(BINARY_FN_OP, minimum, min)
+FOR_EACH_DTYPE(SCALAR_OP, maximum_scalar, max(C(A[idx_a]), s))
+FOR_EACH_DTYPE(SCALAR_OP, minimum_scalar, min(C(A[idx_a]), s))
+
+// where_<dtype>: Out = Cond ? A : B, with a uint8 condition broadcast like the values.
+#define WHERE_OP(NAME20, T, C, SUF) \
+kernel void NAME20##_##SUF( \
+    const device uchar* Cond    [[ buffer(0) ]], \
+    const device T* A           [[ buffer(1) ]], \
+    const device T* B           [[ buffer(2) ]], \
+    device T* Out               [[ buffer(3) ]], \
+    constant long* shape        [[ buffer(4) ]], \
+    constant long* strides_C    [[ buffer(5) ]], \
+    constant long& offset_C     [[ buffer(6) ]], \
+    constant long* strides_A    [[ buffer(7) ]], \
+    constant long& offset_A     [[ buffer(8) ]], \
+    constant long* strides_B    [[ buffer(9) ]], \
+    constant long& offset_B     [[ buffer(10) ]], \
+    constant uint& ndim         [[ buffer(11) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_c = elem_index(gid, shape, strides_C, offset_C, ndim); \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        uint idx_b = elem_index(gid, shape, strides_B, offset_B, ndim); \
+        \
+        Out[gid] = Cond[idx_c] ? A[idx_a] : B[idx_b]; \
+    } \
+}
+FOR_EACH_DTYPE(WHERE_OP, where)
+
+// Fused matmul epilogue (MatmulEpilogue), run in place over the float32 product:
+// bias_<act>: A = act(A + B) with the bias B broadcast; bias_<act>_scalar adds s instead.
+inline float act_relu(float x) { return max(x, 0.0f); }
+inline float act_tanh(float x) { return tanh(x); }
+inline float act_sigmoid(float x) { return 1.0f / (1.0f + exp(-x)); }
+inline float act_gelu(float x) {
+    return 0.5f * x * (1.0f + tanh(0.7978845608f * (x + 0.044715f * x * x * x)));
+}
+
+#define INPLACE_ACT_OP(NAME11, ACT11, T, C, SUF) \
+kernel void NAME11##_##SUF( \
+    device T* A                 [[ buffer(0) ]], \
+    const device T* B           [[ buffer(1) ]], \
+    constant long* shape        [[ buffer(2) ]], \
+    constant long* strides_A    [[ buffer(3) ]], \
+    constant long& offset_A     [[ buffer(4) ]], \
+    constant long* strides_B    [[ buffer(5) ]], \
+    constant long& offset_B     [[ buffer(6) ]], \
+    constant uint& ndim         [[ buffer(7) ]], \
+    \
+    uint tid                    [[ thread_position_in_grid ]]) \
+{ \
+    FOR_EACH_ELEM(tid, shape) { \
+        uint idx_a = elem_index(gid, shape, strides_A, offset_A, ndim); \
+        uint idx_b = elem_index(gid, shape, strides_B, offset_B, ndim); \
+        \
+        A[idx_a] = T(ACT11(C(A[idx_a]) + C(B[idx_b]))); \
+    } \
+}
+#define BIAS_ACT(NAME12, ACT12) \
+    INPLACE_ACT_OP(NAME12, ACT12, float, float, float32) \
+    INPLACE_SCALAR_OP(NAME12##_scalar, ACT12(float(A[idx_a]) + s), float, float, float32)
+BIAS_ACT(bias_relu, act_relu)
+BIAS_ACT(bias_tanh, act_tanh)
+BIAS_ACT(bias_sigmoid, act_sigmoid)
+BIAS_ACT(bias_gelu, act_gelu)
+
+#define COPY_VIEW(NAME6, T, C, SUF) \
+kernel void NAME6##_##SUF( \
+    device T* Dest              [[ buffer(0) ]], \
+    const device T* Src         [[ buffer(1) ]], \
+    constant long* shape        [[ buffer(2) ]], \
+    constant long* strides_dst  [[ buffer(3) ]], \
+    constant long& offset_dst   [[ buffer(4) ]], \
+    constant long* strides_src  [[ buffer(5) ]], \
+    constant long& offset_src   [[ buffer(6) ]], \
+    constant uint& ndim         [[ buffer(7) ]], \
     uint gid                    [[ thread_position_in_grid ]]) \
 { \
-    /* Calculate Read Locations */ \
-    uint idx_a = get_strided_index(gid, shape, strides_A, offset_A, ndim); \
-    uint idx_b = get_strided_index(gid, shape, strides_B, offset_B, ndim); \
-    \
-    Out[gid] = A[idx_a] OP2 B[idx_b]; \
-}
-BINARY_OP(add, +)
-BINARY_OP(sub, -)
-BINARY_OP(mul, *)
-BINARY_OP(div, /)
-
-kernel void copy_view(
-    device float* Dest          [[ buffer(0) ]],
-    const device float* Src     [[ buffer(1) ]],
-    constant long* shape        [[ buffer(2) ]],
-    constant long* strides_dst  [[ buffer(3) ]],
-    constant long& offset_dst   [[ buffer(4) ]],
-    constant long* strides_src  [[ buffer(5) ]],
-    constant long& offset_src   [[ buffer(6) ]],
-    constant uint& ndim         [[ buffer(7) ]],
-    uint gid                    [[ thread_position_in_grid ]])
-{
-    uint idx_dst = get_strided_index(gid, shape, strides_dst, offset_dst, ndim);
+    uint idx_dst = get_strided_index(gid, shape, strides_dst, offset_dst, ndim); \
+    \
+    uint idx_src = get_strided_index(gid, shape, strides_src, offset_src, ndim); \
+    \
+    Dest[idx_dst] = Src[idx_src]; \
+}
+FOR_EACH_DTYPE(COPY_VIEW, copy_view)
 
-    uint idx_src = get_strided_index(gid, shape, strides_src, offset_src, ndim);
+// gather_rows: Out[b, r] = A[Idx[b], r] into a dense (batch, row_size) output.
+// A is addressed through its strides; Idx holds int32 row indices read at
+// idx_offset + b * idx_stride, which the caller guarantees are in range.
+#define GATHER_ROWS(NAME9, T, C, SUF) \
+kernel void NAME9##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    const device int* Idx       [[ buffer(1) ]], \
+    device T* Out               [[ buffer(2) ]], \
+    constant long* shape        [[ buffer(3) ]], \
+    constant long* strides_A    [[ buffer(4) ]], \
+    constant long& offset_A     [[ buffer(5) ]], \
+    constant uint& ndim         [[ buffer(6) ]], \
+    constant long& idx_offset   [[ buffer(7) ]], \
+    constant long& idx_stride   [[ buffer(8) ]], \
+    constant uint& row_size     [[ buffer(9) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    uint b = gid / row_size; \
+    uint r = gid - b * row_size; \
+    uint row = uint(Idx[idx_offset + long(b) * idx_stride]); \
+    uint idx_a = get_strided_index(row * row_size + r, shape, strides_A, offset_A, ndim); \
+    \
+    Out[gid] = A[idx_a]; \
+}
+FOR_EACH_DTYPE(GATHER_ROWS, gather_rows)
 
-    Dest[idx_dst] = Src[idx_src];
+// Index lookups shared by the take/gather/scatter kernels: negative indices count from the
+// end of the axis, and anything still out of range gives -1 (read as 0, skipped on writes).
+inline long wrap_index(int i, long len) {
+    long w = i < 0 ? long(i) + len : long(i);
+    return (w < 0 || w >= len) ? -1 : w;
 }
 
-kernel void reduce_sum_global(
-    const device float* Input   [[ buffer(0) ]],
-    device float* Output        [[ buffer(1) ]],
-    constant long* in_shape     [[ buffer(2) ]],
-    constant long* in_strides   [[ buffer(3) ]],
-    constant long& in_offset    [[ buffer(4) ]],
-    constant uint& in_ndim      [[ buffer(5) ]],
-    constant uint& in_numel     [[ buffer(6) ]],
+// take_<dtype>: Out[o, j, r] = A[o, Idx[j], r] along A's axis dims.x, for the dims.y
+// (flattened) indices, with dims.z = prod(shape[axis + 1:]). Out is dense.
+#define TAKE_OP(NAME13, T, C, SUF) \
+kernel void NAME13##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    const device int* Idx       [[ buffer(1) ]], \
+    device T* Out               [[ buffer(2) ]], \
+    constant long* shape        [[ buffer(3) ]], \
+    constant long* strides_A    [[ buffer(4) ]], \
+    constant long& offset_A     [[ buffer(5) ]], \
+    constant uint& ndim         [[ buffer(6) ]], \
+    constant long& idx_offset   [[ buffer(7) ]], \
+    constant long& idx_stride   [[ buffer(8) ]], \
+    constant uint3& dims        [[ buffer(9) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    uint r = gid % dims.z; \
+    uint j = (gid / dims.z) % dims.y; \
+    uint o = gid / (dims.z * dims.y); \
+    long len = shape[dims.x]; \
+    long i = wrap_index(Idx[idx_offset + long(j) * idx_stride], len); \
+    if (i < 0) { \
+        Out[gid] = T(0); \
+        return; \
+    } \
+    uint logical = (uint(o * len) + uint(i)) * dims.z + r; \
+    Out[gid] = A[get_strided_index(logical, shape, strides_A, offset_A, ndim)]; \
+}
+FOR_EACH_DTYPE(TAKE_OP, take)
 
-    uint gid                    [[ thread_position_in_grid ]])
+// Offsets into A (with dim `axis` left out) and into Idx of element `gid` of the index
+// array's shape, for gather/scatter_add.
+inline void along_axis_offsets(uint gid,
+                               constant long* shape,
+                               constant long* strides_A,
+                               constant long* strides_idx,
+                               uint ndim,
+                               uint axis,
+                               thread long& a_off,
+                               thread long& idx_off)
 {
-    if (gid > 0) return;
-    float total = 0.0;
-    for (uint i = 0; i < in_numel; ++i) {
-        uint physical_idx = in_offset;
-        uint remaining = i;
-        for (int d = in_ndim - 1; d >= 0; --d) {
-            uint coord = remaining % in_shape[d];
-            physical_idx += coord * in_strides[d];
-            remaining /= in_shape[d];
-        }
-        total += Input[physical_idx];
+    uint remaining = gid;
+    for (int d = ndim - 1; d >= 0; --d) {
+        uint c = remaining % shape[d];
+        remaining /= shape[d];
+        idx_off += long(c) * strides_idx[d];
+        if (uint(d) != axis) a_off += long(c) * strides_A[d];
     }
-    Output[0] = total;
 }
 
-kernel void reduce_sum_axis(
-    const device float* Input   [[ buffer(0) ]],
-    device float* Output        [[ buffer(1) ]],
+// gather_<dtype>: Out[p] = A[p with coordinate `axis` replaced by Idx[p]] for p over the
+// index array's shape (every other dim no larger than A's). axis_len = (axis, A.shape[axis]).
+#define GATHER_OP(NAME14, T, C, SUF) \
+kernel void NAME14##_##SUF( \
+    const device T* A           [[ buffer(0) ]], \
+    const device int* Idx       [[ buffer(1) ]], \
+    device T* Out               [[ buffer(2) ]], \
+    constant long* shape        [[ buffer(3) ]], \
+    constant long* strides_A    [[ buffer(4) ]], \
+    constant long& offset_A     [[ buffer(5) ]], \
+    constant long* strides_idx  [[ buffer(6) ]], \
+    constant long& offset_idx   [[ buffer(7) ]], \
+    constant uint& ndim         [[ buffer(8) ]], \
+    constant uint2& axis_len    [[ buffer(9) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    long a_off = offset_A, idx_off = offset_idx; \
+    along_axis_offsets(gid, shape, strides_A, strides_idx, ndim, axis_len.x, a_off, idx_off); \
+    long i = wrap_index(Idx[idx_off], axis_len.y); \
+    Out[gid] = i < 0 ? T(0) : A[a_off + i * strides_A[axis_len.x]]; \
+}
+FOR_EACH_DTYPE(GATHER_OP, gather)
 
-    constant long* out_shape    [[ buffer(2) ]],
-    constant uint& out_ndim     [[ buffer(3) ]],
+// Atomic accumulation for index_add / scatter_add; float32 needs Metal 3 (atomic_float),
+// other dtypes are accumulated through float32 on the host side.
+#define INDEX_ADD_OP(NAME15, T, ATOMIC_T, SUF) \
+kernel void NAME15##_##SUF( \
+    device ATOMIC_T* Target     [[ buffer(0) ]], \
+    const device int* Idx       [[ buffer(1) ]], \
+    const device T* Src         [[ buffer(2) ]], \
+    constant long* shape        [[ buffer(3) ]], \
+    constant long* strides_T    [[ buffer(4) ]], \
+    constant long& offset_T     [[ buffer(5) ]], \
+    constant uint& ndim         [[ buffer(6) ]], \
+    constant long& idx_offset   [[ buffer(7) ]], \
+    constant long& idx_stride   [[ buffer(8) ]], \
+    constant uint3& dims        [[ buffer(9) ]], \
+    constant long* shape_S      [[ buffer(10) ]], \
+    constant long* strides_S    [[ buffer(11) ]], \
+    constant long& offset_S     [[ buffer(12) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    /* index_add_<dtype>: Target[o, Idx[j], r] += Src[o, j, r], as take in reverse */ \
+    uint r = gid % dims.z; \
+    uint j = (gid / dims.z) % dims.y; \
+    uint o = gid / (dims.z * dims.y); \
+    long len = shape[dims.x]; \
+    long i = wrap_index(Idx[idx_offset + long(j) * idx_stride], len); \
+    if (i < 0) return; \
+    uint logical = (uint(o * len) + uint(i)) * dims.z + r; \
+    T v = Src[get_strided_index(gid, shape_S, strides_S, offset_S, ndim)]; \
+    atomic_fetch_add_explicit( \
+        &Target[get_strided_index(logical, shape, strides_T, offset_T, ndim)], v, \
+        memory_order_relaxed); \
+}
 
-    constant long* in_shape     [[ buffer(4) ]],
-    constant long* in_strides   [[ buffer(5) ]],
-    constant long& in_offset    [[ buffer(6) ]],
+#define SCATTER_ADD_OP(NAME16, T, ATOMIC_T, SUF) \
+kernel void NAME16##_##SUF( \
+    device ATOMIC_T* Target     [[ buffer(0) ]], \
+    const device int* Idx       [[ buffer(1) ]], \
+    const device T* Src         [[ buffer(2) ]], \
+    constant long* shape        [[ buffer(3) ]], \
+    constant long* strides_T    [[ buffer(4) ]], \
+    constant long& offset_T     [[ buffer(5) ]], \
+    constant long* strides_idx  [[ buffer(6) ]], \
+    constant long& offset_idx   [[ buffer(7) ]], \
+    constant long* strides_S    [[ buffer(8) ]], \
+    constant long& offset_S     [[ buffer(9) ]], \
+    constant uint& ndim         [[ buffer(10) ]], \
+    constant uint2& axis_len    [[ buffer(11) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    /* scatter_add_<dtype>: Target[p with axis -> Idx[p]] += Src[p], as gather in reverse */ \
+    long t_off = offset_T, idx_off = offset_idx; \
+    along_axis_offsets(gid, shape, strides_T, strides_idx, ndim, axis_len.x, t_off, idx_off); \
+    long i = wrap_index(Idx[idx_off], axis_len.y); \
+    if (i < 0) return; \
+    T v = Src[get_strided_index(gid, shape, strides_S, offset_S, ndim)]; \
+    atomic_fetch_add_explicit(&Target[t_off + i * strides_T[axis_len.x]], v, \
+                              memory_order_relaxed); \
+}
+INDEX_ADD_OP(index_add, int, atomic_int, int32)
+SCATTER_ADD_OP(scatter_add, int, atomic_int, int32)
+#if __METAL_VERSION__ >= 300
+INDEX_ADD_OP(index_add, float, atomic_float, float32)
+SCATTER_ADD_OP(scatter_add, float, atomic_float, float32)
+#endif
 
-    constant uint& reduce_axis  [[ buffer(7) ]],
-    constant uint& out_numel    [[ buffer(8) ]],
+// Reductions accumulate in ACC (float for floating-point storage) and write OUT_T;
+// uint8 sums are widened to int32.
+#define REDUCE_SUM_GLOBAL(T, ACC, OUT_T, SUF) \
+kernel void reduce_sum_global_##SUF( \
+    const device T* Input       [[ buffer(0) ]], \
+    device OUT_T* Output        [[ buffer(1) ]], \
+    constant long* in_shape     [[ buffer(2) ]], \
+    constant long* in_strides   [[ buffer(3) ]], \
+    constant long& in_offset    [[ buffer(4) ]], \
+    constant uint& in_ndim      [[ buffer(5) ]], \
+    constant uint& in_numel     [[ buffer(6) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    if (gid > 0) return; \
+    ACC total = 0; \
+    for (uint i = 0; i < in_numel; ++i) { \
+        uint physical_idx = in_offset; \
+        uint remaining = i; \
+        for (int d = in_ndim - 1; d >= 0; --d) { \
+            uint coord = remaining % in_shape[d]; \
+            physical_idx += coord * in_strides[d]; \
+            remaining /= in_shape[d]; \
+        } \
+        total += ACC(Input[physical_idx]); \
+    } \
+    Output[0] = OUT_T(total); \
+}
 
-    uint gid                    [[ thread_position_in_grid ]])
+// Physical index of element 0 of the row that output element `gid` reduces over.
+// out_shape is the input shape with reduce_axis removed.
+uint get_axis_base_index(uint gid,
+                         constant long* out_shape,
+                         uint out_ndim,
+                         constant long* strides,
+                         uint offset,
+                         uint reduce_axis)
 {
-    if (gid >= out_numel) return;
     uint remaining = gid;
-    uint input_base_idx = in_offset;
+    uint base_idx = offset;
     for (int i = out_ndim - 1; i >= 0; --i) {
         uint coord = remaining % out_shape[i];
         uint in_dim = (i >= reduce_axis) ? i + 1 : i;
-        input_base_idx += coord * in_strides[in_dim];
+        base_idx += coord * strides[in_dim];
         remaining /= out_shape[i];
     }
+    return base_idx;
+}
+
+#define REDUCE_SUM_AXIS(T, ACC, OUT_T, SUF) \
+kernel void reduce_sum_axis_##SUF( \
+    const device T* Input       [[ buffer(0) ]], \
+    device OUT_T* Output        [[ buffer(1) ]], \
+    \
+    constant long* out_shape    [[ buffer(2) ]], \
+    constant uint& out_ndim     [[ buffer(3) ]], \
+    \
+    constant long* in_shape     [[ buffer(4) ]], \
+    constant long* in_strides   [[ buffer(5) ]], \
+    constant long& in_offset    [[ buffer(6) ]], \
+    \
+    constant uint& reduce_axis  [[ buffer(7) ]], \
+    constant uint& out_numel    [[ buffer(8) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    if (gid >= out_numel) return; \
+    uint input_base_idx = \
+        get_axis_base_index(gid, out_shape, out_ndim, in_strides, in_offset, reduce_axis); \
+    ACC total = 0; \
+    uint axis_size = in_shape[reduce_axis]; \
+    uint axis_stride = in_strides[reduce_axis]; \
+    for (uint j = 0; j < axis_size; ++j) { \
+        total += ACC(Input[input_base_idx + (j * axis_stride)]); \
+    } \
+    Output[gid] = OUT_T(total); \
+}
+
+#define REDUCE_SUM(T, ACC, OUT_T, SUF) \
+    REDUCE_SUM_GLOBAL(T, ACC, OUT_T, SUF) \
+    REDUCE_SUM_AXIS(T, ACC, OUT_T, SUF)
+REDUCE_SUM(float, float, float, float32)
+REDUCE_SUM(half, float, half, float16)
+#if __METAL_VERSION__ >= 310
+REDUCE_SUM(bfloat, float, bfloat, bfloat16)
+#endif
+REDUCE_SUM(int, int, int, int32)
+REDUCE_SUM(uchar, int, int, uint8)
+
+// Position of the largest (IS_MAX) or smallest element of one row, the first one on ties.
+// Rows are never empty (checked on the host).
+template <typename T, typename C, bool IS_MAX>
+inline uint row_extremum(const device T* Input, uint base, uint n, uint stride)
+{
+    uint best = 0;
+    C best_v = C(Input[base]);
+    for (uint j = 1; j < n; ++j) {
+        C x = C(Input[base + j * stride]);
+        if (IS_MAX ? x > best_v : x < best_v) {
+            best_v = x;
+            best = j;
+        }
+    }
+    return best;
+}
+
+// max_axis / min_axis write the extremum in T, argmax_axis / argmin_axis its int32
+// position along the axis; both in the reduce_sum_axis layout.
+#define EXTREMUM_AXIS(NAME21, IS_MAX21, OUT_T, VALUE21, T, C, SUF) \
+kernel void NAME21##_##SUF( \
+    const device T* Input       [[ buffer(0) ]], \
+    device OUT_T* Output        [[ buffer(1) ]], \
+    constant long* out_shape    [[ buffer(2) ]], \
+    constant uint& out_ndim     [[ buffer(3) ]], \
+    constant long* in_shape     [[ buffer(4) ]], \
+    constant long* in_strides   [[ buffer(5) ]], \
+    constant long& in_offset    [[ buffer(6) ]], \
+    constant uint& reduce_axis  [[ buffer(7) ]], \
+    constant uint& out_numel    [[ buffer(8) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    if (gid >= out_numel) return; \
+    uint base = \
+        get_axis_base_index(gid, out_shape, out_ndim, in_strides, in_offset, reduce_axis); \
+    uint stride = in_strides[reduce_axis]; \
+    uint j = row_extremum<T, C, IS_MAX21>(Input, base, in_shape[reduce_axis], stride); \
+    Output[gid] = VALUE21; \
+}
+#define EXTREMUM_OPS(NAME, T, C, SUF) \
+    EXTREMUM_AXIS(max_axis, true, T, Input[base + j * stride], T, C, SUF) \
+    EXTREMUM_AXIS(min_axis, false, T, Input[base + j * stride], T, C, SUF) \
+    EXTREMUM_AXIS(argmax_axis, true, int, int(j), T, C, SUF) \
+    EXTREMUM_AXIS(argmin_axis, false, int, int(j), T, C, SUF)
+FOR_EACH_DTYPE(EXTREMUM_OPS, extremum)
+
+// Row entries at or below -FLT_MAX (-inf included, as in masked attention rows) are masked
+// out with probability 0. The library is built with fast math, which assumes no infinities
+// or NaNs and may fold float comparisons against them, so masked entries are found from the
+// bits (negative with the largest magnitudes) and skipped instead of relying on
+// exp(-inf) == 0, and results that would be -inf are written as -FLT_MAX.
+inline bool row_masked(float x)
+{
+    uint bits = as_type<uint>(x);
+    return (bits >> 31) && (bits & 0x7fffffffu) >= as_type<uint>(FLT_MAX);
+}
+
+// Online max / sum-of-exponentials over the unmasked entries of one row: a single read of
+// the row gives both the max (for stability) and sum(exp(x - max)). The first unmasked entry
+// seeds the max; a row without any (empty or fully masked) returns a sum of 0.
+template <typename T>
+inline float2 row_max_sumexp(const device T* Input, uint base, uint n, uint stride)
+{
+    float m = -FLT_MAX;
     float total = 0.0;
-    uint axis_size = in_shape[reduce_axis];
-    uint axis_stride = in_strides[reduce_axis];
-    for (uint j = 0; j < axis_size; ++j) {
-        total += Input[input_base_idx + (j * axis_stride)];
+    for (uint j = 0; j < n; ++j) {
+        float x = float(Input[base + j * stride]);
+        if (row_masked(x)) continue;
+        if (total == 0.0) {
+            m = x;
+            total = 1.0;
+        } else if (x > m) {
+            total = total * exp(m - x) + 1.0;
+            m = x;
+        } else {
+            total += exp(x - m);
+        }
     }
-    Output[gid] = total;
+    return float2(m, total);
+}
+
+// log(sum(exp(x))) of a row from its stats, -FLT_MAX when no entry is unmasked
+inline float row_logsumexp(float2 stats)
+{
+    return stats.y > 0.0 ? stats.x + log(stats.y) : -FLT_MAX;
+}
+
+// Row-wise kernels share the reduce_sum_axis layout (slots 0-8).
+// Softmax / log-softmax write a dense output of the input's shape (dst_strides).
+#define ROW_OP(NAME3, BODY3, T, C, SUF) \
+kernel void NAME3##_##SUF( \
+    const device T* Input       [[ buffer(0) ]], \
+    device T* Output            [[ buffer(1) ]], \
+    constant long* out_shape    [[ buffer(2) ]], \
+    constant uint& out_ndim     [[ buffer(3) ]], \
+    constant long* in_shape     [[ buffer(4) ]], \
+    constant long* in_strides   [[ buffer(5) ]], \
+    constant long& in_offset    [[ buffer(6) ]], \
+    constant uint& reduce_axis  [[ buffer(7) ]], \
+    constant uint& out_numel    [[ buffer(8) ]], \
+    constant long* dst_strides  [[ buffer(9) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    if (gid >= out_numel) return; \
+    uint in_base = \
+        get_axis_base_index(gid, out_shape, out_ndim, in_strides, in_offset, reduce_axis); \
+    uint out_base = get_axis_base_index(gid, out_shape, out_ndim, dst_strides, 0, reduce_axis); \
+    uint n = in_shape[reduce_axis]; \
+    uint s_in = in_strides[reduce_axis]; \
+    uint s_out = dst_strides[reduce_axis]; \
+    float2 stats = row_max_sumexp(Input, in_base, n, s_in); \
+    typedef T value_t; \
+    BODY3 \
+}
+// A fully masked row has softmax 0 everywhere and log_softmax -FLT_MAX
+FOR_EACH_FLOAT_DTYPE(ROW_OP, softmax_axis,
+    float inv = stats.y > 0.0 ? 1.0 / stats.y : 0.0;
+    for (uint j = 0; j < n; ++j) {
+        float x = float(Input[in_base + j * s_in]);
+        Output[out_base + j * s_out] = value_t(row_masked(x) ? 0.0 : exp(x - stats.x) * inv);
+    })
+FOR_EACH_FLOAT_DTYPE(ROW_OP, log_softmax_axis,
+    float lse = row_logsumexp(stats);
+    for (uint j = 0; j < n; ++j) {
+        float x = float(Input[in_base + j * s_in]);
+        Output[out_base + j * s_out] = value_t(row_masked(x) ? -FLT_MAX : x - lse);
+    })
+
+#define LOGSUMEXP_AXIS(NAME7, T, C, SUF) \
+kernel void NAME7##_##SUF( \
+    const device T* Input       [[ buffer(0) ]], \
+    device T* Output            [[ buffer(1) ]], \
+    constant long* out_shape    [[ buffer(2) ]], \
+    constant uint& out_ndim     [[ buffer(3) ]], \
+    constant long* in_shape     [[ buffer(4) ]], \
+    constant long* in_strides   [[ buffer(5) ]], \
+    constant long& in_offset    [[ buffer(6) ]], \
+    constant uint& reduce_axis  [[ buffer(7) ]], \
+    constant uint& out_numel    [[ buffer(8) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    if (gid >= out_numel) return; \
+    uint in_base = \
+        get_axis_base_index(gid, out_shape, out_ndim, in_strides, in_offset, reduce_axis); \
+    float2 stats = row_max_sumexp(Input, in_base, in_shape[reduce_axis], in_strides[reduce_axis]); \
+    Output[gid] = T(row_logsumexp(stats)); \
+}
+FOR_EACH_FLOAT_DTYPE(LOGSUMEXP_AXIS, logsumexp_axis)
+
+// Per-row loss, scaled by `scale` (1/rows for a mean reduction). Labels are float32.
+// sparse == 0: Labels are soft targets with the logits' shape (label_strides over in_shape)
+// sparse == 1: Labels hold class indices with the reduced shape (label_strides over out_shape)
+// A target on a masked logit costs FLT_MAX; an out-of-range class index writes a NaN bit
+// pattern (stored as is, not computed, so fast math can't fold it away).
+#define CROSS_ENTROPY_AXIS(NAME8, T, C, SUF) \
+kernel void NAME8##_##SUF( \
+    const device T* Input       [[ buffer(0) ]], \
+    device T* Output            [[ buffer(1) ]], \
+    constant long* out_shape    [[ buffer(2) ]], \
+    constant uint& out_ndim     [[ buffer(3) ]], \
+    constant long* in_shape     [[ buffer(4) ]], \
+    constant long* in_strides   [[ buffer(5) ]], \
+    constant long& in_offset    [[ buffer(6) ]], \
+    constant uint& reduce_axis  [[ buffer(7) ]], \
+    constant uint& out_numel    [[ buffer(8) ]], \
+    const device float* Labels  [[ buffer(9) ]], \
+    constant long* label_strides [[ buffer(10) ]], \
+    constant long& label_offset [[ buffer(11) ]], \
+    constant uint& sparse       [[ buffer(12) ]], \
+    constant float& scale       [[ buffer(13) ]], \
+    \
+    uint gid                    [[ thread_position_in_grid ]]) \
+{ \
+    if (gid >= out_numel) return; \
+    uint in_base = \
+        get_axis_base_index(gid, out_shape, out_ndim, in_strides, in_offset, reduce_axis); \
+    uint n = in_shape[reduce_axis]; \
+    uint s_in = in_strides[reduce_axis]; \
+    float2 stats = row_max_sumexp(Input, in_base, n, s_in); \
+    float lse = row_logsumexp(stats); \
+    \
+    float loss = 0.0; \
+    bool saturated = false; \
+    if (sparse) { \
+        uint label_idx = get_strided_index(gid, out_shape, label_strides, label_offset, out_ndim); \
+        float label = Labels[label_idx]; \
+        uint k = uint(label); \
+        if (!(label >= 0.0 && k < n)) { \
+            Output[gid] = T(as_type<float>(0x7fc00000u)); \
+            return; \
+        } \
+        float x = float(Input[in_base + k * s_in]); \
+        saturated = row_masked(x); \
+        loss = lse - x; \
+    } else { \
+        uint label_base = \
+            get_axis_base_index(gid, out_shape, out_ndim, label_strides, label_offset, reduce_axis); \
+        uint s_label = label_strides[reduce_axis]; \
+        for (uint j = 0; j < n; ++j) { \
+            float y = Labels[label_base + j * s_label]; \
+            if (y == 0.0) continue; \
+            float x = float(Input[in_base + j * s_in]); \
+            if (row_masked(x)) saturated = true; \
+            else loss += y * (lse - x); \
+        } \
+    } \
+    Output[gid] = T(saturated ? FLT_MAX * scale : loss * scale); \
+}
+FOR_EACH_FLOAT_DTYPE(CROSS_ENTROPY_AXIS, cross_entropy_axis)
+
+// Fused optimizer updates. Parameters and optimizer state are contiguous and
+// updated in place; every hyperparameter is passed as an immediate.
+kernel void sgd_update(
+    device float* P             [[ buffer(0) ]],
+    const device float* G       [[ buffer(1) ]],
+    constant float& lr          [[ buffer(2) ]],
+    constant float& weight_decay [[ buffer(3) ]],
+    constant uint& numel        [[ buffer(4) ]],
+
+    uint gid                    [[ thread_position_in_grid ]])
+{
+    if (gid >= numel) return;
+    float p = P[gid];
+    float g = G[gid] + weight_decay * p;
+    P[gid] = p - lr * g;
+}
+
+kernel void sgd_momentum_update(
+    device float* P             [[ buffer(0) ]],
+    const device float* G       [[ buffer(1) ]],
+    device float* Buf           [[ buffer(2) ]],
+    constant float& lr          [[ buffer(3) ]],
+    constant float& momentum    [[ buffer(4) ]],
+    constant float& dampening   [[ buffer(5) ]],
+    constant float& weight_decay [[ buffer(6) ]],
+    constant uint& nesterov     [[ buffer(7) ]],
+    constant uint& first_step   [[ buffer(8) ]],
+    constant uint& numel        [[ buffer(9) ]],
+
+    uint gid                    [[ thread_position_in_grid ]])
+{
+    if (gid >= numel) return;
+    float p = P[gid];
+    float g = G[gid] + weight_decay * p;
+    float buf = first_step ? g : momentum * Buf[gid] + (1.0f - dampening) * g;
+    Buf[gid] = buf;
+    float d = nesterov ? g + momentum * buf : buf;
+    P[gid] = p - lr * d;
+}
+
+kernel void adam_update(
+    device float* P             [[ buffer(0) ]],
+    const device float* G       [[ buffer(1) ]],
+    device float* M             [[ buffer(2) ]],
+    device float* V             [[ buffer(3) ]],
+    constant float& lr          [[ buffer(4) ]],
+    constant float& beta1       [[ buffer(5) ]],
+    constant float& beta2       [[ buffer(6) ]],
+    constant float& eps         [[ buffer(7) ]],
+    constant float& weight_decay [[ buffer(8) ]],
+    constant float& bias_correction1 [[ buffer(9) ]],
+    constant float& bias_correction2 [[ buffer(10) ]],
+    constant uint& numel        [[ buffer(11) ]],
+
+    uint gid                    [[ thread_position_in_grid ]])
+{
+    if (gid >= numel) return;
+    float p = P[gid];
+    float g = G[gid] + weight_decay * p;
+    float m = beta1 * M[gid] + (1.0f - beta1) * g;
+    float v = beta2 * V[gid] + (1.0f - beta2) * g * g;
+    M[gid] = m;
+    V[gid] = v;
+    float denom = sqrt(v / bias_correction2) + eps;
+    P[gid] = p - lr * (m / bias_correction1) / denom;
 }
 )";
@@ -1,21 +1,50 @@
 #pragma once
 #include <cstdint>
 #include <initializer_list>
+#include <optional>
+#include <span>
 #include <string>
 
 #include "array_handle.h"
 
-void* get_pipeline(const std::string& op_name, const char* metal_c_string);
+// Index modes of the elementwise kernels, bound as function constant 0 in METAL_SOURCE.
+enum class ElementwiseLayout : uint32_t {
+    strided = 0,     // any rank, full index math per element
+    contiguous = 1,  // one dim, unit strides
+    strided_1d = 2,  // one dim, any strides (0 for a broadcast scalar)
+    strided_2d = 3,  // two dims (row broadcast, transposes)
+};
+
+// Pipelines are cached per (op_name, layout); the layout only specializes kernels that
+// declare the function constant and is ignored by the rest.
+void* get_pipeline(const std::string& op_name, const char* metal_c_string,
+                   ElementwiseLayout layout = ElementwiseLayout::strided);
+
+// Name of the per-dtype instantiation of a kernel, e.g. ("add", float16) -> "add_float16".
+inline std::string kernel_name(const std::string& op_name, DType dtype) {
+    return op_name + "_" + dtype_name(dtype);
+}
 
 // Launches a kernel that follows the shared elementwise buffer layout:
 //   inputs[0..N-1]              at slots 0..N-1
 //   out_buf (if non-nil)        at slot N
 //   shape                       next
 //   (strides_i, offset_i) pairs for each input, in order
-//   ndim                        last
+//   ndim                        next
+//   scalars (if any)            last, as one float constant (float, float2, ...)
 // Each input's strides are broadcast to out_shape via get_bcast_strides.
+// Unless `coalesce` is false (kernels that read shape themselves, e.g. one_hot), the shape
+// and strides are then collapsed with coalesce_dims and the kernel is specialized for the
+// resulting ElementwiseLayout.
+// A dedicated output takes out_dtype, defaulting to the first input's dtype.
 // Commits the command buffer and returns it so the caller can wire
 // set_event on the result handle.
 std::shared_ptr<ArrayHandle> launch_elementwise(
     const std::string& op_name, const std::vector<int64_t>& out_shape,
-    std::initializer_list<const std::shared_ptr<ArrayHandle>> inputs, bool dedicated_out);
+    std::initializer_list<const std::shared_ptr<ArrayHandle>> inputs, bool dedicated_out,
+    std::span<const float> scalars = {}, std::optional<DType> out_dtype = std::nullopt,
+    bool coalesce = true);
+
+// Globally enables or disables the coalesced layouts of launch_elementwise (on by default).
+// Only meant for benchmarking the generic strided path against them.
+void set_elementwise_fast_paths(bool enabled);
@@ -0,0 +1,57 @@
+#pragma once
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+
+// Philox-4x32-10 (Salmon et al., "Parallel Random Numbers: As Easy as 1, 2, 3"), a
+// counter-based generator: each 128-bit counter block maps to four 32-bit values under a 64-bit
+// key, so any element can be generated independently, by any thread, in any order. The
+// `philox_fill` kernel in METAL_SOURCE runs the same rounds and transforms on the device.
+//
+// Counter words 0-1 are the block index (the generator's offset plus the block's position in
+// the call), words 2-3 the stream id; the key is the seed.
+
+enum class Distribution : uint32_t {
+    uniform = 0,    // [0, 1)
+    normal = 1,     // standard normal, Box-Muller on both values of each pair
+    bernoulli = 2,  // 1 with probability p, else 0
+    dropout = 3,    // 0 with probability p, else scale (= 1 / (1 - p))
+};
+
+// One generating call; the layout matches PhiloxParams in METAL_SOURCE.
+struct PhiloxParams {
+    uint32_t key[2];
+    uint32_t counter[2];
+    uint32_t stream[2];
+    uint32_t numel;
+    uint32_t dist;
+    float p;
+    float scale;
+};
+
+// A random stream: (seed, stream) pick the sequence, `offset` is the next unused counter block.
+// Every call reserves the blocks it uses, so successive calls (device or host) never overlap.
+class Generator {
+   public:
+    explicit Generator(uint64_t seed = 0, uint64_t stream = 0) : seed_(seed), stream_(stream) {}
+
+    uint64_t seed() const { return seed_; }
+    uint64_t stream() const { return stream_; }
+    uint64_t offset() const { return offset_.load(std::memory_order_relaxed); }
+    void set_offset(uint64_t offset) { offset_.store(offset, std::memory_order_relaxed); }
+    // Restarts the generator on another seed (and stream) from block 0.
+    void reseed(uint64_t seed, uint64_t stream = 0);
+
+    // The parameters of a call generating `numel` values, advancing the offset past them.
+    PhiloxParams reserve(size_t numel, Distribution dist, float p = 0.0f);
+
+   private:
+    uint64_t seed_;
+    uint64_t stream_;
+    std::atomic<uint64_t> offset_{0};
+};
+
+// Fills out[0, params.numel) on the host with `threads` threads (0: one per core). The values
+// only depend on params, not on the thread count. Uniform, bernoulli and dropout values match
+// the device bit for bit; normals can differ in the last bits (device log/cos).
+void philox_fill_host(float* out, const PhiloxParams& params, unsigned threads = 0);
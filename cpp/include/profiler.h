@@ -0,0 +1,64 @@
+#pragma once
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "array_handle.h"
+
+#ifdef __OBJC__
+@protocol MTLCommandBuffer;
+#endif
+
+// One recorded call. Times are microseconds since profiler_start(); the gpu_* fields stay -1
+// for calls that didn't run a command buffer (and for allocations).
+struct ProfileEvent {
+    std::string name;      // kernel or function, e.g. "add_float32", "matmul", "execute"
+    std::string category;  // "elementwise", "matmul", "reduction", "copy", "graph" or "alloc"
+    std::vector<std::vector<int64_t>> shapes;  // operands read, then written
+    uint64_t thread = 0;
+    double start_us = 0;
+    double wall_us = 0;
+    double gpu_start_us = -1;
+    double gpu_us = -1;
+    uint64_t bytes_read = 0;
+    uint64_t bytes_written = 0;
+    uint64_t bytes_allocated = 0;
+};
+
+// Starts recording (dropping anything recorded before). While stopped, every hook below is a
+// single atomic load.
+void profiler_start();
+
+// Stops recording and returns the events in the order their calls returned. Waits for the
+// command buffers of the recorded calls to finish, to read their GPU timestamps.
+std::vector<ProfileEvent> profiler_stop();
+
+bool profiling_enabled();
+
+// Records the call it is scoped to, while the profiler runs: wall time from construction to
+// destruction, the operands passed to read/write (shapes and bytes moved) and, if a command
+// buffer is watched, its GPU execution time.
+class ProfileScope {
+   public:
+    ProfileScope(const char* category, const std::string& name);
+    ~ProfileScope();
+    ProfileScope(const ProfileScope&) = delete;
+    ProfileScope& operator=(const ProfileScope&) = delete;
+
+    void read(const ArrayHandle& h) { read(h.shape(), h.dtype()); }
+    void read(const std::vector<int64_t>& shape, DType dtype);
+    void write(const ArrayHandle& h) { write(h.shape(), h.dtype()); }
+    void write(const std::vector<int64_t>& shape, DType dtype);
+#ifdef __OBJC__
+    // Can be called before or after the commit
+    void watch(id<MTLCommandBuffer> cmd);
+#endif
+
+   private:
+    std::unique_ptr<ProfileEvent> event_;  // null while the profiler is stopped
+    void* cmd_ = nullptr;                  // retained command buffer
+};
+
+// Records a new device buffer of `nbytes` (an ArrayHandle's storage or a graph arena).
+void profile_allocation(const char* name, const std::vector<int64_t>& shape, uint64_t nbytes);
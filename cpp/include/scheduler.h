@@ -0,0 +1,18 @@
+#pragma once
+#include <vector>
+
+#include "graph.h"
+
+// Groups the kernel nodes of a graph (with its arena) into waves that can run concurrently.
+// Node j depends on an earlier kernel node i when their memory overlaps with a hazard: i writes
+// what j reads (RAW), reads what j writes (WAR, the arena recycles dead buffers) or writes it too
+// (WAW). Memory is tracked per root: graph inputs and the output each have their own buffer, and
+// everything else is the root's byte range in the arena (a CONCAT input placed in its output
+// lies inside the CONCAT's range). A wave holds the nodes whose dependencies all ran in earlier
+// waves, in graph order; nodes that launch no kernel (inputs, views) are left out.
+std::vector<std::vector<int>> schedule_waves(const Graph& graph);
+
+// Globally enables or disables concurrent execution of waves in Graph::execute (on by default).
+// When disabled, nodes are dispatched one after another in graph order.
+void set_graph_concurrency(bool enabled);
+bool graph_concurrency();
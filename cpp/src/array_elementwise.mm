@@ -1,12 +1,28 @@
 #import <Metal/Metal.h>
 
+#include <algorithm>
+#include <bit>
+
 #include "../include/array_elementwise.h"
 #include "../include/metal_source.h"
 #include "../include/metal_utils.h"
+#include "../include/profiler.h"
+
+static void check_same_dtype(const std::shared_ptr<ArrayHandle>& A,
+                             const std::shared_ptr<ArrayHandle>& B, const std::string& op_name) {
+    if (A->dtype() != B->dtype()) {
+        throw std::runtime_error(op_name + ": dtype mismatch (" + dtype_name(A->dtype()) + " vs " +
+                                 dtype_name(B->dtype()) + "), use astype");
+    }
+}
 
 std::shared_ptr<ArrayHandle> array_unaryops(const std::shared_ptr<ArrayHandle>& A,
                                             const std::string& op_name) {
-    return launch_elementwise(op_name, A->shape(), {A}, true);
+    if (!dtype_is_float(A->dtype())) {
+        throw std::runtime_error(op_name + ": unsupported dtype " + dtype_name(A->dtype()) +
+                                 ", use astype");
+    }
+    return launch_elementwise(kernel_name(op_name, A->dtype()), A->shape(), {A}, true);
 }
 
 std::shared_ptr<ArrayHandle> array_binops(const std::shared_ptr<ArrayHandle>& A,
@@ -15,8 +31,9 @@ std::shared_ptr<ArrayHandle> array_binops(const std::shared_ptr<ArrayHandle>& A,
     const auto& shapeA = A->shape();
     const auto& shapeB = B->shape();
     std::vector<int64_t> out_shape = (shapeA == shapeB) ? shapeA : broadcast_shapes(shapeA, shapeB);
+    check_same_dtype(A, B, op_name);
 
-    return launch_elementwise(op_name, out_shape, {A, B}, true);
+    return launch_elementwise(kernel_name(op_name, A->dtype()), out_shape, {A, B}, true);
 }
 
 std::shared_ptr<ArrayHandle> array_inplaceops(const std::shared_ptr<ArrayHandle>& A,
@@ -26,27 +43,152 @@ std::shared_ptr<ArrayHandle> array_inplaceops(const std::shared_ptr<ArrayHandle>
     const auto& shapeB = B->shape();
     std::vector<int64_t> out_shape = broadcast_shapes(shapeA, shapeB);
     if (out_shape != shapeA) throw std::runtime_error("array_inplaceops: broadcast failed");
+    check_same_dtype(A, B, op_name);
+
+    return launch_elementwise(kernel_name(op_name, A->dtype()), shapeA, {A, B}, false);
+}
+
+std::shared_ptr<ArrayHandle> array_compare(const std::shared_ptr<ArrayHandle>& A,
+                                           const std::shared_ptr<ArrayHandle>& B,
+                                           const std::string& op_name) {
+    const auto& shapeA = A->shape();
+    const auto& shapeB = B->shape();
+    std::vector<int64_t> out_shape = (shapeA == shapeB) ? shapeA : broadcast_shapes(shapeA, shapeB);
+    check_same_dtype(A, B, op_name);
+
+    return launch_elementwise(kernel_name(op_name, A->dtype()), out_shape, {A, B}, true, {},
+                              DType::uint8);
+}
+
+std::shared_ptr<ArrayHandle> array_compare_scalar(const std::shared_ptr<ArrayHandle>& A,
+                                                  float scalar, const std::string& op_name) {
+    const auto& shapeA = A->shape();
+    std::vector<int64_t> out_shape = shapeA.empty() ? std::vector<int64_t>{1} : shapeA;
+
+    return launch_elementwise(kernel_name(op_name + "_scalar", A->dtype()), out_shape, {A}, true,
+                              {&scalar, 1}, DType::uint8);
+}
+
+std::shared_ptr<ArrayHandle> array_where(const std::shared_ptr<ArrayHandle>& cond,
+                                         const std::shared_ptr<ArrayHandle>& A,
+                                         const std::shared_ptr<ArrayHandle>& B) {
+    check_same_dtype(A, B, "where");
+    std::vector<int64_t> out_shape =
+        broadcast_shapes(broadcast_shapes(cond->shape(), A->shape()), B->shape());
+    // The kernel reads the condition as a uint8 mask
+    auto mask = cond->dtype() == DType::uint8 ? cond : array_compare_scalar(cond, 0.0f, "ne");
 
-    return launch_elementwise(op_name, shapeA, {A, B}, false);
+    return launch_elementwise(kernel_name("where", A->dtype()), out_shape, {mask, A, B}, true, {},
+                              A->dtype());
+}
+
+// The scalar constant in the kernel's compute type, as the 4 bytes setBytes passes: a float
+// for float dtypes, int for int32 and uint for uint8 (wrapping like the uint8 arithmetic,
+// except that maximum/minimum clamp it to the uint8 range).
+static float scalar_constant(DType dtype, double scalar, const std::string& op_name) {
+    if (dtype == DType::int32) return std::bit_cast<float>(static_cast<int32_t>((int64_t)scalar));
+    if (dtype == DType::uint8) {
+        if (op_name == "maximum_scalar" || op_name == "minimum_scalar") {
+            scalar = std::clamp(scalar, 0.0, 255.0);
+        }
+        return std::bit_cast<float>(static_cast<uint32_t>((int64_t)scalar));
+    }
+    return static_cast<float>(scalar);
+}
+
+// Scalar ops take the Python scalar as a kernel constant, so no 1-element
+// buffer is allocated. Output shape matches broadcasting against shape (1,).
+std::shared_ptr<ArrayHandle> array_scalarops(const std::shared_ptr<ArrayHandle>& A, double scalar,
+                                             const std::string& op_name) {
+    const auto& shapeA = A->shape();
+    std::vector<int64_t> out_shape = shapeA.empty() ? std::vector<int64_t>{1} : shapeA;
+    float s = scalar_constant(A->dtype(), scalar, op_name);
+
+    return launch_elementwise(kernel_name(op_name, A->dtype()), out_shape, {A}, true, {&s, 1});
+}
+
+std::shared_ptr<ArrayHandle> array_inplace_scalarops(const std::shared_ptr<ArrayHandle>& A,
+                                                     double scalar, const std::string& op_name) {
+    if (A->shape().empty()) throw std::runtime_error("array_inplaceops: broadcast failed");
+    float s = scalar_constant(A->dtype(), scalar, op_name);
+
+    return launch_elementwise(kernel_name(op_name, A->dtype()), A->shape(), {A}, false, {&s, 1});
+}
+
+void array_fill_view(const std::shared_ptr<ArrayHandle>& A, double value,
+                     std::vector<int64_t> shape, std::vector<int64_t> strides, size_t offset) {
+    auto view = std::make_shared<ArrayHandle>(A, std::move(shape), std::move(strides), offset);
+    if (numel_from_shape(view->shape()) == 0) return;
+    float s = scalar_constant(A->dtype(), value, "fill_view");
+    launch_elementwise(kernel_name("fill_view", A->dtype()), view->shape(), {view}, false, {&s, 1});
+}
+
+// Converts into a new dense Array of `dtype`; returns A itself when it already has it.
+std::shared_ptr<ArrayHandle> array_astype(const std::shared_ptr<ArrayHandle>& A, DType dtype) {
+    if (A->dtype() == dtype) return A;
+    std::string op_name = kernel_name("astype_" + std::string(dtype_name(A->dtype())), dtype);
+    if (numel_from_shape(A->shape()) == 0) return std::make_shared<ArrayHandle>(A->shape(), dtype);
+    return launch_elementwise(op_name, A->shape(), {A}, true, {}, dtype);
+}
+
+std::shared_ptr<ArrayHandle> array_astype_scaled(const std::shared_ptr<ArrayHandle>& A, DType dtype,
+                                                 float scale, float shift) {
+    std::string op_name =
+        kernel_name("astype_scaled_" + std::string(dtype_name(A->dtype())), dtype);
+    if (numel_from_shape(A->shape()) == 0) return std::make_shared<ArrayHandle>(A->shape(), dtype);
+    float affine[2] = {scale, shift};
+    return launch_elementwise(op_name, A->shape(), {A}, true, affine, dtype);
+}
+
+// The labels get a trailing size-1 axis with stride 0, so the shared elementwise
+// layout broadcasts each label across its row of num_classes outputs.
+std::shared_ptr<ArrayHandle> array_one_hot(const std::shared_ptr<ArrayHandle>& labels,
+                                           int64_t num_classes, DType dtype) {
+    if (num_classes <= 0) throw std::runtime_error("one_hot: num_classes must be positive");
+    std::vector<int64_t> col_shape = labels->shape();
+    std::vector<int64_t> col_strides = labels->strides();
+    col_shape.push_back(1);
+    col_strides.push_back(0);
+    auto column = std::make_shared<ArrayHandle>(labels, col_shape, col_strides, labels->offset());
+
+    std::vector<int64_t> out_shape = labels->shape();
+    out_shape.push_back(num_classes);
+    if (numel_from_shape(out_shape) == 0) return std::make_shared<ArrayHandle>(out_shape, dtype);
+    std::string op_name = kernel_name("one_hot_" + std::string(dtype_name(labels->dtype())), dtype);
+    // The kernel derives the class index from the trailing dim, so the shape must not coalesce.
+    return launch_elementwise(op_name, out_shape, {column}, true, {}, dtype, false);
 }
 
 // Nullary ops (rand/randn/zeros) don't share the same buffer layout
 // so kept as a dedicated launcher
 std::shared_ptr<ArrayHandle> array_nullaryops(const std::vector<int64_t>& shape,
-                                              const std::string& op_name) {
-    auto fh = get_default_forge();
-
+                                              const std::string& op_name, DType dtype) {
     if (op_name == "zeros") {
-        return std::make_shared<ArrayHandle>(shape, fh->device_ptr(), /*zero=*/true);
+        return std::make_shared<ArrayHandle>(shape, dtype, get_default_forge()->device_ptr(),
+                                             /*zero=*/true);
     }
+    Distribution dist = op_name == "randn" ? Distribution::normal : Distribution::uniform;
+    return array_random(shape, dist, 0.0f, nullptr, dtype);
+}
 
+// Generated in float32 and converted.
+std::shared_ptr<ArrayHandle> array_random(const std::vector<int64_t>& shape, Distribution dist,
+                                          float p, Generator* generator, DType dtype) {
+    if (dtype != DType::float32) {
+        return array_astype(array_random(shape, dist, p, generator), dtype);
+    }
+    auto fh = get_default_forge();
+    if (!generator) generator = &fh->generator();
     auto out = std::make_shared<ArrayHandle>(shape, fh->device_ptr());
-    id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)fh->queue_ptr();
-    uint32_t seed = fh->get_seed();
+    size_t numel = numel_from_shape(shape);
+    PhiloxParams params = generator->reserve(numel, dist, p);
+    if (numel == 0) return out;
 
+    ProfileScope prof("elementwise", "philox_fill");
+    prof.write(*out);
+    id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)fh->queue_ptr();
     id<MTLComputePipelineState> pipeline =
-        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(op_name, METAL_SOURCE);
-    id<MTLBuffer> bufOut = out->metal_buffer();
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline("philox_fill", METAL_SOURCE);
 
     id<MTLCommandBuffer> cmd = [queue commandBuffer];
     if (!cmd)
@@ -55,18 +197,17 @@ std::shared_ptr<ArrayHandle> array_nullaryops(const std::vector<int64_t>& shape,
     id<MTLComputeCommandEncoder> enc = [cmd computeCommandEncoder];
     if (!enc) throw std::runtime_error("Metal Error: Failed to create command encoder.");
     [enc setComputePipelineState:pipeline];
-    [enc setBuffer:bufOut offset:0 atIndex:0];
-    [enc setBytes:&seed length:4 atIndex:1];
+    [enc setBuffer:out->metal_buffer() offset:0 atIndex:0];
+    [enc setBytes:&params length:sizeof(params) atIndex:1];
 
-    size_t numel = numel_from_shape(shape);
-    MTLSize grid = MTLSizeMake(numel, 1, 1);
+    MTLSize grid = MTLSizeMake((numel + 3) / 4, 1, 1);
     MTLSize threads = MTLSizeMake(256, 1, 1);
     if (threads.width > grid.width) threads.width = grid.width;
     [enc dispatchThreads:grid threadsPerThreadgroup:threads];
     [enc endEncoding];
 
     [cmd commit];
-    fh->set_seed(seed + (uint32_t)numel);
+    prof.watch(cmd);
     out->set_event(cmd);
     return out;
 }
@@ -1,40 +1,66 @@
 #import <Metal/Metal.h>
 
+#include "../include/array_elementwise.h"
 #include "../include/array_handle.h"
 #include "../include/forge_handle.h"
+#include "../include/memory_stats.h"
 #include "../include/metal_source.h"
 #include "../include/metal_utils.h"
+#include "../include/profiler.h"
 
 struct ArrayStorage {
     id<MTLBuffer> metal_buffer = nil;
     id<MTLCommandBuffer> write_event = nil;
+    size_t nbytes = 0;  // bytes allocated by Forge, 0 for wrapped buffers
+
+    ~ArrayStorage() { record_free(nbytes); }
 };
 
 ArrayHandle::ArrayHandle(std::vector<int64_t> shape, void* dev, bool zero)
-    : shape_{std::move(shape)}, offset_(0), storage_(std::make_shared<ArrayStorage>()) {
+    : ArrayHandle(std::move(shape), DType::float32, dev, zero) {}
+
+ArrayHandle::ArrayHandle(std::vector<int64_t> shape, DType dtype, void* dev, bool zero)
+    : shape_{std::move(shape)},
+      offset_(0),
+      dtype_(dtype),
+      storage_(std::make_shared<ArrayStorage>()) {
+    record_handle(1);
     strides_ = make_strides(shape_);
-    size_t nbytes = numel_from_shape(shape_) * sizeof(float);
+    size_t nbytes = numel_from_shape(shape_) * dtype_size(dtype_);
     if (nbytes == 0) return;
     if (!dev) dev = get_default_forge()->device_ptr();
     id<MTLDevice> device = (__bridge id<MTLDevice>)dev;
     id<MTLBuffer> buf = [device newBufferWithLength:nbytes options:MTLResourceStorageModeShared];
     if (zero) memset(buf.contents, 0, nbytes);
+    profile_allocation("ArrayHandle", shape_, nbytes);
+    record_alloc(nbytes);
 
     storage_->metal_buffer = buf;
+    storage_->nbytes = nbytes;
 }
 
 ArrayHandle::ArrayHandle(const float* src_data, std::vector<int64_t> shape, void* dev)
-    : shape_{std::move(shape)}, offset_(0), storage_(std::make_shared<ArrayStorage>()) {
+    : ArrayHandle(static_cast<const void*>(src_data), std::move(shape), DType::float32, dev) {}
+
+ArrayHandle::ArrayHandle(const void* src_data, std::vector<int64_t> shape, DType dtype, void* dev)
+    : shape_{std::move(shape)},
+      offset_(0),
+      dtype_(dtype),
+      storage_(std::make_shared<ArrayStorage>()) {
+    record_handle(1);
     strides_ = make_strides(shape_);
-    size_t nbytes = numel_from_shape(shape_) * sizeof(float);
+    size_t nbytes = numel_from_shape(shape_) * dtype_size(dtype_);
     if (nbytes == 0) return;
     if (!dev) dev = get_default_forge()->device_ptr();
     id<MTLDevice> device = (__bridge id<MTLDevice>)dev;
     id<MTLBuffer> buf = [device newBufferWithBytes:src_data
                                             length:nbytes
                                            options:MTLResourceStorageModeShared];
+    profile_allocation("ArrayHandle", shape_, nbytes);
+    record_alloc(nbytes);
 
     storage_->metal_buffer = buf;
+    storage_->nbytes = nbytes;
 }
 
 ArrayHandle::ArrayHandle(const std::shared_ptr<ArrayHandle>& parent, std::vector<int64_t> new_shape,
@@ -42,9 +68,29 @@ ArrayHandle::ArrayHandle(const std::shared_ptr<ArrayHandle>& parent, std::vector
     : shape_(std::move(new_shape)),
       strides_(std::move(new_strides)),
       offset_(new_offset),
-      storage_(parent->storage_) {}
+      dtype_(parent->dtype_),
+      storage_(parent->storage_) {
+    record_handle(1);
+}
+
+ArrayHandle::ArrayHandle(id<MTLBuffer> buffer, std::vector<int64_t> shape, DType dtype,
+                         size_t offset)
+    : shape_{std::move(shape)},
+      offset_(offset),
+      dtype_(dtype),
+      storage_(std::make_shared<ArrayStorage>()) {
+    record_handle(1);
+    strides_ = make_strides(shape_);
+    storage_->metal_buffer = buffer;
+}
+
+ArrayHandle::~ArrayHandle() { record_handle(-1); }
 
 std::span<float> ArrayHandle::data() {
+    if (dtype_ != DType::float32) {
+        throw std::runtime_error(std::string("ArrayHandle::data: float32 view of a ") +
+                                 dtype_name(dtype_) + " array");
+    }
     size_t total = numel_from_shape(shape_);
     if (total == 0) return {};
     if (!storage_->metal_buffer) {
@@ -58,6 +104,11 @@ std::span<float> ArrayHandle::data() {
 
 std::span<const float> ArrayHandle::data() const { return const_cast<ArrayHandle*>(this)->data(); }
 
+void* ArrayHandle::raw_data() const {
+    if (!storage_->metal_buffer) return nullptr;
+    return [storage_->metal_buffer contents];
+}
+
 id<MTLBuffer> ArrayHandle::metal_buffer() const { return storage_->metal_buffer; }
 
 void ArrayHandle::set_event(id<MTLCommandBuffer> event) {
@@ -67,7 +118,12 @@ void ArrayHandle::set_event(id<MTLCommandBuffer> event) {
 
 void ArrayHandle::copy_from(std::shared_ptr<ArrayHandle> other, std::vector<int64_t> shape,
                             std::vector<int64_t> strides, size_t offset) {
-    std::string op_name = "copy_view";
+    // Assigning across dtypes converts the source first
+    if (other->dtype() != dtype_) other = array_astype(other, dtype_);
+    std::string op_name = kernel_name("copy_view", dtype_);
+    ProfileScope prof("copy", op_name);
+    prof.read(shape, dtype_);
+    prof.write(shape, dtype_);
     id<MTLComputePipelineState> pipeline =
         (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(op_name, METAL_SOURCE);
 
@@ -121,6 +177,7 @@ void ArrayHandle::copy_from(std::shared_ptr<ArrayHandle> other, std::vector<int6
 
     [enc dispatchThreads:gridSize threadsPerThreadgroup:threadgroupSize];
     [enc endEncoding];
+    prof.watch(cmd);
     [cmd commit];
     this->set_event(cmd);
 }
@@ -133,27 +190,135 @@ void ArrayHandle::synchronize() {
 
 std::vector<int64_t> array_shape(const std::shared_ptr<ArrayHandle>& h) { return h->shape(); }
 
+std::optional<std::vector<int64_t>> reshape_view_strides(const std::vector<int64_t>& shape,
+                                                         const std::vector<int64_t>& strides,
+                                                         const std::vector<int64_t>& new_shape) {
+    if (numel_from_shape(shape) == 0) return make_strides(new_shape);
+    // Size-1 dims never constrain the layout
+    std::vector<int64_t> old_dims, old_strides;
+    for (size_t i = 0; i < shape.size(); ++i) {
+        if (shape[i] == 1) continue;
+        old_dims.push_back(shape[i]);
+        old_strides.push_back(strides[i]);
+    }
+    std::vector<int64_t> new_strides(new_shape.size(), 1);
+    // Match groups of old dims [oi, oj) against groups of new dims [ni, nj) of equal size
+    size_t oi = 0, oj = 1, ni = 0, nj = 1;
+    while (ni < new_shape.size() && oi < old_dims.size()) {
+        int64_t np = new_shape[ni], op = old_dims[oi];
+        while (np != op) {
+            if (np < op) {
+                np *= new_shape[nj++];
+            } else {
+                op *= old_dims[oj++];
+            }
+        }
+        // The old group must be one contiguous run to be re-split freely
+        for (size_t k = oi; k + 1 < oj; ++k) {
+            if (old_strides[k] != old_dims[k + 1] * old_strides[k + 1]) return std::nullopt;
+        }
+        new_strides[nj - 1] = old_strides[oj - 1];
+        for (size_t k = nj - 1; k > ni; --k) new_strides[k - 1] = new_strides[k] * new_shape[k];
+        ni = nj++;
+        oi = oj++;
+    }
+    // Trailing size-1 dims of the new shape
+    int64_t last_stride = ni > 0 ? new_strides[ni - 1] : 1;
+    for (size_t k = ni; k < new_shape.size(); ++k) new_strides[k] = last_stride;
+    return new_strides;
+}
+
 std::shared_ptr<ArrayHandle> array_reshape(const std::shared_ptr<ArrayHandle>& h,
                                            std::vector<int64_t> shape) {
-    bool contiguous = true;
-    int64_t z = 1;
     const auto& other_shape = h->shape();
-    const auto& other_strides = h->strides();
-    for (int i = other_shape.size() - 1; i >= 0; --i) {
-        if (other_strides[i] != z) {
-            contiguous = false;
-            break;
-        }
-        z *= other_shape[i];
+    if (auto strides = reshape_view_strides(other_shape, h->strides(), shape)) {
+        return std::make_shared<ArrayHandle>(h, shape, *strides, h->offset());
     }
-    if (contiguous) {
-        return std::make_shared<ArrayHandle>(h, shape, make_strides(shape), h->offset());
-    }
-    std::shared_ptr<ArrayHandle> ret = std::make_shared<ArrayHandle>(shape);
+    std::shared_ptr<ArrayHandle> ret = std::make_shared<ArrayHandle>(shape, h->dtype());
     ret->copy_from(h, other_shape, make_strides(h->shape()), 0);
     return ret;
 }
 
+std::shared_ptr<ArrayHandle> array_concatenate(
+    const std::vector<std::shared_ptr<ArrayHandle>>& inputs, int axis) {
+    if (inputs.empty()) throw std::runtime_error("concatenate: need at least one array");
+    const auto& first = inputs[0];
+    size_t ndim = first->shape().size();
+    if (ndim == 0)
+        throw std::runtime_error("concatenate: zero-dimensional arrays cannot be joined");
+    if (axis < 0 || (size_t)axis >= ndim) {
+        throw std::runtime_error("concatenate: axis " + std::to_string(axis) +
+                                 " is out of bounds for arrays of dimension " +
+                                 std::to_string(ndim));
+    }
+    std::vector<int64_t> out_shape = first->shape();
+    out_shape[axis] = 0;
+    for (const auto& h : inputs) {
+        if (h->dtype() != first->dtype()) {
+            throw std::runtime_error("concatenate: dtype mismatch (" +
+                                     std::string(dtype_name(first->dtype())) + " vs " +
+                                     dtype_name(h->dtype()) + "), use astype");
+        }
+        bool same = h->shape().size() == ndim;
+        for (size_t d = 0; same && d < ndim; ++d) {
+            same = (int)d == axis || h->shape()[d] == first->shape()[d];
+        }
+        if (!same) {
+            throw std::runtime_error(
+                "concatenate: all arrays must have the same shape except along the axis");
+        }
+        out_shape[axis] += h->shape()[axis];
+    }
+
+    ProfileScope prof("copy", "concatenate");
+    for (const auto& h : inputs) prof.read(*h);
+    auto out = std::make_shared<ArrayHandle>(out_shape, first->dtype());
+    prof.write(*out);
+    if (numel_from_shape(out_shape) == 0) return out;
+
+    id<MTLComputePipelineState> pipeline =
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(
+            kernel_name("copy_view", first->dtype()), METAL_SOURCE);
+    id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)get_default_forge()->queue_ptr();
+    id<MTLCommandBuffer> cmd = [queue commandBuffer];
+    if (!cmd)
+        throw std::runtime_error(
+            "Metal Error: Failed to create command buffer. GPU might out of memory.");
+    id<MTLComputeCommandEncoder> enc = [cmd computeCommandEncoder];
+    if (!enc) throw std::runtime_error("Metal Error: Failed to create command encoder.");
+    [enc setComputePipelineState:pipeline];
+    [enc setBuffer:out->metal_buffer() offset:0 atIndex:0];
+
+    // Each input's slab is the output viewed with the input's shape, starting
+    // `axis_offset` entries along the axis
+    const auto& dst_strides = out->strides();
+    uint u_ndim = (uint)ndim;
+    int64_t axis_offset = 0;
+    for (const auto& h : inputs) {
+        size_t n = numel_from_shape(h->shape());
+        int64_t dst_offset = axis_offset * dst_strides[axis];
+        axis_offset += h->shape()[axis];
+        if (n == 0) continue;
+        size_t src_offset = h->offset();
+        [enc setBuffer:h->metal_buffer() offset:0 atIndex:1];
+        [enc setBytes:h->shape().data() length:ndim * 8 atIndex:2];
+        [enc setBytes:dst_strides.data() length:ndim * 8 atIndex:3];
+        [enc setBytes:&dst_offset length:8 atIndex:4];
+        [enc setBytes:h->strides().data() length:ndim * 8 atIndex:5];
+        [enc setBytes:&src_offset length:8 atIndex:6];
+        [enc setBytes:&u_ndim length:4 atIndex:7];
+
+        MTLSize grid = MTLSizeMake(n, 1, 1);
+        MTLSize threads = MTLSizeMake(MIN(pipeline.maxTotalThreadsPerThreadgroup, n), 1, 1);
+        [enc dispatchThreads:grid threadsPerThreadgroup:threads];
+    }
+    [enc endEncoding];
+    prof.watch(cmd);
+    [cmd commit];
+    out->set_event(cmd);
+    return out;
+}
+
 std::vector<int64_t> broadcast_shapes(std::span<const int64_t>&& a_shape,
                                       std::span<const int64_t>&& b_shape) {
     std::vector<int64_t> out;
@@ -199,3 +364,29 @@ std::vector<int64_t> get_bcast_strides(const std::vector<int64_t>& shape,
     }
     return bcast_strides;
 };
+
+std::vector<int64_t> coalesce_dims(const std::vector<int64_t>& shape,
+                                   std::vector<std::vector<int64_t>>& strides) {
+    std::vector<int64_t> out_shape;
+    std::vector<std::vector<int64_t>> out_strides(strides.size());
+    for (size_t d = 0; d < shape.size(); ++d) {
+        if (shape[d] == 1) continue;
+        bool merge = !out_shape.empty();
+        for (size_t k = 0; merge && k < strides.size(); ++k) {
+            merge = out_strides[k].back() == strides[k][d] * shape[d];
+        }
+        if (merge) {
+            out_shape.back() *= shape[d];
+            for (size_t k = 0; k < strides.size(); ++k) out_strides[k].back() = strides[k][d];
+        } else {
+            out_shape.push_back(shape[d]);
+            for (size_t k = 0; k < strides.size(); ++k) out_strides[k].push_back(strides[k][d]);
+        }
+    }
+    if (out_shape.empty()) {
+        out_shape.push_back(1);
+        for (auto& s : out_strides) s.push_back(1);
+    }
+    strides = std::move(out_strides);
+    return out_shape;
+}
@@ -0,0 +1,309 @@
+#import <Metal/Metal.h>
+
+#include <algorithm>
+
+#include "../include/array_elementwise.h"
+#include "../include/array_index.h"
+#include "../include/metal_source.h"
+#include "../include/metal_utils.h"
+
+void array_gather_rows(const std::shared_ptr<ArrayHandle>& out,
+                       const std::shared_ptr<ArrayHandle>& A,
+                       const std::shared_ptr<ArrayHandle>& indices) {
+    if (indices->dtype() != DType::int32 || indices->shape().size() != 1) {
+        throw std::runtime_error("gather_rows: indices must be a 1-d int32 array");
+    }
+    if (A->shape().empty()) throw std::runtime_error("gather_rows: cannot gather from a 0-d array");
+    if (out->dtype() != A->dtype()) throw std::runtime_error("gather_rows: dtype mismatch");
+    std::vector<int64_t> out_shape = A->shape();
+    out_shape[0] = indices->shape()[0];
+    if (out->shape() != out_shape || !is_contiguous(out->shape(), out->strides())) {
+        throw std::runtime_error("gather_rows: out must be dense with shape (len(indices), ...)");
+    }
+
+    uint row_size = (uint)(numel_from_shape(A->shape()) / std::max<int64_t>(A->shape()[0], 1));
+    size_t numel = numel_from_shape(out_shape);
+    if (numel == 0) return;
+
+    auto fh = get_default_forge();
+    id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)fh->queue_ptr();
+    id<MTLComputePipelineState> pipeline =
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(
+            kernel_name("gather_rows", A->dtype()), METAL_SOURCE);
+
+    id<MTLCommandBuffer> cmd = [queue commandBuffer];
+    if (!cmd)
+        throw std::runtime_error(
+            "Metal Error: Failed to create command buffer. GPU might out of memory.");
+    id<MTLComputeCommandEncoder> enc = [cmd computeCommandEncoder];
+    if (!enc) throw std::runtime_error("Metal Error: Failed to create command encoder.");
+    [enc setComputePipelineState:pipeline];
+
+    [enc setBuffer:A->metal_buffer() offset:0 atIndex:0];
+    [enc setBuffer:indices->metal_buffer() offset:0 atIndex:1];
+    [enc setBuffer:out->metal_buffer() offset:out->offset() * out->itemsize() atIndex:2];
+    uint ndim = (uint)A->shape().size();
+    [enc setBytes:A->shape().data() length:ndim * 8 atIndex:3];
+    [enc setBytes:A->strides().data() length:ndim * 8 atIndex:4];
+    size_t offset_A = A->offset();
+    [enc setBytes:&offset_A length:sizeof(size_t) atIndex:5];
+    [enc setBytes:&ndim length:4 atIndex:6];
+    int64_t idx_offset = indices->offset();
+    int64_t idx_stride = indices->strides()[0];
+    [enc setBytes:&idx_offset length:8 atIndex:7];
+    [enc setBytes:&idx_stride length:8 atIndex:8];
+    [enc setBytes:&row_size length:4 atIndex:9];
+
+    MTLSize grid = MTLSizeMake(numel, 1, 1);
+    MTLSize threads = MTLSizeMake(256, 1, 1);
+    if (threads.width > grid.width) threads.width = grid.width;
+    [enc dispatchThreads:grid threadsPerThreadgroup:threads];
+    [enc endEncoding];
+
+    [cmd commit];
+    out->set_event(cmd);
+}
+
+namespace {
+
+// Command buffer and encoder for one index kernel, with its pipeline already bound.
+struct IndexLaunch {
+    id<MTLCommandBuffer> cmd;
+    id<MTLComputeCommandEncoder> enc;
+};
+
+IndexLaunch begin_index_launch(const std::string& op_name) {
+    auto fh = get_default_forge();
+    id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)fh->queue_ptr();
+    id<MTLComputePipelineState> pipeline =
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(op_name, METAL_SOURCE);
+
+    id<MTLCommandBuffer> cmd = [queue commandBuffer];
+    if (!cmd)
+        throw std::runtime_error(
+            "Metal Error: Failed to create command buffer. GPU might out of memory.");
+    id<MTLComputeCommandEncoder> enc = [cmd computeCommandEncoder];
+    if (!enc) throw std::runtime_error("Metal Error: Failed to create command encoder.");
+    [enc setComputePipelineState:pipeline];
+    return {cmd, enc};
+}
+
+void finish_index_launch(const IndexLaunch& launch, size_t numel,
+                         const std::shared_ptr<ArrayHandle>& written) {
+    MTLSize grid = MTLSizeMake(numel, 1, 1);
+    MTLSize threads = MTLSizeMake(256, 1, 1);
+    if (threads.width > grid.width) threads.width = grid.width;
+    [launch.enc dispatchThreads:grid threadsPerThreadgroup:threads];
+    [launch.enc endEncoding];
+
+    [launch.cmd commit];
+    written->set_event(launch.cmd);
+}
+
+void check_axis(const char* op, int axis, size_t ndim) {
+    if (axis < 0 || (size_t)axis >= ndim) {
+        throw std::runtime_error(std::string(op) + ": axis " + std::to_string(axis) +
+                                 " is out of bounds for an array of dimension " +
+                                 std::to_string(ndim));
+    }
+}
+
+void check_indices(const char* op, const std::shared_ptr<ArrayHandle>& indices) {
+    if (indices->dtype() != DType::int32) {
+        throw std::runtime_error(std::string(op) + ": indices must be int32 (got " +
+                                 dtype_name(indices->dtype()) + ")");
+    }
+}
+
+// Shape of A.take(indices, axis): A.shape[:axis] + index_shape + A.shape[axis + 1:].
+std::vector<int64_t> take_shape(const std::vector<int64_t>& shape,
+                                const std::vector<int64_t>& index_shape, int axis) {
+    std::vector<int64_t> out(shape.begin(), shape.begin() + axis);
+    out.insert(out.end(), index_shape.begin(), index_shape.end());
+    out.insert(out.end(), shape.begin() + axis + 1, shape.end());
+    return out;
+}
+
+// gather/scatter_add index arrays have the data's rank and fit inside it off the axis.
+void check_along_axis(const char* op, const std::vector<int64_t>& shape,
+                      const std::vector<int64_t>& index_shape, int axis) {
+    if (index_shape.size() != shape.size()) {
+        throw std::runtime_error(std::string(op) +
+                                 ": indices must have the same rank as the array");
+    }
+    for (size_t d = 0; d < shape.size(); ++d) {
+        if ((int)d != axis && index_shape[d] > shape[d]) {
+            throw std::runtime_error(std::string(op) +
+                                     ": indices are larger than the array in dim " +
+                                     std::to_string(d));
+        }
+    }
+}
+
+// index_add / scatter_add accumulate atomically in int32 or float32; other dtypes are
+// accumulated in a float32 copy that is written back.
+bool has_atomic_add(DType dtype) { return dtype == DType::int32 || dtype == DType::float32; }
+
+}  // namespace
+
+std::shared_ptr<ArrayHandle> array_take(const std::shared_ptr<ArrayHandle>& A,
+                                        const std::shared_ptr<ArrayHandle>& indices, int axis) {
+    check_axis("take", axis, A->shape().size());
+    check_indices("take", indices);
+    auto out =
+        std::make_shared<ArrayHandle>(take_shape(A->shape(), indices->shape(), axis), A->dtype());
+    size_t numel = numel_from_shape(out->shape());
+    if (numel == 0) return out;
+    auto flat = array_reshape(indices, {(int64_t)numel_from_shape(indices->shape())});
+
+    uint ndim = (uint)A->shape().size();
+    uint inner = (uint)numel_from_shape(
+        std::vector<int64_t>(A->shape().begin() + axis + 1, A->shape().end()));
+    uint dims[3] = {(uint)axis, (uint)flat->shape()[0], inner};
+
+    auto launch = begin_index_launch(kernel_name("take", A->dtype()));
+    id<MTLComputeCommandEncoder> enc = launch.enc;
+    [enc setBuffer:A->metal_buffer() offset:0 atIndex:0];
+    [enc setBuffer:flat->metal_buffer() offset:0 atIndex:1];
+    [enc setBuffer:out->metal_buffer() offset:0 atIndex:2];
+    [enc setBytes:A->shape().data() length:ndim * 8 atIndex:3];
+    [enc setBytes:A->strides().data() length:ndim * 8 atIndex:4];
+    size_t offset_A = A->offset();
+    [enc setBytes:&offset_A length:sizeof(size_t) atIndex:5];
+    [enc setBytes:&ndim length:4 atIndex:6];
+    int64_t idx_offset = flat->offset();
+    int64_t idx_stride = flat->strides()[0];
+    [enc setBytes:&idx_offset length:8 atIndex:7];
+    [enc setBytes:&idx_stride length:8 atIndex:8];
+    [enc setBytes:dims length:sizeof(dims) atIndex:9];
+    finish_index_launch(launch, numel, out);
+    return out;
+}
+
+std::shared_ptr<ArrayHandle> array_gather(const std::shared_ptr<ArrayHandle>& A,
+                                          const std::shared_ptr<ArrayHandle>& indices, int axis) {
+    check_axis("gather", axis, A->shape().size());
+    check_indices("gather", indices);
+    check_along_axis("gather", A->shape(), indices->shape(), axis);
+    auto out = std::make_shared<ArrayHandle>(indices->shape(), A->dtype());
+    size_t numel = numel_from_shape(out->shape());
+    if (numel == 0) return out;
+
+    uint ndim = (uint)A->shape().size();
+    uint axis_len[2] = {(uint)axis, (uint)A->shape()[axis]};
+
+    auto launch = begin_index_launch(kernel_name("gather", A->dtype()));
+    id<MTLComputeCommandEncoder> enc = launch.enc;
+    [enc setBuffer:A->metal_buffer() offset:0 atIndex:0];
+    [enc setBuffer:indices->metal_buffer() offset:0 atIndex:1];
+    [enc setBuffer:out->metal_buffer() offset:0 atIndex:2];
+    [enc setBytes:indices->shape().data() length:ndim * 8 atIndex:3];
+    [enc setBytes:A->strides().data() length:ndim * 8 atIndex:4];
+    size_t offset_A = A->offset();
+    [enc setBytes:&offset_A length:sizeof(size_t) atIndex:5];
+    [enc setBytes:indices->strides().data() length:ndim * 8 atIndex:6];
+    size_t offset_idx = indices->offset();
+    [enc setBytes:&offset_idx length:sizeof(size_t) atIndex:7];
+    [enc setBytes:&ndim length:4 atIndex:8];
+    [enc setBytes:axis_len length:sizeof(axis_len) atIndex:9];
+    finish_index_launch(launch, numel, out);
+    return out;
+}
+
+std::shared_ptr<ArrayHandle> array_index_add(const std::shared_ptr<ArrayHandle>& target,
+                                             const std::shared_ptr<ArrayHandle>& indices,
+                                             const std::shared_ptr<ArrayHandle>& updates,
+                                             int axis) {
+    check_axis("index_add", axis, target->shape().size());
+    check_indices("index_add", indices);
+    if (updates->shape() != take_shape(target->shape(), indices->shape(), axis)) {
+        throw std::runtime_error(
+            "index_add: updates must have shape target.shape[:axis] + indices.shape + "
+            "target.shape[axis + 1:]");
+    }
+    if (!has_atomic_add(target->dtype())) {
+        auto acc = array_astype(target, DType::float32);
+        array_index_add(acc, indices, array_astype(updates, DType::float32), axis);
+        target->copy_from(acc, target->shape(), target->strides(), target->offset());
+        return target;
+    }
+    auto src =
+        updates->dtype() == target->dtype() ? updates : array_astype(updates, target->dtype());
+    size_t numel = numel_from_shape(src->shape());
+    if (numel == 0) return target;
+    auto flat = array_reshape(indices, {(int64_t)numel_from_shape(indices->shape())});
+    // The kernel walks updates as (outer, len(indices), inner) in the target's rank
+    src = array_reshape(src, take_shape(target->shape(), flat->shape(), axis));
+
+    uint ndim = (uint)target->shape().size();
+    uint inner = (uint)numel_from_shape(
+        std::vector<int64_t>(target->shape().begin() + axis + 1, target->shape().end()));
+    uint dims[3] = {(uint)axis, (uint)flat->shape()[0], inner};
+
+    auto launch = begin_index_launch(kernel_name("index_add", target->dtype()));
+    id<MTLComputeCommandEncoder> enc = launch.enc;
+    [enc setBuffer:target->metal_buffer() offset:0 atIndex:0];
+    [enc setBuffer:flat->metal_buffer() offset:0 atIndex:1];
+    [enc setBuffer:src->metal_buffer() offset:0 atIndex:2];
+    [enc setBytes:target->shape().data() length:ndim * 8 atIndex:3];
+    [enc setBytes:target->strides().data() length:ndim * 8 atIndex:4];
+    size_t offset_T = target->offset();
+    [enc setBytes:&offset_T length:sizeof(size_t) atIndex:5];
+    [enc setBytes:&ndim length:4 atIndex:6];
+    int64_t idx_offset = flat->offset();
+    int64_t idx_stride = flat->strides()[0];
+    [enc setBytes:&idx_offset length:8 atIndex:7];
+    [enc setBytes:&idx_stride length:8 atIndex:8];
+    [enc setBytes:dims length:sizeof(dims) atIndex:9];
+    [enc setBytes:src->shape().data() length:ndim * 8 atIndex:10];
+    [enc setBytes:src->strides().data() length:ndim * 8 atIndex:11];
+    size_t offset_S = src->offset();
+    [enc setBytes:&offset_S length:sizeof(size_t) atIndex:12];
+    finish_index_launch(launch, numel, target);
+    return target;
+}
+
+std::shared_ptr<ArrayHandle> array_scatter_add(const std::shared_ptr<ArrayHandle>& target,
+                                               const std::shared_ptr<ArrayHandle>& indices,
+                                               const std::shared_ptr<ArrayHandle>& updates,
+                                               int axis) {
+    check_axis("scatter_add", axis, target->shape().size());
+    check_indices("scatter_add", indices);
+    check_along_axis("scatter_add", target->shape(), indices->shape(), axis);
+    if (updates->shape() != indices->shape()) {
+        throw std::runtime_error("scatter_add: updates must have the same shape as indices");
+    }
+    if (!has_atomic_add(target->dtype())) {
+        auto acc = array_astype(target, DType::float32);
+        array_scatter_add(acc, indices, array_astype(updates, DType::float32), axis);
+        target->copy_from(acc, target->shape(), target->strides(), target->offset());
+        return target;
+    }
+    auto src =
+        updates->dtype() == target->dtype() ? updates : array_astype(updates, target->dtype());
+    size_t numel = numel_from_shape(src->shape());
+    if (numel == 0) return target;
+
+    uint ndim = (uint)target->shape().size();
+    uint axis_len[2] = {(uint)axis, (uint)target->shape()[axis]};
+
+    auto launch = begin_index_launch(kernel_name("scatter_add", target->dtype()));
+    id<MTLComputeCommandEncoder> enc = launch.enc;
+    [enc setBuffer:target->metal_buffer() offset:0 atIndex:0];
+    [enc setBuffer:indices->metal_buffer() offset:0 atIndex:1];
+    [enc setBuffer:src->metal_buffer() offset:0 atIndex:2];
+    [enc setBytes:indices->shape().data() length:ndim * 8 atIndex:3];
+    [enc setBytes:target->strides().data() length:ndim * 8 atIndex:4];
+    size_t offset_T = target->offset();
+    [enc setBytes:&offset_T length:sizeof(size_t) atIndex:5];
+    [enc setBytes:indices->strides().data() length:ndim * 8 atIndex:6];
+    size_t offset_idx = indices->offset();
+    [enc setBytes:&offset_idx length:sizeof(size_t) atIndex:7];
+    [enc setBytes:src->strides().data() length:ndim * 8 atIndex:8];
+    size_t offset_S = src->offset();
+    [enc setBytes:&offset_S length:sizeof(size_t) atIndex:9];
+    [enc setBytes:&ndim length:4 atIndex:10];
+    [enc setBytes:axis_len length:sizeof(axis_len) atIndex:11];
+    finish_index_launch(launch, numel, target);
+    return target;
+}
@@ -0,0 +1,65 @@
+#import <Metal/Metal.h>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <cerrno>
+#include <cstring>
+
+#include "../include/array_io.h"
+
+std::shared_ptr<ArrayHandle> array_from_file(const std::string& path, std::vector<int64_t> shape,
+                                             DType dtype, size_t offset) {
+    size_t itemsize = dtype_size(dtype);
+    if (offset % itemsize != 0) {
+        throw std::runtime_error("from_file: offset must be a multiple of the dtype size");
+    }
+    size_t nbytes = numel_from_shape(shape) * itemsize;
+
+    int fd = open(path.c_str(), O_RDONLY);
+    if (fd < 0) {
+        throw std::runtime_error("from_file: cannot open '" + path + "': " + std::strerror(errno));
+    }
+    struct stat st;
+    if (fstat(fd, &st) != 0) {
+        close(fd);
+        throw std::runtime_error("from_file: cannot stat '" + path + "': " + std::strerror(errno));
+    }
+    if (offset + nbytes > (size_t)st.st_size) {
+        close(fd);
+        throw std::runtime_error("from_file: '" + path + "' is too short for the given shape");
+    }
+    if (nbytes == 0) {
+        close(fd);
+        return std::make_shared<ArrayHandle>(shape, dtype);
+    }
+
+    // Metal wraps page-aligned memory only: map from the page holding `offset` and
+    // start the array that many elements into the buffer. The last page is only
+    // partially backed by the file, which reads as zeros past the end.
+    size_t page = (size_t)getpagesize();
+    size_t map_offset = offset - offset % page;
+    size_t map_len = (offset - map_offset + nbytes + page - 1) / page * page;
+    // Writable private mapping: in-place kernels get copy-on-write pages
+    void* ptr = mmap(nullptr, map_len, PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, map_offset);
+    close(fd);
+    if (ptr == MAP_FAILED) {
+        throw std::runtime_error("from_file: cannot map '" + path + "': " + std::strerror(errno));
+    }
+
+    id<MTLDevice> device = (__bridge id<MTLDevice>)get_default_forge()->device_ptr();
+    id<MTLBuffer> buf = [device newBufferWithBytesNoCopy:ptr
+                                                  length:map_len
+                                                 options:MTLResourceStorageModeShared
+                                             deallocator:^(void* pointer, NSUInteger length) {
+                                                 munmap(pointer, length);
+                                             }];
+    if (!buf) {
+        munmap(ptr, map_len);
+        throw std::runtime_error("Metal Error: Failed to wrap the mapped file in a buffer.");
+    }
+    return std::make_shared<ArrayHandle>(buf, std::move(shape), dtype,
+                                         (offset - map_offset) / itemsize);
+}
@@ -1,27 +1,149 @@
 #import <Metal/Metal.h>
 #import <MetalPerformanceShaders/MetalPerformanceShaders.h>
 
+#include <atomic>
+#include <optional>
+
+#include "../include/array_elementwise.h"
 #include "../include/array_matmul.h"
 #include "../include/metal_utils.h"
+#include "../include/profiler.h"
+
+static std::atomic<size_t> copy_count{0};
+
+size_t matmul_copy_count() { return copy_count; }
 
-std::pair<std::shared_ptr<ArrayHandle>, bool> prepare(const std::shared_ptr<ArrayHandle>& h) {
+// Hands `h` to MPS without copying when its last two dims are a row-major matrix, or the
+// transpose of one, whose rows are `ld` elements apart (sliced and padded layouts included).
+// Batch dims may have any non-negative strides. Anything else (broadcast or negative
+// matrix strides, overlapping rows) is copied into a dense buffer first.
+MatmulOperand prepare(const std::shared_ptr<ArrayHandle>& h) {
     int ndim = h->shape().size();
     int64_t R = h->shape()[ndim - 2];
     int64_t C = h->shape()[ndim - 1];
     int64_t sR = h->strides()[ndim - 2];
     int64_t sC = h->strides()[ndim - 1];
-    // Contiguous data regular
-    if (sR == C && sC == 1) return {h, false};
-    // Transposed / Col-Major (Strides: 1, R)
-    if (sR == 1 && sC == R) return {h, true};
 
+    std::optional<MatmulOperand> op;
+    // Row-major, rows `sR` apart (a single row can take any stride)
+    if ((sC == 1 || C == 1) && (R == 1 || sR >= C)) op = MatmulOperand{h, false, R == 1 ? C : sR};
+    // Transposed / Col-Major: columns `sC` apart
+    else if ((sR == 1 || R == 1) && (C == 1 || sC >= R))
+        op = MatmulOperand{h, true, C == 1 ? R : sC};
+
+    // MPS reads whole rows of ld elements, so the last one must fit in the buffer. A column
+    // slice (w.T[1:6]) is described as its parent rows, starting at the row start, with the
+    // column offset as the origin; batches must then all start at the same column.
+    if (op) {
+        int64_t stored_rows = op->transposed ? C : R;
+        int64_t stored_cols = op->transposed ? R : C;
+        op->col = op->ld > 0 ? h->offset() % op->ld : 0;
+        for (int i = 0; i < ndim - 2; ++i) {
+            if (h->shape()[i] > 1 && op->col && h->strides()[i] % op->ld != 0) op->col = 0;
+        }
+        if (op->col + stored_cols > op->ld) op->col = 0;
+        int64_t extent = h->offset() - op->col + stored_rows * op->ld;
+        for (int i = 0; i < ndim - 2 && op; ++i) {
+            if (h->shape()[i] > 1 && h->strides()[i] < 0) op.reset();
+            if (h->shape()[i] > 1) extent += (h->shape()[i] - 1) * h->strides()[i];
+        }
+        if (op && (size_t)extent * h->itemsize() > [h->metal_buffer() length]) op.reset();
+    }
+    if (op) return *op;
+
+    copy_count++;
     auto new_handle = std::make_shared<ArrayHandle>(h->shape());
     new_handle->copy_from(h, new_handle->shape(), new_handle->strides(), 0);
-    return {new_handle, false};
+    return {new_handle, false, C, 0};
+}
+
+const char* activation_name(Activation activation) {
+    switch (activation) {
+        case Activation::none:
+            return "none";
+        case Activation::relu:
+            return "relu";
+        case Activation::tanh:
+            return "tanh";
+        case Activation::sigmoid:
+            return "sigmoid";
+        case Activation::gelu:
+            return "gelu";
+    }
+    throw std::runtime_error("matmul: unknown activation");
+}
+
+// Bias and activation of the epilogue as one in-place pass over the float32 product.
+static void apply_epilogue(const std::shared_ptr<ArrayHandle>& result,
+                           const MatmulEpilogue& epilogue) {
+    if (epilogue.activation == Activation::none) {
+        if (epilogue.bias) {
+            launch_elementwise(kernel_name("iadd", DType::float32), result->shape(),
+                               {result, epilogue.bias}, false);
+        }
+        return;
+    }
+    std::string op_name = std::string("bias_") + activation_name(epilogue.activation);
+    if (epilogue.bias) {
+        launch_elementwise(kernel_name(op_name, DType::float32), result->shape(),
+                           {result, epilogue.bias}, false);
+    } else {
+        float zero = 0.0f;
+        launch_elementwise(kernel_name(op_name + "_scalar", DType::float32), result->shape(),
+                           {result}, false, {&zero, 1});
+    }
+}
+
+static void check_epilogue_shapes(const MatmulEpilogue& epilogue,
+                                  const std::vector<int64_t>& result_shape) {
+    if (epilogue.bias && broadcast_shapes(epilogue.bias->shape(), result_shape) != result_shape) {
+        throw std::runtime_error("matmul: bias does not broadcast to the result shape");
+    }
+    if (epilogue.out && epilogue.out->shape() != result_shape) {
+        throw std::runtime_error("matmul: out has the wrong shape");
+    }
 }
 
 std::shared_ptr<ArrayHandle> array_matmul(const std::shared_ptr<ArrayHandle>& A,
-                                          const std::shared_ptr<ArrayHandle>& B) {
+                                          const std::shared_ptr<ArrayHandle>& B,
+                                          const MatmulEpilogue& epilogue) {
+    if (A->dtype() != B->dtype()) {
+        throw std::runtime_error(std::string("matmul: dtype mismatch (") + dtype_name(A->dtype()) +
+                                 " vs " + dtype_name(B->dtype()) + "), use astype");
+    }
+    if (epilogue.bias && epilogue.bias->dtype() != A->dtype()) {
+        throw std::runtime_error("matmul: bias dtype must match the operands");
+    }
+    if (epilogue.out && (epilogue.out->dtype() != A->dtype() ||
+                         !is_contiguous(epilogue.out->shape(), epilogue.out->strides()))) {
+        throw std::runtime_error("matmul: out must be dense with the operands' dtype");
+    }
+    // MPS would read the operand while writing the product over it
+    if (epilogue.out && (epilogue.out->metal_buffer() == A->metal_buffer() ||
+                         epilogue.out->metal_buffer() == B->metal_buffer())) {
+        throw std::runtime_error("matmul: out must not share memory with either operand");
+    }
+    activation_name(epilogue.activation);  // throws for unknown activations
+    // MPS multiplies in float32 here; other dtypes are converted in and out so that
+    // accumulation always happens in float.
+    if (A->dtype() != DType::float32) {
+        MatmulEpilogue f32 = epilogue;
+        if (f32.bias) f32.bias = array_astype(f32.bias, DType::float32);
+        f32.out = epilogue.out && epilogue.beta != 0.0f ? array_astype(epilogue.out, DType::float32)
+                                                        : nullptr;
+        auto C = array_astype(
+            array_matmul(array_astype(A, DType::float32), array_astype(B, DType::float32), f32),
+            A->dtype());
+        if (!epilogue.out) return C;
+        check_epilogue_shapes(epilogue, C->shape());
+        epilogue.out->copy_from(C, epilogue.out->shape(), epilogue.out->strides(),
+                                epilogue.out->offset());
+        return epilogue.out;
+    }
+    // Spans operand copies and the epilogue, which are also recorded on their own
+    ProfileScope prof("matmul", "matmul");
+    prof.read(*A);
+    prof.read(*B);
     bool squeeze_a = false, squeeze_b = false;
     auto Ashape = A->shape();
     auto Astrides = A->strides();
@@ -39,8 +161,10 @@ std::shared_ptr<ArrayHandle> array_matmul(const std::shared_ptr<ArrayHandle>& A,
         Bshape.push_back(1);
         Bstrides.push_back(1);
     }
-    auto [a, trans_a] = prepare(make_shared<ArrayHandle>(A, Ashape, Astrides, A->offset()));
-    auto [b, trans_b] = prepare(make_shared<ArrayHandle>(B, Bshape, Bstrides, B->offset()));
+    auto [a, trans_a, ld_a, col_a] =
+        prepare(make_shared<ArrayHandle>(A, Ashape, Astrides, A->offset()));
+    auto [b, trans_b, ld_b, col_b] =
+        prepare(make_shared<ArrayHandle>(B, Bshape, Bstrides, B->offset()));
 
     int64_t M = a->shape()[a->shape().size() - 2];
     int64_t K_a = a->shape()[a->shape().size() - 1];
@@ -59,57 +183,77 @@ std::shared_ptr<ArrayHandle> array_matmul(const std::shared_ptr<ArrayHandle>& A,
     out_shape.push_back(M);
     out_shape.push_back(N);
 
-    auto c = std::make_shared<ArrayHandle>(out_shape);
+    std::vector<int64_t> final_shape = out_shape;
+    if (squeeze_a && squeeze_b) {
+        // Case: (K,) @ (K,) -> Scalar. Remove the last two dims.
+        final_shape.resize(final_shape.size() - 2);
+    } else if (squeeze_a) {
+        // Case: (K,) @ (K, N) -> (N,). Remove dim -2.
+        final_shape.erase(final_shape.end() - 2);
+    } else if (squeeze_b) {
+        // Case: (M, K) @ (K,) -> (M,). Remove dim -1.
+        final_shape.pop_back();
+    }
+    check_epilogue_shapes(epilogue, final_shape);
 
-    // Compute strides for batch dimensions only (excluding M, N)
-    auto get_batch_strides = [&](const std::vector<int64_t>& shape) {
+    // Accumulating into `out` lets MPS apply beta while it writes the product
+    auto c = epilogue.out
+                 ? std::make_shared<ArrayHandle>(epilogue.out, out_shape, make_strides(out_shape),
+                                                 epilogue.out->offset())
+                 : std::make_shared<ArrayHandle>(out_shape);
+
+    // Strides of the batch dimensions only (excluding M, N), aligned to batch_shape
+    auto get_batch_strides = [&](const ArrayHandle& h) {
         std::vector<int64_t> strides;
-        int ndim = shape.size();
-        int batch_ndim = ndim - 2;  // Number of batch dims in this tensor
+        int batch_ndim = h.shape().size() - 2;  // Number of batch dims in this tensor
         int offset = batch_shape.size() - batch_ndim;
-        auto dense = make_strides(shape);
         for (int i = 0; i < batch_shape.size(); ++i) {
             int idx = i - offset;
             // If dim missing (idx < 0) or dim is 1 -> Stride is 0 (Broadcast)
-            if (idx < 0 || shape[idx] == 1)
+            if (idx < 0 || h.shape()[idx] == 1)
                 strides.push_back(0);
             else
-                strides.push_back(dense[idx]);
+                strides.push_back(h.strides()[idx]);
         }
         return strides;
     };
 
-    auto str_a = get_batch_strides(a->shape());
-    auto str_b = get_batch_strides(b->shape());
+    auto str_a = get_batch_strides(*a);
+    auto str_b = get_batch_strides(*b);
 
     id<MTLDevice> device = (__bridge id<MTLDevice>)get_default_forge()->device_ptr();
     id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)get_default_forge()->queue_ptr();
     id<MTLCommandBuffer> cmd = [queue commandBuffer];
     size_t dsize = sizeof(float);
 
-    auto descA = [MPSMatrixDescriptor
-        matrixDescriptorWithRows:(trans_a ? K : M)
-                         columns:(trans_a ? M : K)rowBytes:(trans_a ? M : K) * dsize
-                        dataType:MPSDataTypeFloat32];
+    // The operands' stored matrices include the `col` columns before their origin
+    auto descA = [MPSMatrixDescriptor matrixDescriptorWithRows:(trans_a ? K : M)
+                                                       columns:(trans_a ? M : K) + col_a
+                                                      rowBytes:ld_a * dsize
+                                                      dataType:MPSDataTypeFloat32];
 
-    auto descB = [MPSMatrixDescriptor
-        matrixDescriptorWithRows:(trans_b ? N : K)
-                         columns:(trans_b ? K : N)rowBytes:(trans_b ? K : N) * dsize
-                        dataType:MPSDataTypeFloat32];
+    auto descB = [MPSMatrixDescriptor matrixDescriptorWithRows:(trans_b ? N : K)
+                                                       columns:(trans_b ? K : N) + col_b
+                                                      rowBytes:ld_b * dsize
+                                                      dataType:MPSDataTypeFloat32];
 
     auto descC = [MPSMatrixDescriptor matrixDescriptorWithRows:M
                                                        columns:N
                                                       rowBytes:N * dsize
                                                       dataType:MPSDataTypeFloat32];
 
-    MPSMatrixMultiplication* kernel = [[MPSMatrixMultiplication alloc] initWithDevice:device
-                                                                        transposeLeft:trans_a
-                                                                       transposeRight:trans_b
-                                                                           resultRows:M
-                                                                        resultColumns:N
-                                                                      interiorColumns:K
-                                                                                alpha:1.0
-                                                                                 beta:0.0];
+    MPSMatrixMultiplication* kernel =
+        [[MPSMatrixMultiplication alloc] initWithDevice:device
+                                          transposeLeft:trans_a
+                                         transposeRight:trans_b
+                                             resultRows:M
+                                          resultColumns:N
+                                        interiorColumns:K
+                                                  alpha:epilogue.alpha
+                                                   beta:epilogue.out ? epilogue.beta : 0.0];
+    // Origins are in the stored (untransposed) matrices' coordinates: x is the column
+    kernel.leftMatrixOrigin = MTLOriginMake(col_a, 0, 0);
+    kernel.rightMatrixOrigin = MTLOriginMake(col_b, 0, 0);
 
     id<MTLBuffer> bufA = a->metal_buffer();
     id<MTLBuffer> bufB = b->metal_buffer();
@@ -121,9 +265,9 @@ std::shared_ptr<ArrayHandle> array_matmul(const std::shared_ptr<ArrayHandle>& A,
 
     std::vector<int> counters(batch_shape.size(), 0);
 
-    size_t off_a = a->offset() * dsize;
-    size_t off_b = b->offset() * dsize;
-    size_t off_c = 0;
+    size_t off_a = (a->offset() - col_a) * dsize;
+    size_t off_b = (b->offset() - col_b) * dsize;
+    size_t off_c = c->offset() * dsize;
 
     // Loop only over batch dimensions
     for (size_t op = 0; op < total_ops; ++op) {
@@ -149,23 +293,17 @@ std::shared_ptr<ArrayHandle> array_matmul(const std::shared_ptr<ArrayHandle>& A,
         }
     }
 
+    prof.write(final_shape, DType::float32);
+    prof.watch(cmd);
     [cmd commit];
     c->set_event(cmd);
 
-    std::vector<int64_t> final_shape = c->shape();
-    if (squeeze_a && squeeze_b) {
-        // Case: (K,) @ (K,) -> Scalar. Current c: (..., 1, 1). Remove last two dims.
-        if (final_shape.size() >= 2) {
-            final_shape.resize(final_shape.size() - 2);
-        }
-    } else if (squeeze_a) {
-        // Case: (K,) @ (K, N) -> (N,). Current c: (..., 1, N). Remove dim -2.
-        auto it = final_shape.end() - 2;
-        final_shape.erase(it);
-    } else if (squeeze_b) {
-        // Case: (M, K) @ (K,) -> (M,). Current c: (..., M, 1). Remove dim -1.
-        final_shape.pop_back();
+    if (epilogue.out) {
+        apply_epilogue(epilogue.out, epilogue);
+        return epilogue.out;
     }
-
-    return std::make_shared<ArrayHandle>(c, final_shape, make_strides(final_shape), c->offset());
+    auto result =
+        std::make_shared<ArrayHandle>(c, final_shape, make_strides(final_shape), c->offset());
+    apply_epilogue(result, epilogue);
+    return result;
 }
@@ -0,0 +1,169 @@
+#import <Metal/Metal.h>
+
+#include <cmath>
+
+#include "../include/array_optim.h"
+#include "../include/metal_source.h"
+#include "../include/metal_utils.h"
+
+// Parameters and optimizer state are written in place, so they must be dense.
+// Gradients are only read: a strided gradient is compacted once via array_reshape.
+static std::vector<std::shared_ptr<ArrayHandle>> check_operands(
+    const std::string& op_name, const std::vector<std::shared_ptr<ArrayHandle>>& params,
+    const std::vector<std::shared_ptr<ArrayHandle>>& grads,
+    std::initializer_list<const std::vector<std::shared_ptr<ArrayHandle>>*> states) {
+    if (grads.size() != params.size()) {
+        throw std::runtime_error(op_name + ": expected one gradient per parameter");
+    }
+    for (auto state : states) {
+        if (state->size() != params.size()) {
+            throw std::runtime_error(op_name + ": optimizer state doesn't match parameters");
+        }
+    }
+
+    std::vector<std::shared_ptr<ArrayHandle>> dense_grads;
+    dense_grads.reserve(grads.size());
+    for (size_t i = 0; i < params.size(); ++i) {
+        const auto& p = params[i];
+        if (!is_contiguous(p->shape(), p->strides())) {
+            throw std::runtime_error(op_name + ": parameters must be contiguous");
+        }
+        if (p->dtype() != DType::float32 || grads[i]->dtype() != DType::float32) {
+            throw std::runtime_error(op_name + ": parameters and gradients must be float32");
+        }
+        if (grads[i]->shape() != p->shape()) {
+            throw std::runtime_error(op_name + ": gradient shape doesn't match parameter");
+        }
+        for (auto state : states) {
+            const auto& s = (*state)[i];
+            if (s->shape() != p->shape() || !is_contiguous(s->shape(), s->strides())) {
+                throw std::runtime_error(op_name + ": optimizer state doesn't match parameters");
+            }
+        }
+        dense_grads.push_back(array_reshape(grads[i], grads[i]->shape()));
+    }
+    return dense_grads;
+}
+
+static void dispatch_numel(id<MTLComputeCommandEncoder> enc, uint numel) {
+    MTLSize grid = MTLSizeMake(numel, 1, 1);
+    MTLSize threads = MTLSizeMake(256, 1, 1);
+    if (threads.width > grid.width) threads.width = grid.width;
+    [enc dispatchThreads:grid threadsPerThreadgroup:threads];
+}
+
+void sgd_step(const std::vector<std::shared_ptr<ArrayHandle>>& params,
+              const std::vector<std::shared_ptr<ArrayHandle>>& grads,
+              const std::vector<std::shared_ptr<ArrayHandle>>& momentum_bufs, float lr,
+              float momentum, float dampening, float weight_decay, bool nesterov, bool first_step) {
+    bool use_momentum = momentum != 0.0f;
+    std::vector<std::shared_ptr<ArrayHandle>> dense_grads;
+    if (use_momentum) {
+        dense_grads = check_operands("sgd_step", params, grads, {&momentum_bufs});
+    } else {
+        dense_grads = check_operands("sgd_step", params, grads, {});
+    }
+    if (params.empty()) return;
+
+    std::string op_name = use_momentum ? "sgd_momentum_update" : "sgd_update";
+    id<MTLComputePipelineState> pipeline =
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(op_name, METAL_SOURCE);
+    id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)get_default_forge()->queue_ptr();
+
+    id<MTLCommandBuffer> cmd = [queue commandBuffer];
+    if (!cmd)
+        throw std::runtime_error(
+            "Metal Error: Failed to create command buffer. GPU might out of memory.");
+    id<MTLComputeCommandEncoder> enc = [cmd computeCommandEncoder];
+    if (!enc) throw std::runtime_error("Metal Error: Failed to create command encoder.");
+    [enc setComputePipelineState:pipeline];
+
+    uint u_nesterov = nesterov ? 1 : 0;
+    uint u_first = first_step ? 1 : 0;
+    for (size_t i = 0; i < params.size(); ++i) {
+        uint numel = (uint)numel_from_shape(params[i]->shape());
+        if (numel == 0) continue;
+        const auto& p = params[i];
+        const auto& g = dense_grads[i];
+        [enc setBuffer:p->metal_buffer() offset:p->offset() * sizeof(float) atIndex:0];
+        [enc setBuffer:g->metal_buffer() offset:g->offset() * sizeof(float) atIndex:1];
+        if (use_momentum) {
+            const auto& buf = momentum_bufs[i];
+            [enc setBuffer:buf->metal_buffer() offset:buf->offset() * sizeof(float) atIndex:2];
+            [enc setBytes:&lr length:4 atIndex:3];
+            [enc setBytes:&momentum length:4 atIndex:4];
+            [enc setBytes:&dampening length:4 atIndex:5];
+            [enc setBytes:&weight_decay length:4 atIndex:6];
+            [enc setBytes:&u_nesterov length:4 atIndex:7];
+            [enc setBytes:&u_first length:4 atIndex:8];
+            [enc setBytes:&numel length:4 atIndex:9];
+        } else {
+            [enc setBytes:&lr length:4 atIndex:2];
+            [enc setBytes:&weight_decay length:4 atIndex:3];
+            [enc setBytes:&numel length:4 atIndex:4];
+        }
+        dispatch_numel(enc, numel);
+    }
+    [enc endEncoding];
+    [cmd commit];
+
+    for (size_t i = 0; i < params.size(); ++i) {
+        params[i]->set_event(cmd);
+        if (use_momentum) momentum_bufs[i]->set_event(cmd);
+    }
+}
+
+void adam_step(const std::vector<std::shared_ptr<ArrayHandle>>& params,
+               const std::vector<std::shared_ptr<ArrayHandle>>& grads,
+               const std::vector<std::shared_ptr<ArrayHandle>>& exp_avgs,
+               const std::vector<std::shared_ptr<ArrayHandle>>& exp_avg_sqs, float lr, float beta1,
+               float beta2, float eps, float weight_decay, int64_t step) {
+    auto dense_grads = check_operands("adam_step", params, grads, {&exp_avgs, &exp_avg_sqs});
+    if (step < 1) throw std::runtime_error("adam_step: step count starts at 1");
+    if (params.empty()) return;
+
+    id<MTLComputePipelineState> pipeline =
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline("adam_update", METAL_SOURCE);
+    id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)get_default_forge()->queue_ptr();
+
+    id<MTLCommandBuffer> cmd = [queue commandBuffer];
+    if (!cmd)
+        throw std::runtime_error(
+            "Metal Error: Failed to create command buffer. GPU might out of memory.");
+    id<MTLComputeCommandEncoder> enc = [cmd computeCommandEncoder];
+    if (!enc) throw std::runtime_error("Metal Error: Failed to create command encoder.");
+    [enc setComputePipelineState:pipeline];
+
+    // Bias corrections only depend on the step count, so they are folded on the host
+    float bias_correction1 = 1.0f - std::pow(beta1, (float)step);
+    float bias_correction2 = 1.0f - std::pow(beta2, (float)step);
+    for (size_t i = 0; i < params.size(); ++i) {
+        uint numel = (uint)numel_from_shape(params[i]->shape());
+        if (numel == 0) continue;
+        const auto& p = params[i];
+        const auto& g = dense_grads[i];
+        const auto& m = exp_avgs[i];
+        const auto& v = exp_avg_sqs[i];
+        [enc setBuffer:p->metal_buffer() offset:p->offset() * sizeof(float) atIndex:0];
+        [enc setBuffer:g->metal_buffer() offset:g->offset() * sizeof(float) atIndex:1];
+        [enc setBuffer:m->metal_buffer() offset:m->offset() * sizeof(float) atIndex:2];
+        [enc setBuffer:v->metal_buffer() offset:v->offset() * sizeof(float) atIndex:3];
+        [enc setBytes:&lr length:4 atIndex:4];
+        [enc setBytes:&beta1 length:4 atIndex:5];
+        [enc setBytes:&beta2 length:4 atIndex:6];
+        [enc setBytes:&eps length:4 atIndex:7];
+        [enc setBytes:&weight_decay length:4 atIndex:8];
+        [enc setBytes:&bias_correction1 length:4 atIndex:9];
+        [enc setBytes:&bias_correction2 length:4 atIndex:10];
+        [enc setBytes:&numel length:4 atIndex:11];
+        dispatch_numel(enc, numel);
+    }
+    [enc endEncoding];
+    [cmd commit];
+
+    for (size_t i = 0; i < params.size(); ++i) {
+        params[i]->set_event(cmd);
+        exp_avgs[i]->set_event(cmd);
+        exp_avg_sqs[i]->set_event(cmd);
+    }
+}
@@ -1,23 +1,41 @@
 #import <Metal/Metal.h>
 
+#include <functional>
+
+#include "../include/array_elementwise.h"
 #include "../include/array_sum.h"
 #include "../include/metal_source.h"
 #include "../include/metal_utils.h"
+#include "../include/profiler.h"
+
+// Sums accumulate in float (integers in int) and keep the input dtype, except
+// uint8 which is widened to int32.
+static DType sum_dtype(DType dtype) { return dtype == DType::uint8 ? DType::int32 : dtype; }
+
+static void check_float_dtype(const std::shared_ptr<ArrayHandle>& A, const std::string& op_name) {
+    if (!dtype_is_float(A->dtype())) {
+        throw std::runtime_error(op_name + ": unsupported dtype " + dtype_name(A->dtype()) +
+                                 ", use astype");
+    }
+}
 
 std::shared_ptr<ArrayHandle> sum_global(const std::shared_ptr<ArrayHandle>& A, bool keepdims) {
+    ProfileScope prof("reduction", kernel_name("reduce_sum_global", A->dtype()));
+    prof.read(*A);
     auto defaultForgeHandle = get_default_forge();
     id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)defaultForgeHandle->queue_ptr();
 
     id<MTLComputePipelineState> pipeline =
-        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline("reduce_sum_global",
-                                                                    METAL_SOURCE);
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(
+            kernel_name("reduce_sum_global", A->dtype()), METAL_SOURCE);
 
     std::vector<int64_t> out_shape;
     if (keepdims) {
         out_shape = std::vector<int64_t>(A->shape().size(), 1);
     }
 
-    auto out = std::make_shared<ArrayHandle>(out_shape, defaultForgeHandle->device_ptr());
+    auto out = std::make_shared<ArrayHandle>(out_shape, sum_dtype(A->dtype()),
+                                             defaultForgeHandle->device_ptr());
 
     id<MTLBuffer> bufA = A->metal_buffer();
     id<MTLBuffer> bufOut = out->metal_buffer();
@@ -56,32 +74,40 @@ std::shared_ptr<ArrayHandle> sum_global(const std::shared_ptr<ArrayHandle>& A, b
     [enc dispatchThreads:grid threadsPerThreadgroup:threads];
     [enc endEncoding];
 
+    prof.write(*out);
+    prof.watch(cmd);
     [cmd commit];
     out->set_event(cmd);
 
     return out;
 }
 
-std::shared_ptr<ArrayHandle> sum_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis,
-                                      bool keepdims) {
+// Row-wise kernels (reductions, softmax family) all use the reduce_sum_axis buffer layout:
+//   Input, Output, reduced shape, reduced ndim, in_shape, in_strides, in_offset, axis, numel
+// followed by kernel-specific arguments bound by `bind_extra` from slot 9 onwards.
+// One thread handles one row along `axis`; the output is dense with shape `out_shape`.
+// `op_name` is instantiated for A's dtype.
+static std::shared_ptr<ArrayHandle> launch_axis_kernel(
+    const std::string& op_name, const std::shared_ptr<ArrayHandle>& A, size_t axis,
+    const std::vector<int64_t>& out_shape, DType out_dtype,
+    const std::function<void(id<MTLComputeCommandEncoder>)>& bind_extra = nullptr) {
+    ProfileScope prof("reduction", kernel_name(op_name, A->dtype()));
+    prof.read(*A);
     auto defaultForgeHandle = get_default_forge();
     id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)defaultForgeHandle->queue_ptr();
 
     id<MTLComputePipelineState> pipeline =
-        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline("reduce_sum_axis",
-                                                                    METAL_SOURCE);
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(
+            kernel_name(op_name, A->dtype()), METAL_SOURCE);
 
-    std::vector<int64_t> out_shape = A->shape();
-    if (keepdims) {
-        out_shape[axis] = 1;
-    } else {
-        out_shape.erase(out_shape.begin() + axis);
-    }
+    auto out =
+        std::make_shared<ArrayHandle>(out_shape, out_dtype, defaultForgeHandle->device_ptr());
 
-    auto out = std::make_shared<ArrayHandle>(out_shape, defaultForgeHandle->device_ptr());
-    uint out_numel = numel_from_shape(out_shape);
+    std::vector<int64_t> kernel_shape = A->shape();
+    kernel_shape.erase(kernel_shape.begin() + axis);
+    uint out_numel = numel_from_shape(kernel_shape);
 
-    if (out_numel == 0) return out;
+    if (out_numel == 0 || numel_from_shape(out_shape) == 0) return out;
 
     id<MTLBuffer> bufA = A->metal_buffer();
     id<MTLBuffer> bufOut = out->metal_buffer();
@@ -95,8 +121,6 @@ std::shared_ptr<ArrayHandle> sum_axis(const std::shared_ptr<ArrayHandle>& A, siz
     [enc setBuffer:bufA offset:0 atIndex:0];
     [enc setBuffer:bufOut offset:0 atIndex:1];
 
-    std::vector<int64_t> kernel_shape = A->shape();
-    kernel_shape.erase(kernel_shape.begin() + axis);
     uint kernel_ndim = (uint)kernel_shape.size();
 
     if (kernel_ndim == 0) {
@@ -118,6 +142,8 @@ std::shared_ptr<ArrayHandle> sum_axis(const std::shared_ptr<ArrayHandle>& A, siz
     [enc setBytes:&u_axis length:4 atIndex:7];
     [enc setBytes:&out_numel length:4 atIndex:8];
 
+    if (bind_extra) bind_extra(enc);
+
     MTLSize grid = MTLSizeMake(out_numel, 1, 1);
     MTLSize threads = MTLSizeMake(256, 1, 1);
     if (threads.width > grid.width) {
@@ -126,8 +152,108 @@ std::shared_ptr<ArrayHandle> sum_axis(const std::shared_ptr<ArrayHandle>& A, siz
     [enc dispatchThreads:grid threadsPerThreadgroup:threads];
     [enc endEncoding];
 
+    prof.write(*out);
+    prof.watch(cmd);
     [cmd commit];
     out->set_event(cmd);
 
     return out;
 }
+
+static std::vector<int64_t> reduced_shape(const std::vector<int64_t>& shape, size_t axis,
+                                          bool keepdims) {
+    std::vector<int64_t> out_shape = shape;
+    if (keepdims) {
+        out_shape[axis] = 1;
+    } else {
+        out_shape.erase(out_shape.begin() + axis);
+    }
+    return out_shape;
+}
+
+std::shared_ptr<ArrayHandle> sum_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis,
+                                      bool keepdims) {
+    return launch_axis_kernel("reduce_sum_axis", A, axis, reduced_shape(A->shape(), axis, keepdims),
+                              sum_dtype(A->dtype()));
+}
+
+std::shared_ptr<ArrayHandle> extremum_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis,
+                                           bool keepdims, const std::string& op_name) {
+    if (op_name != "max" && op_name != "min" && op_name != "argmax" && op_name != "argmin") {
+        throw std::runtime_error("extremum_axis: unknown op " + op_name);
+    }
+    if (A->shape()[axis] == 0) {
+        throw std::runtime_error(op_name + ": attempt to reduce a zero-size axis");
+    }
+    DType out_dtype = op_name.starts_with("arg") ? DType::int32 : A->dtype();
+    return launch_axis_kernel(op_name + "_axis", A, axis, reduced_shape(A->shape(), axis, keepdims),
+                              out_dtype);
+}
+
+static std::shared_ptr<ArrayHandle> row_normalize(const std::string& op_name,
+                                                  const std::shared_ptr<ArrayHandle>& A,
+                                                  size_t axis) {
+    check_float_dtype(A, op_name);
+    std::vector<int64_t> dst_strides = make_strides(A->shape());
+    return launch_axis_kernel(
+        op_name, A, axis, A->shape(), A->dtype(), [&](id<MTLComputeCommandEncoder> enc) {
+            [enc setBytes:dst_strides.data() length:dst_strides.size() * 8 atIndex:9];
+        });
+}
+
+std::shared_ptr<ArrayHandle> softmax_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis) {
+    return row_normalize("softmax_axis", A, axis);
+}
+
+std::shared_ptr<ArrayHandle> log_softmax_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis) {
+    return row_normalize("log_softmax_axis", A, axis);
+}
+
+std::shared_ptr<ArrayHandle> logsumexp_axis(const std::shared_ptr<ArrayHandle>& A, size_t axis,
+                                            bool keepdims) {
+    check_float_dtype(A, "logsumexp_axis");
+    return launch_axis_kernel("logsumexp_axis", A, axis, reduced_shape(A->shape(), axis, keepdims),
+                              A->dtype());
+}
+
+std::shared_ptr<ArrayHandle> cross_entropy(const std::shared_ptr<ArrayHandle>& logits,
+                                           const std::shared_ptr<ArrayHandle>& labels, size_t axis,
+                                           const std::string& reduction) {
+    if (reduction != "mean" && reduction != "sum" && reduction != "none") {
+        throw std::runtime_error("cross_entropy: reduction must be 'mean', 'sum' or 'none'");
+    }
+    check_float_dtype(logits, "cross_entropy");
+    std::vector<int64_t> rows_shape = reduced_shape(logits->shape(), axis, false);
+    uint sparse;
+    if (labels->shape() == logits->shape()) {
+        sparse = 0;
+    } else if (labels->shape() == rows_shape) {
+        sparse = 1;
+    } else {
+        throw std::runtime_error(
+            "cross_entropy: labels must match the logits' shape (probabilities) or its shape "
+            "without the class axis (class indices)");
+    }
+    size_t rows = numel_from_shape(rows_shape);
+    float scale = (reduction == "mean" && rows > 0) ? 1.0f / (float)rows : 1.0f;
+
+    // The kernel reads float32 labels (e.g. int32 class indices are converted)
+    auto labels_f = array_astype(labels, DType::float32);
+
+    // 0-d buffers still need one readable stride, like the other launchers
+    std::vector<int64_t> label_strides = labels_f->strides();
+    if (label_strides.empty()) label_strides.push_back(0);
+    size_t label_offset = labels_f->offset();
+
+    auto losses = launch_axis_kernel(
+        "cross_entropy_axis", logits, axis, rows_shape, logits->dtype(),
+        [&](id<MTLComputeCommandEncoder> enc) {
+            [enc setBuffer:labels_f->metal_buffer() offset:0 atIndex:9];
+            [enc setBytes:label_strides.data() length:label_strides.size() * 8 atIndex:10];
+            [enc setBytes:&label_offset length:sizeof(size_t) atIndex:11];
+            [enc setBytes:&sparse length:4 atIndex:12];
+            [enc setBytes:&scale length:4 atIndex:13];
+        });
+    if (reduction == "none") return losses;
+    return sum_global(losses, false);
+}
@@ -2,34 +2,68 @@
 
 #include "../include/array_elementwise.h"
 #include "../include/array_handle.h"
+#include "../include/array_index.h"
+#include "../include/array_io.h"
 #include "../include/array_matmul.h"
+#include "../include/array_optim.h"
 #include "../include/array_sum.h"
 #include "../include/compiler.h"
 #include "../include/graph.h"
+#include "../include/memory_arena.h"
+#include "../include/memory_stats.h"
+#include "../include/metal_utils.h"
+#include "../include/profiler.h"
+#include "../include/scheduler.h"
 
 namespace nb = nanobind;
 
+static nb::tuple int_tuple(const std::vector<int64_t>& values) {
+    PyObject* t = PyTuple_New((Py_ssize_t)values.size());
+    for (size_t i = 0; i < values.size(); ++i) {
+        PyTuple_SET_ITEM(t, i, PyLong_FromLongLong(values[i]));
+    }
+    return nb::steal<nb::tuple>(t);
+}
+
 NB_MODULE(_backend, m) {
     // DOC //
     m.doc() = "Forge";
 
+    // DTYPES //
+    nb::enum_<DType>(m, "DType", nb::is_arithmetic())
+        .value("float32", DType::float32)
+        .value("float16", DType::float16)
+        .value("bfloat16", DType::bfloat16)
+        .value("int32", DType::int32)
+        .value("uint8", DType::uint8);
+
     // ARRAY HANDLE //
     nb::class_<ArrayHandle>(m, "ArrayHandle")
         .def_prop_ro("shape", [](const ArrayHandle& h) { return h.shape(); })
         .def_prop_ro("strides", [](const ArrayHandle& h) { return h.strides(); })
         .def_prop_ro("offset", [](const ArrayHandle& h) { return h.offset(); })
+        .def_prop_ro("dtype", [](const ArrayHandle& h) { return h.dtype(); })
         .def_prop_ro("data", [](const ArrayHandle& h) { return h.data(); })
-        .def("item", [](ArrayHandle& h) -> float {
+        // (shape, strides, offset, dtype) in one call, cached by the Python Array
+        .def_prop_ro("meta",
+                     [](const ArrayHandle& h) {
+                         return nb::make_tuple(int_tuple(h.shape()), int_tuple(h.strides()),
+                                               h.offset(), h.dtype());
+                     })
+        .def("item", [](ArrayHandle& h) -> nb::object {
             if (!h.shape().empty()) {
                 throw std::runtime_error("item(): can only convert scalar arrays to float");
             }
-            h.synchronize();
-            return h.data()[h.offset()];
+            {
+                // Let other Python threads (e.g. a prefetching DataLoader) run while waiting
+                nb::gil_scoped_release release;
+                h.synchronize();
+            }
+            return element_to_py(h, h.offset());
         });
     m.def(
         "create_array_from_buffer",
-        [](nb::ndarray<float, nb::numpy, nb::c_contig, nb::device::cpu> arr,
-           std::vector<int64_t> shape) {
+        [](nb::ndarray<nb::numpy, nb::c_contig, nb::device::cpu> arr, std::vector<int64_t> shape) {
             return create_array_from_buffer_py(arr, shape, /*FH=*/nullptr);
         },
         nb::arg("arr"), nb::arg("shape"));
@@ -40,19 +74,73 @@ NB_MODULE(_backend, m) {
     m.def("copy_to_view", [](std::shared_ptr<ArrayHandle> h, std::shared_ptr<ArrayHandle> other,
                              std::vector<int64_t> shape, std::vector<int64_t> strides,
                              size_t offset) { h->copy_from(other, shape, strides, offset); });
+    m.def("index", &array_index, nb::arg("h"), nb::arg("key").none());
+    m.def("index_view", &index_view, nb::arg("shape"), nb::arg("strides"), nb::arg("offset"),
+          nb::arg("key").none());
+    m.def("fill_view", &array_fill_view);
     m.def("reshape", &array_reshape);
+    m.def("reshape_view_strides", &reshape_view_strides);
+    m.def("concatenate", &array_concatenate);
+    m.def("astype", &array_astype);
+    m.def("astype_scaled", &array_astype_scaled);
+    m.def("one_hot", &array_one_hot);
+    m.def("from_file", &array_from_file);
+    m.def("gather_rows", &array_gather_rows, nb::call_guard<nb::gil_scoped_release>());
+    m.def("take", &array_take);
+    m.def("gather", &array_gather);
+    m.def("index_add", &array_index_add);
+    m.def("scatter_add", &array_scatter_add);
     m.def("array_shape", &array_shape);
     m.def("array_to_list", &array_to_list);
     m.def("set_seed", [](int32_t seed) { return get_default_forge()->set_seed(seed); });
+    m.def("set_elementwise_fast_paths", &set_elementwise_fast_paths);
 
     // OPERATIONS //
     // nullary_ops //
-    m.def("rand",
-          [](const std::vector<int64_t>& shape) { return array_nullaryops(shape, "rand"); });
-    m.def("randn",
-          [](const std::vector<int64_t>& shape) { return array_nullaryops(shape, "randn"); });
-    m.def("zeros",
-          [](const std::vector<int64_t>& shape) { return array_nullaryops(shape, "zeros"); });
+    m.def(
+        "rand",
+        [](const std::vector<int64_t>& shape, DType dtype) {
+            return array_nullaryops(shape, "rand", dtype);
+        },
+        nb::arg("shape"), nb::arg("dtype") = DType::float32);
+    m.def(
+        "randn",
+        [](const std::vector<int64_t>& shape, DType dtype) {
+            return array_nullaryops(shape, "randn", dtype);
+        },
+        nb::arg("shape"), nb::arg("dtype") = DType::float32);
+    m.def(
+        "zeros",
+        [](const std::vector<int64_t>& shape, DType dtype) {
+            return array_nullaryops(shape, "zeros", dtype);
+        },
+        nb::arg("shape"), nb::arg("dtype") = DType::float32);
+
+    // random //
+    nb::enum_<Distribution>(m, "Distribution")
+        .value("uniform", Distribution::uniform)
+        .value("normal", Distribution::normal)
+        .value("bernoulli", Distribution::bernoulli)
+        .value("dropout", Distribution::dropout);
+    nb::class_<Generator>(m, "Generator")
+        .def(nb::init<uint64_t, uint64_t>(), nb::arg("seed") = 0, nb::arg("stream") = 0)
+        .def_prop_ro("seed", &Generator::seed)
+        .def_prop_ro("stream", &Generator::stream)
+        .def_prop_rw("offset", &Generator::offset, &Generator::set_offset)
+        .def(
+            "fill_host",
+            [](Generator& g, nb::ndarray<float, nb::c_contig, nb::device::cpu> out,
+               Distribution dist, float p, unsigned threads) {
+                PhiloxParams params = g.reserve(out.size(), dist, p);
+                nb::gil_scoped_release release;
+                philox_fill_host(out.data(), params, threads);
+            },
+            nb::arg("out"), nb::arg("dist"), nb::arg("p") = 0.0f, nb::arg("threads") = 0);
+    m.def(
+        "default_generator", []() -> Generator& { return get_default_forge()->generator(); },
+        nb::rv_policy::reference);
+    m.def("random", &array_random, nb::arg("shape"), nb::arg("dist"), nb::arg("p") = 0.0f,
+          nb::arg("generator").none() = nb::none(), nb::arg("dtype") = DType::float32);
 
     // unary_ops //
     m.def("exp", [](const std::shared_ptr<ArrayHandle>& a) { return array_unaryops(a, "exp"); });
@@ -114,14 +202,176 @@ NB_MODULE(_backend, m) {
     m.def("div", [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
         return array_binops(a, b, "div");
     });
-    m.def("matmul", [](const std::shared_ptr<ArrayHandle>& a,
-                       const std::shared_ptr<ArrayHandle>& b) { return array_matmul(a, b); });
+    m.def("maximum",
+          [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
+              return array_binops(a, b, "maximum");
+          });
+    m.def("minimum",
+          [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
+              return array_binops(a, b, "minimum");
+          });
+    m.def("where", &array_where);
+
+    // comparison_ops //
+    m.def("eq", [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
+        return array_compare(a, b, "eq");
+    });
+    m.def("ne", [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
+        return array_compare(a, b, "ne");
+    });
+    m.def("lt", [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
+        return array_compare(a, b, "lt");
+    });
+    m.def("le", [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
+        return array_compare(a, b, "le");
+    });
+    m.def("gt", [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
+        return array_compare(a, b, "gt");
+    });
+    m.def("ge", [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b) {
+        return array_compare(a, b, "ge");
+    });
+    m.def("eq_scalar", [](const std::shared_ptr<ArrayHandle>& a, float s) {
+        return array_compare_scalar(a, s, "eq");
+    });
+    m.def("ne_scalar", [](const std::shared_ptr<ArrayHandle>& a, float s) {
+        return array_compare_scalar(a, s, "ne");
+    });
+    m.def("lt_scalar", [](const std::shared_ptr<ArrayHandle>& a, float s) {
+        return array_compare_scalar(a, s, "lt");
+    });
+    m.def("le_scalar", [](const std::shared_ptr<ArrayHandle>& a, float s) {
+        return array_compare_scalar(a, s, "le");
+    });
+    m.def("gt_scalar", [](const std::shared_ptr<ArrayHandle>& a, float s) {
+        return array_compare_scalar(a, s, "gt");
+    });
+    m.def("ge_scalar", [](const std::shared_ptr<ArrayHandle>& a, float s) {
+        return array_compare_scalar(a, s, "ge");
+    });
+
+    m.def(
+        "matmul",
+        [](const std::shared_ptr<ArrayHandle>& a, const std::shared_ptr<ArrayHandle>& b,
+           std::shared_ptr<ArrayHandle> bias, std::shared_ptr<ArrayHandle> out, float alpha,
+           float beta, int activation) {
+            return array_matmul(a, b,
+                                {bias, out, alpha, beta, static_cast<Activation>(activation)});
+        },
+        nb::arg("a"), nb::arg("b"), nb::arg("bias").none() = nb::none(),
+        nb::arg("out").none() = nb::none(), nb::arg("alpha") = 1.0f, nb::arg("beta") = 0.0f,
+        nb::arg("activation") = 0);
+    m.def("matmul_copy_count", &matmul_copy_count);
+
+    // scalar_ops //
+    m.def("add_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_scalarops(a, s, "add_scalar");
+    });
+    m.def("sub_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_scalarops(a, s, "sub_scalar");
+    });
+    m.def("rsub_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_scalarops(a, s, "rsub_scalar");
+    });
+    m.def("mul_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_scalarops(a, s, "mul_scalar");
+    });
+    m.def("div_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_scalarops(a, s, "div_scalar");
+    });
+    m.def("rdiv_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_scalarops(a, s, "rdiv_scalar");
+    });
+    m.def("iadd_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_inplace_scalarops(a, s, "iadd_scalar");
+    });
+    m.def("isub_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_inplace_scalarops(a, s, "isub_scalar");
+    });
+    m.def("imul_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_inplace_scalarops(a, s, "imul_scalar");
+    });
+    m.def("idiv_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_inplace_scalarops(a, s, "idiv_scalar");
+    });
+    m.def("maximum_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_scalarops(a, s, "maximum_scalar");
+    });
+    m.def("minimum_scalar", [](const std::shared_ptr<ArrayHandle>& a, double s) {
+        return array_scalarops(a, s, "minimum_scalar");
+    });
 
     // reduction_ops //
     m.def("sum_global", &sum_global);
     m.def("sum_axis", &sum_axis);
+    m.def("extremum_axis", &extremum_axis);
+    m.def("softmax_axis", &softmax_axis);
+    m.def("log_softmax_axis", &log_softmax_axis);
+    m.def("logsumexp_axis", &logsumexp_axis);
+    m.def("cross_entropy", &cross_entropy);
+
+    // optimizer_ops //
+    m.def("sgd_step", &sgd_step);
+    m.def("adam_step", &adam_step);
+
+    // PROFILER //
+    nb::class_<ProfileEvent>(m, "ProfileEvent")
+        .def_ro("name", &ProfileEvent::name)
+        .def_ro("category", &ProfileEvent::category)
+        .def_ro("shapes", &ProfileEvent::shapes)
+        .def_ro("thread", &ProfileEvent::thread)
+        .def_ro("start_us", &ProfileEvent::start_us)
+        .def_ro("wall_us", &ProfileEvent::wall_us)
+        .def_ro("gpu_start_us", &ProfileEvent::gpu_start_us)
+        .def_ro("gpu_us", &ProfileEvent::gpu_us)
+        .def_ro("bytes_read", &ProfileEvent::bytes_read)
+        .def_ro("bytes_written", &ProfileEvent::bytes_written)
+        .def_ro("bytes_allocated", &ProfileEvent::bytes_allocated);
+    m.def("profiler_start", &profiler_start);
+    m.def("profiler_stop", &profiler_stop, nb::call_guard<nb::gil_scoped_release>());
+
+    // MEMORY //
+    nb::class_<MemoryStats>(m, "MemoryStats")
+        .def_ro("live_bytes", &MemoryStats::live_bytes)
+        .def_ro("peak_bytes", &MemoryStats::peak_bytes)
+        .def_ro("arena_bytes", &MemoryStats::arena_bytes)
+        .def_ro("allocations", &MemoryStats::allocations)
+        .def_ro("frees", &MemoryStats::frees)
+        .def_ro("live_buffers", &MemoryStats::live_buffers)
+        .def_ro("live_handles", &MemoryStats::live_handles);
+    m.def("memory_stats", &memory_stats);
+    m.def("reset_peak_memory", &reset_peak_memory);
 
     // COMPILE AND RUN //
-    nb::class_<Graph>(m, "Graph").def("execute", &Graph::execute);
-    m.def("make_graph", &make_graph);
+    nb::class_<Node>(m, "Node")
+        .def_prop_ro("op", [](const Node& n) { return static_cast<int>(n.op); })
+        .def_ro("inputs", &Node::inputs)
+        .def_ro("shape", &Node::shape)
+        .def_ro("strides", &Node::strides)
+        .def_ro("offset", &Node::offset)
+        .def_ro("dtype", &Node::dtype)
+        .def_ro("args", &Node::args);
+    nb::class_<Graph>(m, "Graph")
+        .def("execute", &Graph::execute)
+        .def("execute_loop", &Graph::execute_loop, nb::arg("inputs"), nb::arg("iterations"),
+             nb::arg("carry_input"), nb::arg("input_steps"))
+        .def_ro("nodes", &Graph::nodes)
+        .def_ro("output_index", &Graph::output_index)
+        .def_ro("waves", &Graph::waves)
+        .def_ro("remat_nodes", &Graph::remat_nodes)
+        .def_ro("remat_flops", &Graph::remat_flops)
+        .def_ro("remat_bytes_saved", &Graph::remat_bytes_saved)
+        .def_prop_ro("arena_bytes", [](const Graph& g) { return g.arena->get_total_bytes(); })
+        .def_prop_ro("arena_offsets", [](const Graph& g) { return g.arena->get_all_offsets(); })
+        .def_prop_ro("arena_roots", [](const Graph& g) { return g.arena->get_roots(); })
+        .def_prop_ro("arena_placed_in", [](const Graph& g) {
+            std::vector<int> placed(g.nodes.size());
+            for (size_t i = 0; i < placed.size(); ++i) placed[i] = g.arena->get_placed_in(i);
+            return placed;
+        });
+    m.def("make_graph", &make_graph, nb::arg("flat_nodes"), nb::arg("output_index"),
+          nb::arg("memory_budget") = 0);
+    m.def("make_graph_packed", &make_graph_packed, nb::arg("columns"), nb::arg("output_index"),
+          nb::arg("memory_budget") = 0);
+    m.def("set_graph_concurrency", &set_graph_concurrency);
 }
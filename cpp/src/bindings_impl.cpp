@@ -1,31 +1,59 @@
+#include <bit>
+#include <unordered_map>
+
 #include "../include/array_handle.h"
 #include "../include/bindings.h"
 #include "../include/compiler.h"
 #include "../include/graph.h"
 #include "../include/memory_arena.h"
+#include "../include/profiler.h"
+#include "../include/scheduler.h"
 
 namespace nb = nanobind;
 
+static DType dtype_from_ndarray(const nb::dlpack::dtype& dt) {
+    if (dt == nb::dtype<float>()) return DType::float32;
+    if (dt == nb::dtype<int32_t>()) return DType::int32;
+    if (dt == nb::dtype<uint8_t>()) return DType::uint8;
+    if (dt.bits == 16 && dt.lanes == 1) {
+        if (dt.code == (uint8_t)nb::dlpack::dtype_code::Float) return DType::float16;
+        if (dt.code == (uint8_t)nb::dlpack::dtype_code::Bfloat) return DType::bfloat16;
+    }
+    throw nb::type_error(
+        "create_array_from_buffer: unsupported dtype, expected float32, float16, bfloat16, int32 "
+        "or uint8");
+}
+
 std::shared_ptr<ArrayHandle> create_array_from_buffer_py(
-    nb::ndarray<float, nb::numpy, nb::c_contig, nb::device::cpu> arr, std::vector<int64_t> shape,
+    nb::ndarray<nb::numpy, nb::c_contig, nb::device::cpu> arr, std::vector<int64_t> shape,
     ForgeHandle* FH) {
+    DType dtype = dtype_from_ndarray(arr.dtype());
     int64_t total = numel_from_shape(shape);
     if (arr.size() != total) {
         throw std::runtime_error(
             "create_array_from_buffer: buffer length doesn't match given shape");
     }
-    float* src_ptr = arr.data();
     void* dev = FH ? FH->device_ptr() : get_default_forge()->device_ptr();
-    return std::make_shared<ArrayHandle>(src_ptr, shape, dev);
+    return std::make_shared<ArrayHandle>(arr.data(), shape, dtype, dev);
+}
+
+// Python int for integer dtypes, float otherwise.
+nb::object element_to_py(const ArrayHandle& h, size_t idx) {
+    double v = load_element(h.raw_data(), h.dtype(), idx);
+    if (dtype_is_float(h.dtype())) return nb::float_(v);
+    return nb::int_((int64_t)v);
 }
 
 nb::object array_to_list(const ArrayHandle& h) {
-    const_cast<ArrayHandle&>(h).synchronize();
+    {
+        nb::gil_scoped_release release;
+        const_cast<ArrayHandle&>(h).synchronize();
+    }
     const std::vector<int64_t> shape = h.shape();
     const std::vector<int64_t> strides = h.strides();
-    const std::span<const float> data = h.data();
+    size_t total = numel_from_shape(shape);
     if (shape.empty() || strides.empty()) {
-        return nb::cast(data.size() ? data[h.offset()] : 0.0f);
+        return total && h.raw_data() ? element_to_py(h, h.offset()) : nb::cast(0.0f);
     }
 
     std::function<nb::object(size_t, size_t)> build;
@@ -34,7 +62,7 @@ nb::object array_to_list(const ArrayHandle& h) {
         if (dim + 1 == shape.size()) {
             nb::list lst;
             for (int64_t i = 0; i < shape[dim]; ++i)
-                lst.append(nb::float_(data[offset + i * stride]));
+                lst.append(element_to_py(h, offset + i * stride));
             return lst;
         } else {
             nb::list lst;
@@ -60,6 +88,7 @@ std::vector<Node> parse_nodes(nb::list flat_nodes) {
         n.offset = nb::cast<int64_t>(t[3]);
         n.strides = nb::cast<std::vector<int64_t>>(t[4]);
         nb::tuple py_args = nb::cast<nb::tuple>(t[5]);
+        n.dtype = static_cast<DType>(nb::cast<int>(t[6]));
 
         // different operation add more later, if they take args
         // consider using a switch statement
@@ -72,15 +101,64 @@ std::vector<Node> parse_nodes(nb::list flat_nodes) {
             n.args.insert(n.args.end(), s.begin(), s.end());
             n.args.insert(n.args.end(), st.begin(), st.end());
             n.args.push_back(off);
+        } else if (n.op == OpCode::SOFTMAX || n.op == OpCode::LOG_SOFTMAX ||
+                   n.op == OpCode::LOGSUMEXP || n.op == OpCode::CROSS_ENTROPY ||
+                   n.op == OpCode::CAST || n.op == OpCode::TAKE || n.op == OpCode::GATHER ||
+                   n.op == OpCode::INDEX_ADD || n.op == OpCode::SCATTER_ADD ||
+                   n.op == OpCode::CONCAT) {
+            // py_args = (axis,) or (axis, keepdims) or (axis, reduction) or (dtype,)
+            n.args = nb::cast<std::vector<int64_t>>(py_args);
+        } else if (n.op == OpCode::MATMUL && py_args.size() == 2) {
+            // py_args = (activation, alpha), with the bias as an optional third input.
+            // alpha is stored as its float bits.
+            n.args.push_back(nb::cast<int64_t>(py_args[0]));
+            n.args.push_back(std::bit_cast<int32_t>(nb::cast<float>(py_args[1])));
         }
         nodes.push_back(n);
     }
     return nodes;
 }
 
-std::shared_ptr<Graph> make_graph(nb::list flat_nodes, int output_index) {
-    // 1. Get the basic graph
-    std::vector<Node> raw_nodes = parse_nodes(flat_nodes);
+std::vector<Node> parse_packed_nodes(const std::vector<PackedColumn>& columns) {
+    if (columns.size() != 10) {
+        throw nb::value_error("make_graph_packed: expected the 10 arrays of PackedNodes");
+    }
+    const auto &ops = columns[0], &dtypes = columns[1], &offsets = columns[2];
+    const auto &input_starts = columns[3], &inputs = columns[4];
+    const auto &dim_starts = columns[5], &shapes = columns[6], &strides = columns[7];
+    const auto &arg_starts = columns[8], &args = columns[9];
+    size_t num_nodes = ops.shape(0);
+    if (dtypes.shape(0) != num_nodes || offsets.shape(0) != num_nodes ||
+        input_starts.shape(0) != num_nodes + 1 || dim_starts.shape(0) != num_nodes + 1 ||
+        arg_starts.shape(0) != num_nodes + 1 || shapes.shape(0) != strides.shape(0) ||
+        (size_t)input_starts(num_nodes) != inputs.shape(0) ||
+        (size_t)dim_starts(num_nodes) != shapes.shape(0) ||
+        (size_t)arg_starts(num_nodes) != args.shape(0)) {
+        throw nb::value_error("make_graph_packed: inconsistent array lengths");
+    }
+
+    std::vector<Node> nodes(num_nodes);
+    for (size_t i = 0; i < num_nodes; ++i) {
+        Node& n = nodes[i];
+        n.op = static_cast<OpCode>(ops(i));
+        n.dtype = static_cast<DType>(dtypes(i));
+        n.offset = offsets(i);
+        n.inputs.assign(inputs.data() + input_starts(i), inputs.data() + input_starts(i + 1));
+        for (int in : n.inputs) {
+            if (in < 0 || in >= (int64_t)i) {
+                throw nb::value_error("make_graph_packed: inputs must be earlier nodes");
+            }
+        }
+        n.shape.assign(shapes.data() + dim_starts(i), shapes.data() + dim_starts(i + 1));
+        n.strides.assign(strides.data() + dim_starts(i), strides.data() + dim_starts(i + 1));
+        n.args.assign(args.data() + arg_starts(i), args.data() + arg_starts(i + 1));
+    }
+    return nodes;
+}
+
+namespace {
+std::shared_ptr<Graph> build_graph(std::vector<Node> raw_nodes, int output_index,
+                                   uint64_t memory_budget) {
     // 2. Optimize graph
     std::vector<Node> optimized_nodes = optimize_graph(raw_nodes);
     // 3. Make graph
@@ -88,9 +166,190 @@ std::shared_ptr<Graph> make_graph(nb::list flat_nodes, int output_index) {
     auto graph = std::make_shared<Graph>(std::move(optimized_nodes), output_index);
     // 4. Get shared memory map (with some Data struct)
     graph->arena = std::make_shared<MemoryArena>(*graph);
+    // 4b. Recompute cheap nodes to fit the memory budget (0: none)
+    if (memory_budget > 0) rematerialize(*graph, memory_budget);
     // 5. Compile Graph, to get strings of the relevant kernels and associated info
     generateKernels(*graph);
     // 6. Pre-Compile Metal (MSL -> MTLComputePipelineState)
     compile_metal(*graph);
+    // 7. Group independent kernels into waves that run concurrently
+    graph->waves = schedule_waves(*graph);
     return graph;
 }
+}  // namespace
+
+std::shared_ptr<Graph> make_graph(nb::list flat_nodes, int output_index, uint64_t memory_budget) {
+    ProfileScope prof("graph", "make_graph");
+    // 1. Get the basic graph
+    return build_graph(parse_nodes(flat_nodes), output_index, memory_budget);
+}
+
+std::shared_ptr<Graph> make_graph_packed(const std::vector<PackedColumn>& columns, int output_index,
+                                         uint64_t memory_budget) {
+    ProfileScope prof("graph", "make_graph");
+    // 1. Get the basic graph, reading the traced arrays in place
+    return build_graph(parse_packed_nodes(columns), output_index, memory_budget);
+}
+
+namespace {
+
+// A key entry: an integer, a slice (as unpacked by PySlice_Unpack), None or Ellipsis
+enum KeyTag : int64_t { kInt, kSlice, kNewAxis, kEllipsis };
+
+struct IndexedView {
+    std::vector<int64_t> shape;
+    std::vector<int64_t> strides;
+    int64_t offset_delta;
+};
+
+struct VectorHash {
+    size_t operator()(const std::vector<int64_t>& v) const {
+        size_t h = v.size();
+        for (int64_t x : v)
+            h ^= std::hash<int64_t>{}(x) + 0x9e3779b97f4a7c15ULL + (h << 6) + (h >> 2);
+        return h;
+    }
+};
+
+// Views by (shape, strides, encoded key); offsets are additive, so the base offset is left out.
+// Only touched with the GIL held.
+std::unordered_map<std::vector<int64_t>, IndexedView, VectorHash> view_cache;
+constexpr size_t kViewCacheSize = 4096;
+
+void encode_entry(std::vector<int64_t>& out, PyObject* k) {
+    if (k == Py_None) {
+        out.push_back(kNewAxis);
+    } else if (k == Py_Ellipsis) {
+        out.push_back(kEllipsis);
+    } else if (PySlice_Check(k)) {
+        Py_ssize_t start, stop, step;
+        if (PySlice_Unpack(k, &start, &stop, &step) < 0) {
+            // The only ValueError is a zero step
+            if (!PyErr_ExceptionMatches(PyExc_ValueError)) throw nb::python_error();
+            PyErr_Clear();
+            throw nb::value_error("Array: slice step cannot be zero");
+        }
+        out.insert(out.end(), {kSlice, start, stop, step});
+    } else if (PyIndex_Check(k)) {
+        Py_ssize_t v = PyNumber_AsSsize_t(k, nullptr);
+        if (v == -1 && PyErr_Occurred()) throw nb::python_error();
+        out.insert(out.end(), {kInt, v});
+    } else {
+        throw nb::type_error("Array: Only int and slice supported");
+    }
+}
+
+IndexedView compute_view(const std::vector<int64_t>& shape, const std::vector<int64_t>& strides,
+                         const std::vector<int64_t>& enc, size_t key_begin) {
+    // Decode the key entries, expanding the ellipsis into full slices
+    struct Entry {
+        int64_t tag, a, b, c;
+    };
+    std::vector<Entry> key;
+    int ellipsis_count = 0;
+    int64_t explicit_count = 0;
+    for (size_t i = key_begin; i < enc.size();) {
+        Entry e{enc[i], 0, 0, 0};
+        if (e.tag == kInt) {
+            e.a = enc[i + 1];
+            i += 2;
+        } else if (e.tag == kSlice) {
+            e.a = enc[i + 1], e.b = enc[i + 2], e.c = enc[i + 3];
+            i += 4;
+        } else {
+            i += 1;
+        }
+        if (e.tag == kEllipsis) ++ellipsis_count;
+        if (e.tag == kInt || e.tag == kSlice) ++explicit_count;
+        key.push_back(e);
+    }
+    if (ellipsis_count > 1) throw nb::index_error("Array: only one ellipsis allowed in indexing");
+    int64_t ndim = (int64_t)shape.size();
+    if (ndim < explicit_count) throw nb::index_error("Array: too many indices for array");
+    if (ellipsis_count == 1) {
+        std::vector<Entry> expanded;
+        for (const Entry& e : key) {
+            if (e.tag != kEllipsis) {
+                expanded.push_back(e);
+                continue;
+            }
+            for (int64_t j = 0; j < ndim - explicit_count; ++j) {
+                expanded.push_back({kSlice, 0, PY_SSIZE_T_MAX, 1});
+            }
+        }
+        key = std::move(expanded);
+    }
+
+    IndexedView view{shape, strides, 0};
+    int64_t dim = 0;
+    int64_t deleted = 0;
+    for (const Entry& e : key) {
+        if (e.tag == kNewAxis) {
+            view.shape.insert(view.shape.begin() + (dim - deleted), 1);
+            view.strides.insert(view.strides.begin() + (dim - deleted), 0);
+            --deleted;
+        } else if (e.tag == kInt) {
+            int64_t s = e.a < 0 ? e.a + shape[dim] : e.a;
+            if (s < 0 || s >= shape[dim]) throw nb::index_error("Array: Index out of range");
+            view.offset_delta += s * view.strides[dim - deleted];
+            view.shape.erase(view.shape.begin() + (dim - deleted));
+            view.strides.erase(view.strides.begin() + (dim - deleted));
+            ++deleted;
+            ++dim;
+        } else {
+            Py_ssize_t begin = e.a, end = e.b;
+            int64_t length = PySlice_AdjustIndices(shape[dim], &begin, &end, e.c);
+            int64_t& stride = view.strides[dim - deleted];
+            // Empty views keep the offset in bounds
+            if (length > 0) view.offset_delta += begin * stride;
+            stride *= e.c;
+            view.shape[dim - deleted] = length;
+            ++dim;
+        }
+    }
+    return view;
+}
+
+const IndexedView& cached_view(const std::vector<int64_t>& shape,
+                               const std::vector<int64_t>& strides, nb::handle key) {
+    std::vector<int64_t> enc;
+    enc.reserve(1 + 2 * shape.size() + 8);
+    enc.push_back((int64_t)shape.size());
+    enc.insert(enc.end(), shape.begin(), shape.end());
+    enc.insert(enc.end(), strides.begin(), strides.end());
+    size_t key_begin = enc.size();
+    if (PyTuple_Check(key.ptr())) {
+        for (Py_ssize_t i = 0; i < PyTuple_GET_SIZE(key.ptr()); ++i) {
+            encode_entry(enc, PyTuple_GET_ITEM(key.ptr(), i));
+        }
+    } else {
+        encode_entry(enc, key.ptr());
+    }
+
+    auto it = view_cache.find(enc);
+    if (it != view_cache.end()) return it->second;
+    IndexedView view = compute_view(shape, strides, enc, key_begin);
+    if (view_cache.size() >= kViewCacheSize) view_cache.clear();
+    return view_cache.emplace(std::move(enc), std::move(view)).first->second;
+}
+
+}  // namespace
+
+std::tuple<std::vector<int64_t>, std::vector<int64_t>, int64_t> index_view(
+    const std::vector<int64_t>& shape, const std::vector<int64_t>& strides, int64_t offset,
+    nb::handle key) {
+    const IndexedView& view = cached_view(shape, strides, key);
+    return {view.shape, view.strides, offset + view.offset_delta};
+}
+
+nb::object array_index(const std::shared_ptr<ArrayHandle>& h, nb::handle key) {
+    const IndexedView& view = cached_view(h->shape(), h->strides(), key);
+    auto out = std::make_shared<ArrayHandle>(h, view.shape, view.strides,
+                                             (size_t)((int64_t)h->offset() + view.offset_delta));
+    if (!view.shape.empty()) return nb::cast(out);
+    {
+        nb::gil_scoped_release release;
+        out->synchronize();
+    }
+    return element_to_py(*out, out->offset());
+}
@@ -1,5 +1,7 @@
 #include "../include/compiler.h"
 
+#include "../include/memory_arena.h"
+
 std::vector<Node> optimize_graph(std::vector<Node> raw_nodes) { return raw_nodes; }
 // Could generate Fused Kernels, with special OpCodes
 // Description of which fusedkernel for the OpCode given in the OpCodes "Arg" parameter
@@ -23,3 +25,148 @@ void generateKernels(Graph& graph) {}
 // Op metadata: Shape, strides (internal offset?) WONT be handled from execute()
 // This means the kernel strings we generate needs to bake in/hardcode the loops for that
 // kernels generated so that out buffer is idx 0, then the N inputs to the node (in order)
+
+namespace {
+// Cheap to recompute: one pass over memory already at hand
+bool is_recomputable(OpCode op) {
+    return op == OpCode::ADD || op == OpCode::SUB || op == OpCode::MUL || op == OpCode::DIV ||
+           op == OpCode::CAST;
+}
+
+bool is_view(OpCode op) {
+    return op == OpCode::RESHAPE || op == OpCode::TRANSPOSE || op == OpCode::VIEW;
+}
+
+// The root a node's memory belongs to, following views
+int view_root(const std::vector<Node>& nodes, int idx) {
+    while (is_view(nodes[idx].op)) idx = nodes[idx].inputs[0];
+    return idx;
+}
+
+// Drops views nothing reads any more (they would keep their root alive in the arena)
+std::vector<Node> remove_unused_views(std::vector<Node> nodes, int& output_index) {
+    std::vector<bool> used(nodes.size(), false);
+    used[output_index] = true;
+    for (int i = (int)nodes.size() - 1; i >= 0; --i) {
+        if (is_view(nodes[i].op) && !used[i]) continue;
+        for (int in : nodes[i].inputs) used[in] = true;
+    }
+    std::vector<int> new_index(nodes.size(), -1);
+    std::vector<Node> kept;
+    for (size_t i = 0; i < nodes.size(); ++i) {
+        if (is_view(nodes[i].op) && !used[i]) continue;
+        new_index[i] = kept.size();
+        Node node = std::move(nodes[i]);
+        for (int& in : node.inputs) in = new_index[in];
+        kept.push_back(std::move(node));
+    }
+    output_index = new_index[output_index];
+    return kept;
+}
+
+// Recomputes `target` (and the views of it they read) right before its consumers from index
+// `split` on, which then read the copy. Returns the new nodes and the output's new index.
+std::vector<Node> duplicate_for_late_uses(const std::vector<Node>& nodes, int target, int split,
+                                          int& output_index) {
+    // Originals to copy: target, then the view chains late consumers read it through
+    std::vector<bool> copied(nodes.size(), false);
+    copied[target] = true;
+    for (size_t u = split; u < nodes.size(); ++u) {
+        if (is_view(nodes[u].op)) continue;
+        for (int in : nodes[u].inputs) {
+            if (view_root(nodes, in) != target) continue;
+            for (int w = in; w != target; w = nodes[w].inputs[0]) copied[w] = true;
+        }
+    }
+    std::vector<int> copies;
+    for (size_t i = 0; i < nodes.size(); ++i) {
+        if (copied[i]) copies.push_back(i);
+    }
+
+    // Old index -> new index, for the originals and their copies
+    std::vector<int> moved(nodes.size()), copy_of(nodes.size(), -1);
+    for (size_t i = 0; i < nodes.size(); ++i) {
+        moved[i] = (int)i < split ? i : i + copies.size();
+    }
+    for (size_t k = 0; k < copies.size(); ++k) copy_of[copies[k]] = split + k;
+
+    std::vector<Node> out;
+    out.reserve(nodes.size() + copies.size());
+    for (size_t i = 0; i < (size_t)split; ++i) out.push_back(nodes[i]);
+    for (int c : copies) {
+        Node node = nodes[c];
+        for (int& in : node.inputs) in = copy_of[in] != -1 ? copy_of[in] : moved[in];
+        out.push_back(std::move(node));
+    }
+    for (size_t i = split; i < nodes.size(); ++i) {
+        Node node = nodes[i];
+        bool late_consumer = !is_view(node.op);
+        for (int& in : node.inputs) {
+            in = late_consumer && copy_of[in] != -1 ? copy_of[in] : moved[in];
+        }
+        out.push_back(std::move(node));
+    }
+    output_index = moved[output_index];
+    return remove_unused_views(std::move(out), output_index);
+}
+}  // namespace
+
+void rematerialize(Graph& graph, uint64_t memory_budget) {
+    uint64_t start_bytes = graph.arena->get_total_bytes();
+    // Greedy: while over budget, apply the recomputation that shrinks the arena the most (the
+    // fewest added FLOPs on ties). A candidate recomputes a cheap node for the consumers after
+    // the longest stretch of the graph in which its value sits unused.
+    while (graph.arena->get_total_bytes() > memory_budget) {
+        const std::vector<Node>& nodes = graph.nodes;
+        int output_root = view_root(nodes, graph.output_index);
+        // Consumers of each root (views excluded), in graph order
+        std::vector<std::vector<int>> uses(nodes.size());
+        for (size_t u = 0; u < nodes.size(); ++u) {
+            if (is_view(nodes[u].op)) continue;
+            for (int in : nodes[u].inputs) {
+                int r = view_root(nodes, in);
+                if (uses[r].empty() || uses[r].back() != (int)u) uses[r].push_back(u);
+            }
+        }
+
+        uint64_t best_bytes = graph.arena->get_total_bytes();
+        uint64_t best_flops = 0;
+        std::vector<Node> best_nodes;
+        int best_output = -1;
+        for (size_t v = 0; v < nodes.size(); ++v) {
+            if (!is_recomputable(nodes[v].op) || (int)v == output_root || uses[v].empty()) {
+                continue;
+            }
+            int gap = 0, split = -1, previous = v;
+            for (int u : uses[v]) {
+                if (u - previous > gap && previous != (int)v) {
+                    gap = u - previous;
+                    split = u;
+                }
+                previous = u;
+            }
+            if (split == -1) continue;
+
+            int output_index = graph.output_index;
+            std::vector<Node> candidate = duplicate_for_late_uses(nodes, v, split, output_index);
+            Graph trial(candidate, output_index);
+            uint64_t bytes = MemoryArena(trial).get_total_bytes();
+            uint64_t flops = nodes[v].op == OpCode::CAST ? 0 : numel_from_shape(nodes[v].shape);
+            if (bytes < best_bytes ||
+                (bytes == best_bytes && !best_nodes.empty() && flops < best_flops)) {
+                best_bytes = bytes;
+                best_flops = flops;
+                best_nodes = std::move(candidate);
+                best_output = output_index;
+            }
+        }
+        if (best_nodes.empty()) break;
+
+        graph.nodes = std::move(best_nodes);
+        graph.output_index = best_output;
+        graph.arena = std::make_shared<MemoryArena>(graph);
+        graph.remat_nodes += 1;
+        graph.remat_flops += best_flops;
+    }
+    graph.remat_bytes_saved = start_bytes - graph.arena->get_total_bytes();
+}
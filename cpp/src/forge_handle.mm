@@ -6,12 +6,11 @@
 struct ForgeHandle::Impl {
     id<MTLDevice> device;
     id<MTLCommandQueue> queue;
-    uint32_t seed;
+    Generator generator{42};
 
     Impl() {
         device = MTLCreateSystemDefaultDevice();
         queue = [device newCommandQueue];
-        seed = 42;
     }
 };
 
@@ -30,6 +29,8 @@ void* ForgeHandle::device_ptr() const { return (__bridge void*)impl->device; }
 
 void* ForgeHandle::queue_ptr() const { return (__bridge void*)impl->queue; }
 
-uint32_t ForgeHandle::get_seed() const { return impl->seed; }
+uint32_t ForgeHandle::get_seed() const { return (uint32_t)impl->generator.seed(); }
 
-void ForgeHandle::set_seed(uint32_t s) { impl->seed = s; }
+void ForgeHandle::set_seed(uint32_t s) { impl->generator.reseed(s); }
+
+Generator& ForgeHandle::generator() { return impl->generator; }
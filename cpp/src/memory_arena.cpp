@@ -1,6 +1,9 @@
 #include "../include/memory_arena.h"
 
-MemoryArena::MemoryArena(const Graph& graph, uint64_t element_size) {
+#include <algorithm>
+#include <functional>
+
+MemoryArena::MemoryArena(const Graph& graph) {
     // 1. Calculate array sizes and find roots of each array
     // ---> (root is the original array's memory being used in the case of a view, etc)
     size_t num_nodes = graph.nodes.size();
@@ -16,7 +19,9 @@ MemoryArena::MemoryArena(const Graph& graph, uint64_t element_size) {
             roots[idx] = roots[parent];
         }
 
-        sizes[idx] = element_size * numel_from_shape(graph.nodes[idx].shape);
+        uint64_t nbytes =
+            dtype_size(graph.nodes[idx].dtype) * numel_from_shape(graph.nodes[idx].shape);
+        sizes[idx] = (nbytes + 3) & ~uint64_t(3);
     }
     int output_root;
     if (num_nodes > 0) output_root = this->roots[graph.output_index];
@@ -31,6 +36,48 @@ MemoryArena::MemoryArena(const Graph& graph, uint64_t element_size) {
     }
     if (num_nodes > 0) last_use[roots[output_root]] = INT_MAX;
 
+    // 2b. Place CONCAT inputs directly in their slab of the output, so no copy is needed:
+    // an input whose memory is a dense array of its own (not a graph input or output, and not
+    // already placed elsewhere) is given the CONCAT's buffer at its byte offset. Slabs are only
+    // contiguous when the dims before the axis are all 1. The CONCAT then has to stay alive as
+    // long as any placed input does.
+    // Dense ignoring size-1 dims, such as the axis a traced stack inserts
+    auto is_dense = [](const Node& n) {
+        int64_t z = 1;
+        for (int d = (int)n.shape.size() - 1; d >= 0; --d) {
+            if (n.shape[d] == 1) continue;
+            if (n.strides[d] != z) return false;
+            z *= n.shape[d];
+        }
+        return true;
+    };
+    placed_in.assign(num_nodes, -1);
+    std::vector<uint64_t> placed_offset(num_nodes, 0);
+    for (size_t c = 0; c < num_nodes; ++c) {
+        const Node& node = graph.nodes[c];
+        if (node.op != OpCode::CONCAT || roots[c] != c || c == output_root) continue;
+        size_t axis = node.args.empty() ? 0 : (size_t)node.args[0];
+        if (numel_from_shape(std::vector<int64_t>(node.shape.begin(), node.shape.begin() + axis)) !=
+            1) {
+            continue;
+        }
+        uint64_t offset = 0;
+        for (int input : node.inputs) {
+            const Node& in = graph.nodes[input];
+            int r = roots[input];
+            uint64_t nbytes = dtype_size(in.dtype) * numel_from_shape(in.shape);
+            bool dense_alias = in.offset == 0 && is_dense(in) &&
+                               numel_from_shape(in.shape) == numel_from_shape(graph.nodes[r].shape);
+            if (dense_alias && graph.nodes[r].op != OpCode::INPUT && r != output_root &&
+                r != (int)c && placed_in[r] == -1 && in.dtype == node.dtype) {
+                placed_in[r] = c;
+                placed_offset[r] = offset;
+                last_use[c] = std::max(last_use[c], last_use[r]);
+            }
+            offset += nbytes;
+        }
+    }
+
     // 3. Simulate allocation, and frees using greedy best-fit
     // Walk through nodes in graph, if not enough memory available allocate more
     // Recycle dead memory, return the peak usage and offsets
@@ -52,18 +99,18 @@ MemoryArena::MemoryArena(const Graph& graph, uint64_t element_size) {
     std::vector<FreeBlock> free_blocks;
     node_offsets.resize(num_nodes, 0);
 
-    for (size_t i = 0; i < num_nodes; ++i) {
-        if (roots[i] != i) {
-            node_offsets[i] = node_offsets[roots[i]];
-            continue;
-        }
-
-        if (graph.nodes[i].op == OpCode::INPUT || i == output_root) {
-            this->node_offsets[i] = 0;
-            continue;
+    // A placed node lives inside its CONCAT's block, which is allocated early (when its first
+    // placed input is produced) instead of at the CONCAT itself.
+    std::vector<bool> allocated(num_nodes, false);
+    std::function<void(size_t)> allocate = [&](size_t n) {
+        if (allocated[n]) return;
+        allocated[n] = true;
+        if (placed_in[n] != -1) {
+            allocate(placed_in[n]);
+            node_offsets[n] = node_offsets[placed_in[n]] + placed_offset[n];
+            return;
         }
-
-        uint64_t size = sizes[i];
+        uint64_t size = sizes[n];
         int best_fit = -1;
         uint64_t min_waste = UINT64_MAX;
         for (int b = 0; b < free_blocks.size(); ++b) {
@@ -76,19 +123,33 @@ MemoryArena::MemoryArena(const Graph& graph, uint64_t element_size) {
             }
         }
         if (best_fit == -1) {
-            node_offsets[i] = peak_memory;
+            node_offsets[n] = peak_memory;
             peak_memory += size;
         } else {
-            node_offsets[i] = free_blocks[best_fit].offset;
+            node_offsets[n] = free_blocks[best_fit].offset;
             free_blocks[best_fit].offset += size;
             free_blocks[best_fit].size -= size;
             if (free_blocks[best_fit].size == 0) free_blocks.erase(free_blocks.begin() + best_fit);
         }
+    };
+
+    for (size_t i = 0; i < num_nodes; ++i) {
+        if (roots[i] != i) {
+            node_offsets[i] = node_offsets[roots[i]];
+            continue;
+        }
+
+        if (graph.nodes[i].op == OpCode::INPUT || i == output_root) {
+            this->node_offsets[i] = 0;
+            continue;
+        }
+
+        allocate(i);
 
         // Could potentially be optimized by keeping track of a list
         // O(N^2) to O(N)
         for (size_t r = 0; r <= i; ++r) {
-            if (roots[r] == r && last_use[r] == i) {
+            if (roots[r] == r && last_use[r] == i && placed_in[r] == -1) {
                 if (graph.nodes[r].op != OpCode::INPUT && r != output_root) {
                     free_blocks.emplace_back(this->node_offsets[r], sizes[r]);
                 }
@@ -0,0 +1,48 @@
+#include "../include/memory_stats.h"
+
+#include <atomic>
+
+namespace {
+std::atomic<uint64_t> live_bytes{0};
+std::atomic<uint64_t> peak_bytes{0};
+std::atomic<uint64_t> arena_bytes{0};
+std::atomic<uint64_t> allocations{0};
+std::atomic<uint64_t> frees{0};
+std::atomic<int64_t> live_handles{0};
+
+void raise_peak(uint64_t live) {
+    uint64_t peak = peak_bytes.load(std::memory_order_relaxed);
+    while (live > peak && !peak_bytes.compare_exchange_weak(peak, live)) {
+    }
+}
+}  // namespace
+
+void record_alloc(uint64_t nbytes, bool arena) {
+    if (nbytes == 0) return;
+    raise_peak(live_bytes += nbytes);
+    if (arena) arena_bytes += nbytes;
+    allocations++;
+}
+
+void record_free(uint64_t nbytes, bool arena) {
+    if (nbytes == 0) return;
+    live_bytes -= nbytes;
+    if (arena) arena_bytes -= nbytes;
+    frees++;
+}
+
+void record_handle(int delta) { live_handles += delta; }
+
+MemoryStats memory_stats() {
+    MemoryStats stats;
+    stats.live_bytes = live_bytes;
+    stats.peak_bytes = peak_bytes;
+    stats.arena_bytes = arena_bytes;
+    stats.allocations = allocations;
+    stats.frees = frees;
+    stats.live_buffers = stats.allocations - stats.frees;
+    stats.live_handles = live_handles;
+    return stats;
+}
+
+void reset_peak_memory() { peak_bytes = live_bytes.load(); }
@@ -1,16 +1,39 @@
 #import <Metal/Metal.h>
 
+#include <atomic>
 #include <iostream>
 #include <map>
+#include <mutex>
 #include <vector>
 
 #include "../include/array_handle.h"
 #include "../include/metal_source.h"
 #include "../include/metal_utils.h"
+#include "../include/profiler.h"
 
-void* get_pipeline(const std::string& op_name, const char* metal_c_string) {
+namespace {
+std::atomic<bool> fast_paths_enabled{true};
+
+ElementwiseLayout choose_layout(const std::vector<int64_t>& shape,
+                                const std::vector<std::vector<int64_t>>& strides) {
+    if (shape.size() == 2) return ElementwiseLayout::strided_2d;
+    if (shape.size() != 1) return ElementwiseLayout::strided;
+    for (const auto& s : strides) {
+        if (s[0] != 1) return ElementwiseLayout::strided_1d;
+    }
+    return ElementwiseLayout::contiguous;
+}
+}  // namespace
+
+void set_elementwise_fast_paths(bool enabled) { fast_paths_enabled = enabled; }
+
+void* get_pipeline(const std::string& op_name, const char* metal_c_string,
+                   ElementwiseLayout layout) {
     static std::map<std::string, id<MTLComputePipelineState>> cache;
     static id<MTLLibrary> library = nil;
+    // Kernels may be launched off the main thread (e.g. the DataLoader's prefetch thread)
+    static std::mutex mutex;
+    std::lock_guard<std::mutex> lock(mutex);
     auto defaultForgeHandle = get_default_forge();
     id<MTLDevice> device = (__bridge id<MTLDevice>)defaultForgeHandle->device_ptr();
 
@@ -26,8 +49,10 @@ void* get_pipeline(const std::string& op_name, const char* metal_c_string) {
         }
     }
 
-    if (cache.find(op_name) != cache.end()) {
-        return (__bridge_retained void*)cache[op_name];
+    uint32_t layout_value = static_cast<uint32_t>(layout);
+    std::string key = op_name + "#" + std::to_string(layout_value);
+    if (cache.find(key) != cache.end()) {
+        return (__bridge_retained void*)cache[key];
     }
     NSString* nameNS = [NSString stringWithUTF8String:op_name.c_str()];
     id<MTLFunction> fn = [library newFunctionWithName:nameNS];
@@ -35,23 +60,50 @@ void* get_pipeline(const std::string& op_name, const char* metal_c_string) {
         throw std::runtime_error("get_pipeline: Failed to find function '" + op_name +
                                  "' in library");
     }
+    if (fn.functionConstantsDictionary.count > 0) {
+        MTLFunctionConstantValues* values = [[MTLFunctionConstantValues alloc] init];
+        [values setConstantValue:&layout_value type:MTLDataTypeUInt atIndex:0];
+        NSError* err = nil;
+        fn = [library newFunctionWithName:nameNS constantValues:values error:&err];
+        if (!fn) {
+            throw std::runtime_error("get_pipeline: Failed to specialize function '" + op_name +
+                                     "'");
+        }
+    }
     id<MTLComputePipelineState> pipeline = [device newComputePipelineStateWithFunction:fn
                                                                                  error:nil];
 
     if (!pipeline) {
         throw std::runtime_error("Metal Error: Failed to create pipeline state for " + op_name);
     }
-    cache[op_name] = pipeline;
+    cache[key] = pipeline;
     return (__bridge_retained void*)pipeline;
 }
 
 std::shared_ptr<ArrayHandle> launch_elementwise(
     const std::string& op_name, const std::vector<int64_t>& out_shape,
-    std::initializer_list<const std::shared_ptr<ArrayHandle>> inputs, bool dedicated_out) {
+    std::initializer_list<const std::shared_ptr<ArrayHandle>> inputs, bool dedicated_out,
+    std::span<const float> scalars, std::optional<DType> out_dtype, bool coalesce) {
+    ProfileScope prof("elementwise", op_name);
+    // 0-d outputs are dispatched as a single-element 1-d kernel: shape=[1], stride=[0].
+    std::vector<int64_t> shape = out_shape.empty() ? std::vector<int64_t>{1} : out_shape;
+    std::vector<std::vector<int64_t>> stride_store;
+    stride_store.reserve(inputs.size());
+    for (const auto& inp : inputs) {
+        stride_store.push_back(out_shape.empty()
+                                   ? std::vector<int64_t>{0}
+                                   : get_bcast_strides(inp->shape(), inp->strides(), out_shape));
+    }
+    ElementwiseLayout layout = ElementwiseLayout::strided;
+    if (coalesce && fast_paths_enabled) {
+        shape = coalesce_dims(shape, stride_store);
+        layout = choose_layout(shape, stride_store);
+    }
+
     auto fh = get_default_forge();
     id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)fh->queue_ptr();
     id<MTLComputePipelineState> pipeline =
-        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(op_name, METAL_SOURCE);
+        (__bridge_transfer id<MTLComputePipelineState>)get_pipeline(op_name, METAL_SOURCE, layout);
 
     id<MTLCommandBuffer> cmd = [queue commandBuffer];
     if (!cmd)
@@ -64,49 +116,39 @@ std::shared_ptr<ArrayHandle> launch_elementwise(
     NSUInteger slot = 0;
     for (const auto& inp : inputs) {
         [enc setBuffer:inp->metal_buffer() offset:0 atIndex:slot++];
+        prof.read(*inp);
     }
-    auto out = dedicated_out ? std::make_shared<ArrayHandle>(out_shape, fh->device_ptr())
+    DType dtype = out_dtype.value_or((*std::begin(inputs))->dtype());
+    auto out = dedicated_out ? std::make_shared<ArrayHandle>(out_shape, dtype, fh->device_ptr())
                              : *std::begin(inputs);
     if (dedicated_out) {
         id<MTLBuffer> out_metalbuf = out->metal_buffer();
         [enc setBuffer:out_metalbuf offset:0 atIndex:slot++];
     }
 
-    // 0-d scalars are dispatched as a single-element 1-d kernel: shape=[1], stride=[0], ndim=1.
-    uint ndim_raw = (uint)out_shape.size();
-    uint ndim_safe = ndim_raw == 0 ? 1 : ndim_raw;
-    uint64_t scalar_shape = 1;
-    uint64_t scalar_stride = 0;
-
-    if (ndim_raw == 0) {
-        [enc setBytes:&scalar_shape length:8 atIndex:slot++];
-    } else {
-        [enc setBytes:out_shape.data() length:ndim_raw * 8 atIndex:slot++];
-    }
-
-    std::vector<std::vector<int64_t>> stride_store;
-    stride_store.reserve(inputs.size());
+    uint ndim = (uint)shape.size();
+    [enc setBytes:shape.data() length:ndim * 8 atIndex:slot++];
+    size_t i = 0;
     for (const auto& inp : inputs) {
-        stride_store.push_back(get_bcast_strides(inp->shape(), inp->strides(), out_shape));
-        if (ndim_raw == 0) {
-            [enc setBytes:&scalar_stride length:8 atIndex:slot++];
-        } else {
-            [enc setBytes:stride_store.back().data() length:ndim_raw * 8 atIndex:slot++];
-        }
+        [enc setBytes:stride_store[i++].data() length:ndim * 8 atIndex:slot++];
         size_t off = inp->offset();
         [enc setBytes:&off length:sizeof(size_t) atIndex:slot++];
     }
 
-    [enc setBytes:&ndim_safe length:4 atIndex:slot++];
+    [enc setBytes:&ndim length:4 atIndex:slot++];
+    if (!scalars.empty()) [enc setBytes:scalars.data() length:scalars.size_bytes() atIndex:slot++];
 
-    size_t numel = 1;
-    for (int64_t d : out_shape) numel *= (size_t)d;
-    MTLSize grid = MTLSizeMake(numel, 1, 1);
+    // The coalesced layouts cover 4 consecutive elements per thread (ELEMS_PER_THREAD).
+    size_t numel = numel_from_shape(shape);
+    size_t per_thread = layout == ElementwiseLayout::strided ? 1 : 4;
+    MTLSize grid = MTLSizeMake((numel + per_thread - 1) / per_thread, 1, 1);
     MTLSize threads = MTLSizeMake(256, 1, 1);
     if (threads.width > grid.width) threads.width = grid.width;
     [enc dispatchThreads:grid threadsPerThreadgroup:threads];
     [enc endEncoding];
 
+    prof.write(out_shape, dtype);
+    prof.watch(cmd);
     [cmd commit];
     out->set_event(cmd);
     return out;
@@ -0,0 +1,115 @@
+#include "../include/philox.h"
+
+#include <algorithm>
+#include <cmath>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+
+namespace {
+constexpr uint32_t kM0 = 0xD2511F53;
+constexpr uint32_t kM1 = 0xCD9E8D57;
+constexpr uint32_t kW0 = 0x9E3779B9;
+constexpr uint32_t kW1 = 0xBB67AE85;
+constexpr int kRounds = 10;
+// Values per thread chunk below which the host fill stays single-threaded
+constexpr size_t kMinValuesPerThread = 1 << 16;
+
+void philox4x32(uint32_t c[4], uint32_t k0, uint32_t k1) {
+    for (int r = 0; r < kRounds; ++r) {
+        uint64_t p0 = (uint64_t)kM0 * c[0];
+        uint64_t p1 = (uint64_t)kM1 * c[2];
+        uint32_t hi0 = (uint32_t)(p0 >> 32), lo0 = (uint32_t)p0;
+        uint32_t hi1 = (uint32_t)(p1 >> 32), lo1 = (uint32_t)p1;
+        c[0] = hi1 ^ c[1] ^ k0;
+        c[1] = lo1;
+        c[2] = hi0 ^ c[3] ^ k1;
+        c[3] = lo0;
+        k0 += kW0;
+        k1 += kW1;
+    }
+}
+
+// 24 random bits to [0, 1), exactly representable in float
+inline float to_unit(uint32_t x) { return (float)(x >> 8) * 0x1p-24f; }
+
+void transform(const uint32_t x[4], const PhiloxParams& p, float out[4]) {
+    switch ((Distribution)p.dist) {
+        case Distribution::uniform:
+            for (int i = 0; i < 4; ++i) out[i] = to_unit(x[i]);
+            break;
+        case Distribution::normal:
+            for (int i = 0; i < 4; i += 2) {
+                float u1 = to_unit(x[i]) + 0x1p-24f;  // (0, 1], log stays finite
+                float theta = 6.2831853071795864f * to_unit(x[i + 1]);
+                float r = std::sqrt(-2.0f * std::log(u1));
+                out[i] = r * std::cos(theta);
+                out[i + 1] = r * std::sin(theta);
+            }
+            break;
+        case Distribution::bernoulli:
+            for (int i = 0; i < 4; ++i) out[i] = to_unit(x[i]) < p.p ? 1.0f : 0.0f;
+            break;
+        case Distribution::dropout:
+            for (int i = 0; i < 4; ++i) out[i] = to_unit(x[i]) < p.p ? 0.0f : p.scale;
+            break;
+    }
+}
+
+void fill_blocks(float* out, const PhiloxParams& p, size_t first, size_t last) {
+    uint64_t base = ((uint64_t)p.counter[1] << 32) | p.counter[0];
+    for (size_t b = first; b < last; ++b) {
+        uint64_t block = base + b;
+        uint32_t c[4] = {(uint32_t)block, (uint32_t)(block >> 32), p.stream[0], p.stream[1]};
+        philox4x32(c, p.key[0], p.key[1]);
+        float values[4];
+        transform(c, p, values);
+        size_t n = std::min<size_t>(4, p.numel - 4 * b);
+        std::copy(values, values + n, out + 4 * b);
+    }
+}
+}  // namespace
+
+void Generator::reseed(uint64_t seed, uint64_t stream) {
+    seed_ = seed;
+    stream_ = stream;
+    set_offset(0);
+}
+
+PhiloxParams Generator::reserve(size_t numel, Distribution dist, float p) {
+    if (numel > UINT32_MAX) throw std::runtime_error("random: at most 2^32 - 1 values per call");
+    uint64_t blocks = (numel + 3) / 4;
+    uint64_t first = offset_.fetch_add(blocks, std::memory_order_relaxed);
+    PhiloxParams params{};
+    params.key[0] = (uint32_t)seed_;
+    params.key[1] = (uint32_t)(seed_ >> 32);
+    params.counter[0] = (uint32_t)first;
+    params.counter[1] = (uint32_t)(first >> 32);
+    params.stream[0] = (uint32_t)stream_;
+    params.stream[1] = (uint32_t)(stream_ >> 32);
+    params.numel = (uint32_t)numel;
+    params.dist = (uint32_t)dist;
+    params.p = p;
+    params.scale = dist == Distribution::dropout ? 1.0f / (1.0f - p) : 1.0f;
+    return params;
+}
+
+void philox_fill_host(float* out, const PhiloxParams& params, unsigned threads) {
+    size_t blocks = ((size_t)params.numel + 3) / 4;
+    if (threads == 0) threads = std::max(1u, std::thread::hardware_concurrency());
+    threads = (unsigned)std::min<size_t>(threads, params.numel / kMinValuesPerThread + 1);
+    if (threads <= 1) {
+        fill_blocks(out, params, 0, blocks);
+        return;
+    }
+    // Contiguous block ranges per thread; every block only depends on its index
+    std::vector<std::thread> workers;
+    size_t per_thread = (blocks + threads - 1) / threads;
+    for (unsigned t = 0; t < threads; ++t) {
+        size_t first = std::min(blocks, t * per_thread);
+        size_t last = std::min(blocks, first + per_thread);
+        if (first == last) break;
+        workers.emplace_back(fill_blocks, out, std::cref(params), first, last);
+    }
+    for (auto& w : workers) w.join();
+}
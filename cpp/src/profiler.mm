@@ -0,0 +1,133 @@
+#import <Metal/Metal.h>
+#include <mach/mach_time.h>
+
+#include <atomic>
+#include <functional>
+#include <mutex>
+#include <thread>
+
+#include "../include/profiler.h"
+
+namespace {
+std::atomic<bool> recording{false};
+
+// Everything below is guarded by `mutex`. cmds[i] is the retained command buffer of events[i]
+// (or nullptr), released once its timestamps are read.
+std::mutex mutex;
+std::vector<ProfileEvent> events;
+std::vector<void*> cmds;
+double start_seconds = 0;
+
+// Same time base as MTLCommandBuffer.GPUStartTime / GPUEndTime
+double host_seconds() {
+    static mach_timebase_info_data_t timebase = [] {
+        mach_timebase_info_data_t info;
+        mach_timebase_info(&info);
+        return info;
+    }();
+    return (double)mach_absolute_time() * timebase.numer / timebase.denom * 1e-9;
+}
+
+uint64_t thread_key() { return std::hash<std::thread::id>{}(std::this_thread::get_id()); }
+
+void release_cmds() {
+    for (void* cmd : cmds) {
+        if (cmd) {
+            id old_cmd = (__bridge_transfer id)cmd;
+        }
+    }
+    cmds.clear();
+}
+}  // namespace
+
+bool profiling_enabled() { return recording.load(std::memory_order_relaxed); }
+
+void profiler_start() {
+    std::lock_guard<std::mutex> lock(mutex);
+    release_cmds();
+    events.clear();
+    start_seconds = host_seconds();
+    recording = true;
+}
+
+std::vector<ProfileEvent> profiler_stop() {
+    std::vector<ProfileEvent> out;
+    std::vector<void*> pending;
+    double t0;
+    {
+        std::lock_guard<std::mutex> lock(mutex);
+        recording = false;
+        out.swap(events);
+        pending.swap(cmds);
+        t0 = start_seconds;
+    }
+    for (size_t i = 0; i < pending.size(); ++i) {
+        if (!pending[i]) continue;
+        id<MTLCommandBuffer> cmd = (__bridge_transfer id<MTLCommandBuffer>)pending[i];
+        [cmd waitUntilCompleted];
+        if (cmd.GPUEndTime > 0) {
+            out[i].gpu_start_us = (cmd.GPUStartTime - t0) * 1e6;
+            out[i].gpu_us = (cmd.GPUEndTime - cmd.GPUStartTime) * 1e6;
+        }
+    }
+    return out;
+}
+
+ProfileScope::ProfileScope(const char* category, const std::string& name) {
+    if (!profiling_enabled()) return;
+    event_ = std::make_unique<ProfileEvent>();
+    event_->name = name;
+    event_->category = category;
+    event_->thread = thread_key();
+    event_->start_us = host_seconds();  // made relative when recorded
+}
+
+ProfileScope::~ProfileScope() {
+    if (!event_) return;
+    double end = host_seconds();
+    std::lock_guard<std::mutex> lock(mutex);
+    if (!recording) {
+        // The profiler was stopped while this call ran
+        if (cmd_) {
+            id old_cmd = (__bridge_transfer id)cmd_;
+        }
+        return;
+    }
+    event_->wall_us = (end - event_->start_us) * 1e6;
+    event_->start_us = (event_->start_us - start_seconds) * 1e6;
+    events.push_back(std::move(*event_));
+    cmds.push_back(cmd_);
+}
+
+void ProfileScope::read(const std::vector<int64_t>& shape, DType dtype) {
+    if (!event_) return;
+    event_->shapes.push_back(shape);
+    event_->bytes_read += numel_from_shape(shape) * dtype_size(dtype);
+}
+
+void ProfileScope::write(const std::vector<int64_t>& shape, DType dtype) {
+    if (!event_) return;
+    event_->shapes.push_back(shape);
+    event_->bytes_written += numel_from_shape(shape) * dtype_size(dtype);
+}
+
+void ProfileScope::watch(id<MTLCommandBuffer> cmd) {
+    if (!event_ || cmd_) return;
+    cmd_ = (__bridge_retained void*)cmd;
+}
+
+void profile_allocation(const char* name, const std::vector<int64_t>& shape, uint64_t nbytes) {
+    if (!profiling_enabled()) return;
+    ProfileEvent event;
+    event.name = name;
+    event.category = "alloc";
+    event.shapes.push_back(shape);
+    event.thread = thread_key();
+    event.bytes_allocated = nbytes;
+    double now = host_seconds();
+    std::lock_guard<std::mutex> lock(mutex);
+    if (!recording) return;
+    event.start_us = (now - start_seconds) * 1e6;
+    events.push_back(std::move(event));
+    cmds.push_back(nullptr);
+}
@@ -3,32 +3,121 @@
 #include "../include/forge_handle.h"
 #include "../include/graph.h"
 #include "../include/memory_arena.h"
+#include "../include/memory_stats.h"
+#include "../include/profiler.h"
+#include "../include/scheduler.h"
+
+namespace {
+// Allocates the memory plan's arena for one command buffer; it lives until that completes
+id<MTLBuffer> allocate_arena(const Graph& graph, id<MTLDevice> device,
+                             id<MTLCommandBuffer> commandBuffer) {
+    uint64_t total_bytes = graph.arena->get_total_bytes();
+    if (total_bytes == 0) return nil;
+    id<MTLBuffer> arena_buffer = [device newBufferWithLength:total_bytes
+                                                     options:MTLResourceStorageModeShared];
+    profile_allocation("arena", {(int64_t)total_bytes}, total_bytes);
+    record_alloc(total_bytes, /*arena=*/true);
+    [commandBuffer addCompletedHandler:^(id<MTLCommandBuffer>) {
+        record_free(total_bytes, /*arena=*/true);
+    }];
+    return arena_buffer;
+}
+
+// A fresh ArrayHandle for the output root (not part of Arena to allow Arena to be freed)
+std::shared_ptr<ArrayHandle> make_root_handle(const Graph& graph) {
+    const Node& root = graph.nodes[graph.arena->get_root(graph.output_index)];
+    return std::make_shared<ArrayHandle>(root.shape, root.dtype);
+}
+
+// Encodes one run of the graph's kernels. `input_buffers` and `input_shifts` are indexed by
+// node: the buffer bound for each graph input and a byte shift added to its offset.
+void encode_graph(const Graph& graph, id<MTLComputeCommandEncoder> computeEncoder, bool concurrent,
+                  const std::vector<id<MTLBuffer>>& input_buffers,
+                  const std::vector<uint64_t>& input_shifts, id<MTLBuffer> arena_buffer,
+                  id<MTLBuffer> output_buffer) {
+    int output_root = graph.arena->get_root(graph.output_index);
+
+    // Helper to find which buffers a node's I/O refers to: (inputHandle, Arena or outputHandle)
+    auto get_metal_buffer_for_node = [&](int node_idx) -> id<MTLBuffer> {
+        int root = graph.arena->get_root(node_idx);
+        if (root == output_root) return output_buffer;
+        if (graph.nodes[root].op == OpCode::INPUT) return input_buffers[root];
+        return arena_buffer;
+    };
+    auto get_offset_for_node = [&](int node_idx) -> uint64_t {
+        const Node& node = graph.nodes[node_idx];
+        int root = graph.arena->get_root(node_idx);
+        uint64_t shift = graph.nodes[root].op == OpCode::INPUT ? input_shifts[root] : 0;
+        return graph.arena->get_offset(node_idx) + node.offset * dtype_size(node.dtype) + shift;
+    };
+
+    auto encode = [&](size_t i) {
+        const KernelConfig& config = graph.configs[i];
+        void* raw_ptr = graph.pipelines[i];
+        // config.name.empty() IFF pipeline == nullptr
+        // TODO: add an assert (?) but there's other places where we should assert
+        // like if .size() are equal needs to be asserted somewhere probably
+        if (!raw_ptr) return;
+
+        id<MTLComputePipelineState> pso = (__bridge id<MTLComputePipelineState>)raw_ptr;
+        [computeEncoder setComputePipelineState:pso];
+        // b) Set the correct buffer inputs
+        [computeEncoder setBuffer:get_metal_buffer_for_node(i)
+                           offset:get_offset_for_node(i)
+                          atIndex:0];
+        int bind_index = 1;
+        for (int in_idx : graph.nodes[i].inputs) {
+            [computeEncoder setBuffer:get_metal_buffer_for_node(in_idx)
+                               offset:get_offset_for_node(in_idx)
+                              atIndex:bind_index++];
+        }
+
+        MTLSize grid = MTLSizeMake(config.grid[0], config.grid[1], config.grid[2]);
+        MTLSize threadgroup = MTLSizeMake(config.group[0], config.group[1], config.group[2]);
+        [computeEncoder dispatchThreads:grid threadsPerThreadgroup:threadgroup];
+    };
+
+    // c) Launch the kernels: the nodes of a wave have no RAW/WAR/WAW hazards between them
+    // (schedule_waves), so they're dispatched concurrently, with a barrier before the next wave
+    if (concurrent) {
+        for (size_t w = 0; w < graph.waves.size(); ++w) {
+            if (w > 0) [computeEncoder memoryBarrierWithScope:MTLBarrierScopeBuffers];
+            for (int i : graph.waves[w]) encode(i);
+        }
+    } else {
+        for (size_t i = 0; i < graph.nodes.size(); ++i) encode(i);
+    }
+}
+}  // namespace
 
 std::shared_ptr<ArrayHandle> Graph::execute(std::vector<std::shared_ptr<ArrayHandle>> inputs) {
     // Combine graph with inputs to execute and produce the output
     // No need to copy inputs over, we just edit in place if needed, because its pass-by-ref
+    ProfileScope prof("graph", "execute");
+    for (const auto& input : inputs) {
+        if (input) prof.read(*input);
+    }
     auto defaultForgeHandle = get_default_forge();
     id<MTLDevice> device = (__bridge id<MTLDevice>)defaultForgeHandle->device_ptr();
     id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)defaultForgeHandle->queue_ptr();
     id<MTLCommandBuffer> commandBuffer = [queue commandBuffer];
-    id<MTLComputeCommandEncoder> computeEncoder = [commandBuffer computeCommandEncoder];
+    // A serial encoder orders every dispatch after the previous one
+    bool concurrent = graph_concurrency();
+    id<MTLComputeCommandEncoder> computeEncoder =
+        [commandBuffer computeCommandEncoderWithDispatchType:concurrent ? MTLDispatchTypeConcurrent
+                                                                        : MTLDispatchTypeSerial];
 
     // a) Allocate the memory plan needed
     // i. allocate the arena
-    uint64_t total_bytes = this->arena->get_total_bytes();
-    id<MTLBuffer> arena_buffer = nil;
-    if (total_bytes > 0) {
-        arena_buffer = [device newBufferWithLength:total_bytes
-                                           options:MTLResourceStorageModeShared];
-    }
-    // a) ii. Allocate the output ArrayHandle (not part of Arena to allow Arena to be freed)
+    id<MTLBuffer> arena_buffer = allocate_arena(*this, device, commandBuffer);
+    // a) ii. Allocate the output ArrayHandle
     int output_root = this->arena->get_root(this->output_index);
     std::shared_ptr<ArrayHandle> root_handle;
     if (this->nodes[output_root].op == OpCode::INPUT) {
         // if the output is just a view of the input
         root_handle = inputs[output_root];
     } else {
-        root_handle = std::make_shared<ArrayHandle>(this->nodes[output_root].shape);
+        root_handle = make_root_handle(*this);
     }
     std::shared_ptr<ArrayHandle> output_handle;
     if (this->output_index == output_root) {
@@ -39,52 +128,73 @@ std::shared_ptr<ArrayHandle> Graph::execute(std::vector<std::shared_ptr<ArrayHan
             this->nodes[this->output_index].strides, this->nodes[this->output_index].offset);
     }
 
-    // Helper to find which buffers a node's I/O refers to: (inputHandle, Arena or outputHandle)
-    auto get_metal_buffer_for_node = [&](int node_idx) -> id<MTLBuffer> {
-        int root = this->arena->get_root(node_idx);
-        if (root == output_root) return output_handle->metal_buffer();
-        if (this->nodes[root].op == OpCode::INPUT) {
-            return inputs[root]->metal_buffer();
-        }
-        return arena_buffer;
-    };
+    std::vector<id<MTLBuffer>> input_buffers(inputs.size());
+    for (size_t k = 0; k < inputs.size(); ++k) input_buffers[k] = inputs[k]->metal_buffer();
+    encode_graph(*this, computeEncoder, concurrent, input_buffers,
+                 std::vector<uint64_t>(inputs.size(), 0), arena_buffer,
+                 root_handle->metal_buffer());
+    [computeEncoder endEncoding];
+    prof.write(*output_handle);
+    prof.watch(commandBuffer);
+    [commandBuffer commit];
+    output_handle->set_event(commandBuffer);
+    return output_handle;
+}
 
-    for (size_t i = 0; i < this->nodes.size(); ++i) {
-        const Node& node = this->nodes[i];
-        const KernelConfig& config = this->configs[i];
-        void* raw_ptr = this->pipelines[i];
-        // config.name.empty() IFF pipeline == nullptr
-        // TODO: add an assert (?) but there's other places where we should assert
-        // like if .size() are equal needs to be asserted somewhere probably
-        if (!raw_ptr) continue;
+std::shared_ptr<ArrayHandle> Graph::execute_loop(std::vector<std::shared_ptr<ArrayHandle>> inputs,
+                                                 int64_t iterations, int carry_input,
+                                                 std::vector<int64_t> input_steps) {
+    int output_root = this->arena->get_root(this->output_index);
+    if (carry_input < 0 || carry_input >= (int64_t)inputs.size()) {
+        throw std::runtime_error("execute_loop: carry_input out of range");
+    }
+    if (input_steps.size() != inputs.size()) {
+        throw std::runtime_error("execute_loop: need one step per input");
+    }
+    if (this->output_index != output_root || this->nodes[output_root].op == OpCode::INPUT) {
+        throw std::runtime_error("execute_loop: the output must be a new dense Array");
+    }
+    if (iterations <= 0) return inputs[carry_input];
 
-        id<MTLComputePipelineState> pso = (__bridge id<MTLComputePipelineState>)raw_ptr;
-        [computeEncoder setComputePipelineState:pso];
-        // b) Set the correct buffer inputs
-        id<MTLBuffer> dest_buf = get_metal_buffer_for_node(i);
-        uint64_t dest_offset = this->arena->get_offset(i) + (node.offset * sizeof(float));
-        [computeEncoder setBuffer:dest_buf offset:dest_offset atIndex:0];
-        int bind_index = 1;
-        for (int in_idx : node.inputs) {
-            id<MTLBuffer> in_buf = get_metal_buffer_for_node(in_idx);
-            uint64_t in_offset =
-                this->arena->get_offset(in_idx) + (this->nodes[in_idx].offset * sizeof(float));
+    ProfileScope prof("graph", "execute_loop");
+    for (const auto& input : inputs) {
+        if (input) prof.read(*input);
+    }
+    auto defaultForgeHandle = get_default_forge();
+    id<MTLDevice> device = (__bridge id<MTLDevice>)defaultForgeHandle->device_ptr();
+    id<MTLCommandQueue> queue = (__bridge id<MTLCommandQueue>)defaultForgeHandle->queue_ptr();
+    id<MTLCommandBuffer> commandBuffer = [queue commandBuffer];
+    bool concurrent = graph_concurrency();
+    id<MTLComputeCommandEncoder> computeEncoder =
+        [commandBuffer computeCommandEncoderWithDispatchType:concurrent ? MTLDispatchTypeConcurrent
+                                                                        : MTLDispatchTypeSerial];
 
-            [computeEncoder setBuffer:in_buf offset:in_offset atIndex:bind_index++];
-        }
+    // Every iteration reuses the same arena; the carry alternates between two output buffers,
+    // each iteration reading the one the previous iteration wrote
+    id<MTLBuffer> arena_buffer = allocate_arena(*this, device, commandBuffer);
+    std::shared_ptr<ArrayHandle> carries[2] = {make_root_handle(*this), nullptr};
+    if (iterations > 1) carries[1] = make_root_handle(*this);
 
-        // c) Launch the kernels one by one
-        MTLSize grid = MTLSizeMake(config.grid[0], config.grid[1], config.grid[2]);
-        MTLSize threadgroup = MTLSizeMake(config.group[0], config.group[1], config.group[2]);
-        [computeEncoder dispatchThreads:grid threadsPerThreadgroup:threadgroup];
-        // TODO: Noting when synchs are necessary; we could always synch between two kernels
-        // But technically only need to synch if RAW and WAW cases
-        // (like when they share the same mem in the arena)
-        // -> Change to: id<MTLComputeCommandEncoder> computeEncoder =
-        // [commandBuffer computeCommandEncoderWithDispatchType:MTLDispatchTypeConcurrent];
-        // And add fences when needed: MTLFence
+    std::vector<id<MTLBuffer>> input_buffers(inputs.size());
+    for (size_t k = 0; k < inputs.size(); ++k) input_buffers[k] = inputs[k]->metal_buffer();
+    std::vector<uint64_t> input_shifts(inputs.size(), 0);
+    for (int64_t t = 0; t < iterations; ++t) {
+        if (t > 0) {
+            input_buffers[carry_input] = carries[(t - 1) % 2]->metal_buffer();
+            // The previous iteration's writes (carry and arena) must land first
+            if (concurrent) [computeEncoder memoryBarrierWithScope:MTLBarrierScopeBuffers];
+        }
+        for (size_t k = 0; k < inputs.size(); ++k) {
+            input_shifts[k] = t * input_steps[k] * dtype_size(this->nodes[k].dtype);
+        }
+        encode_graph(*this, computeEncoder, concurrent, input_buffers, input_shifts, arena_buffer,
+                     carries[t % 2]->metal_buffer());
     }
     [computeEncoder endEncoding];
+
+    std::shared_ptr<ArrayHandle> output_handle = carries[(iterations - 1) % 2];
+    prof.write(*output_handle);
+    prof.watch(commandBuffer);
     [commandBuffer commit];
     output_handle->set_event(commandBuffer);
     return output_handle;
@@ -0,0 +1,79 @@
+#include "../include/scheduler.h"
+
+#include <algorithm>
+#include <atomic>
+#include <climits>
+
+#include "../include/memory_arena.h"
+
+namespace {
+std::atomic<bool> concurrency_enabled{true};
+
+// A byte range of one buffer: the root's own buffer (graph input or output) or, with
+// buffer == -1, the arena
+struct Region {
+    int buffer;
+    uint64_t begin;
+    uint64_t end;
+
+    bool overlaps(const Region& other) const {
+        return buffer == other.buffer && begin < other.end && other.begin < end;
+    }
+};
+
+bool overlaps_any(const Region& region, const std::vector<Region>& regions) {
+    return std::any_of(regions.begin(), regions.end(),
+                       [&](const Region& r) { return region.overlaps(r); });
+}
+}  // namespace
+
+void set_graph_concurrency(bool enabled) { concurrency_enabled = enabled; }
+
+bool graph_concurrency() { return concurrency_enabled; }
+
+std::vector<std::vector<int>> schedule_waves(const Graph& graph) {
+    const MemoryArena& arena = *graph.arena;
+    size_t num_nodes = graph.nodes.size();
+    if (num_nodes == 0) return {};
+    int output_root = arena.get_root(graph.output_index);
+
+    auto region = [&](int node_idx) -> Region {
+        int root = arena.get_root(node_idx);
+        const Node& node = graph.nodes[root];
+        if (node.op == OpCode::INPUT || root == output_root) return {root, 0, UINT64_MAX};
+        uint64_t nbytes = dtype_size(node.dtype) * numel_from_shape(node.shape);
+        uint64_t begin = arena.get_offset(root);
+        return {-1, begin, begin + ((nbytes + 3) & ~uint64_t(3))};
+    };
+    // Once kernels are generated, nodes with an empty config launch nothing
+    bool has_configs = graph.configs.size() == num_nodes;
+    auto launches = [&](size_t i) {
+        if (has_configs) return !graph.configs[i].name.empty();
+        return graph.nodes[i].op != OpCode::INPUT && arena.get_root(i) == i;
+    };
+
+    std::vector<int> level(num_nodes, -1);
+    std::vector<Region> writes(num_nodes);
+    std::vector<std::vector<Region>> reads(num_nodes);
+    std::vector<int> kernels;
+    int num_waves = 0;
+    for (size_t j = 0; j < num_nodes; ++j) {
+        if (!launches(j)) continue;
+        writes[j] = region(j);
+        for (int in : graph.nodes[j].inputs) reads[j].push_back(region(in));
+
+        level[j] = 0;
+        for (int i : kernels) {
+            bool raw = overlaps_any(writes[i], reads[j]);
+            bool war = overlaps_any(writes[j], reads[i]);
+            bool waw = writes[i].overlaps(writes[j]);
+            if (raw || war || waw) level[j] = std::max(level[j], level[i] + 1);
+        }
+        kernels.push_back(j);
+        num_waves = std::max(num_waves, level[j] + 1);
+    }
+
+    std::vector<std::vector<int>> waves(num_waves);
+    for (int i : kernels) waves[level[i]].push_back(i);
+    return waves;
+}
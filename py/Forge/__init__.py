@@ -1,6 +1,9 @@
-from . import ops, shape
+from . import data, dtypes, io, ops, optim, random, shape
 from .array import Array
-from .forge import forge
+from .dtypes import DType
+from .forge import forge, fori_loop, scan
+from .memory import memory_stats, reset_peak_memory
+from .profiler import profiler
 from .utils import _set_seed
 
 # package version
@@ -12,11 +15,48 @@ for op_name in ops.UNARY_OPS:
 for op_name in ops.NULLARY_OPS:
     globals()[op_name] = getattr(ops, op_name)
 
+for dtype_name in dtypes.DTYPES:
+    globals()[dtype_name] = getattr(dtypes, dtype_name)
+
+for op_name in ops.ROW_OPS:
+    globals()[op_name] = getattr(ops, op_name)
+
+for op_name in ops.MATMUL_OPS:
+    globals()[op_name] = getattr(ops, op_name)
+
+for op_name in ops.INDEX_OPS:
+    globals()[op_name] = getattr(ops, op_name)
+
+for op_name in ops.MASK_OPS:
+    globals()[op_name] = getattr(ops, op_name)
+
+for op_name in ops.SHAPE_OPS:
+    globals()[op_name] = getattr(ops, op_name)
+
 globals()["set_seed"] = _set_seed
 
-__all__ = [
-    "forge",
-    "Array",
-    "ops",
-    "shape",
-] + ops.UNARY_OPS
+__all__ = (
+    [
+        "forge",
+        "fori_loop",
+        "scan",
+        "profiler",
+        "memory_stats",
+        "reset_peak_memory",
+        "Array",
+        "DType",
+        "data",
+        "io",
+        "ops",
+        "optim",
+        "random",
+        "shape",
+    ]
+    + ops.UNARY_OPS
+    + ops.ROW_OPS
+    + ops.MATMUL_OPS
+    + ops.INDEX_OPS
+    + ops.MASK_OPS
+    + ops.SHAPE_OPS
+    + dtypes.DTYPES
+)
@@ -0,0 +1,264 @@
+from .dtypes import _itemsize
+from .graph import Ops
+
+_OP_NAMES = {v: k for k, v in vars(Ops).items() if k.isupper()}
+
+# Ops that only reinterpret their input's memory
+_VIEW_OPS = {Ops.RESHAPE, Ops.TRANSPOSE, Ops.VIEW}
+_NO_WORK_OPS = _VIEW_OPS | {Ops.INPUT, Ops.CONSTANT}
+# Rough FLOPs per element of the input row, e.g. softmax: max, sub, exp, sum, div
+_ROW_FLOPS = {
+    Ops.SOFTMAX: 5,
+    Ops.LOG_SOFTMAX: 5,
+    Ops.LOGSUMEXP: 4,
+    Ops.CROSS_ENTROPY: 6,
+}
+_ONE_FLOP_OPS = {Ops.ADD, Ops.SUB, Ops.MUL, Ops.DIV}
+# FLOPs per byte above which a node counts as compute-bound (roughly peak FLOP/s over
+# memory bandwidth of an Apple GPU)
+DEFAULT_RIDGE = 20.0
+
+
+def _numel(shape):
+    n = 1
+    for d in shape:
+        n *= d
+    return n
+
+
+def _nbytes(node):
+    return _numel(node[2]) * _itemsize(node[6])
+
+
+def _node_cost(nodes, i):
+    """Estimated (FLOPs, bytes read + written) of nodes[i]."""
+    op, inputs, shape = nodes[i][:3]
+    if op in _NO_WORK_OPS:
+        return 0, 0
+    moved = _nbytes(nodes[i]) + sum(_nbytes(nodes[j]) for j in inputs)
+    numel = _numel(shape)
+    if op == Ops.MATMUL:
+        k = nodes[inputs[0]][2][-1]
+        flops = 2 * numel * k
+        if len(inputs) > 2:
+            flops += numel  # bias
+        return flops, moved
+    if op in _ONE_FLOP_OPS:
+        return numel, moved
+    if op in _ROW_FLOPS:
+        return _ROW_FLOPS[op] * _numel(nodes[inputs[0]][2]), moved
+    if op in (Ops.INDEX_ADD, Ops.SCATTER_ADD):
+        return _numel(nodes[inputs[2]][2]), moved
+    # Data movement only: COPY, CAST, UPDATE, TAKE, GATHER, CONCAT
+    return 0, moved
+
+
+def _roots(nodes):
+    roots = list(range(len(nodes)))
+    for i, node in enumerate(nodes):
+        if node[0] in _VIEW_OPS:
+            roots[i] = roots[node[1][0]]
+    return roots
+
+
+class GraphReport:
+    """
+    Per-node cost model and memory layout of a traced or compiled @forge graph.
+
+    Each row has the node's op, shape, strides, offset and dtype, its estimated
+    FLOPs and bytes moved, their ratio (arithmetic intensity) and whether it is
+    "memory" or "compute" bound against `ridge` FLOPs per byte. For compiled
+    graphs, rows also carry the node's arena root and byte offset. `live_bytes` is
+    the memory the graph itself holds (graph inputs excluded) while the node runs,
+    from each buffer's first write to its last read.
+
+    Build one with `f.report(*args)` on a @forge function; `optimized=False`
+    reports the traced graph before the compiler passes, for comparison.
+    """
+
+    def __init__(
+        self,
+        nodes,
+        output_index,
+        arena_offsets=None,
+        arena_roots=None,
+        arena_placed_in=None,
+        arena_bytes=None,
+        remat=None,
+        ridge=DEFAULT_RIDGE,
+    ):
+        # nodes: flat tuples (op, inputs, shape, offset, strides, args, dtype)
+        self.nodes = [tuple(n) for n in nodes]
+        self.output_index = output_index
+        self.ridge = ridge
+        roots = list(arena_roots) if arena_roots is not None else _roots(self.nodes)
+        placed_in = list(arena_placed_in or [-1] * len(self.nodes))
+        self.rows = [
+            self._row(i, roots, arena_offsets, placed_in)
+            for i in range(len(self.nodes))
+        ]
+        self._liveness(roots, placed_in)
+
+        flops = sum(r["flops"] for r in self.rows)
+        moved = sum(r["bytes"] for r in self.rows)
+        peak = max(self.rows, key=lambda r: r["live_bytes"], default=None)
+        self.totals = {
+            "nodes": len(self.rows),
+            "flops": flops,
+            "bytes": moved,
+            "intensity": flops / moved if moved else 0.0,
+            "peak_bytes": peak["live_bytes"] if peak else 0,
+            "peak_node": peak["index"] if peak else None,
+            "arena_bytes": arena_bytes,
+            # Rematerialization under a memory budget: (nodes, FLOPs added, bytes saved)
+            "remat_nodes": remat[0] if remat else 0,
+            "remat_flops": remat[1] if remat else 0,
+            "remat_bytes_saved": remat[2] if remat else 0,
+            "memory_bound_bytes": sum(
+                r["bytes"] for r in self.rows if r["bound"] == "memory"
+            ),
+        }
+
+    @classmethod
+    def from_backend(cls, graph, ridge=DEFAULT_RIDGE):
+        """Report of a compiled backend Graph (after the compiler passes)."""
+        nodes = [
+            (n.op, n.inputs, n.shape, n.offset, n.strides, n.args, n.dtype)
+            for n in graph.nodes
+        ]
+        return cls(
+            nodes,
+            graph.output_index,
+            arena_offsets=graph.arena_offsets,
+            arena_roots=graph.arena_roots,
+            arena_placed_in=graph.arena_placed_in,
+            arena_bytes=graph.arena_bytes,
+            remat=(graph.remat_nodes, graph.remat_flops, graph.remat_bytes_saved),
+            ridge=ridge,
+        )
+
+    def _row(self, i, roots, arena_offsets, placed_in):
+        op, inputs, shape, offset, strides, args, dtype = self.nodes[i]
+        flops, moved = _node_cost(self.nodes, i)
+        intensity = flops / moved if moved else 0.0
+        if not moved:
+            bound = "-"
+        else:
+            bound = "compute" if intensity >= self.ridge else "memory"
+        return {
+            "index": i,
+            "op": _OP_NAMES.get(op, str(op)),
+            "inputs": list(inputs),
+            "shape": tuple(shape),
+            "strides": tuple(strides),
+            "offset": offset,
+            "dtype": int(dtype),
+            "flops": flops,
+            "bytes": moved,
+            "intensity": intensity,
+            "bound": bound,
+            "root": roots[i],
+            "placed_in": placed_in[i],
+            "arena_offset": arena_offsets[i] if arena_offsets is not None else None,
+            "live_bytes": 0,
+        }
+
+    def _liveness(self, roots, placed_in):
+        # A buffer is owned by its root, or by the CONCAT it is placed in; graph inputs
+        # belong to the caller
+        owner = [placed_in[r] if placed_in[r] != -1 else r for r in roots]
+        first, last = {}, {}
+        for i, node in enumerate(self.nodes):
+            o = owner[i]
+            first.setdefault(o, i)
+            for j in node[1]:
+                last[owner[j]] = i
+        out = owner[self.output_index] if self.nodes else None
+        live = 0
+        ends = {}
+        for i in range(len(self.nodes)):
+            o = owner[i]
+            if first[o] == i and self.nodes[o][0] != Ops.INPUT:
+                end = len(self.nodes) if o == out else last.get(o, i)
+                live += _nbytes(self.nodes[o])
+                ends.setdefault(end, []).append(o)
+            self.rows[i]["live_bytes"] = live
+            for o in ends.pop(i, []):
+                live -= _nbytes(self.nodes[o])
+
+    def table(self):
+        """The rows and totals as a printable table."""
+        lines = [
+            f"{'#':>4} {'op':<14} {'shape':<20} {'inputs':<12} {'FLOPs':>12} "
+            f"{'bytes':>12} {'FLOP/B':>8} {'bound':<8} {'live':>12}",
+            "-" * 110,
+        ]
+        for r in self.rows:
+            lines.append(
+                f"{r['index']:>4} {r['op']:<14} {str(r['shape']):<20} "
+                f"{str(r['inputs']):<12} {r['flops']:>12} {r['bytes']:>12} "
+                f"{r['intensity']:>8.2f} {r['bound']:<8} {r['live_bytes']:>12}"
+            )
+        t = self.totals
+        lines.append("-" * 110)
+        lines.append(
+            f"total: {t['flops']} FLOPs, {t['bytes']} bytes "
+            f"({t['intensity']:.2f} FLOP/B), {t['memory_bound_bytes']} bytes in "
+            f"memory-bound nodes, peak {t['peak_bytes']} bytes at node {t['peak_node']}"
+            + (
+                f", arena {t['arena_bytes']} bytes"
+                if t["arena_bytes"] is not None
+                else ""
+            )
+        )
+        if t["remat_nodes"]:
+            lines.append(
+                f"recomputed {t['remat_nodes']} nodes: +{t['remat_flops']} FLOPs, "
+                f"-{t['remat_bytes_saved']} arena bytes"
+            )
+        return "\n".join(lines)
+
+    def to_dot(self, name="forge_graph"):
+        """
+        The graph in Graphviz DOT. Memory-bound nodes are filled orange,
+        compute-bound ones blue and the peak-memory node is outlined in red.
+        """
+        lines = [f"digraph {name} {{", "  node [shape=record, fontsize=10];"]
+        for r in self.rows:
+            fields = [
+                f"#{r['index']} {r['op']}",
+                f"shape {r['shape']} strides {r['strides']} offset {r['offset']}",
+                f"{r['flops']} FLOPs, {r['bytes']} B, {r['intensity']:.2f} FLOP/B",
+            ]
+            if r["arena_offset"] is not None:
+                arena = f"root {r['root']} @ {r['arena_offset']}"
+                if r["placed_in"] != -1:
+                    arena += f" in #{r['placed_in']}"
+                fields.append(arena)
+            fields.append(f"live {r['live_bytes']} B")
+            label = "|".join(_dot_escape(f) for f in fields)
+            style = {"memory": "orange", "compute": "lightblue"}.get(r["bound"])
+            attrs = [f'label="{{{label}}}"']
+            if style:
+                attrs.append(f'style=filled, fillcolor="{style}"')
+            if r["index"] == self.totals["peak_node"]:
+                attrs.append("color=red, penwidth=2")
+            if r["index"] == self.output_index:
+                attrs.append("peripheries=2")
+            lines.append(f"  n{r['index']} [{', '.join(attrs)}];")
+        for r in self.rows:
+            for j in r["inputs"]:
+                lines.append(f"  n{j} -> n{r['index']};")
+        t = self.totals
+        lines.append(
+            f'  label="{t["flops"]} FLOPs, {t["bytes"]} bytes, '
+            f'{t["intensity"]:.2f} FLOP/B, peak {t["peak_bytes"]} bytes";'
+        )
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def _dot_escape(text):
+    for ch in '\\{}|<>"':
+        text = text.replace(ch, "\\" + ch)
+    return text
@@ -2,13 +2,14 @@ from array import array
 from typing import Sequence
 
 from . import _backend
-from .utils import _indexing_helper
+from .dtypes import _TYPECODES, _as_dtype, float32, int32, uint8
+from .utils import _check_assignable, _indexing_helper, _split_index_array
 
 
 def _infer_shape_and_flatten(x):
     """
     Takes nested lists/tuples and returns (shape, flat_list_of_floats).
-    ValueError if missing values. Only floats for now.
+    ValueError if missing values. Values are returned as floats.
     """
     if isinstance(x, (int, float)):
         return (), [float(x)]
@@ -32,9 +33,9 @@ def _infer_shape_and_flatten(x):
             "shape required for raw bytes; use Array.from_buffer(buf, shape) and specify shape"
         )
     if isinstance(x, array):
-        if x.typecode != "f":
-            raise TypeError("array must be of type 'float32'")
-        return (len(x),), list(x)
+        if x.typecode not in _TYPECODES:
+            raise TypeError("array must have typecode 'f', 'i' or 'B'")
+        return (len(x),), [float(v) for v in x]
     raise TypeError(f"unsupported input type: {type(x)}")
 
 
@@ -42,21 +43,28 @@ class Array:
     """
     Python Array that the library provides.
     Stores only metadata and a backend handle (where the data is).
+    Shape, strides, offset and dtype are read from the handle in one backend call on
+    first use and cached, since a handle's layout never changes.
     """
 
-    def __init__(self, data):
+    __slots__ = ("_handle", "_meta", "_keep", "__weakref__")
+
+    def __init__(self, data, dtype=None):
         """
         Accepts:
          - Existing Array
-         - Nested Python lists/tuples
-         - Python array('f') type
+         - Nested Python lists/tuples (float32 unless `dtype` is given)
+         - Python array('f'), array('i') or array('B') (float32, int32, uint8)
          - bytes/memoryview with Array.from_buffer
+        A `dtype` that differs from the data's is converted on the device.
         """
+        self._meta = None
         if isinstance(data, Array):
             # Existing Array
             self._handle = data._handle
-            self.shape = data.shape
+            self._meta = data._meta
             self._keep = data
+            self._convert(dtype)
             return
 
         try:
@@ -66,37 +74,51 @@ class Array:
         if backend_type is not None and isinstance(data, backend_type):
             # Passed a backend array handle
             self._handle = data
-            self.shape = tuple(_backend.array_shape(self._handle))
+            self._convert(dtype)
             return
 
         if isinstance(data, array):
-            # Python array('f') type
-            if data.typecode != "f":
-                raise TypeError("array must have type float32")
-            shape = (len(data),)
+            # Python array('f'/'i'/'B') type
+            if data.typecode not in _TYPECODES:
+                raise TypeError("array must have typecode 'f', 'i' or 'B'")
             mv = memoryview(data)
-            self._handle = _backend.create_array_from_buffer(mv, list(shape))
-            self.shape = shape
+            self._handle = _backend.create_array_from_buffer(mv, [len(data)])
             self._keep = data
+            self._convert(dtype)
             return
 
         else:
             # Nested Python lists/tuples
+            dtype = float32 if dtype is None else _as_dtype(dtype)
             shape, flat = _infer_shape_and_flatten(data)
-            buf = array("f", flat)
+            if dtype == int32:
+                buf = array("i", (int(x) for x in flat))
+            elif dtype == uint8:
+                buf = array("B", (int(x) for x in flat))
+            else:
+                # 16-bit floats are converted from float32 on the device
+                buf = array("f", flat)
             self._keep = buf
             mv = memoryview(buf)
             self._handle = _backend.create_array_from_buffer(mv, list(shape))
-            self.shape = shape
+            self._convert(dtype)
             return
 
+    def _convert(self, dtype):
+        if dtype is not None:
+            self._handle = _backend.astype(self._handle, _as_dtype(dtype))
+            self._meta = None
+
     @classmethod
     def from_buffer(cls, buf, shape: Sequence[int]):
-        """Construct Array from memoryview/array('f') with explicit shape"""
+        """
+        Construct Array from memoryview/array/ndarray with explicit shape.
+        The dtype follows the buffer's format (float32, float16, int32, uint8, ...).
+        """
         mv = memoryview(buf)
         inst = cls.__new__(cls)
         inst._handle = _backend.create_array_from_buffer(mv, list(shape))
-        inst.shape = tuple(shape)
+        inst._meta = None
         return inst
 
     @classmethod
@@ -104,23 +126,56 @@ class Array:
         """Construct Array from a backend array handle"""
         inst = cls.__new__(cls)
         inst._handle = handle
-        inst.shape = tuple(_backend.array_shape(handle))
+        inst._meta = None
         return inst
 
+    def _load_meta(self):
+        self._meta = self._handle.meta
+        return self._meta
+
+    @property
+    def shape(self):
+        return (self._meta or self._load_meta())[0]
+
     @property
     def strides(self):
-        return self._handle.strides
+        return (self._meta or self._load_meta())[1]
 
     @property
     def offset(self):
-        return self._handle.offset
+        return (self._meta or self._load_meta())[2]
+
+    @property
+    def dtype(self):
+        return (self._meta or self._load_meta())[3]
 
     def list(self):
         """Return back a nested list form"""
         return _backend.array_to_list(self._handle)
 
+    def item(self):
+        """Value of a one-element Array as a Python scalar (waits for the device)."""
+        size = 1
+        for dim in self.shape:
+            size *= dim
+        if size != 1:
+            raise ValueError("Array: item() needs an Array with exactly one element")
+        return _backend.make_view(self._handle, [], [], self.offset).item()
+
+    def astype(self, dtype):
+        """
+        Convert to `dtype` (a Forge DType or its name) into a new dense Array.
+        Returns self if the dtype already matches.
+        """
+        dtype = _as_dtype(dtype)
+        if dtype == self.dtype:
+            return self
+        return Array.from_handle(_backend.astype(self._handle, dtype))
+
     def __repr__(self):
-        return f"Array(shape = {self.shape}, type=float)\n" + str(self.list())
+        return f"Array(shape = {self.shape}, dtype={self.dtype.name})\n" + str(
+            self.list()
+        )
 
     def __str__(self):
         return self.__repr__()
@@ -128,31 +183,54 @@ class Array:
     def __len__(self):
         return self.shape[0]
 
+    def __bool__(self):
+        """Truth of a one-element Array, so `if a == b:` tests the comparison mask."""
+        size = 1
+        for dim in self.shape:
+            size *= dim
+        if size != 1:
+            raise ValueError(
+                "truth value of an Array with more than one element is ambiguous"
+            )
+        return self.item() != 0
+
     def __getitem__(self, key):
         """
         Indexing and slicing, returns a new Array that refers to the same data.
         Index by [3], [3,4], or negatives [-1] or slice [3:5].
+        One entry may be an integer index Array or list ([idx], [:, idx]), which
+        gathers along that axis on the device into a new Array (see Array.take).
         """
-        new_shape, new_strides, new_offset = _indexing_helper(self, key)
-
-        handle = _backend.make_view(self._handle, new_shape, new_strides, new_offset)
-        if len(new_shape) == 0:
-            return handle.item()
-        return Array(handle)
+        try:
+            result = _backend.index(self._handle, key)
+        except TypeError:
+            split = _split_index_array(
+                self, key, lambda k: isinstance(k, (Array, list))
+            )
+            if split is None:
+                raise
+            basic_key, axis, indices = split
+            return self[basic_key].take(indices, axis)
+        if isinstance(result, _backend.ArrayHandle):
+            return Array.from_handle(result)
+        return result
 
     def __setitem__(self, key, value):
         """
         Set values of an indexed into view.
         Value can be a scalar or an Array of matching shape.
         """
+        _check_assignable(key)
         new_shape, new_strides, new_offset = _indexing_helper(self, key)
 
         if isinstance(value, (list, tuple)):
             value = Array(value)
 
         if isinstance(value, (int, float)):
-            val_handle = Array([value])._handle
-        elif isinstance(value, Array):
+            _backend.fill_view(self._handle, value, new_shape, new_strides, new_offset)
+            return
+
+        if isinstance(value, Array):
             size = 1
             for dim in value.shape:
                 size *= dim
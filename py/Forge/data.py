@@ -0,0 +1,120 @@
+import queue
+import random
+import threading
+from array import array
+from typing import Optional
+
+from . import _backend
+from .array import Array
+from .ops import zeros
+
+
+class DataLoader:
+    """
+    Iterates over minibatches of one or more Arrays that share their first dimension,
+    yielding one batch Array per dataset Array (or the batch itself for one Array).
+    Rows are gathered on the device into preallocated, double-buffered batch Arrays.
+    With `prefetch`, a background thread gathers the next batch while the current
+    one is in use. A yielded batch is overwritten two batches later, so copy it
+    (e.g. with astype to another dtype or `+ 0`) to keep it around.
+    """
+
+    def __init__(
+        self,
+        *arrays: Array,
+        batch_size: int,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        prefetch: bool = True,
+        seed: Optional[int] = None,
+    ):
+        if not arrays:
+            raise ValueError("DataLoader: expected at least one Array")
+        for a in arrays:
+            if not isinstance(a, Array) or len(a.shape) == 0:
+                raise TypeError(
+                    "DataLoader: datasets must be Arrays with a batch dimension"
+                )
+        if any(len(a) != len(arrays[0]) for a in arrays):
+            raise ValueError("DataLoader: Arrays must have the same length")
+        if batch_size <= 0:
+            raise ValueError("DataLoader: batch_size must be positive")
+        self.arrays = arrays
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.prefetch = prefetch
+        self._rng = random.Random(seed)
+        self._num_rows = len(arrays[0])
+        self._order = None
+        # Two slots of preallocated batches: one in use, one being filled
+        self._slots = [
+            [zeros([batch_size] + list(a.shape[1:]), dtype=a.dtype) for a in arrays]
+            for _ in range(2)
+        ]
+
+    def __len__(self):
+        if self.drop_last:
+            return self._num_rows // self.batch_size
+        return -(-self._num_rows // self.batch_size)
+
+    def _epoch_order(self):
+        """Row order for one epoch as an int32 Array (uploaded once per epoch)."""
+        if not self.shuffle:
+            if self._order is None:
+                self._order = Array(array("i", range(self._num_rows)))
+            return self._order
+        order = list(range(self._num_rows))
+        self._rng.shuffle(order)
+        return Array(array("i", order))
+
+    def _gather(self, slot, order, start):
+        count = min(self.batch_size, self._num_rows - start)
+        indices = order[start : start + count]
+        batch = []
+        for src, out in zip(self.arrays, self._slots[slot]):
+            if count < self.batch_size:
+                out = out[:count]
+            _backend.gather_rows(out._handle, src._handle, indices._handle)
+            batch.append(out)
+        return batch[0] if len(batch) == 1 else tuple(batch)
+
+    def _produce(self, order, free, ready, stop):
+        try:
+            for i in range(len(self)):
+                free.acquire()
+                if stop.is_set():
+                    return
+                ready.put(self._gather(i % 2, order, i * self.batch_size))
+            ready.put(None)
+        except BaseException as e:
+            ready.put(e)
+
+    def __iter__(self):
+        order = self._epoch_order()
+        if not self.prefetch:
+            for i in range(len(self)):
+                yield self._gather(i % 2, order, i * self.batch_size)
+            return
+
+        # A slot is released when the consumer asks for the batch after it
+        free = threading.Semaphore(2)
+        ready = queue.Queue()
+        stop = threading.Event()
+        worker = threading.Thread(
+            target=self._produce, args=(order, free, ready, stop), daemon=True
+        )
+        worker.start()
+        try:
+            while True:
+                batch = ready.get()
+                if batch is None:
+                    return
+                if isinstance(batch, BaseException):
+                    raise batch
+                yield batch
+                free.release()
+        finally:
+            stop.set()
+            free.release()
+            worker.join()
@@ -0,0 +1,44 @@
+from . import _backend
+
+# Mirrors the DType enum in common.h
+DType = _backend.DType
+
+float32 = DType.float32
+float16 = DType.float16
+bfloat16 = DType.bfloat16
+int32 = DType.int32
+uint8 = DType.uint8
+
+DTYPES = ["float32", "float16", "bfloat16", "int32", "uint8"]
+
+# Python array module typecodes that map directly onto a DType
+_TYPECODES = {"f": float32, "i": int32, "B": uint8}
+
+
+def _as_dtype(dtype):
+    """Accepts a DType or its name, e.g. Forge.float16 or "float16"."""
+    if isinstance(dtype, str):
+        if dtype not in DTYPES:
+            raise TypeError(f"unsupported dtype: {dtype}")
+        return getattr(DType, dtype)
+    if isinstance(dtype, DType):
+        return dtype
+    raise TypeError(f"dtype must be a Forge DType or its name, got {type(dtype)}")
+
+
+# Bytes per element, by the integer value of the DType
+_ITEMSIZES = {
+    int(float32): 4,
+    int(float16): 2,
+    int(bfloat16): 2,
+    int(int32): 4,
+    int(uint8): 1,
+}
+
+
+def _itemsize(dtype):
+    return _ITEMSIZES[int(dtype)]
+
+
+def _is_float(dtype):
+    return dtype in (float32, float16, bfloat16)
@@ -2,71 +2,196 @@ import functools
 import weakref
 
 from . import _backend, graph
+from .analysis import DEFAULT_RIDGE, GraphReport
 from .array import Array
 from .graph import Graph, Node, Ops
 from .symbolic import SymbolicArray
+from .utils import _default_strides
 
 GRAPH_CACHE = weakref.WeakKeyDictionary()
 
 
 def _flatten(g, output):
-    node_to_id = {node: i for i, node in enumerate(g.nodes)}
-    flat_nodes = []
-    for node in g.nodes:
-        input_ids = [node_to_id[parent] for parent in node.inputs]
-        flat_nodes.append(
-            (node.op, input_ids, node.shape, node.offset, node.strides, node.args)
+    """The traced nodes as tuples (for reports) and the output index."""
+    flat_nodes = [
+        (
+            node.op,
+            [parent.index for parent in node.inputs],
+            node.shape,
+            node.offset,
+            node.strides,
+            node.args,
+            node.dtype,
         )
-    return flat_nodes, node_to_id[output.node]
+        for node in g.nodes
+    ]
+    return flat_nodes, output.node.index
 
 
-def _print_helper(flat_nodes, output_index):
-    for node in flat_nodes:
-        print(node[0])
-        print(*node[1])
-        print(*node[2])
-        print(*node[4])
-        print(node[3])
-        print(*node[5])
-    print(output_index)
+def _trace_graph(fn, args):
+    """Traces fn on symbolic stand-ins for args into a Graph and its symbolic output."""
+    g = Graph()
+    graph.CURRENT_GRAPH = g
+    sym_args = []
+    for x in args:
+        input_node = Node(Ops.INPUT, [], x.shape, x.offset, x.strides, dtype=x.dtype)
+        g.add(input_node)
+        sym_args.append(SymbolicArray(input_node))
+    try:
+        # assume for now that output is an Array type for fn
+        # thus caught as a symbolicArray
+        # TODO: Support return multiple Array/constants or other types
+        sym_out = fn(*sym_args)
+    finally:
+        graph.CURRENT_GRAPH = None
+    return g, sym_out
 
 
-def forge(fn=None, *, debug=False):
-    """Decorator"""
+def _trace(fn, args):
+    """Traces fn on symbolic stand-ins for args into flat nodes and the output index."""
+    return _flatten(*_trace_graph(fn, args))
+
+
+def _compile(fn, args, debug=False, memory_budget=None):
+    """
+    The backend graph of fn for the shapes/strides/dtypes of args (and memory
+    budget), compiled once.
+    """
+    input_metas = tuple(
+        (x.shape, x.offset, tuple(x.strides), int(x.dtype)) for x in args
+    )
+    key = (input_metas, memory_budget)
+    graph_cache = GRAPH_CACHE.setdefault(fn, {})
+    if key in graph_cache:
+        return graph_cache[key]
+    if debug:
+        print(f"Compiling func {fn.__name__}")
+    g, sym_out = _trace_graph(fn, args)
+    if debug:
+        print(GraphReport(*_flatten(g, sym_out)).table())
+    # The packed arrays built while tracing are read by the backend in place
+    backend_graph = _backend.make_graph_packed(
+        g.packed.buffers(), sym_out.node.index, int(memory_budget or 0)
+    )
+    if debug:
+        print(GraphReport.from_backend(backend_graph).table())
+    graph_cache[key] = backend_graph
+    return backend_graph
+
+
+def forge(fn=None, *, debug=False, memory_budget=None):
+    """
+    Decorator compiling fn into a graph per input signature. With `debug`, prints
+    the cost report of the traced and the compiled graph when compiling.
+    `f.report(*args)` returns the GraphReport of the graph f runs for args
+    (`optimized=False` for the traced graph, before the compiler passes).
+
+    With `memory_budget` (bytes), the compiler recomputes cheap nodes (elementwise
+    ops and casts) right before late uses instead of keeping them alive, until the
+    graph's arena fits the budget or nothing more helps. The report's totals show
+    the nodes recomputed, the FLOPs that adds and the arena bytes it saves.
+    """
     if fn is None:
-        return functools.partial(forge, debug=debug)
+        return functools.partial(forge, debug=debug, memory_budget=memory_budget)
+    if memory_budget is not None and memory_budget <= 0:
+        raise ValueError("forge: memory_budget must be a positive number of bytes")
 
     @functools.wraps(fn)
     def wrapper(*args):
-        input_metas = tuple((x.shape, x.offset, tuple(x.strides)) for x in args)
-        graph_cache = GRAPH_CACHE.setdefault(fn, {})
-        if input_metas in graph_cache:
-            backend_graph = graph_cache[input_metas]
-        else:
-            if debug:
-                print(f"Compiling func {fn.__name__}")
-            g = Graph()
-            graph.CURRENT_GRAPH = g
-            sym_args = []
-            for x in args:
-                input_node = Node(Ops.INPUT, [], x.shape, x.offset, x.strides)
-                g.add(input_node)
-                sym_args.append(SymbolicArray(input_node))
-            try:
-                # assume for now that output is an Array type for fn
-                # thus caught as a symbolicArray
-                # TODO: Support return multiple Array/constants or other types
-                sym_out = fn(*sym_args)
-            finally:
-                graph.CURRENT_GRAPH = None
-
-            flat_nodes, output_index = _flatten(g, sym_out)
-            if debug:
-                _print_helper(flat_nodes, output_index)
-            backend_graph = _backend.make_graph(flat_nodes, output_index)
-            graph_cache[input_metas] = backend_graph
-
+        backend_graph = _compile(fn, args, debug, memory_budget)
         inputs = [x._handle for x in args]
         return Array(backend_graph.execute(inputs))
 
+    def report(*args, optimized=True, ridge=DEFAULT_RIDGE):
+        if not optimized:
+            return GraphReport(*_trace(fn, args), ridge=ridge)
+        return GraphReport.from_backend(
+            _compile(fn, args, memory_budget=memory_budget), ridge=ridge
+        )
+
+    wrapper.report = report
     return wrapper
+
+
+def _dense(x):
+    """x itself if it is dense with offset 0, else a dense copy."""
+    if x.offset == 0 and tuple(x.strides) == _default_strides(x.shape):
+        return x
+    out = Array.from_handle(_backend.zeros(list(x.shape), x.dtype))
+    out[...] = x
+    return out
+
+
+def _first(x):
+    """View of x[0] as an Array, 0-d when x is 1-d (where x[0] is a Python scalar)."""
+    return Array.from_handle(
+        _backend.make_view(x._handle, list(x.shape[1:]), list(x.strides[1:]), x.offset)
+    )
+
+
+def _loop(name, body, init, iterations, sliced, args):
+    if isinstance(init, SymbolicArray):
+        # Inside a @forge function the loop is unrolled into the traced graph
+        carry = init
+        for t in range(iterations):
+            carry = body(carry, *(x[t] for x in sliced), *args)
+        return carry
+    if iterations == 0:
+        return init
+
+    init = _dense(init)
+    loop_args = (init, *(_first(x) for x in sliced), *args)
+    backend_graph = _compile(body, loop_args)
+    out = backend_graph.nodes[backend_graph.output_index]
+    if (tuple(out.shape), int(out.dtype)) != (init.shape, int(init.dtype)):
+        raise ValueError(
+            f"{name}: body must return the carry's shape {init.shape} and dtype "
+            f"{init.dtype}, got shape {tuple(out.shape)}"
+        )
+    output_root = backend_graph.arena_roots[backend_graph.output_index]
+    if (
+        output_root != backend_graph.output_index
+        or out.op == Ops.INPUT
+        or tuple(out.strides) != init.strides
+    ):
+        raise ValueError(f"{name}: body must return a new dense Array, not a view")
+    steps = [0] + [x.strides[0] for x in sliced] + [0] * len(args)
+    inputs = [x._handle for x in loop_args]
+    return Array(backend_graph.execute_loop(inputs, iterations, 0, steps))
+
+
+def fori_loop(iterations: int, body, init, *args):
+    """
+    Runs `carry = body(carry, *args)` `iterations` times and returns the final
+    carry. body is traced once, like a @forge function, and every iteration runs
+    in a single command buffer that reuses one arena, with no return to Python
+    in between. The carry is one Array whose shape and dtype body keeps; args
+    are loop-invariant Arrays. Inside a @forge function the loop is unrolled.
+
+        step = lambda w, x, y: w - (x.T @ (x @ w - y)) * 0.1
+        w = Forge.fori_loop(1000, step, w0, x, y)
+    """
+    if iterations < 0:
+        raise ValueError("fori_loop: iterations must be non-negative")
+    return _loop("fori_loop", body, init, iterations, [], args)
+
+
+def scan(body, init, xs, *args):
+    """
+    Runs `carry = body(carry, x, *args)` for each x in xs along its first axis,
+    and returns the final carry. xs can be one Array or a tuple of Arrays of
+    the same length, whose slices are passed in order, e.g. minibatches of
+    inputs and labels:
+
+        w = Forge.scan(sgd_step, w0, (batches_x, batches_y))
+
+    Runs like fori_loop: body is traced once for the slices' layout and every
+    step runs in one command buffer, each one reading the next slice in place.
+    """
+    sliced = list(xs) if isinstance(xs, (tuple, list)) else [xs]
+    if not sliced or any(len(x.shape) == 0 for x in sliced):
+        raise ValueError("scan: xs must be Arrays with at least one dimension")
+    iterations = sliced[0].shape[0]
+    if any(x.shape[0] != iterations for x in sliced):
+        raise ValueError("scan: every Array in xs needs the same first dimension")
+    return _loop("scan", body, init, iterations, sliced, args)
@@ -1,3 +1,7 @@
+import struct
+from array import array
+
+
 class Ops:
     INPUT = 0
     MATMUL = 1
@@ -11,10 +15,20 @@ class Ops:
     UPDATE = 9
     CONSTANT = 10
     COPY = 11
+    SOFTMAX = 12
+    LOG_SOFTMAX = 13
+    LOGSUMEXP = 14
+    CROSS_ENTROPY = 15
+    CAST = 16
+    TAKE = 17
+    GATHER = 18
+    INDEX_ADD = 19
+    SCATTER_ADD = 20
+    CONCAT = 21
 
 
 class Node:
-    __slots__ = ("op", "inputs", "shape", "offset", "strides", "args")
+    __slots__ = ("op", "inputs", "shape", "offset", "strides", "args", "dtype", "index")
 
     def __init__(
         self,
@@ -24,6 +38,7 @@ class Node:
         offset: int,
         strides: tuple,
         args=None,
+        dtype=None,
     ):
         self.op = op
         self.inputs = inputs
@@ -31,14 +46,104 @@ class Node:
         self.offset = offset
         self.strides = strides
         self.args = args if args is not None else ()
+        # Integer value of the DType enum (common.h); inherited from the first
+        # input unless given, and float32 (0) for nodes without inputs
+        if dtype is None:
+            dtype = inputs[0].dtype if inputs else 0
+        self.dtype = int(dtype)
+        # Position in the graph it was added to (-1 until then)
+        self.index = -1
+
+
+# Ops whose args are a flat tuple of ints
+_INT_ARG_OPS = {
+    Ops.SOFTMAX,
+    Ops.LOG_SOFTMAX,
+    Ops.LOGSUMEXP,
+    Ops.CROSS_ENTROPY,
+    Ops.CAST,
+    Ops.TAKE,
+    Ops.GATHER,
+    Ops.INDEX_ADD,
+    Ops.SCATTER_ADD,
+    Ops.CONCAT,
+}
+
+
+def _packed_args(node):
+    """node.args as the int64s the backend stores (see parse_nodes)."""
+    if node.op == Ops.UPDATE:
+        # (shape, strides, offset)
+        shape, strides, offset = node.args
+        return [*shape, *strides, offset]
+    if node.op in _INT_ARG_OPS:
+        return node.args
+    if node.op == Ops.MATMUL and len(node.args) == 2:
+        # (activation, alpha), alpha as its float32 bits
+        activation, alpha = node.args
+        (bits,) = struct.unpack("<i", struct.pack("<f", alpha))
+        return (activation, bits)
+    return ()
+
+
+class PackedNodes:
+    """
+    The nodes of a graph as int64 arrays (structure of arrays), appended to while
+    tracing and read by the backend in place. Per node: `ops`, `dtypes` and
+    `offsets`; its inputs (node indices) are `inputs[input_starts[i]:input_starts[i
+    + 1]]`, its shape and strides `shapes`/`strides[dim_starts[i]:dim_starts[i +
+    1]]` and its args `args[arg_starts[i]:arg_starts[i + 1]]`.
+    """
+
+    FIELDS = (
+        "ops",
+        "dtypes",
+        "offsets",
+        "input_starts",
+        "inputs",
+        "dim_starts",
+        "shapes",
+        "strides",
+        "arg_starts",
+        "args",
+    )
+
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, array("q"))
+        self.input_starts.append(0)
+        self.dim_starts.append(0)
+        self.arg_starts.append(0)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def append(self, node: Node):
+        self.ops.append(node.op)
+        self.dtypes.append(node.dtype)
+        self.offsets.append(node.offset)
+        self.inputs.extend(parent.index for parent in node.inputs)
+        self.input_starts.append(len(self.inputs))
+        self.shapes.extend(node.shape)
+        self.strides.extend(node.strides)
+        self.dim_starts.append(len(self.shapes))
+        self.args.extend(_packed_args(node))
+        self.arg_starts.append(len(self.args))
+
+    def buffers(self):
+        """The arrays in FIELDS order, as make_graph_packed takes them."""
+        return [getattr(self, name) for name in self.FIELDS]
 
 
 class Graph:
     def __init__(self):
         self.nodes = []
+        self.packed = PackedNodes()
 
     def add(self, node: Node):
+        node.index = len(self.nodes)
         self.nodes.append(node)
+        self.packed.append(node)
         return node
 
 
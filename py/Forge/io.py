@@ -0,0 +1,42 @@
+import os
+from typing import Sequence, Union
+
+from . import _backend
+from .array import Array
+from .dtypes import _as_dtype
+
+
+def from_file(
+    path, shape: Union[int, Sequence[int]], dtype="uint8", offset: int = 0
+) -> Array:
+    """
+    Memory-map the binary file `path` as an Array of `shape` and `dtype`,
+    starting `offset` bytes in (e.g. past a header).
+    The file's pages back the Array directly, nothing is copied through Python.
+    Writes to the Array stay in memory and never reach the file.
+    """
+    shape = [shape] if isinstance(shape, int) else list(shape)
+    h = _backend.from_file(os.fspath(path), shape, _as_dtype(dtype), offset)
+    return Array.from_handle(h)
+
+
+def normalize(x: Array, scale: float = 1.0, shift: float = 0.0, dtype="float32"):
+    """
+    x * scale + shift converted to `dtype` in a single kernel,
+    e.g. normalize(pixels, 1 / 255) for uint8 images.
+    """
+    return Array.from_handle(
+        _backend.astype_scaled(x._handle, _as_dtype(dtype), scale, shift)
+    )
+
+
+def one_hot(labels: Array, num_classes: int, dtype="float32"):
+    """
+    One-hot encode the class indices in `labels` along a new last axis
+    of size `num_classes`. Out of range labels give all-zero rows.
+    """
+    h = _backend.one_hot(labels._handle, num_classes, _as_dtype(dtype))
+    return Array.from_handle(h)
+
+
+Array.from_file = staticmethod(from_file)
@@ -0,0 +1,43 @@
+from . import _backend
+from .forge import GRAPH_CACHE
+
+_STAT_NAMES = (
+    "live_bytes",
+    "peak_bytes",
+    "arena_bytes",
+    "allocations",
+    "frees",
+    "live_buffers",
+    "live_handles",
+)
+
+
+def memory_stats():
+    """
+    Device memory held by Forge, as a dict:
+
+    - live_bytes / peak_bytes: bytes of Array storage and graph arenas currently
+      allocated, and the most ever held at once (see reset_peak_memory). Views share
+      their base Array's storage and add nothing.
+    - arena_bytes: the part of live_bytes held by graph arenas still executing.
+    - allocations / frees / live_buffers: buffers allocated and released so far, and
+      how many are still alive.
+    - live_handles: backend handles alive, views included (a steady rise across
+      iterations of a loop points to a leak).
+    - graph_arena_bytes: for each @forge function, the arena size of every compiled
+      graph (one per input signature), which each call allocates while it runs.
+
+    Memory-mapped files (Forge.io.from_file) aren't counted.
+    """
+    stats = _backend.memory_stats()
+    out = {name: getattr(stats, name) for name in _STAT_NAMES}
+    out["graph_arena_bytes"] = {
+        fn.__qualname__: [g.arena_bytes for g in graphs.values()]
+        for fn, graphs in GRAPH_CACHE.items()
+    }
+    return out
+
+
+def reset_peak_memory():
+    """Restarts peak_bytes from the memory currently held."""
+    _backend.reset_peak_memory()
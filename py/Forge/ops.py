@@ -2,6 +2,9 @@ from typing import Sequence, Union
 
 from . import _backend
 from .array import Array
+from .dtypes import _as_dtype, _is_float, float32, int32, uint8
+from .symbolic import SymbolicArray
+from .utils import _activation_code, _normalize_axis
 
 
 def _to_array(x):
@@ -16,8 +19,11 @@ def _to_array(x):
 
 def _make_binop(op_name):
     backend_fn = getattr(_backend, op_name)
+    scalar_fn = getattr(_backend, op_name + "_scalar")
 
     def method(self, other):
+        if isinstance(other, (int, float)):
+            return Array.from_handle(scalar_fn(self._handle, other))
         a, b = self, _to_array(other)
         if b is NotImplemented:
             return NotImplemented
@@ -28,8 +34,11 @@ def _make_binop(op_name):
 
 def _make_rbinop(op_name):
     backend_fn = getattr(_backend, op_name)
+    scalar_fn = getattr(_backend, "r" + op_name + "_scalar")
 
     def method(self, other):
+        if isinstance(other, (int, float)):
+            return Array.from_handle(scalar_fn(self._handle, other))
         a, b = _to_array(other), self
         if a is NotImplemented:
             return NotImplemented
@@ -41,7 +50,37 @@ def _make_rbinop(op_name):
 def array_matmul(self, other):
     if not isinstance(other, Array):
         return NotImplemented
-    return Array(_backend.matmul(self._handle, other._handle))
+    return self.matmul(other)
+
+
+def array_matmul_fused(
+    self, other, bias=None, alpha=1.0, beta=0.0, out=None, activation=None
+):
+    """
+    self @ other with a fused epilogue: act(alpha * (self @ other) + beta * out + bias).
+    `bias` broadcasts against the result (usually shape (N,)). If `out` is given it must
+    be a dense Array of the result's shape and dtype, not sharing memory with either
+    operand; it is accumulated into and returned.
+    `activation` is None, "relu", "tanh", "sigmoid" or "gelu".
+    """
+    if not isinstance(other, Array):
+        raise TypeError("matmul: operands must be Arrays")
+    if bias is not None:
+        bias = _to_array(bias)
+        if bias is NotImplemented:
+            raise TypeError("matmul: bias must be an Array")
+    if out is not None and not isinstance(out, Array):
+        raise TypeError("matmul: out must be an Array")
+    h = _backend.matmul(
+        self._handle,
+        other._handle,
+        bias._handle if bias is not None else None,
+        out._handle if out is not None else None,
+        alpha,
+        beta,
+        _activation_code(activation),
+    )
+    return out if out is not None else Array.from_handle(h)
 
 
 UNARY_OPS = [
@@ -89,7 +128,9 @@ NULLARY_OPS = ["rand", "randn", "zeros"]
 for op_name in NULLARY_OPS:
     backend_fn = getattr(_backend, op_name)
 
-    def nullary_wrapper(*shape: Union[int, Sequence[int]], _fn=backend_fn) -> Array:
+    def nullary_wrapper(
+        *shape: Union[int, Sequence[int]], dtype="float32", _fn=backend_fn
+    ) -> Array:
         if len(shape) == 1:
             arg = shape[0]
             if isinstance(arg, int):
@@ -98,7 +139,7 @@ for op_name in NULLARY_OPS:
                 shape = list(arg)
         else:
             shape = list(shape)
-        return Array.from_handle(_fn(shape))
+        return Array.from_handle(_fn(shape, _as_dtype(dtype)))
 
     nullary_wrapper.__name__ = op_name
     globals()[op_name] = nullary_wrapper
@@ -110,24 +151,375 @@ def sum(self, axis=None, keepdims=False):
         out_array = Array.from_handle(h)
         return out_array
 
-    if not isinstance(axis, int):
-        raise TypeError("axis must be an integer or None")
+    axis = _normalize_axis(self, axis)
+    h = _backend.sum_axis(self._handle, axis, keepdims)
+    return Array.from_handle(h)
 
-    if axis < 0:
-        axis += len(self.shape)
-    if axis < 0 or axis >= len(self.shape):
-        raise IndexError(
-            f"Array: Axis {axis} is out of bounds for Array of dimension {len(self.shape)}"
+
+def array_softmax(self, axis=-1):
+    """Numerically stable softmax along `axis`, fused into one kernel."""
+    axis = _normalize_axis(self, axis)
+    return Array.from_handle(_backend.softmax_axis(self._handle, axis))
+
+
+def array_log_softmax(self, axis=-1):
+    """Numerically stable log(softmax(x)) along `axis`, fused into one kernel."""
+    axis = _normalize_axis(self, axis)
+    return Array.from_handle(_backend.log_softmax_axis(self._handle, axis))
+
+
+def array_logsumexp(self, axis=-1, keepdims=False):
+    """log(sum(exp(x))) along `axis`, computed with max-subtraction."""
+    axis = _normalize_axis(self, axis)
+    return Array.from_handle(_backend.logsumexp_axis(self._handle, axis, keepdims))
+
+
+def array_cross_entropy(self, labels, axis=-1, reduction="mean"):
+    """
+    Cross-entropy of the logits `self` against `labels` along the class `axis`.
+    `labels` is either a probability (e.g. one-hot) Array of the logits' shape,
+    or an Array of class indices with the class axis removed.
+    `reduction` is "mean" (over rows), "sum" or "none" (per-row losses).
+    """
+    axis = _normalize_axis(self, axis)
+    labels = _to_array(labels)
+    if labels is NotImplemented:
+        raise TypeError("cross_entropy: labels must be an Array")
+    h = _backend.cross_entropy(self._handle, labels._handle, axis, reduction)
+    return Array.from_handle(h)
+
+
+def softmax(x, axis=-1):
+    return x.softmax(axis)
+
+
+def log_softmax(x, axis=-1):
+    return x.log_softmax(axis)
+
+
+def logsumexp(x, axis=-1, keepdims=False):
+    return x.logsumexp(axis, keepdims)
+
+
+def cross_entropy(logits, labels, axis=-1, reduction="mean"):
+    return logits.cross_entropy(labels, axis, reduction)
+
+
+ROW_OPS = ["softmax", "log_softmax", "logsumexp", "cross_entropy"]
+
+
+def matmul(a, b, bias=None, alpha=1.0, beta=0.0, out=None, activation=None):
+    return a.matmul(
+        b, bias=bias, alpha=alpha, beta=beta, out=out, activation=activation
+    )
+
+
+def linear(x, weight, bias=None, activation=None):
+    """
+    Dense layer activation(x @ weight.T + bias) for weight of shape (out, in).
+    The transpose is read in place and bias and activation are fused into the matmul.
+    """
+    return x.matmul(weight.T, bias=bias, activation=activation)
+
+
+MATMUL_OPS = ["matmul", "linear"]
+
+
+def _to_index(indices, op_name):
+    """Integer index Array for the index ops: lists are converted, masks are rejected."""
+    if isinstance(indices, (list, tuple)):
+        return Array(indices, dtype=int32)
+    if not isinstance(indices, Array):
+        raise TypeError(f"{op_name}: indices must be an Array or a list of integers")
+    if indices.dtype == uint8:
+        raise TypeError(
+            f"{op_name}: uint8 indices are masks (as from x > 0) and boolean mask "
+            "indexing is not supported, use where() or an int32 index Array"
+        )
+    if indices.dtype != int32:
+        raise TypeError(
+            f"{op_name}: indices must be integers (got {indices.dtype.name})"
         )
+    return indices
 
-    h = _backend.sum_axis(self._handle, axis, keepdims)
+
+def array_take(self, indices, axis=None):
+    """
+    Elements of self at `indices` along `axis` (of the flattened array if None), as
+    numpy.take: the result has shape shape[:axis] + indices.shape + shape[axis + 1:].
+    Negative indices count from the end; indices out of range read as 0.
+    """
+    indices = _to_index(indices, "take")
+    if axis is None:
+        self, axis = self.reshape(-1), 0
+    axis = _normalize_axis(self, axis)
+    return Array.from_handle(_backend.take(self._handle, indices._handle, axis))
+
+
+def array_gather(self, indices, axis):
+    """
+    out[p] = self[p with coordinate `axis` replaced by indices[p]] over indices' shape,
+    as numpy.take_along_axis / torch.gather. `indices` has self's rank.
+    """
+    indices = _to_index(indices, "gather")
+    axis = _normalize_axis(self, axis)
+    return Array.from_handle(_backend.gather(self._handle, indices._handle, axis))
+
+
+def array_index_add(self, indices, updates, axis=0):
+    """
+    In place self[..., indices[j], ...] += updates[..., j, ...] along `axis`: the reverse
+    of take, so updates has take's result shape. Repeated indices accumulate.
+    """
+    indices = _to_index(indices, "index_add")
+    updates = _to_array(updates)
+    if updates is NotImplemented:
+        raise TypeError("index_add: updates must be an Array")
+    axis = _normalize_axis(self, axis)
+    _backend.index_add(self._handle, indices._handle, updates._handle, axis)
+    return self
+
+
+def array_scatter_add(self, indices, updates, axis):
+    """
+    In place self[p with coordinate `axis` replaced by indices[p]] += updates[p]: the
+    reverse of gather, with updates of indices' shape. Repeated indices accumulate.
+    """
+    indices = _to_index(indices, "scatter_add")
+    updates = _to_array(updates)
+    if updates is NotImplemented:
+        raise TypeError("scatter_add: updates must be an Array")
+    axis = _normalize_axis(self, axis)
+    _backend.scatter_add(self._handle, indices._handle, updates._handle, axis)
+    return self
+
+
+def take(a, indices, axis=None):
+    return a.take(indices, axis)
+
+
+def index_select(a, indices, axis=0):
+    """Rows (or slices along `axis`) of `a` at a 1-d `indices`, e.g. embedding lookups."""
+    return a.take(indices, axis)
+
+
+def gather(a, indices, axis):
+    return a.gather(indices, axis)
+
+
+def index_add(target, indices, updates, axis=0):
+    return target.index_add(indices, updates, axis)
+
+
+def scatter_add(target, indices, updates, axis):
+    return target.scatter_add(indices, updates, axis)
+
+
+INDEX_OPS = ["take", "index_select", "gather", "index_add", "scatter_add"]
+
+
+def _reduce_extremum(self, op_name, axis, keepdims):
+    if axis is None:
+        h = _backend.extremum_axis(self.reshape(-1)._handle, 0, False, op_name)
+        out = Array.from_handle(h)
+        return out.reshape((1,) * len(self.shape)) if keepdims else out
+    axis = _normalize_axis(self, axis)
+    h = _backend.extremum_axis(self._handle, axis, keepdims, op_name)
+    return Array.from_handle(h)
+
+
+def array_max(self, axis=None, keepdims=False):
+    """Largest element along `axis` (of the whole Array if None), in self's dtype."""
+    return _reduce_extremum(self, "max", axis, keepdims)
+
+
+def array_min(self, axis=None, keepdims=False):
+    """Smallest element along `axis` (of the whole Array if None), in self's dtype."""
+    return _reduce_extremum(self, "min", axis, keepdims)
+
+
+def array_argmax(self, axis=None, keepdims=False):
+    """
+    int32 position of the largest element along `axis` (the first on ties), or in the
+    flattened Array if None.
+    """
+    return _reduce_extremum(self, "argmax", axis, keepdims)
+
+
+def array_argmin(self, axis=None, keepdims=False):
+    """
+    int32 position of the smallest element along `axis` (the first on ties), or in the
+    flattened Array if None.
+    """
+    return _reduce_extremum(self, "argmin", axis, keepdims)
+
+
+def array_mean(self, axis=None, keepdims=False):
+    """
+    Mean along `axis` (of every element if None). Integer and mask inputs give float32,
+    e.g. (pred == labels).mean() is the fraction of matches.
+    """
+    total = self.sum(axis, keepdims)
+    if axis is None:
+        count = 1
+        for d in self.shape:
+            count *= d
+    else:
+        count = self.shape[_normalize_axis(self, axis)]
+    dtype = self.dtype if _is_float(self.dtype) else float32
+    scale = 1.0 / count if count else float("nan")
+    return Array.from_handle(_backend.astype_scaled(total._handle, dtype, scale, 0.0))
+
+
+def array_count_nonzero(self, axis=None, keepdims=False):
+    """Number of nonzero elements along `axis` (of the whole Array if None), as int32."""
+    return (self != 0).sum(axis, keepdims)
+
+
+def _where_operand(x, dtype):
+    if isinstance(x, Array):
+        return x
+    if isinstance(x, (int, float)):
+        return Array([x], dtype=dtype)
+    if isinstance(x, (list, tuple)):
+        return Array(x, dtype=dtype)
+    raise TypeError("where: values must be Arrays, scalars or nested lists")
+
+
+def where(cond, x, y):
+    """
+    Elementwise x where `cond` is nonzero and y elsewhere, broadcasting all three.
+    Scalar or list values take the dtype of the other value (float32 if neither is an Array).
+    """
+    cond = _to_array(cond)
+    if cond is NotImplemented:
+        raise TypeError("where: cond must be an Array")
+    like = x if isinstance(x, Array) else y if isinstance(y, Array) else None
+    dtype = like.dtype if like is not None else float32
+    x, y = _where_operand(x, dtype), _where_operand(y, dtype)
+    return Array.from_handle(_backend.where(cond._handle, x._handle, y._handle))
+
+
+def maximum(a, b):
+    """Elementwise maximum of two Arrays (or an Array and a scalar), broadcasting."""
+    if not isinstance(a, Array):
+        a, b = b, a
+    return a.maximum(b)
+
+
+def minimum(a, b):
+    """Elementwise minimum of two Arrays (or an Array and a scalar), broadcasting."""
+    if not isinstance(a, Array):
+        a, b = b, a
+    return a.minimum(b)
+
+
+def argmax(a, axis=None, keepdims=False):
+    return a.argmax(axis, keepdims)
+
+
+def argmin(a, axis=None, keepdims=False):
+    return a.argmin(axis, keepdims)
+
+
+def mean(a, axis=None, keepdims=False):
+    return a.mean(axis, keepdims)
+
+
+def count_nonzero(a, axis=None, keepdims=False):
+    return a.count_nonzero(axis, keepdims)
+
+
+MASK_OPS = [
+    "where",
+    "maximum",
+    "minimum",
+    "argmax",
+    "argmin",
+    "mean",
+    "count_nonzero",
+]
+
+
+def concatenate(arrays, axis=0):
+    """
+    Join Arrays of the same dtype and shape (except along `axis`) into a new Array.
+    Each input is copied straight into its place in the result, in one command buffer.
+    """
+    arrays = list(arrays)
+    if not arrays:
+        raise ValueError("concatenate: need at least one array")
+    if isinstance(arrays[0], SymbolicArray):
+        return SymbolicArray.concatenate(arrays, axis)
+    if not all(isinstance(a, Array) for a in arrays):
+        raise TypeError("concatenate: expected a sequence of Arrays")
+    axis = _normalize_axis(arrays[0], axis)
+    h = _backend.concatenate([a._handle for a in arrays], axis)
     return Array.from_handle(h)
 
 
+def stack(arrays, axis=0):
+    """Join Arrays of the same shape along a new axis at position `axis`."""
+    arrays = list(arrays)
+    if not arrays:
+        raise ValueError("stack: need at least one array")
+    shape = tuple(arrays[0].shape)
+    if any(tuple(a.shape) != shape for a in arrays):
+        raise ValueError("stack: all arrays must have the same shape")
+    ndim = len(shape) + 1
+    if axis < 0:
+        axis += ndim
+    if axis < 0 or axis >= ndim:
+        raise IndexError(f"stack: axis out of bounds for result of dimension {ndim}")
+    # A size-1 axis is inserted as a view, so only the final concatenate copies
+    key = (slice(None),) * axis + (None,)
+    return concatenate([a[key] for a in arrays], axis)
+
+
+def _split_at(a, bounds, axis):
+    """Views of `a` between consecutive `bounds` along `axis`."""
+    prefix = (slice(None),) * axis
+    return [
+        a[prefix + (slice(start, stop),)] for start, stop in zip(bounds, bounds[1:])
+    ]
+
+
+def split(a, indices_or_sections, axis=0):
+    """
+    Views of `a` sharing its storage, as numpy.split: an int gives that many equal
+    parts (the axis must divide evenly), a list gives the indices to split at.
+    """
+    axis = _normalize_axis(a, axis)
+    n = a.shape[axis]
+    if isinstance(indices_or_sections, int):
+        sections = indices_or_sections
+        if sections <= 0 or n % sections:
+            raise ValueError("split: array split does not result in an equal division")
+        bounds = [i * (n // sections) for i in range(sections + 1)]
+    else:
+        indices = [int(i) for i in indices_or_sections]
+        bounds = [0] + [min(max(i + n if i < 0 else i, 0), n) for i in indices] + [n]
+    return _split_at(a, bounds, axis)
+
+
+def chunk(a, chunks, axis=0):
+    """
+    Split `a` into at most `chunks` views of ceil(n / chunks) entries along `axis`,
+    the last one possibly shorter (as torch.chunk).
+    """
+    if chunks <= 0:
+        raise ValueError("chunk: number of chunks must be positive")
+    axis = _normalize_axis(a, axis)
+    n = a.shape[axis]
+    size = max(-(-n // chunks), 1)
+    return _split_at(a, list(range(0, n, size)) + [n], axis)
+
+
+SHAPE_OPS = ["concatenate", "stack", "split", "chunk"]
+
+
 Array.__pos__ = lambda self: self
-Array.__neg__ = lambda self: Array.from_handle(
-    _backend.sub(_to_array(0)._handle, self._handle)
-)
+Array.__neg__ = lambda self: Array.from_handle(_backend.rsub_scalar(self._handle, 0.0))
 Array.__add__ = _make_binop("add")
 Array.__radd__ = Array.__add__
 Array.__sub__ = _make_binop("sub")
@@ -140,5 +532,30 @@ Array.__iadd__ = _make_binop("iadd")
 Array.__isub__ = _make_binop("isub")
 Array.__imul__ = _make_binop("imul")
 Array.__itruediv__ = _make_binop("idiv")
+Array.__eq__ = _make_binop("eq")
+Array.__ne__ = _make_binop("ne")
+Array.__lt__ = _make_binop("lt")
+Array.__le__ = _make_binop("le")
+Array.__gt__ = _make_binop("gt")
+Array.__ge__ = _make_binop("ge")
+# Comparisons return masks; Arrays stay hashable by identity
+Array.__hash__ = object.__hash__
+Array.maximum = _make_binop("maximum")
+Array.minimum = _make_binop("minimum")
 Array.__matmul__ = array_matmul
+Array.matmul = array_matmul_fused
 Array.sum = sum
+Array.max = array_max
+Array.min = array_min
+Array.argmax = array_argmax
+Array.argmin = array_argmin
+Array.mean = array_mean
+Array.count_nonzero = array_count_nonzero
+Array.softmax = array_softmax
+Array.log_softmax = array_log_softmax
+Array.logsumexp = array_logsumexp
+Array.cross_entropy = array_cross_entropy
+Array.take = array_take
+Array.gather = array_gather
+Array.index_add = array_index_add
+Array.scatter_add = array_scatter_add
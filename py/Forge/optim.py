@@ -0,0 +1,108 @@
+from typing import Sequence
+
+from . import _backend
+from .array import Array
+
+
+class Optimizer:
+    """
+    Base optimizer over a fixed list of parameter Arrays.
+    Parameters are updated in place by fused multi-tensor kernels,
+    so Arrays (and views) referring to them see the new values.
+    """
+
+    def __init__(self, params: Sequence[Array], lr: float):
+        self.params = list(params)
+        for p in self.params:
+            if not isinstance(p, Array):
+                raise TypeError("Optimizer: parameters must be Arrays")
+        self.lr = lr
+        self._handles = [p._handle for p in self.params]
+
+    def _grad_handles(self, grads: Sequence[Array]):
+        grads = list(grads)
+        if len(grads) != len(self.params):
+            raise ValueError(
+                f"Optimizer: expected {len(self.params)} gradients, got {len(grads)}"
+            )
+        return [g._handle for g in grads]
+
+    def _zeros_like_params(self):
+        return [_backend.zeros(list(p.shape)) for p in self.params]
+
+
+class SGD(Optimizer):
+    """
+    Stochastic gradient descent with optional momentum, dampening,
+    Nesterov momentum and (L2) weight decay.
+    """
+
+    def __init__(
+        self,
+        params: Sequence[Array],
+        lr: float,
+        momentum: float = 0.0,
+        dampening: float = 0.0,
+        weight_decay: float = 0.0,
+        nesterov: bool = False,
+    ):
+        super().__init__(params, lr)
+        if nesterov and (momentum <= 0.0 or dampening != 0.0):
+            raise ValueError("SGD: nesterov requires momentum and zero dampening")
+        self.momentum = momentum
+        self.dampening = dampening
+        self.weight_decay = weight_decay
+        self.nesterov = nesterov
+        self._bufs = self._zeros_like_params() if momentum != 0.0 else []
+        self._steps = 0
+
+    def step(self, grads: Sequence[Array]):
+        """Apply one update given one gradient per parameter (in order)."""
+        _backend.sgd_step(
+            self._handles,
+            self._grad_handles(grads),
+            self._bufs,
+            self.lr,
+            self.momentum,
+            self.dampening,
+            self.weight_decay,
+            self.nesterov,
+            self._steps == 0,
+        )
+        self._steps += 1
+
+
+class Adam(Optimizer):
+    """Adam with bias correction and optional (L2) weight decay."""
+
+    def __init__(
+        self,
+        params: Sequence[Array],
+        lr: float = 1e-3,
+        betas: Sequence[float] = (0.9, 0.999),
+        eps: float = 1e-8,
+        weight_decay: float = 0.0,
+    ):
+        super().__init__(params, lr)
+        self.betas = tuple(betas)
+        self.eps = eps
+        self.weight_decay = weight_decay
+        self._exp_avgs = self._zeros_like_params()
+        self._exp_avg_sqs = self._zeros_like_params()
+        self._steps = 0
+
+    def step(self, grads: Sequence[Array]):
+        """Apply one update given one gradient per parameter (in order)."""
+        _backend.adam_step(
+            self._handles,
+            self._grad_handles(grads),
+            self._exp_avgs,
+            self._exp_avg_sqs,
+            self.lr,
+            self.betas[0],
+            self.betas[1],
+            self.eps,
+            self.weight_decay,
+            self._steps + 1,
+        )
+        self._steps += 1
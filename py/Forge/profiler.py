@@ -0,0 +1,157 @@
+import json
+from collections import defaultdict
+
+from . import _backend
+
+_SORT_KEYS = ("wall_us", "gpu_us", "calls", "bytes", "allocated")
+
+
+class profiler:
+    """
+    Context manager recording every op Forge runs inside the block: elementwise
+    launches, matmuls, reductions, copies, graph builds/runs and buffer allocations,
+    with their shapes, host (wall) and GPU durations and bytes moved.
+
+        with Forge.profiler() as prof:
+            train_step()
+        print(prof.table())
+        prof.export_chrome_trace("trace.json")  # open in chrome://tracing or Perfetto
+
+    Leaving the block waits for the recorded GPU work to finish. Nested calls (a
+    matmul's operand copies or epilogue, a reshape's copy) are recorded both on their
+    own and inside their caller's wall time. When no profiler is active the hooks
+    cost one atomic load per op.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def __enter__(self):
+        _backend.profiler_start()
+        return self
+
+    def __exit__(self, *exc):
+        self.events = _backend.profiler_stop()
+        return False
+
+    def summary(self, sort_by="wall_us"):
+        """
+        One dict per (category, name) with its call count, total wall and GPU
+        microseconds, bytes read + written and bytes allocated, largest first by
+        `sort_by` (one of "wall_us", "gpu_us", "calls", "bytes", "allocated").
+        """
+        if sort_by not in _SORT_KEYS:
+            raise ValueError(f"profiler: sort_by must be one of {_SORT_KEYS}")
+        rows = defaultdict(
+            lambda: {
+                "calls": 0,
+                "wall_us": 0.0,
+                "gpu_us": 0.0,
+                "bytes": 0,
+                "allocated": 0,
+            }
+        )
+        for e in self.events:
+            row = rows[(e.category, e.name)]
+            row["calls"] += 1
+            row["wall_us"] += e.wall_us
+            row["gpu_us"] += max(e.gpu_us, 0.0)
+            row["bytes"] += e.bytes_read + e.bytes_written
+            row["allocated"] += e.bytes_allocated
+        out = [
+            {"category": cat, "name": name, **row} for (cat, name), row in rows.items()
+        ]
+        return sorted(out, key=lambda row: row[sort_by], reverse=True)
+
+    def table(self, sort_by="wall_us", limit=None):
+        """The summary as a printable table; GB/s is bytes moved over GPU time."""
+        rows = self.summary(sort_by)[:limit]
+        lines = [
+            f"{'name':<36} {'category':<12} {'calls':>7} {'wall ms':>10} "
+            f"{'gpu ms':>10} {'GB/s':>8} {'alloc MB':>10}",
+            "-" * 99,
+        ]
+        for row in rows:
+            gbps = row["bytes"] / (row["gpu_us"] * 1e3) if row["gpu_us"] > 0 else 0.0
+            lines.append(
+                f"{row['name'][:36]:<36} {row['category']:<12} {row['calls']:>7} "
+                f"{row['wall_us'] / 1e3:>10.3f} {row['gpu_us'] / 1e3:>10.3f} "
+                f"{gbps:>8.1f} {row['allocated'] / 2**20:>10.2f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """
+        The events in Chrome's trace event format: host calls on one row per thread,
+        their command buffers on a GPU row, allocations as instant events plus a
+        running total counter.
+        """
+        threads = {}
+        trace = [
+            {"name": "process_name", "ph": "M", "pid": 0, "args": {"name": "Host"}},
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "GPU"}},
+        ]
+        allocated = 0
+        for e in sorted(self.events, key=lambda e: e.start_us):
+            tid = threads.setdefault(e.thread, len(threads))
+            if e.category == "alloc":
+                allocated += e.bytes_allocated
+                args = {"shape": e.shapes[0], "bytes": e.bytes_allocated}
+                trace.append(
+                    {
+                        "name": e.name,
+                        "cat": e.category,
+                        "ph": "i",
+                        "s": "t",
+                        "ts": e.start_us,
+                        "pid": 0,
+                        "tid": tid,
+                        "args": args,
+                    }
+                )
+                trace.append(
+                    {
+                        "name": "allocated bytes",
+                        "ph": "C",
+                        "ts": e.start_us,
+                        "pid": 0,
+                        "args": {"allocated": allocated},
+                    }
+                )
+                continue
+            args = {
+                "shapes": e.shapes,
+                "bytes_read": e.bytes_read,
+                "bytes_written": e.bytes_written,
+            }
+            trace.append(
+                {
+                    "name": e.name,
+                    "cat": e.category,
+                    "ph": "X",
+                    "ts": e.start_us,
+                    "dur": e.wall_us,
+                    "pid": 0,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+            if e.gpu_us >= 0:
+                trace.append(
+                    {
+                        "name": e.name,
+                        "cat": e.category,
+                        "ph": "X",
+                        "ts": e.gpu_start_us,
+                        "dur": e.gpu_us,
+                        "pid": 1,
+                        "tid": 0,
+                        "args": args,
+                    }
+                )
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """Writes chrome_trace() as JSON to `path`."""
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
@@ -0,0 +1,130 @@
+from typing import Sequence, Union
+
+from . import _backend
+from .array import Array
+from .dtypes import _as_dtype
+
+_DISTRIBUTIONS = {
+    "uniform": _backend.Distribution.uniform,
+    "normal": _backend.Distribution.normal,
+    "bernoulli": _backend.Distribution.bernoulli,
+    "dropout": _backend.Distribution.dropout,
+}
+
+
+def _shape_list(shape):
+    if len(shape) == 1 and not isinstance(shape[0], int):
+        return list(shape[0])
+    return list(shape)
+
+
+def _check_p(name, p, inclusive):
+    if not (0.0 <= p <= 1.0) or (p == 1.0 and not inclusive):
+        bound = "]" if inclusive else ")"
+        raise ValueError(f"{name}: p must be in [0, 1{bound}")
+
+
+class Generator:
+    """
+    An independent Philox-4x32 random stream. `seed` and `stream` select the
+    sequence; generators with the same seed and different streams never overlap.
+    Values are a pure function of (seed, stream, position), so `offset` (the next
+    unused block of four values) can be saved and restored to replay a sequence,
+    and host fills give the same values for any thread count.
+
+        g = Forge.random.Generator(seed=0, stream=rank)
+        x = g.normal(256, 256)
+        mask = g.dropout_mask(256, 256, p=0.1)
+
+    Forge.rand/randn and the module-level functions draw from the default
+    generator, which Forge.set_seed reseeds.
+    """
+
+    def __init__(self, seed: int = 0, stream: int = 0, *, _handle=None):
+        self._gen = _handle if _handle is not None else _backend.Generator(seed, stream)
+
+    @property
+    def seed(self):
+        return self._gen.seed
+
+    @property
+    def stream(self):
+        return self._gen.stream
+
+    @property
+    def offset(self):
+        return self._gen.offset
+
+    @offset.setter
+    def offset(self, value: int):
+        self._gen.offset = value
+
+    def _random(self, shape, dist, p, dtype):
+        h = _backend.random(_shape_list(shape), dist, p, self._gen, _as_dtype(dtype))
+        return Array.from_handle(h)
+
+    def uniform(self, *shape: Union[int, Sequence[int]], dtype="float32") -> Array:
+        """Uniform values in [0, 1)."""
+        return self._random(shape, _backend.Distribution.uniform, 0.0, dtype)
+
+    def normal(self, *shape: Union[int, Sequence[int]], dtype="float32") -> Array:
+        """Standard normal values."""
+        return self._random(shape, _backend.Distribution.normal, 0.0, dtype)
+
+    def bernoulli(
+        self, *shape: Union[int, Sequence[int]], p: float = 0.5, dtype="float32"
+    ) -> Array:
+        """1 with probability `p`, else 0."""
+        _check_p("bernoulli", p, inclusive=True)
+        return self._random(shape, _backend.Distribution.bernoulli, p, dtype)
+
+    def dropout_mask(
+        self, *shape: Union[int, Sequence[int]], p: float = 0.5, dtype="float32"
+    ) -> Array:
+        """0 with probability `p`, else 1 / (1 - p), so `x * mask` keeps the mean."""
+        _check_p("dropout_mask", p, inclusive=False)
+        return self._random(shape, _backend.Distribution.dropout, p, dtype)
+
+    def fill(self, buf, distribution="uniform", p: float = 0.0, threads: int = 0):
+        """
+        Fills a writable float32 host buffer (array('f'), NumPy array, ...) in place
+        with `threads` threads (0: one per core). Uniform, bernoulli and dropout
+        values are the ones the device would generate from the same offset.
+        """
+        if distribution not in _DISTRIBUTIONS:
+            raise ValueError(
+                f"fill: distribution must be one of {list(_DISTRIBUTIONS)}"
+            )
+        if distribution in ("bernoulli", "dropout"):
+            _check_p(distribution, p, inclusive=distribution == "bernoulli")
+        self._gen.fill_host(buf, _DISTRIBUTIONS[distribution], p, threads)
+        return buf
+
+
+def default_generator() -> Generator:
+    """The generator behind Forge.rand/randn and this module's functions."""
+    return Generator(_handle=_backend.default_generator())
+
+
+def uniform(*shape: Union[int, Sequence[int]], dtype="float32") -> Array:
+    return default_generator().uniform(*shape, dtype=dtype)
+
+
+def normal(*shape: Union[int, Sequence[int]], dtype="float32") -> Array:
+    return default_generator().normal(*shape, dtype=dtype)
+
+
+def bernoulli(*shape: Union[int, Sequence[int]], p: float = 0.5, dtype="float32"):
+    return default_generator().bernoulli(*shape, p=p, dtype=dtype)
+
+
+def dropout_mask(*shape: Union[int, Sequence[int]], p: float = 0.5, dtype="float32"):
+    return default_generator().dropout_mask(*shape, p=p, dtype=dtype)
+
+
+def dropout(x: Array, p: float = 0.5, generator: Generator = None) -> Array:
+    """x with each element zeroed with probability `p` and the rest scaled by 1 / (1 - p)."""
+    if p == 0.0:
+        return x
+    generator = generator if generator is not None else default_generator()
+    return x * generator.dropout_mask(x.shape, p=p, dtype=x.dtype)
@@ -1,9 +1,20 @@
 from typing import Sequence, Union
 
-from . import graph
+from . import _backend, graph
+from .dtypes import DType, _as_dtype
 from .graph import Node, Ops
 from .shape import _deduce_new_shape, _transpose_helper
-from .utils import _default_strides, _indexing_helper
+from .utils import (
+    _activation_code,
+    _check_assignable,
+    _default_strides,
+    _indexing_helper,
+    _normalize_axis,
+    _split_index_array,
+)
+
+# Encoding of cross_entropy's reduction in the CROSS_ENTROPY node args
+_REDUCTIONS = {"none": 0, "mean": 1, "sum": 2}
 
 
 def _broadcast_shapes(s1, s2):
@@ -50,6 +61,14 @@ class SymbolicArray:
         return self._binary_op(Ops.DIV, other)
 
     def __matmul__(self, other):
+        return self.matmul(other)
+
+    def matmul(self, other, bias=None, alpha=1.0, beta=0.0, out=None, activation=None):
+        if out is not None or beta != 0.0:
+            raise ValueError(
+                "matmul: out/beta accumulation is not supported in a traced graph"
+            )
+        activation = _activation_code(activation)
         other = _lift(other)
         ndim_a = len(self.shape)
         ndim_b = len(other.shape)
@@ -71,12 +90,21 @@ class SymbolicArray:
             if len(out_shape) > 0:
                 out_shape.pop(col_idx)
         out_shape = tuple(out_shape)
+        inputs = [self.node, other.node]
+        if bias is not None:
+            bias = _lift(bias)
+            if _broadcast_shapes(bias.shape, out_shape) != out_shape:
+                raise ValueError(
+                    f"matmul: bias of shape {bias.shape} does not broadcast to {out_shape}"
+                )
+            inputs.append(bias.node)
         new_node = Node(
             Ops.MATMUL,
-            [self.node, other.node],
+            inputs,
             out_shape,
             0,
             _default_strides(out_shape),
+            args=(activation, float(alpha)),
         )
         if graph.CURRENT_GRAPH:
             graph.CURRENT_GRAPH.add(new_node)
@@ -97,6 +125,15 @@ class SymbolicArray:
         return SymbolicArray(new_node)
 
     def __getitem__(self, key):
+        split = _split_index_array(self, key, lambda k: isinstance(k, SymbolicArray))
+        if split is not None:
+            basic_key, axis, indices = split
+            return self[basic_key].take(indices, axis)
+        if _split_index_array(self, key, lambda k: isinstance(k, list)):
+            raise TypeError(
+                "SymbolicArray: index lists can't be traced, "
+                "pass the indices to the graph as an int32 Array"
+            )
         new_shape, new_strides, new_offset = _indexing_helper(self, key)
         new_node = Node(Ops.VIEW, [self.node], new_shape, new_offset, new_strides)
         if graph.CURRENT_GRAPH:
@@ -104,6 +141,7 @@ class SymbolicArray:
         return SymbolicArray(new_node)
 
     def __setitem__(self, key, value):
+        _check_assignable(key)
         value = _lift(value)
         new_shape, new_strides, new_offset = _indexing_helper(self, key)
         new_node = Node(
@@ -120,22 +158,16 @@ class SymbolicArray:
 
     def reshape(self, *shape: Union[int, Sequence[int]]):
         new_shape = _deduce_new_shape(self, *shape)
-        # the new offset depends on if we make a copy
-        # which depends on if the old array was contiguous
-        # if contiguous, we can use the same offset, and just redo strides
-        # if not, a new Array is created in _backend (array_reshape) so offset = 0
-        contiguous = True
-        z = 1
-        for i in range(len(self.shape) - 1, -1, -1):
-            if self.strides[i] != z:
-                contiguous = False
-                break
-            z *= self.shape[i]
-        new_offset = 0
+        # Same no-copy check as the eager reshape: a view when the strides allow it,
+        # otherwise a COPY into a new dense array (offset 0) first
+        new_strides = _backend.reshape_view_strides(
+            list(self.shape), list(self.strides), list(new_shape)
+        )
+        new_offset = self.offset
         cur_node = self.node
-        if contiguous:
-            new_offset = self.offset
-        else:
+        if new_strides is None:
+            new_offset = 0
+            new_strides = _default_strides(new_shape)
             cur_node = Node(
                 Ops.COPY,
                 [self.node],
@@ -148,9 +180,148 @@ class SymbolicArray:
         new_node = Node(
             Ops.RESHAPE,
             [cur_node],
-            new_shape,
+            tuple(new_shape),
             new_offset,
-            _default_strides(new_shape),
+            tuple(new_strides),
+        )
+        if graph.CURRENT_GRAPH:
+            graph.CURRENT_GRAPH.add(new_node)
+        return SymbolicArray(new_node)
+
+    def _row_op(self, op_code, inputs, out_shape, args):
+        new_node = Node(
+            op_code,
+            inputs,
+            tuple(out_shape),
+            0,
+            _default_strides(out_shape),
+            args=args,
+        )
+        if graph.CURRENT_GRAPH:
+            graph.CURRENT_GRAPH.add(new_node)
+        return SymbolicArray(new_node)
+
+    def softmax(self, axis=-1):
+        axis = _normalize_axis(self, axis)
+        return self._row_op(Ops.SOFTMAX, [self.node], self.shape, (axis,))
+
+    def log_softmax(self, axis=-1):
+        axis = _normalize_axis(self, axis)
+        return self._row_op(Ops.LOG_SOFTMAX, [self.node], self.shape, (axis,))
+
+    def logsumexp(self, axis=-1, keepdims=False):
+        axis = _normalize_axis(self, axis)
+        out_shape = list(self.shape)
+        if keepdims:
+            out_shape[axis] = 1
+        else:
+            out_shape.pop(axis)
+        return self._row_op(
+            Ops.LOGSUMEXP, [self.node], out_shape, (axis, int(keepdims))
+        )
+
+    def cross_entropy(self, labels, axis=-1, reduction="mean"):
+        axis = _normalize_axis(self, axis)
+        if reduction not in _REDUCTIONS:
+            raise ValueError("cross_entropy: reduction must be 'mean', 'sum' or 'none'")
+        rows_shape = self.shape[:axis] + self.shape[axis + 1 :]
+        if tuple(labels.shape) not in (tuple(self.shape), tuple(rows_shape)):
+            raise ValueError(
+                "cross_entropy: labels must match the logits' shape (probabilities) "
+                "or its shape without the class axis (class indices)"
+            )
+        out_shape = rows_shape if reduction == "none" else ()
+        return self._row_op(
+            Ops.CROSS_ENTROPY,
+            [self.node, labels.node],
+            out_shape,
+            (axis, _REDUCTIONS[reduction]),
+        )
+
+    def take(self, indices, axis=None):
+        # Index nodes keep the eager API's semantics, with `indices` an int32 input node
+        # and the axis as the only arg. The adds are in place like the eager ones: the
+        # target is rebound to the new node holding its updated value (as __setitem__).
+        if axis is None:
+            return self.reshape(-1).take(indices, 0)
+        axis = _normalize_axis(self, axis)
+        out_shape = (
+            tuple(self.shape[:axis])
+            + tuple(indices.shape)
+            + tuple(self.shape[axis + 1 :])
+        )
+        return self._row_op(Ops.TAKE, [self.node, indices.node], out_shape, (axis,))
+
+    def gather(self, indices, axis):
+        axis = _normalize_axis(self, axis)
+        if len(indices.shape) != len(self.shape):
+            raise ValueError("gather: indices must have the same rank as the array")
+        return self._row_op(
+            Ops.GATHER, [self.node, indices.node], indices.shape, (axis,)
+        )
+
+    def index_add(self, indices, updates, axis=0):
+        axis = _normalize_axis(self, axis)
+        expected = (
+            tuple(self.shape[:axis])
+            + tuple(indices.shape)
+            + tuple(self.shape[axis + 1 :])
+        )
+        if tuple(updates.shape) != expected:
+            raise ValueError(f"index_add: updates must have shape {expected}")
+        self.node = self._row_op(
+            Ops.INDEX_ADD,
+            [self.node, indices.node, updates.node],
+            self.shape,
+            (axis,),
+        ).node
+        return self
+
+    def scatter_add(self, indices, updates, axis):
+        axis = _normalize_axis(self, axis)
+        if tuple(updates.shape) != tuple(indices.shape):
+            raise ValueError("scatter_add: updates must have the same shape as indices")
+        self.node = self._row_op(
+            Ops.SCATTER_ADD,
+            [self.node, indices.node, updates.node],
+            self.shape,
+            (axis,),
+        ).node
+        return self
+
+    @staticmethod
+    def concatenate(arrays, axis=0):
+        arrays = [_lift(a) for a in arrays]
+        first = arrays[0]
+        axis = _normalize_axis(first, axis)
+        out_shape = list(first.shape)
+        out_shape[axis] = 0
+        for a in arrays:
+            if len(a.shape) != len(first.shape) or any(
+                d != axis and a.shape[d] != first.shape[d] for d in range(len(a.shape))
+            ):
+                raise ValueError(
+                    "concatenate: all arrays must have the same shape except along the axis"
+                )
+            out_shape[axis] += a.shape[axis]
+        # When the dims before `axis` are all 1, the arena planner computes the inputs
+        # directly into their slabs of the output
+        return first._row_op(Ops.CONCAT, [a.node for a in arrays], out_shape, (axis,))
+
+    @property
+    def dtype(self):
+        return DType(self.node.dtype)
+
+    def astype(self, dtype):
+        dtype = _as_dtype(dtype)
+        new_node = Node(
+            Ops.CAST,
+            [self.node],
+            self.shape,
+            0,
+            _default_strides(self.shape),
+            args=(int(dtype),),
+            dtype=dtype,
         )
         if graph.CURRENT_GRAPH:
             graph.CURRENT_GRAPH.add(new_node)
@@ -12,6 +12,31 @@ def _default_strides(shape):
     return tuple(strides)
 
 
+# Encoding of the fused matmul epilogue's activation (Activation in array_matmul.h)
+_ACTIVATIONS = {None: 0, "none": 0, "relu": 1, "tanh": 2, "sigmoid": 3, "gelu": 4}
+
+
+def _activation_code(activation):
+    if activation not in _ACTIVATIONS:
+        raise ValueError(
+            "matmul: activation must be None, 'relu', 'tanh', 'sigmoid' or 'gelu'"
+        )
+    return _ACTIVATIONS[activation]
+
+
+def _normalize_axis(self, axis):
+    if not isinstance(axis, int):
+        raise TypeError("axis must be an integer or None")
+    ndim = len(self.shape)
+    if axis < 0:
+        axis += ndim
+    if axis < 0 or axis >= ndim:
+        raise IndexError(
+            f"Array: Axis {axis} is out of bounds for Array of dimension {ndim}"
+        )
+    return axis
+
+
 def _deduce_new_shape(self, *shape: Union[int, Sequence[int]]):
     if len(shape) == 1:
         arg = shape[0]
@@ -46,105 +71,41 @@ def _deduce_new_shape(self, *shape: Union[int, Sequence[int]]):
     return new_shape
 
 
-def _indexing_helper(self, key):
-    if isinstance(key, list):
-        raise TypeError(
-            "Array: fancy indexing (passing lists/arrays as indices) is not supported"
-        )
+def _split_index_array(self, key, is_index_array):
+    """
+    Split a key holding one integer index array (an entry for which `is_index_array` is
+    true) into the basic key with that entry replaced by a full slice, the axis of the
+    basic view it indexes, and the index array itself. Returns None if there is none.
+    """
     if not isinstance(key, tuple):
         key = (key,)
-
-    ellipsis_count = key.count(Ellipsis)
-    if ellipsis_count > 1:
-        raise IndexError("Array: only one ellipsis allowed in indexing")
-    if ellipsis_count == 1:
-        ellipsis_index = key.index(Ellipsis)
+    positions = [i for i, k in enumerate(key) if is_index_array(k)]
+    if not positions:
+        return None
+    if len(positions) > 1:
+        raise IndexError("Array: only one index array per key is supported")
+    pos = positions[0]
+    before = key[:pos]
+    axis = sum(1 for k in before if k is None or isinstance(k, slice))
+    if Ellipsis in before:
         explicit_count = sum(1 for k in key if k is not Ellipsis and k is not None)
-        if len(self.shape) < explicit_count:
-            raise IndexError("Array: too many indices for array")
-        num_missing = len(self.shape) - explicit_count
-        key = (
-            key[:ellipsis_index]
-            + (slice(None),) * num_missing
-            + key[ellipsis_index + 1 :]
-        )
-        key = tuple(key)
-
-    new_shape = list(self.shape)
-    new_strides = list(self.strides)
-    new_offset = self.offset
-
-    dim = 0
-    deleted = 0
-    if len(self.shape) < len(key) - key.count(None):
-        raise IndexError("Array: too many indices for array")
-    for s in key:
-        if s is None:
-            new_shape.insert(dim, 1)
-            new_strides.insert(dim, 0)
-            deleted -= 1
-
-        elif isinstance(s, int):
-            if s < 0:
-                s += self.shape[dim]
-            if s < 0 or s >= self.shape[dim]:
-                raise IndexError("Array: Index out of range")
-
-            new_offset += s * new_strides[dim - deleted]
-            new_shape.pop(dim - deleted)
-            new_strides.pop(dim - deleted)
-            deleted += 1
-            dim += 1
-
-        elif isinstance(s, slice):
-            if s.step == 0:
-                raise ValueError("Array: slice step cannot be zero")
-            if s.step is None:
-                step = 1
-            else:
-                step = s.step
-            if s.start is None:
-                if step > 0:
-                    start = 0
-                else:
-                    start = self.shape[dim] - 1
-            else:
-                start = s.start
-            if s.stop is None:
-                if step > 0:
-                    stop = self.shape[dim]
-                elif self.shape[dim] == 0:
-                    stop = 0
-                else:
-                    stop = -1 - self.shape[dim]
-            else:
-                stop = s.stop
-
-            if start < 0:
-                start += self.shape[dim]
-            if stop < 0:
-                stop += self.shape[dim]
-            if start < 0:
-                start = 0
-            if start >= self.shape[dim] and self.shape[dim]:
-                start = self.shape[dim] - 1
-            if stop < -1:
-                stop = -1
-            if stop > self.shape[dim]:
-                stop = self.shape[dim]
-
-            new_offset += start * new_strides[dim - deleted]
-            new_strides[dim - deleted] *= step
-            sgn = 1 if step > 0 else -1
-            new_shape[dim - deleted] = max(
-                0, (sgn * (stop - start) + abs(step) - 1) // abs(step)
-            )
-            dim += 1
+        axis += len(self.shape) - explicit_count
+    basic_key = before + (slice(None),) + key[pos + 1 :]
+    return basic_key, axis, key[pos]
+
+
+def _indexing_helper(self, key):
+    """(shape, strides, offset) of the basic view self[key], computed by the backend."""
+    return _backend.index_view(self.shape, self.strides, self.offset, key)
 
-        else:
-            raise TypeError("Array: Only int and slice supported")
 
-    return new_shape, new_strides, new_offset
+def _check_assignable(key):
+    """Rejects keys that assign through an index array (only basic views can be set)."""
+    if isinstance(key, list):
+        raise TypeError(
+            "Array: assigning through index arrays is not supported, "
+            "use index_add/scatter_add"
+        )
 
 
 def _set_seed(s: int):
@@ -35,28 +35,25 @@ B3 = (Forge.rand(10) - 0.5) * bias_scale
 def forward(A0):
     """Given some inputs A0, we calculate the activations after each layer"""
     global W1, W2, W3, B1, B2, B3
-    A1 = Forge.tanh(A0 @ W1.T + B1)
-    A2 = Forge.tanh(A1 @ W2.T + B2)
-    A3 = A2 @ W3.T + B3
-    # softmax
-    exp_A3 = Forge.exp(A3)
-    P = exp_A3 / exp_A3.sum(axis=1, keepdims=True)
+    # Bias add and tanh are fused into each matmul
+    A1 = Forge.linear(A0, W1, B1, activation="tanh")
+    A2 = Forge.linear(A1, W2, B2, activation="tanh")
+    A3 = Forge.linear(A2, W3, B3)
+    P = Forge.softmax(A3, axis=1)
     return P, A3, A2, A1
 
 
 def accuracy(Ps, GTs):
-    acc = [
-        max(range(10), key=lambda k: i[k]) == max(range(10), key=lambda k: j[k])
-        for i, j in zip(Ps.list(), GTs.list())
-    ]
-    return sum(acc) / len(acc)
+    # Computed on the device, only the final fraction is read back
+    hits = Forge.argmax(Ps, axis=1) == Forge.argmax(GTs, axis=1)
+    return hits.mean().item()
 
 
-def total_loss(Ps, GTs):
+def total_loss(Ps, logits, GTs):
     """Given predictions and ground truths, what's our accuracy and loss?"""
     acc = accuracy(Ps, GTs)
-    loss = (-GTs * (Ps + 1e-9).log()).sum()
-    return loss.list() / len(Ps), acc
+    loss = Forge.cross_entropy(logits, GTs, axis=1)
+    return loss.list(), acc
 
 
 def backward(Ps, A3s, A2s, A1s, GTs, A0s):
@@ -85,19 +82,21 @@ def train(batchsize=1, alpha=0.1, epochs=10, view=100000, expo=True):
     global train_x, train_y
     global W1, W2, W3, B1, B2, B3
 
-    batchcount = len(train_x) // batchsize
+    # Shuffled minibatches, gathered on the device while the previous step runs
+    loader = Forge.data.DataLoader(
+        train_x, train_y, batch_size=batchsize, drop_last=True, seed=42
+    )
     test()
 
+    # Fused in-place updates: weights get weight decay, biases don't
+    decay = 0.001
+    weights = Forge.optim.SGD([W1, W2, W3], lr=alpha, weight_decay=decay)
+    biases = Forge.optim.SGD([B1, B2, B3], lr=alpha)
+
     for i in range(epochs):
         a = alpha * exp(-i * 0.3) if expo else alpha * (1 - i / epochs)
-        for j in range(batchcount):
-            start = j * batchsize
-            end = start + batchsize
-
-            # Grab batch
-            batch_x = train_x[start:end]
-            batch_y = train_y[start:end]
-
+        weights.lr = biases.lr = a
+        for j, (batch_x, batch_y) in enumerate(loader):
             # Forward pass
             P, A3, A2, A1 = forward(batch_x)
 
@@ -105,13 +104,8 @@ def train(batchsize=1, alpha=0.1, epochs=10, view=100000, expo=True):
             dW1, dW2, dW3, dB1, dB2, dB3 = backward(P, A3, A2, A1, batch_y, batch_x)
 
             # Update weights
-            decay = 0.001
-            W1 -= (dW1 + decay * W1) * a
-            W2 -= (dW2 + decay * W2) * a
-            W3 -= (dW3 + decay * W3) * a
-            B1 -= dB1 * a
-            B2 -= dB2 * a
-            B3 -= dB3 * a
+            weights.step([dW1, dW2, dW3])
+            biases.step([dB1, dB2, dB3])
             if j % view == view - 1:
                 test()
         test()
@@ -120,9 +114,9 @@ def train(batchsize=1, alpha=0.1, epochs=10, view=100000, expo=True):
 def test():
     global test_x, test_y, train_x, train_y
     P, A3, A2, A1 = forward(test_x)
-    loss_metrics = total_loss(P, test_y)
+    loss_metrics = total_loss(P, A3, test_y)
     P, A3, A2, A1 = forward(train_x)
-    train_loss_metrics = total_loss(P, train_y)
+    train_loss_metrics = total_loss(P, A3, train_y)
 
     print(
         f"Test Loss: {loss_metrics[0]:.4f}, Test Accuracy: {100*loss_metrics[1]:.2f}%"
@@ -1,5 +1,7 @@
 #include <gtest/gtest.h>
 
+#include <cmath>
+
 #include "../../cpp/include/array_handle.h"
 
 TEST(ArrayHelpersTest, numel) {
@@ -26,3 +28,66 @@ TEST(ArrayHelpersTest, make_strides) {
     std::vector<int64_t> strides3{2, 2, 2, 1};
     ASSERT_EQ(make_strides(shape3), strides3);
 }
+
+TEST(ArrayHelpersTest, dtype_size) {
+    ASSERT_EQ(dtype_size(DType::float32), 4);
+    ASSERT_EQ(dtype_size(DType::float16), 2);
+    ASSERT_EQ(dtype_size(DType::bfloat16), 2);
+    ASSERT_EQ(dtype_size(DType::int32), 4);
+    ASSERT_EQ(dtype_size(DType::uint8), 1);
+}
+
+TEST(ArrayHelpersTest, load_element) {
+    uint16_t halves[5] = {0x3C00, 0xC000, 0x7BFF, 0x0001, 0x7C00};
+    ASSERT_EQ(load_element(halves, DType::float16, 0), 1.0);
+    ASSERT_EQ(load_element(halves, DType::float16, 1), -2.0);
+    ASSERT_EQ(load_element(halves, DType::float16, 2), 65504.0);
+    ASSERT_EQ(load_element(halves, DType::float16, 3), std::ldexp(1.0, -24));
+    ASSERT_TRUE(std::isinf(load_element(halves, DType::float16, 4)));
+
+    uint16_t bfloats[2] = {0x3F80, 0xC0A0};
+    ASSERT_EQ(load_element(bfloats, DType::bfloat16, 0), 1.0);
+    ASSERT_EQ(load_element(bfloats, DType::bfloat16, 1), -5.0);
+
+    uint8_t bytes[2] = {7, 255};
+    ASSERT_EQ(load_element(bytes, DType::uint8, 1), 255.0);
+    int32_t ints[2] = {-3, 1 << 30};
+    ASSERT_EQ(load_element(ints, DType::int32, 0), -3.0);
+    ASSERT_EQ(load_element(ints, DType::int32, 1), (double)(1 << 30));
+}
+
+TEST(ArrayHelpersTest, coalesce_dims) {
+    // Dense operands collapse to one dim
+    std::vector<std::vector<int64_t>> dense{{12, 4, 1}, {12, 4, 1}};
+    ASSERT_EQ(coalesce_dims({2, 3, 4}, dense), (std::vector<int64_t>{24}));
+    ASSERT_EQ(dense, (std::vector<std::vector<int64_t>>{{1}, {1}}));
+
+    // Row broadcast keeps the row dim apart, size-1 dims are dropped
+    std::vector<std::vector<int64_t>> row{{12, 12, 4, 1}, {0, 0, 4, 1}};
+    ASSERT_EQ(coalesce_dims({2, 1, 3, 4}, row), (std::vector<int64_t>{2, 12}));
+    ASSERT_EQ(row, (std::vector<std::vector<int64_t>>{{12, 1}, {0, 1}}));
+
+    // Transposed operand blocks merging
+    std::vector<std::vector<int64_t>> transposed{{1, 3}, {2, 1}};
+    ASSERT_EQ(coalesce_dims({3, 2}, transposed), (std::vector<int64_t>{3, 2}));
+
+    // All size-1 dims collapse to a single element
+    std::vector<std::vector<int64_t>> single{{1, 1}};
+    ASSERT_EQ(coalesce_dims({1, 1}, single), (std::vector<int64_t>{1}));
+    ASSERT_EQ(single, (std::vector<std::vector<int64_t>>{{1}}));
+}
+
+TEST(ArrayHelpersTest, reshape_view_strides) {
+    using Strides = std::optional<std::vector<int64_t>>;
+    // Dense arrays always reshape in place
+    ASSERT_EQ(reshape_view_strides({2, 3, 4}, {12, 4, 1}, {6, 4}), Strides({4, 1}));
+    // Row slice (2, 2, 4) of a (2, 3, 4) array: merge and split contiguous groups
+    ASSERT_EQ(reshape_view_strides({2, 2, 4}, {12, 4, 1}, {2, 8}), Strides({12, 1}));
+    ASSERT_EQ(reshape_view_strides({2, 2, 4}, {12, 4, 1}, {2, 2, 2, 2}), Strides({12, 4, 2, 1}));
+    // Size-1 dims are free on both sides
+    ASSERT_EQ(reshape_view_strides({3, 1, 2}, {10, 7, 5}, {1, 3, 2, 1}), Strides({30, 10, 5, 5}));
+    // Column slice (2, 3, 2) of a (2, 3, 4) array can't flatten its last two dims
+    ASSERT_EQ(reshape_view_strides({2, 3, 2}, {12, 4, 1}, {2, 6}), std::nullopt);
+    // Transposes can't either
+    ASSERT_EQ(reshape_view_strides({3, 2}, {1, 3}, {6}), std::nullopt);
+}
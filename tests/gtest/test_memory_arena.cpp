@@ -60,7 +60,7 @@ TEST_P(MemoryArenaTest, TestAllocation) {
     Graph g = parse_graph(in_path);
     auto lines = read_file_lines(out_path);
 
-    MemoryArena m(g, 4);
+    MemoryArena m(g);
 
     EXPECT_EQ(m.get_total_bytes(), std::stoull(lines[0]))
         << "Total bytes mismatch in " << test_name;
@@ -72,3 +72,70 @@ TEST_P(MemoryArenaTest, TestAllocation) {
 
 INSTANTIATE_TEST_SUITE_P(TestSuite, MemoryArenaTest,
                          ::testing::Values("test1", "test2", "test3", "test4"));
+
+TEST(MemoryArenaDTypeTest, SizesFollowDType) {
+    auto make_node = [](OpCode op, std::vector<int> inputs, std::vector<int64_t> shape,
+                        DType dtype) {
+        Node n;
+        n.op = op;
+        n.inputs = std::move(inputs);
+        n.shape = shape;
+        n.strides = make_strides(shape);
+        n.offset = 0;
+        n.dtype = dtype;
+        return n;
+    };
+    // float32 input -> uint8 (3 bytes, padded to 4) -> float16 (6 bytes, padded to 8) -> output
+    std::vector<Node> nodes = {
+        make_node(OpCode::INPUT, {}, {3}, DType::float32),
+        make_node(OpCode::CAST, {0}, {3}, DType::uint8),
+        make_node(OpCode::CAST, {1}, {3}, DType::float16),
+        make_node(OpCode::ADD, {2, 2}, {3}, DType::float16),
+    };
+    Graph g(nodes, 3);
+    MemoryArena m(g);
+
+    EXPECT_EQ(m.get_total_bytes(), 12);
+    EXPECT_EQ(m.get_all_offsets(), (std::vector<uint64_t>{0, 0, 4, 0}));
+}
+
+TEST(MemoryArenaConcatTest, InputsArePlacedInTheirSlabs) {
+    auto make_node = [](OpCode op, std::vector<int> inputs, std::vector<int64_t> shape,
+                        std::vector<int64_t> args = {}) {
+        Node n;
+        n.op = op;
+        n.inputs = std::move(inputs);
+        n.shape = shape;
+        n.strides = make_strides(shape);
+        n.offset = 0;
+        n.args = std::move(args);
+        return n;
+    };
+    // Along axis 0 the two (2, 3) float32 results are computed straight into the (4, 3) concat
+    std::vector<Node> rows = {
+        make_node(OpCode::INPUT, {}, {2, 3}),   make_node(OpCode::ADD, {0, 0}, {2, 3}),
+        make_node(OpCode::MUL, {0, 0}, {2, 3}), make_node(OpCode::CONCAT, {1, 2}, {4, 3}, {0}),
+        make_node(OpCode::ADD, {3, 3}, {4, 3}),
+    };
+    Graph g(rows, 4);
+    MemoryArena m(g);
+
+    EXPECT_EQ(m.get_total_bytes(), 48);
+    EXPECT_EQ(m.get_all_offsets(), (std::vector<uint64_t>{0, 0, 24, 0, 0}));
+    EXPECT_EQ(m.get_placed_in(0), -1);
+    EXPECT_EQ(m.get_placed_in(1), 3);
+    EXPECT_EQ(m.get_placed_in(2), 3);
+
+    // Along axis 1 the slabs are strided, so the inputs keep their own blocks
+    std::vector<Node> cols = {
+        make_node(OpCode::INPUT, {}, {2, 3}),   make_node(OpCode::ADD, {0, 0}, {2, 3}),
+        make_node(OpCode::MUL, {0, 0}, {2, 3}), make_node(OpCode::CONCAT, {1, 2}, {2, 6}, {1}),
+        make_node(OpCode::ADD, {3, 3}, {2, 6}),
+    };
+    Graph g2(cols, 4);
+    MemoryArena m2(g2);
+
+    EXPECT_EQ(m2.get_total_bytes(), 96);
+    EXPECT_EQ(m2.get_placed_in(1), -1);
+    EXPECT_EQ(m2.get_placed_in(2), -1);
+}
@@ -0,0 +1,223 @@
+import Forge
+import pytest
+from Forge.forge import _compile, _trace
+from Forge.graph import Graph, Node, Ops
+
+# region --- GRAPH REPORT ---
+
+
+def _mlp(x, w, b):
+    return Forge.softmax(x @ w.T + b, axis=1)
+
+
+def test_report_traced_costs():
+    f = Forge.forge(_mlp)
+    x, w, b = Forge.rand(64, 32), Forge.rand(16, 32), Forge.rand(16)
+    report = f.report(x, w, b, optimized=False)
+    ops = [r["op"] for r in report.rows]
+    assert ops[:3] == ["INPUT", "INPUT", "INPUT"]
+    assert "MATMUL" in ops and "SOFTMAX" in ops
+
+    matmul = next(r for r in report.rows if r["op"] == "MATMUL")
+    assert matmul["shape"] == (64, 16)
+    assert matmul["flops"] == 2 * 64 * 16 * 32
+    assert matmul["bytes"] == (64 * 32 + 16 * 32 + 64 * 16) * 4
+    assert matmul["intensity"] == matmul["flops"] / matmul["bytes"]
+
+    # Views and inputs cost nothing
+    transpose = next(r for r in report.rows if r["op"] == "TRANSPOSE")
+    assert transpose["flops"] == transpose["bytes"] == 0
+    assert transpose["root"] == 1
+    assert transpose["strides"] == (1, 32)
+
+    totals = report.totals
+    assert totals["flops"] == sum(r["flops"] for r in report.rows)
+    assert totals["bytes"] == sum(r["bytes"] for r in report.rows)
+    assert totals["arena_bytes"] is None
+
+
+def test_report_bound_and_liveness():
+    f = Forge.forge(lambda a, b: (a + b) * a)
+    a, b = Forge.rand(128), Forge.rand(128)
+    report = f.report(a, b, optimized=False)
+    add, mul = report.rows[2], report.rows[3]
+    assert add["bound"] == mul["bound"] == "memory"
+    # The sum is freed after the product reads it; inputs are never counted
+    assert add["live_bytes"] == 128 * 4
+    assert mul["live_bytes"] == 2 * 128 * 4
+    assert report.totals["peak_bytes"] == 2 * 128 * 4
+    assert report.totals["peak_node"] == 3
+
+    report = f.report(a, b, optimized=False, ridge=0.01)
+    assert report.rows[2]["bound"] == "compute"
+
+
+def test_report_compiled_has_arena():
+    f = Forge.forge(lambda a, b: (a + b) * a)
+    a, b = Forge.rand(128), Forge.rand(128)
+    report = f.report(a, b)
+    assert report.totals["arena_bytes"] is not None
+    assert all(r["arena_offset"] is not None for r in report.rows)
+    assert [r["root"] for r in report.rows[:2]] == [0, 1]
+
+
+def test_report_dot():
+    f = Forge.forge(_mlp)
+    x, w, b = Forge.rand(8, 4), Forge.rand(3, 4), Forge.rand(3)
+    report = f.report(x, w, b, optimized=False)
+    dot = report.to_dot("mlp")
+    assert dot.startswith("digraph mlp {")
+    assert dot.rstrip().endswith("}")
+    for r in report.rows:
+        assert f"n{r['index']} [" in dot
+        for j in r["inputs"]:
+            assert f"n{j} -> n{r['index']};" in dot
+    assert "MATMUL" in dot
+    assert "FLOP/B" in report.table()
+
+
+# endregion
+
+# region --- SCHEDULE ---
+
+
+def _qkv(x, wq, wk, wv):
+    q, k, v = x @ wq, x @ wk, x @ wv
+    return q * k - v
+
+
+def test_schedule_groups_parallel_branches():
+    x, wq, wk, wv = (
+        Forge.rand(16, 8),
+        Forge.rand(8, 8),
+        Forge.rand(8, 8),
+        Forge.rand(8, 8),
+    )
+    graph = _compile(_qkv, (x, wq, wk, wv))
+    matmuls = [i for i, n in enumerate(graph.nodes) if n.op == Ops.MATMUL]
+    assert len(matmuls) == 3
+    assert graph.waves[0] == matmuls
+    assert len(graph.waves) == 3
+
+
+def test_schedule_chain_is_serial():
+    def f(a):
+        return ((a + a) * a) * a
+
+    graph = _compile(f, (Forge.rand(32),))
+    assert graph.waves == [[1], [2], [3]]
+
+
+def test_schedule_respects_recycled_arena():
+    # a * a is computed into the buffer of a + a once that is dead, so although it
+    # doesn't use its value it has to wait for its last reader (WAR)
+    def f(a):
+        b = (a + a) * a
+        return b + a * a
+
+    graph = _compile(f, (Forge.rand(32),))
+    assert graph.arena_offsets[3] == graph.arena_offsets[1]
+    assert graph.waves == [[1], [2], [3], [4]]
+
+
+def test_schedule_independent_buffers_share_a_wave():
+    def f(a, b):
+        return (a + a) * (b + b)
+
+    graph = _compile(f, (Forge.rand(32), Forge.rand(32)))
+    assert graph.waves == [[2, 3], [4]]
+
+
+# endregion
+
+# region --- REMATERIALIZATION ---
+
+
+def _late_use(x, y):
+    a = x * y
+    b = a + x
+    d = b * b + x
+    return d * d + a.T
+
+
+def test_remat_recomputes_under_budget():
+    x, y = Forge.rand(32, 32), Forge.rand(32, 32)
+    plain = Forge.forge(_late_use).report(x, y).totals
+    assert plain["arena_bytes"] == 3 * 32 * 32 * 4
+    assert plain["remat_nodes"] == 0
+
+    f = Forge.forge(memory_budget=2 * 32 * 32 * 4)(_late_use)
+    report = f.report(x, y)
+    totals = report.totals
+    assert totals["arena_bytes"] == 2 * 32 * 32 * 4
+    assert totals["remat_nodes"] == 1
+    assert totals["remat_flops"] == 32 * 32
+    assert totals["remat_bytes_saved"] == 32 * 32 * 4
+    # x * y runs again right before the transpose that reads it
+    ops = [r["op"] for r in report.rows]
+    assert ops.count("MUL") == 4
+    assert ops[-3:] == ["MUL", "TRANSPOSE", "ADD"]
+    assert "recomputed 1 nodes" in report.table()
+
+
+def test_remat_stops_when_nothing_helps():
+    x, y = Forge.rand(32, 32), Forge.rand(32, 32)
+    totals = Forge.forge(memory_budget=1)(_late_use).report(x, y).totals
+    assert totals["arena_bytes"] == 2 * 32 * 32 * 4
+
+
+def test_remat_budget_must_be_positive():
+    with pytest.raises(ValueError):
+        Forge.forge(_late_use, memory_budget=0)
+
+
+# endregion
+
+# region --- PACKED NODES ---
+
+
+def _many_ops(x, w, b):
+    h = Forge.linear(x, w, b, activation="tanh")
+    h[0] = 1.0
+    return Forge.softmax(h * 0.5, axis=1).astype("float16")
+
+
+def test_packed_nodes_layout():
+    g = Graph()
+    a = g.add(Node(Ops.INPUT, [], (2, 3), 0, (3, 1)))
+    t = g.add(Node(Ops.TRANSPOSE, [a], (3, 2), 0, (1, 3)))
+    g.add(Node(Ops.SOFTMAX, [t], (3, 2), 0, (2, 1), args=(1,)))
+    p = g.packed
+    assert len(p) == 3
+    assert list(p.ops) == [Ops.INPUT, Ops.TRANSPOSE, Ops.SOFTMAX]
+    assert list(p.input_starts) == [0, 0, 1, 2]
+    assert list(p.inputs) == [0, 1]
+    assert list(p.dim_starts) == [0, 2, 4, 6]
+    assert list(p.shapes) == [2, 3, 3, 2, 3, 2]
+    assert list(p.strides) == [3, 1, 1, 3, 2, 1]
+    assert list(p.arg_starts) == [0, 0, 0, 1]
+    assert list(p.args) == [1]
+
+
+def test_packed_graph_matches_tuples():
+    x, w, b = Forge.rand(8, 4), Forge.rand(3, 4), Forge.rand(3)
+    packed = _compile(_many_ops, (x, w, b))
+    flat = Forge._backend.make_graph(*_trace(_many_ops, (x, w, b)))
+    assert packed.output_index == flat.output_index
+    fields = ("op", "inputs", "shape", "strides", "offset", "dtype", "args")
+    assert len(packed.nodes) == len(flat.nodes)
+    for p, f in zip(packed.nodes, flat.nodes):
+        for field in fields:
+            assert getattr(p, field) == getattr(f, field)
+
+
+def test_packed_rejects_inconsistent_arrays():
+    g = Graph()
+    g.add(Node(Ops.INPUT, [], (2,), 0, (1,)))
+    columns = g.packed.buffers()
+    columns[6] = columns[6][:-1]
+    with pytest.raises(ValueError):
+        Forge._backend.make_graph_packed(columns, 0)
+
+
+# endregion
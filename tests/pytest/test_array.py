@@ -68,7 +68,7 @@ def test_array_module_float_array():
 
 
 def test_array_module_wrong_type():
-    arr = pyarray("i", [1, 2, 3])
+    arr = pyarray("d", [1, 2, 3])
     with pytest.raises(TypeError):
         Array(arr)
 
@@ -110,6 +110,24 @@ def test_from_handle_roundtrip():
     assert b.list() == [[1, 2], [3, 4]]
 
 
+def test_cached_metadata_matches_handle():
+    a = Array([[1, 2, 3], [4, 5, 6]])
+    for x in [a, a[:, 1:], a.T, a[1], a + 1.0, a.astype("int32")]:
+        h = x._handle
+        assert x.shape == tuple(h.shape)
+        assert x.strides == tuple(h.strides)
+        assert x.offset == h.offset
+        assert x.dtype == h.dtype
+    assert a[:, 1:].strides == (3, 1)
+    assert a[:, 1:].offset == 1
+
+
+def test_array_is_slotted():
+    a = Array([1.0, 2.0])
+    with pytest.raises(AttributeError):
+        a.extra = 1
+
+
 # endregion
 
 # region --- DEEP NESTING ---
@@ -0,0 +1,70 @@
+import pytest
+from Forge import Array, data
+
+
+def _dataset(n=10):
+    x = Array([[float(i), float(-i)] for i in range(n)])
+    y = Array([i for i in range(n)], dtype="int32")
+    return x, y
+
+
+def test_sequential_batches():
+    x, y = _dataset()
+    loader = data.DataLoader(x, y, batch_size=4, shuffle=False)
+    assert len(loader) == 3
+    batches = [(bx.list(), by.list()) for bx, by in loader]
+    assert [len(by) for _, by in batches] == [4, 4, 2]
+    assert batches[0] == (
+        [[0.0, 0.0], [1.0, -1.0], [2.0, -2.0], [3.0, -3.0]],
+        [0, 1, 2, 3],
+    )
+    assert batches[2] == ([[8.0, -8.0], [9.0, -9.0]], [8, 9])
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_shuffle_covers_every_row(prefetch):
+    x, y = _dataset(23)
+    loader = data.DataLoader(x, y, batch_size=5, prefetch=prefetch, seed=0)
+    for _ in range(2):
+        seen = []
+        for bx, by in loader:
+            rows, labels = bx.list(), by.list()
+            assert [r[0] for r in rows] == [float(v) for v in labels]
+            seen.extend(labels)
+        assert sorted(seen) == list(range(23))
+    assert seen != list(range(23))
+
+
+def test_prefetch_matches_sync():
+    x, _ = _dataset(17)
+    with_prefetch = [b.list() for b in data.DataLoader(x, batch_size=3, seed=7)]
+    without = [
+        b.list() for b in data.DataLoader(x, batch_size=3, prefetch=False, seed=7)
+    ]
+    assert with_prefetch == without
+
+
+def test_drop_last_and_strided_source():
+    x = Array([[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]]).T
+    loader = data.DataLoader(x, batch_size=2, shuffle=False, drop_last=True)
+    assert len(loader) == 2
+    assert [b.list() for b in loader] == [[[0, 5], [1, 6]], [[2, 7], [3, 8]]]
+
+
+def test_early_break():
+    x, y = _dataset(100)
+    loader = data.DataLoader(x, y, batch_size=10)
+    for i, (bx, _) in enumerate(loader):
+        if i == 2:
+            break
+    assert sum(len(by) for _, by in loader) == 100
+
+
+def test_invalid_arguments():
+    x, _ = _dataset(4)
+    with pytest.raises(ValueError):
+        data.DataLoader(x, Array([1.0, 2.0]), batch_size=2)
+    with pytest.raises(ValueError):
+        data.DataLoader(x, batch_size=0)
+    with pytest.raises(TypeError):
+        data.DataLoader([1.0, 2.0], batch_size=1)
@@ -0,0 +1,177 @@
+from array import array as pyarray
+
+import Forge
+import numpy as np
+import pytest
+from Forge import Array
+
+# region --- CREATION ---
+
+
+def test_default_is_float32():
+    a = Array([[1, 2], [3, 4]])
+    assert a.dtype == Forge.float32
+    assert a.list() == [[1.0, 2.0], [3.0, 4.0]]
+
+
+def test_lists_with_dtype():
+    a = Array([[1, 2], [3, 4]], dtype="int32")
+    assert a.dtype == Forge.int32
+    assert a.list() == [[1, 2], [3, 4]]
+    assert isinstance(a.list()[0][0], int)
+
+    h = Array([0.5, -2.0], dtype=Forge.float16)
+    assert h.dtype == Forge.float16
+    assert h.list() == [0.5, -2.0]
+
+
+def test_array_module_typecodes():
+    assert Array(pyarray("i", [1, -2])).dtype == Forge.int32
+    b = Array(pyarray("B", [0, 255]))
+    assert b.dtype == Forge.uint8
+    assert b.list() == [0, 255]
+
+
+def test_from_buffer_dtypes():
+    h = Array.from_buffer(np.array([1.5, 2.0], dtype=np.float16), shape=(2,))
+    assert h.dtype == Forge.float16
+    assert h.list() == [1.5, 2.0]
+    with pytest.raises(TypeError):
+        Array.from_buffer(np.array([1.0, 2.0], dtype=np.float64), shape=(2,))
+
+
+def test_unknown_dtype():
+    with pytest.raises(TypeError):
+        Array([1.0], dtype="float64")
+
+
+def test_zeros_dtype():
+    z = Forge.zeros(2, 3, dtype="uint8")
+    assert z.dtype == Forge.uint8
+    assert z.list() == [[0, 0, 0], [0, 0, 0]]
+
+
+# endregion
+
+# region --- ASTYPE ---
+
+
+def test_astype_roundtrip():
+    x_np = np.array([[0.1, -3.25], [1000.0, 7.0]], dtype=np.float32)
+    x = Array(x_np.tolist())
+    for name, np_type in [("float16", np.float16), ("int32", np.int32)]:
+        y = x.astype(name)
+        assert y.dtype == getattr(Forge, name)
+        assert np.allclose(y.list(), x_np.astype(np_type).astype(np.float32))
+        assert y.astype("float32").dtype == Forge.float32
+
+
+def test_astype_bfloat16():
+    x = Array([1.0, -2.5, 3.0078125])
+    y = x.astype(Forge.bfloat16)
+    assert y.list() == [1.0, -2.5, 3.0]
+
+
+def test_astype_strided_and_same_dtype():
+    x = Array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]).T
+    assert x.astype("float32") is x
+    assert x.astype("uint8").list() == [[1, 4], [2, 5], [3, 6]]
+
+
+# endregion
+
+# region --- OPS ---
+
+
+def test_int_elementwise():
+    a = Array([7, -8, 9], dtype="int32")
+    b = Array([2, 3, 4], dtype="int32")
+    assert (a + b).list() == [9, -5, 13]
+    assert (a * b).list() == [14, -24, 36]
+    assert (a / b).list() == [3, -2, 2]
+    assert (a + 1).dtype == Forge.int32
+
+
+def test_int_scalar_ops_are_exact():
+    # Scalar ops on integers don't go through float, which is exact only up to 2^24
+    a = Array([16777217, -7], dtype="int32")
+    assert (a + 1).list() == [16777218, -6]
+    assert (a * 3).list() == [50331651, -21]
+    assert (a - 16777216).list() == [1, -16777223]
+    assert Forge.maximum(a, 16777218).list() == [16777218, 16777218]
+    a[1] = 16777219
+    assert a.list() == [16777217, 16777219]
+    b = Array([5, 250], dtype="uint8")
+    assert (b + 10).list() == [15, 4]
+    assert Forge.maximum(b, -1).list() == [5, 250]
+
+
+def test_half_elementwise():
+    x_np = np.array([0.5, 1.5, -2.0], dtype=np.float16)
+    x = Array.from_buffer(x_np, shape=(3,))
+    y = Forge.exp(x) * 2.0
+    assert y.dtype == Forge.float16
+    assert np.allclose(y.list(), np.exp(x_np.astype(np.float32)) * 2.0, rtol=1e-3)
+
+
+def test_dtype_mismatch():
+    with pytest.raises(RuntimeError):
+        _ = Array([1.0]) + Array([1], dtype="int32")
+
+
+def test_unary_requires_float():
+    with pytest.raises(RuntimeError):
+        Forge.exp(Array([1, 2], dtype="int32"))
+
+
+def test_uint8_sum_widens():
+    b = Array(pyarray("B", [200, 200, 200]))
+    s = b.sum()
+    assert s.dtype == Forge.int32
+    assert s.list() == 600
+    assert b.reshape(3, 1).sum(axis=0).list() == [600]
+
+
+def test_half_sum_accumulates_in_float():
+    # 4096 + 1 is not representable in float16, so a float16 accumulator stalls
+    x = Array.from_buffer(np.ones(8192, dtype=np.float16), shape=(8192,))
+    assert x.sum().list() == 8192.0
+
+
+def test_half_matmul():
+    a_np = np.random.randn(8, 16).astype(np.float16)
+    b_np = np.random.randn(16, 4).astype(np.float16)
+    a = Array.from_buffer(a_np, shape=a_np.shape)
+    b = Array.from_buffer(b_np, shape=b_np.shape)
+    c = a @ b
+    assert c.dtype == Forge.float16
+    expected = a_np.astype(np.float32) @ b_np.astype(np.float32)
+    assert np.allclose(c.list(), expected, rtol=1e-2, atol=1e-2)
+
+
+def test_half_softmax():
+    x_np = np.random.randn(4, 10).astype(np.float16)
+    x = Array.from_buffer(x_np, shape=x_np.shape)
+    p = Forge.softmax(x, axis=1)
+    assert p.dtype == Forge.float16
+    e = np.exp(x_np.astype(np.float32))
+    assert np.allclose(p.list(), e / e.sum(axis=1, keepdims=True), atol=1e-3)
+
+
+def test_cross_entropy_int_labels():
+    logits = Array([[2.0, 0.5, 0.1], [0.1, 0.2, 3.0]])
+    labels = Array([0, 2], dtype="int32")
+    loss = Forge.cross_entropy(logits, labels, axis=1, reduction="none")
+    x = np.array(logits.list())
+    lse = np.log(np.exp(x).sum(axis=1))
+    assert np.allclose(loss.list(), lse - x[[0, 1], [0, 2]], rtol=1e-5)
+
+
+def test_setitem_converts():
+    b = Array([1, 2, 3, 4], dtype="uint8")
+    b[1:3] = Array([7.0, 9.0])
+    b[3] = 250
+    assert b.list() == [1, 7, 9, 250]
+
+
+# endregion
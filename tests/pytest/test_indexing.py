@@ -1,5 +1,9 @@
+import Forge
+import numpy as np
 import pytest
 from Forge import Array
+from Forge.forge import _trace
+from Forge.graph import Ops
 
 
 # Helper to create a shared 3D array for testing
@@ -181,6 +185,33 @@ def test_newaxis_and_ellipsis_combo(tensor_3d):
     assert original_flat == view_flat
 
 
+def test_newaxis_after_integer_and_slice(tensor_3d):
+    """None lands where NumPy puts it, also after integer indices."""
+    ref = np.arange(24, dtype=np.float32).reshape(2, 3, 4)
+    for key in [(0, None), (0, None, 1), (slice(None), None, 0), (None, 1, None)]:
+        view = tensor_3d[key]
+        assert view.shape == ref[key].shape
+        assert view.list() == ref[key].tolist()
+
+
+def test_slices_follow_python_semantics(tensor_3d):
+    """Out-of-range starts give empty views, as for Python sequences."""
+    ref = np.arange(24, dtype=np.float32).reshape(2, 3, 4)
+    for key in [slice(5, 10), slice(2, None), (0, slice(3, 1, -1)), (1, 1, slice(9))]:
+        view = tensor_3d[key]
+        assert view.shape == ref[key].shape
+        assert view.list() == ref[key].tolist()
+
+
+def test_repeated_keys_on_different_arrays():
+    """Memoized views depend on the shape and strides, not just the key."""
+    a = Array([[1, 2, 3], [4, 5, 6]])
+    for _ in range(3):
+        assert a[1:, ::2].list() == [[4, 6]]
+        assert a.T[1:, ::2].list() == [[2], [3]]
+        assert a[1][1:].list() == [5, 6]
+
+
 # endregion
 
 # region --- __setitem__ ---
@@ -211,6 +242,13 @@ def test_set_broadcasting(tensor_3d):
     assert tensor_3d[1, 0].list() == [7, 7, 7, 7]
 
 
+def test_set_scalar_strided(tensor_3d):
+    tensor_3d[:, ::2, 1] = -1.0
+    assert tensor_3d[0, 0, 1] == -1.0
+    assert tensor_3d[1, 2, 1] == -1.0
+    assert tensor_3d[0, 1, 1] != -1.0
+
+
 # endregion
 
 # region --- sum & len ---
@@ -239,3 +277,205 @@ def test_len(tensor_3d):
 
 
 # endregion
+
+# region --- INDEX ARRAYS ---
+
+
+def test_take_rows_and_columns(tensor_3d):
+    idx = Array([2, 0, 2], dtype="int32")
+    ref = np.array(tensor_3d.list())
+    out = tensor_3d.take(idx, axis=1)
+    assert out.shape == (2, 3, 4)
+    assert out.list() == np.take(ref, [2, 0, 2], axis=1).tolist()
+    assert Forge.take(tensor_3d, [3, -1], axis=2).list() == ref[:, :, [3, -1]].tolist()
+
+
+def test_take_flat_and_nd_indices(tensor_3d):
+    ref = np.array(tensor_3d.list())
+    assert tensor_3d.take([23, 0, 5]).list() == np.take(ref, [23, 0, 5]).tolist()
+    idx = [[1, 0], [0, 1]]
+    out = tensor_3d.take(idx, axis=0)
+    assert out.shape == (2, 2, 3, 4)
+    assert out.list() == np.take(ref, idx, axis=0).tolist()
+
+
+def test_take_from_view(tensor_3d):
+    view = tensor_3d.transpose((2, 0, 1))[:, 1]
+    ref = np.array(view.list())
+    idx = Array([2, 1], dtype="int32")[::-1]
+    assert view.take(idx, axis=1).list() == ref[:, [1, 2]].tolist()
+
+
+def test_take_out_of_range_reads_zero():
+    a = Array([1.0, 2.0, 3.0])
+    assert a.take([0, 5, -4]).list() == [1.0, 0.0, 0.0]
+
+
+def test_getitem_index_array(tensor_3d):
+    ref = np.array(tensor_3d.list())
+    idx = Array([1, 0, 1], dtype="int32")
+    assert tensor_3d[idx].list() == ref[[1, 0, 1]].tolist()
+    assert tensor_3d[[1, -2]].list() == ref[[1, -2]].tolist()
+    assert tensor_3d[:, [2, 0]].list() == ref[:, [2, 0]].tolist()
+    assert tensor_3d[1, :, [3, 0]].list() == ref[1][:, [3, 0]].tolist()
+    assert tensor_3d[..., [1]].list() == ref[..., [1]].tolist()
+    assert tensor_3d[None, :, [0]].list() == ref[None, :, [0]].tolist()
+
+
+def test_getitem_index_array_dtypes():
+    a = Array([10.0, 20.0, 30.0])
+    assert a[Array([2, 0], dtype="int32")].list() == [30.0, 10.0]
+    # Comparison masks are uint8 and would otherwise gather rows 0 and 1
+    with pytest.raises(TypeError):
+        a[a > 15.0]
+    with pytest.raises(TypeError):
+        a.take(Array([2, 0], dtype="uint8"))
+    with pytest.raises(TypeError):
+        a[Array([1.0])]
+    with pytest.raises(IndexError):
+        a[[0], [0]]
+
+
+def test_setitem_index_array_rejected(tensor_3d):
+    with pytest.raises(TypeError):
+        tensor_3d[[0, 1]] = 0.0
+
+
+def test_gather_along_axis():
+    ref = np.arange(12, dtype=np.float32).reshape(3, 4)
+    a = Array(ref.tolist())
+    idx = np.array([[3, 0], [1, 1], [2, 0]], dtype=np.int32)
+    out = a.gather(Array(idx.tolist(), dtype="int32"), axis=1)
+    assert out.shape == (3, 2)
+    assert out.list() == np.take_along_axis(ref, idx, axis=1).tolist()
+    idx0 = np.array([[2, 0, 1, 2]], dtype=np.int32)
+    out0 = Forge.gather(a, Array(idx0.tolist(), dtype="int32"), 0)
+    assert out0.list() == np.take_along_axis(ref, idx0, axis=0).tolist()
+
+
+def test_gather_shape_checks():
+    a = Forge.zeros(3, 4)
+    with pytest.raises(RuntimeError):
+        a.gather(Array([0, 1], dtype="int32"), axis=1)
+    with pytest.raises(RuntimeError):
+        a.gather(Array([[0] * 5], dtype="int32"), axis=0)
+
+
+def test_index_add_accumulates_repeats():
+    target = Forge.zeros(4, 2)
+    updates = Array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+    out = Forge.index_add(target, [1, 3, 1], updates)
+    assert out is target
+    assert target.list() == [[0.0, 0.0], [6.0, 8.0], [0.0, 0.0], [3.0, 4.0]]
+
+
+def test_index_add_inner_axis_and_dtypes():
+    ref = np.zeros((2, 3), dtype=np.int32)
+    np.add.at(ref, (slice(None), [2, 2, 0]), np.array([[1, 2, 3], [4, 5, 6]]))
+    target = Forge.zeros(2, 3, dtype="int32")
+    target.index_add([2, 2, 0], Array([[1, 2, 3], [4, 5, 6]], dtype="int32"), axis=1)
+    assert target.list() == ref.tolist()
+
+    half = Forge.zeros(3, dtype="float16")
+    half.index_add([0, 0, 2], Array([0.5, 0.25, 1.0]))
+    assert half.list() == [0.75, 0.0, 1.0]
+
+
+def test_index_add_is_take_backward():
+    # Gradient of an embedding lookup: scatter the row gradients back onto the table
+    idx = [3, 1, 3, 0]
+    grad_out = Forge.rand(4, 5)
+    grad_table = Forge.zeros(6, 5)
+    grad_table.index_add(idx, grad_out)
+    ref = np.zeros((6, 5), dtype=np.float32)
+    np.add.at(ref, idx, np.array(grad_out.list(), dtype=np.float32))
+    assert np.allclose(grad_table.list(), ref, atol=1e-6)
+
+
+def test_scatter_add_along_axis():
+    idx = np.array([[0, 2, 0], [1, 1, 1]], dtype=np.int32)
+    upd = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], dtype=np.float32)
+    ref = np.zeros((2, 4), dtype=np.float32)
+    rows = np.arange(2)[:, None].repeat(3, axis=1)
+    np.add.at(ref, (rows, idx), upd)
+    target = Forge.zeros(2, 4)
+    Forge.scatter_add(
+        target, Array(idx.tolist(), dtype="int32"), Array(upd.tolist()), 1
+    )
+    assert target.list() == ref.tolist()
+
+
+def test_scatter_add_shape_mismatch():
+    with pytest.raises(RuntimeError):
+        Forge.zeros(2, 4).scatter_add(
+            Array([[0, 1]], dtype="int32"), Array([[1.0, 2.0, 3.0]]), axis=1
+        )
+
+
+# endregion
+
+# region --- TRACED INDEX ARRAYS ---
+
+
+def _index_ops(table, idx, rows, grid):
+    emb = table[idx]
+    grid.scatter_add(rows, Forge.gather(grid, rows, 1), 1)
+    return table.index_add(idx, emb * 2.0)
+
+
+def test_trace_index_ops():
+    table, grid = Forge.rand(10, 4), Forge.rand(5, 6)
+    idx = Forge.zeros(3, dtype="int32")
+    rows = Forge.zeros(5, 2, dtype="int32")
+    nodes, output = _trace(_index_ops, (table, idx, rows, grid))
+    index = {node[0]: i for i, node in enumerate(nodes)}
+    op, inputs, shape, _, _, args, _ = nodes[index[Ops.TAKE]]
+    assert nodes[inputs[0]][0] == Ops.VIEW and inputs[1] == 1
+    assert tuple(shape) == (3, 4) and args == (0,)
+
+    op, inputs, shape, _, _, args, _ = nodes[index[Ops.GATHER]]
+    assert inputs == [3, 2] and tuple(shape) == (5, 2) and args == (1,)
+
+    op, inputs, shape, _, _, args, _ = nodes[index[Ops.SCATTER_ADD]]
+    assert inputs == [3, 2, index[Ops.GATHER]]
+    assert tuple(shape) == (5, 6) and args == (1,)
+
+    op, inputs, shape, _, _, args, _ = nodes[index[Ops.INDEX_ADD]]
+    assert inputs[:2] == [0, 1] and nodes[inputs[2]][0] == Ops.MUL
+    assert tuple(shape) == (10, 4) and args == (0,)
+    assert output == index[Ops.INDEX_ADD]
+
+
+def test_trace_index_adds_update_in_place():
+    # As in eager mode, the target holds the result even when the return is discarded
+    def add_rows(table, idx, updates):
+        table.index_add(idx, updates)
+        return table
+
+    def add_along(grid, rows, updates):
+        grid.scatter_add(rows, updates, 1)
+        return grid
+
+    idx = Forge.zeros(3, dtype="int32")
+    nodes, output = _trace(add_rows, (Forge.rand(10, 4), idx, Forge.rand(3, 4)))
+    assert nodes[output][0] == Ops.INDEX_ADD and nodes[output][1] == [0, 1, 2]
+
+    rows = Forge.zeros(5, 2, dtype="int32")
+    nodes, output = _trace(add_along, (Forge.rand(5, 6), rows, Forge.rand(5, 2)))
+    assert nodes[output][0] == Ops.SCATTER_ADD and nodes[output][1] == [0, 1, 2]
+
+
+def test_trace_index_list_errors():
+    x = Forge.rand(4, 3)
+    with pytest.raises(TypeError, match="traced"):
+        _trace(lambda a: a[[0, 2]], (x,))
+
+    def assign(a):
+        a[[0, 2]] = 1.0
+        return a
+
+    with pytest.raises(TypeError, match="assigning"):
+        _trace(assign, (x,))
+
+
+# endregion
@@ -0,0 +1,82 @@
+import Forge
+import numpy as np
+import pytest
+from Forge import Array
+
+# region --- FROM_FILE ---
+
+
+def test_from_file_uint8(tmp_path):
+    path = tmp_path / "data.bin"
+    data = np.arange(24, dtype=np.uint8)
+    path.write_bytes(data.tobytes())
+    a = Forge.io.from_file(path, (4, 6))
+    assert a.dtype == Forge.uint8
+    assert a.shape == (4, 6)
+    assert a.list() == data.reshape(4, 6).tolist()
+
+
+def test_from_file_offset_and_dtype(tmp_path):
+    path = tmp_path / "data.bin"
+    header = np.array([7, 8, 9], dtype=np.uint32).tobytes()
+    values = np.linspace(-1.0, 1.0, 10, dtype=np.float32)
+    path.write_bytes(header + values.tobytes())
+    a = Array.from_file(str(path), 10, dtype="float32", offset=12)
+    assert a.dtype == Forge.float32
+    assert np.allclose(a.list(), values)
+    assert np.allclose((a * 2.0).list(), values * 2.0)
+
+
+def test_from_file_writes_stay_in_memory(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes([1, 2, 3, 4]))
+    a = Forge.io.from_file(path, 4)
+    a[0] = 100
+    a += Array([1, 1, 1, 1], dtype="uint8")
+    assert a.list() == [101, 3, 4, 5]
+    assert path.read_bytes() == bytes([1, 2, 3, 4])
+
+
+def test_from_file_errors(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(10))
+    with pytest.raises(RuntimeError):
+        Forge.io.from_file(path, 11)
+    with pytest.raises(RuntimeError):
+        Forge.io.from_file(path, 2, dtype="float32", offset=2)
+    with pytest.raises(RuntimeError):
+        Forge.io.from_file(tmp_path / "missing.bin", 1)
+
+
+# endregion
+
+# region --- DECODE ---
+
+
+def test_normalize():
+    pixels = Array([[0, 51], [255, 102]], dtype="uint8")
+    x = Forge.io.normalize(pixels, 1.0 / 255.0)
+    assert x.dtype == Forge.float32
+    assert np.allclose(x.list(), [[0.0, 0.2], [1.0, 0.4]])
+
+    centered = Forge.io.normalize(pixels, 2.0 / 255.0, -1.0, dtype="float16")
+    assert centered.dtype == Forge.float16
+    assert np.allclose(centered.list(), [[-1.0, -0.6], [1.0, -0.2]], atol=1e-3)
+
+
+def test_one_hot():
+    labels = Array([2, 0, 1, 5], dtype="uint8")
+    y = Forge.io.one_hot(labels, 3)
+    assert y.dtype == Forge.float32
+    assert y.list() == [[0, 0, 1], [1, 0, 0], [0, 1, 0], [0, 0, 0]]
+
+    grid = Array([[1, 0], [1, 1]], dtype="int32")
+    assert Forge.io.one_hot(grid.T, 2, dtype="int32").list() == [
+        [[0, 1], [0, 1]],
+        [[1, 0], [0, 1]],
+    ]
+    with pytest.raises(RuntimeError):
+        Forge.io.one_hot(labels, 0)
+
+
+# endregion
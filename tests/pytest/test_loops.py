@@ -0,0 +1,73 @@
+import Forge
+import pytest
+
+# region --- TRACING ---
+
+
+def test_fori_loop_unrolls_inside_forge():
+    def f(w, x):
+        return Forge.fori_loop(3, lambda c, x: c * x, w, x)
+
+    w, x = Forge.rand(4, 4), Forge.rand(4, 4)
+    ops = [r["op"] for r in Forge.forge(f).report(w, x, optimized=False).rows]
+    assert ops == ["INPUT", "INPUT", "MUL", "MUL", "MUL"]
+
+
+def test_scan_unrolls_slices_inside_forge():
+    def f(c, xs):
+        return Forge.scan(lambda c, x: c + x, c, xs)
+
+    c, xs = Forge.rand(8), Forge.rand(4, 8)
+    rows = Forge.forge(f).report(c, xs, optimized=False).rows
+    assert [r["op"] for r in rows[2:]] == ["VIEW", "ADD"] * 4
+    assert [r["offset"] for r in rows[2::2]] == [0, 8, 16, 24]
+
+
+# endregion
+
+# region --- VALIDATION ---
+
+
+def test_zero_iterations_return_init():
+    w = Forge.rand(3)
+    assert Forge.fori_loop(0, lambda c: c * c, w) is w
+
+
+def test_negative_iterations_raise():
+    with pytest.raises(ValueError):
+        Forge.fori_loop(-1, lambda c: c * c, Forge.rand(3))
+
+
+def test_body_must_keep_carry_shape():
+    with pytest.raises(ValueError):
+        Forge.fori_loop(2, lambda c: c.T, Forge.rand(2, 3))
+
+
+def test_body_must_return_new_array():
+    with pytest.raises(ValueError):
+        Forge.fori_loop(2, lambda c: c, Forge.rand(3))
+
+
+def test_scan_over_1d_xs():
+    # Each step of a 1-d xs is a 0-d Array, as inside @forge
+    seen = []
+
+    def body(c, lr):
+        seen.append(tuple(lr.shape))
+        return c.T * lr
+
+    with pytest.raises(ValueError):
+        Forge.scan(body, Forge.rand(2, 3), Forge.rand(4))
+    assert seen == [()]
+
+
+def test_scan_lengths_must_match():
+    with pytest.raises(ValueError):
+        Forge.scan(
+            lambda c, x, y: c + x * y,
+            Forge.rand(3),
+            (Forge.rand(4, 3), Forge.rand(5, 3)),
+        )
+
+
+# endregion
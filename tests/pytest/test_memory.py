@@ -0,0 +1,86 @@
+import gc
+
+import Forge
+
+# region --- MEMORY STATS ---
+
+
+def test_memory_stats_track_allocations():
+    gc.collect()
+    before = Forge.memory_stats()
+    a = Forge.zeros(256, 64)
+    after = Forge.memory_stats()
+    assert after["live_bytes"] - before["live_bytes"] == 256 * 64 * 4
+    assert after["allocations"] == before["allocations"] + 1
+    assert after["live_buffers"] == before["live_buffers"] + 1
+
+    # Views share the storage: a new handle, no new bytes
+    view = a[:10].T
+    stats = Forge.memory_stats()
+    assert stats["live_bytes"] == after["live_bytes"]
+    assert stats["live_handles"] > after["live_handles"]
+
+    del a, view
+    gc.collect()
+    freed = Forge.memory_stats()
+    assert freed["live_bytes"] == before["live_bytes"]
+    assert freed["frees"] == before["frees"] + 1
+    assert freed["live_handles"] == before["live_handles"]
+
+
+def test_memory_stats_dtype_sizes():
+    gc.collect()
+    before = Forge.memory_stats()["live_bytes"]
+    h = Forge.zeros(100, dtype=Forge.float16)
+    u = Forge.zeros(100, dtype=Forge.uint8)
+    assert Forge.memory_stats()["live_bytes"] - before == 100 * 2 + 100
+    del h, u
+
+
+def test_peak_memory_reset():
+    gc.collect()
+    Forge.reset_peak_memory()
+    base = Forge.memory_stats()
+    assert base["peak_bytes"] == base["live_bytes"]
+
+    big = Forge.zeros(1024, 1024)
+    del big
+    gc.collect()
+    stats = Forge.memory_stats()
+    assert stats["peak_bytes"] >= base["live_bytes"] + 1024 * 1024 * 4
+    assert stats["live_bytes"] == base["live_bytes"]
+
+    Forge.reset_peak_memory()
+    assert Forge.memory_stats()["peak_bytes"] == stats["live_bytes"]
+
+
+def test_no_growth_across_iterations():
+    x = Forge.rand(64, 64)
+    for _ in range(3):
+        (x @ x + 1.0).sum().item()
+    gc.collect()
+    before = Forge.memory_stats()
+    for _ in range(10):
+        (x @ x + 1.0).sum().item()
+    gc.collect()
+    after = Forge.memory_stats()
+    assert after["live_bytes"] == before["live_bytes"]
+    assert after["live_handles"] == before["live_handles"]
+
+
+def test_memory_stats_keys():
+    stats = Forge.memory_stats()
+    assert set(stats) == {
+        "live_bytes",
+        "peak_bytes",
+        "arena_bytes",
+        "allocations",
+        "frees",
+        "live_buffers",
+        "live_handles",
+        "graph_arena_bytes",
+    }
+    assert isinstance(stats["graph_arena_bytes"], dict)
+
+
+# endregion
@@ -234,6 +234,142 @@ def test_matmul_transpose():
     assert result.list() == [[89.0, 98.0], [116.0, 128.0]]
 
 
+def _copies(fn):
+    before = Forge._backend.matmul_copy_count()
+    result = fn()
+    return result, Forge._backend.matmul_copy_count() - before
+
+
+def test_matmul_zero_copy_layouts():
+    rng = np.random.default_rng(1)
+    x_np = rng.standard_normal((6, 8)).astype(np.float32)
+    w_np = rng.standard_normal((5, 8)).astype(np.float32)
+    x, w = Array(x_np.tolist()), Array(w_np.tolist())
+    cases = [
+        (lambda: x @ w.T, x_np @ w_np.T),
+        # Row slice of a transposed weight
+        (lambda: x[:, :5] @ w.T[1:6], x_np[:, :5] @ w_np.T[1:6]),
+        # Padded leading dimension: rows 8 apart, 3 columns used
+        (lambda: x[:4, :3] @ x.T[2:5, :2], x_np[:4, :3] @ x_np.T[2:5, :2]),
+        # Matrix-vector with a strided vector
+        (lambda: x.T @ x.T[0], x_np.T @ x_np.T[0]),
+    ]
+    for fn, expected in cases:
+        result, copies = _copies(fn)
+        assert copies == 0
+        assert np.allclose(result.list(), expected, atol=1e-5)
+
+
+def test_matmul_zero_copy_batch_strides():
+    rng = np.random.default_rng(2)
+    a_np = rng.standard_normal((4, 3, 5)).astype(np.float32)
+    b_np = rng.standard_normal((5, 2)).astype(np.float32)
+    a, b = Array(a_np.tolist()), Array(b_np.tolist())
+    # Every other batch, and a batch of transposed matrices
+    result, copies = _copies(lambda: a[::2] @ b)
+    assert copies == 0
+    assert np.allclose(result.list(), a_np[::2] @ b_np, atol=1e-5)
+    result, copies = _copies(lambda: a.transpose((0, 2, 1))[1:] @ a[0])
+    assert copies == 0
+    expected = a_np.transpose((0, 2, 1))[1:] @ a_np[0]
+    assert np.allclose(result.list(), expected, atol=1e-5)
+
+
+def test_matmul_copies_strided_columns():
+    x_np = np.arange(24, dtype=np.float32).reshape(4, 6)
+    x = Array(x_np.tolist())
+    result, copies = _copies(lambda: x[:, ::2] @ x[:3])
+    assert copies == 1
+    assert np.allclose(result.list(), x_np[:, ::2] @ x_np[:3])
+
+
+# endregion
+
+# region --- MATMUL EPILOGUE ---
+
+
+@pytest.fixture
+def layer_np():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((6, 5)).astype(np.float32)
+    w = rng.standard_normal((4, 5)).astype(np.float32)
+    b = rng.standard_normal(4).astype(np.float32)
+    return x, w, b
+
+
+def test_linear_bias(layer_np):
+    x, w, b = layer_np
+    result = Forge.linear(Array(x.tolist()), Array(w.tolist()), Array(b.tolist()))
+    assert result.shape == (6, 4)
+    assert np.allclose(result.list(), x @ w.T + b, atol=1e-5)
+
+
+def test_linear_activations(layer_np):
+    x, w, b = layer_np
+    z = x @ w.T + b
+    expected = {
+        "relu": np.maximum(z, 0),
+        "tanh": np.tanh(z),
+        "sigmoid": 1 / (1 + np.exp(-z)),
+        "gelu": 0.5 * z * (1 + np.tanh(0.7978845608 * (z + 0.044715 * z**3))),
+    }
+    fx, fw, fb = Array(x.tolist()), Array(w.tolist()), Array(b.tolist())
+    for name, ref in expected.items():
+        result = Forge.linear(fx, fw, fb, activation=name)
+        assert np.allclose(result.list(), ref, atol=1e-4), name
+    # Activation without a bias
+    assert np.allclose(
+        Forge.linear(fx, fw, activation="relu").list(), np.maximum(x @ w.T, 0)
+    )
+
+
+def test_matmul_alpha_beta_out(layer_np):
+    x, w, b = layer_np
+    acc = np.ones((6, 4), dtype=np.float32)
+    out = Array(acc.tolist())
+    result = Forge.matmul(
+        Array(x.tolist()),
+        Array(w.T.tolist()),
+        bias=Array(b.tolist()),
+        alpha=0.5,
+        beta=2.0,
+        out=out,
+    )
+    assert result is out
+    assert np.allclose(out.list(), 0.5 * (x @ w.T) + 2.0 * acc + b, atol=1e-5)
+
+
+def test_linear_float16(layer_np):
+    x, w, b = layer_np
+    result = Forge.linear(
+        Array(x.tolist(), dtype="float16"),
+        Array(w.tolist(), dtype="float16"),
+        Array(b.tolist(), dtype="float16"),
+        activation="tanh",
+    )
+    assert result.dtype == Forge.float16
+    assert np.allclose(result.list(), np.tanh(x @ w.T + b), atol=1e-2)
+
+
+def test_matmul_epilogue_errors(layer_np):
+    x, w, _ = layer_np
+    fx, fw = Array(x.tolist()), Array(w.tolist())
+    with pytest.raises(ValueError):
+        Forge.linear(fx, fw, activation="softplus")
+    with pytest.raises(RuntimeError):
+        Forge.linear(fx, fw, Array([1.0, 2.0]))
+    with pytest.raises(RuntimeError):
+        Forge.matmul(fx, fw.T, out=Forge.zeros(4, 6))
+
+
+def test_matmul_out_must_not_alias_operands():
+    a, b = Forge.rand(4, 4), Forge.rand(4, 4)
+    with pytest.raises(RuntimeError):
+        a.matmul(b, out=a)
+    with pytest.raises(RuntimeError):
+        a.matmul(b.T, out=b)
+
+
 # endregion
 
 # region --- EXPONENTIATION ---
@@ -288,13 +424,13 @@ def test_rand_correct():
     Forge.set_seed(42)
     result = Forge.rand(2, 2)
     assert result.list() == [
-        [0.34056931734085083, 0.4297073781490326],
-        [0.4053425192832947, 0.8056803345680237],
+        [0.6129598617553711, 0.4685865044593811],
+        [0.07323169708251953, 0.3408614993095398],
     ]
     result2 = Forge.rand(2, 2)
     assert result2.list() != [
-        [0.34056931734085083, 0.4297073781490326],
-        [0.4053425192832947, 0.8056803345680237],
+        [0.6129598617553711, 0.4685865044593811],
+        [0.07323169708251953, 0.3408614993095398],
     ]
 
 
@@ -310,6 +446,115 @@ def test_iadd():
     assert a1.list() == [[5.0, 7.0], [9.0, 11.0]]
 
 
+def test_inplace_scalar():
+    a = Array([[1.0, 2.0], [3.0, 4.0]])
+    view = a[:, 1]
+    view += 1
+    view *= 2.0
+    view -= 0.5
+    view /= 2
+    assert a.list() == [[1.0, 2.75], [3.0, 4.75]]
+
+
+def test_inplace_scalar_0d_fails():
+    a = Array(1.0)
+    with pytest.raises(RuntimeError):
+        a += 1.0
+
+
+# endregion
+
+# region --- SCALAR OPERANDS ---
+
+
+def test_scalar_binops():
+    x_np = np.array([[1.0, -2.0], [4.0, 8.0]], dtype=np.float32)
+    x = Array(x_np.tolist())
+    assert np.allclose((x * 0.5 + 1.0).list(), x_np * 0.5 + 1.0)
+    assert np.allclose((x - 3).list(), x_np - 3)
+    assert np.allclose((3 - x).list(), 3 - x_np)
+    assert np.allclose((x / 4).list(), x_np / 4)
+    assert np.allclose((2.0 / x).list(), 2.0 / x_np)
+    assert np.allclose((2 * x).list(), 2 * x_np)
+    assert np.allclose((-x).list(), -x_np)
+
+
+def test_scalar_strided():
+    x = Array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]).T
+    assert (x[::2] + 10).list() == [[11.0, 14.0], [13.0, 16.0]]
+
+
+def test_scalar_0d_broadcast_shape():
+    # Same result shape as broadcasting against a 1-element Array
+    a = Array(2.0)
+    assert (a + 1.0).shape == (a + Array([1.0])).shape == (1,)
+    assert (-a).list() == [-2.0]
+
+
+# endregion
+
+# region --- LAYOUTS ---
+# Shapes and strides are coalesced before launch; each case lands in a different kernel layout
+# and the odd sizes exercise the partial last group of a thread.
+
+
+@pytest.fixture
+def grid_np():
+    return np.arange(5 * 7 * 3, dtype=np.float32).reshape(5, 7, 3) - 50.0
+
+
+def test_layout_contiguous(grid_np):
+    x = Array(grid_np.tolist())
+    assert np.allclose((x + x).list(), grid_np + grid_np)
+    assert np.allclose(x.exp().list(), np.exp(grid_np), rtol=1e-5)
+
+
+def test_layout_scalar_broadcast(grid_np):
+    x = Array(grid_np.tolist())
+    one = Array([1.5])
+    assert np.allclose((x * one).list(), grid_np * 1.5)
+    assert np.allclose((x[:, 2] * 3.0).list(), grid_np[:, 2] * 3.0)
+
+
+def test_layout_row_broadcast(grid_np):
+    x = Array(grid_np.tolist())
+    row = Array(grid_np[0].tolist())
+    assert np.allclose((x - row).list(), grid_np - grid_np[0])
+
+
+def test_layout_transposed(grid_np):
+    a = grid_np[:, :, 0]
+    x = Array(a.tolist())
+    assert np.allclose((x.T + x.T).list(), a.T + a.T)
+    assert np.allclose((x.T * 2.0).list(), a.T * 2.0)
+
+
+def test_layout_generic(grid_np):
+    x = Array(grid_np.tolist())
+    view = x[::2, 1:, ::2]
+    expected = grid_np[::2, 1:, ::2]
+    assert np.allclose((view + view).list(), expected * 2)
+
+
+def test_layout_inplace_view(grid_np):
+    x = Array(grid_np.tolist())
+    view = x.T
+    view += Array(grid_np.T.tolist())
+    view *= 0.5
+    assert np.allclose(x.list(), grid_np)
+
+
+def test_layout_fast_paths_toggle(grid_np):
+    x = Array(grid_np.tolist())
+    fast = (x.T + x[0, 0, 0]).list()
+    Forge._backend.set_elementwise_fast_paths(False)
+    try:
+        slow = (x.T + x[0, 0, 0]).list()
+    finally:
+        Forge._backend.set_elementwise_fast_paths(True)
+    assert fast == slow
+
+
 # endregion
 
 # region --- ZERO ---
@@ -338,3 +583,236 @@ def test_sum_global():
 
 
 # endregion
+
+# region --- SOFTMAX / CROSS-ENTROPY ---
+
+
+def _np_log_softmax(x, axis):
+    m = x.max(axis=axis, keepdims=True)
+    return x - m - np.log(np.exp(x - m).sum(axis=axis, keepdims=True))
+
+
+def test_softmax_rows():
+    x = np.array([[1.0, 2.0, 3.0], [-1.0, 0.0, 1.0]], dtype=np.float32)
+    result = Forge.softmax(Array(x.tolist()), axis=1)
+    assert result.shape == (2, 3)
+    assert np.allclose(result.list(), np.exp(_np_log_softmax(x, 1)), atol=1e-6)
+
+
+def test_softmax_is_stable():
+    a = Array([[1000.0, 1001.0], [-1000.0, -1000.0]])
+    assert np.allclose(a.softmax().list(), [[0.26894142, 0.73105858], [0.5, 0.5]])
+
+
+def test_softmax_masked_rows():
+    # -inf entries get probability 0; a fully masked row is all 0, not NaN
+    ninf = float("-inf")
+    x = np.array([[ninf, 0.0, 1.0], [ninf, ninf, ninf]], dtype=np.float32)
+    a = Array(x.tolist())
+    expected = np.exp(_np_log_softmax(x[:1, 1:], 1))
+    result = np.array(a.softmax().list())
+    assert np.allclose(result[0], [0.0, *expected[0]], atol=1e-6)
+    assert result[1].tolist() == [0.0, 0.0, 0.0]
+    lsm = np.array(Forge.log_softmax(a).list())
+    assert np.allclose(lsm[0, 1:], _np_log_softmax(x[:1, 1:], 1)[0], atol=1e-5)
+    assert np.all(np.isfinite(lsm)) and lsm[0, 0] < -1e38
+    lse = np.array(Forge.logsumexp(a, axis=1).list())
+    assert np.isclose(lse[0], np.log(np.exp(0.0) + np.exp(1.0)))
+    assert np.isfinite(lse[1]) and lse[1] < -1e38
+
+
+def test_softmax_axis0_strided():
+    x = np.arange(12, dtype=np.float32).reshape(3, 4) / 4
+    a = Array(x.tolist()).T
+    assert np.allclose(
+        Forge.softmax(a, axis=0).list(), np.exp(_np_log_softmax(x.T, 0)), atol=1e-6
+    )
+
+
+def test_log_softmax():
+    x = np.array([[0.5, -2.0, 3.0, 1.0]], dtype=np.float32)
+    result = Forge.log_softmax(Array(x.tolist()))
+    assert np.allclose(result.list(), _np_log_softmax(x, -1), atol=1e-5)
+
+
+def test_logsumexp():
+    x = np.array([[1.0, 2.0], [3.0, 4.0], [100.0, 100.0]], dtype=np.float32)
+    a = Array(x.tolist())
+    expected = np.log(np.exp(x - 100).sum(axis=1)) + 100
+    assert np.allclose(Forge.logsumexp(a, axis=1).list(), expected, atol=1e-5)
+    assert a.logsumexp(axis=0, keepdims=True).shape == (1, 2)
+    with pytest.raises(IndexError):
+        a.logsumexp(axis=2)
+
+
+def test_cross_entropy_one_hot():
+    x = np.array([[2.0, 1.0, 0.1], [0.5, 2.5, 0.3]], dtype=np.float32)
+    y = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], dtype=np.float32)
+    losses = -(y * _np_log_softmax(x, 1)).sum(axis=1)
+    logits, labels = Array(x.tolist()), Array(y.tolist())
+    assert np.isclose(Forge.cross_entropy(logits, labels).list(), losses.mean())
+    assert np.isclose(
+        logits.cross_entropy(labels, reduction="sum").list(), losses.sum()
+    )
+    assert np.allclose(logits.cross_entropy(labels, reduction="none").list(), losses)
+
+
+def test_cross_entropy_class_indices():
+    x = np.array([[2.0, 1.0, 0.1], [0.5, 2.5, 0.3]], dtype=np.float32)
+    losses = -_np_log_softmax(x, 1)[[0, 1], [2, 1]]
+    result = Forge.cross_entropy(Array(x.tolist()), Array([2.0, 1.0]), reduction="none")
+    assert np.allclose(result.list(), losses, atol=1e-6)
+
+
+def test_cross_entropy_masked_and_invalid_targets():
+    ninf = float("-inf")
+    logits = Array([[ninf, 1.0, 2.0], [0.0, 1.0, 2.0]])
+    # Masked logits don't contribute to the normalizer
+    losses = Forge.cross_entropy(logits, Array([2.0, 5.0]), reduction="none").list()
+    assert np.isclose(losses[0], np.log(np.exp(1.0) + np.exp(2.0)) - 2.0)
+    # An out-of-range class index marks its row with NaN
+    assert np.isnan(losses[1])
+    # A target on a masked logit saturates instead of becoming inf or NaN
+    masked = Forge.cross_entropy(logits, Array([0.0, 2.0]), reduction="none").list()
+    assert np.isfinite(masked[0]) and masked[0] > 1e38
+
+
+def test_cross_entropy_errors():
+    logits = Array([[1.0, 2.0], [3.0, 4.0]])
+    with pytest.raises(RuntimeError):
+        Forge.cross_entropy(logits, Array([1.0, 0.0, 1.0]))
+    with pytest.raises(RuntimeError):
+        Forge.cross_entropy(logits, Array([1.0, 0.0]), reduction="max")
+
+
+# endregion
+
+# region --- COMPARISONS & MASKS ---
+
+
+def test_comparisons_return_masks():
+    x = np.array([[1.0, 2.0, 3.0], [3.0, 2.0, 1.0]], dtype=np.float32)
+    y = np.array([2.0, 2.0, 2.0], dtype=np.float32)
+    a, b = Array(x.tolist()), Array(y.tolist())
+    for got, ref in [
+        (a == b, x == y),
+        (a != b, x != y),
+        (a < b, x < y),
+        (a <= b, x <= y),
+        (a > b, x > y),
+        (a >= b, x >= y),
+    ]:
+        assert got.dtype == Forge.uint8
+        assert got.shape == (2, 3)
+        assert got.list() == ref.astype(np.uint8).tolist()
+
+
+def test_comparisons_with_scalars():
+    x = np.array([0.5, 1.0, 1.5], dtype=np.float32)
+    a = Array(x.tolist())
+    assert (a == 1.0).list() == [0, 1, 0]
+    assert (a < 1).list() == (x < 1).astype(np.uint8).tolist()
+    # Reflected: 1.0 <= a is a >= 1.0
+    assert (1.0 <= a).list() == (x >= 1.0).astype(np.uint8).tolist()
+    assert (a[::-1] > 0.75).list() == (x[::-1] > 0.75).astype(np.uint8).tolist()
+
+
+def test_comparison_dtype_mismatch():
+    with pytest.raises(RuntimeError):
+        Array([1.0, 2.0]) == Array([1, 2], dtype="int32")
+
+
+def test_arrays_stay_hashable():
+    a = Array([1.0])
+    assert {a: 1}[a] == 1
+
+
+def test_array_truth_value():
+    assert Array([1.0]) == Array([1.0])
+    assert not (Array([[2.0]]) != 2.0)
+    assert not Forge.zeros(1)
+    with pytest.raises(ValueError):
+        bool(Array([1.0, 2.0]) == Array([1.0, 2.0]))
+    with pytest.raises(ValueError):
+        Array([1.0, 2.0]) in [Array([3.0, 4.0])]
+
+
+def test_maximum_minimum():
+    x = np.array([[1.0, -2.0], [3.0, 0.5]], dtype=np.float32)
+    y = np.array([0.0, 1.0], dtype=np.float32)
+    a, b = Array(x.tolist()), Array(y.tolist())
+    assert Forge.maximum(a, b).list() == np.maximum(x, y).tolist()
+    assert Forge.minimum(a, b).list() == np.minimum(x, y).tolist()
+    assert Forge.maximum(a, 0.0).list() == np.maximum(x, 0.0).tolist()
+    assert Forge.minimum(1.0, a).list() == np.minimum(x, 1.0).tolist()
+
+
+def test_where():
+    x = np.array([[1.0, -2.0], [3.0, -0.5]], dtype=np.float32)
+    a = Array(x.tolist())
+    assert Forge.where(a > 0, a, 0.0).list() == np.where(x > 0, x, 0.0).tolist()
+    assert Forge.where(a < 0, -1.0, a).list() == np.where(x < 0, -1.0, x).tolist()
+    cond = Array([1, 0], dtype="int32")
+    assert Forge.where(cond, a, a * 2).list() == np.where([1, 0], x, x * 2).tolist()
+    ints = Array([1, 2], dtype="int32")
+    assert Forge.where(Array([0, 1], dtype="uint8"), ints, 7).list() == [7, 2]
+    assert Forge.where(ints > 1, ints, 0).dtype == Forge.int32
+
+
+def test_max_min_argmax_argmin_axis():
+    x = np.array([[1.0, 5.0, 5.0], [7.0, -1.0, 2.0]], dtype=np.float32)
+    a = Array(x.tolist())
+    assert a.max(axis=1).list() == x.max(axis=1).tolist()
+    assert a.min(axis=0).list() == x.min(axis=0).tolist()
+    assert a.argmax(axis=1).list() == x.argmax(axis=1).tolist()
+    assert a.argmin(axis=0).list() == x.argmin(axis=0).tolist()
+    assert a.argmax(axis=1).dtype == Forge.int32
+    assert a.max(axis=1, keepdims=True).shape == (2, 1)
+    assert a.T.argmax(axis=0).list() == x.T.argmax(axis=0).tolist()
+
+
+def test_max_argmax_global():
+    x = np.array([[1.0, 5.0, 5.0], [7.0, -1.0, 2.0]], dtype=np.float32)
+    a = Array(x.tolist())
+    assert a.max().item() == 7.0
+    assert a.min().item() == -1.0
+    assert Forge.argmax(a).item() == 3
+    assert a.T.argmin().item() == np.argmin(x.T)
+    assert a.max(keepdims=True).shape == (1, 1)
+
+
+def test_argmax_empty_axis():
+    with pytest.raises(RuntimeError):
+        Forge.zeros(2, 0).argmax(axis=1)
+
+
+def test_mean_and_count_nonzero():
+    x = np.array([[1.0, 0.0, 3.0], [0.0, 0.0, 6.0]], dtype=np.float32)
+    a = Array(x.tolist())
+    assert np.isclose(a.mean().item(), x.mean())
+    assert np.allclose(Forge.mean(a, axis=0).list(), x.mean(axis=0))
+    assert a.mean(axis=1, keepdims=True).shape == (2, 1)
+    assert Forge.count_nonzero(a).item() == 3
+    assert a.count_nonzero(axis=0).list() == np.count_nonzero(x, axis=0).tolist()
+    mask = a > 0.5
+    assert mask.mean().dtype == Forge.float32
+    assert np.isclose(mask.mean().item(), 0.5)
+
+
+def test_classification_accuracy_on_device():
+    preds = np.random.rand(64, 10).astype(np.float32)
+    labels = np.eye(10, dtype=np.float32)[np.random.randint(0, 10, size=64)]
+    hits = Forge.argmax(Array(preds.tolist()), axis=1) == Forge.argmax(
+        Array(labels.tolist()), axis=1
+    )
+    ref = (preds.argmax(axis=1) == labels.argmax(axis=1)).mean()
+    assert np.isclose(hits.mean().item(), ref)
+
+
+def test_item():
+    assert Array([[2.5]]).item() == 2.5
+    with pytest.raises(ValueError):
+        Array([1.0, 2.0]).item()
+
+
+# endregion
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from Forge import Array, optim
+
+# region --- SGD ---
+
+
+def test_sgd_plain():
+    w = Array([[1.0, 2.0], [3.0, 4.0]])
+    g = Array([[0.5, 0.5], [1.0, -1.0]])
+    opt = optim.SGD([w], lr=0.1)
+    opt.step([g])
+    assert np.allclose(w.list(), [[0.95, 1.95], [2.9, 4.1]])
+
+
+def test_sgd_weight_decay_matches_composed():
+    w_np = np.array([[1.0, -2.0, 3.0]], dtype=np.float32)
+    g_np = np.array([[0.1, 0.2, 0.3]], dtype=np.float32)
+    w = Array(w_np.tolist())
+    opt = optim.SGD([w], lr=0.5, weight_decay=0.01)
+    opt.step([Array(g_np.tolist())])
+    expected = w_np - (g_np + 0.01 * w_np) * 0.5
+    assert np.allclose(w.list(), expected)
+
+
+def test_sgd_updates_views():
+    w = Array([1.0, 2.0, 3.0])
+    view = w[1:]
+    opt = optim.SGD([w], lr=1.0)
+    opt.step([Array([1.0, 1.0, 1.0])])
+    assert view.list() == [1.0, 2.0]
+
+
+def test_sgd_momentum_multi_tensor():
+    w1 = Array([1.0, 1.0])
+    w2 = Array([[2.0], [2.0]])
+    opt = optim.SGD([w1, w2], lr=0.1, momentum=0.9)
+    g1 = Array([1.0, -1.0])
+    g2 = Array([[0.5], [0.0]])
+    opt.step([g1, g2])
+    opt.step([g1, g2])
+    # buf_1 = g, buf_2 = 0.9 * g + g
+    assert np.allclose(w1.list(), [1.0 - 0.1 * 1.0 - 0.1 * 1.9, 1.0 + 0.1 + 0.19])
+    assert np.allclose(w2.list(), [[2.0 - 0.05 - 0.095], [2.0]])
+
+
+def test_sgd_nesterov_requires_momentum():
+    with pytest.raises(ValueError):
+        optim.SGD([Array([1.0])], lr=0.1, nesterov=True)
+
+
+def test_sgd_mismatch():
+    w = Array([1.0, 2.0])
+    opt = optim.SGD([w], lr=0.1)
+    with pytest.raises(ValueError):
+        opt.step([])
+    with pytest.raises(RuntimeError):
+        opt.step([Array([1.0, 2.0, 3.0])])
+
+
+def test_sgd_non_contiguous_param():
+    w = Array([[1.0, 2.0], [3.0, 4.0]]).T
+    opt = optim.SGD([w], lr=0.1)
+    with pytest.raises(RuntimeError):
+        opt.step([Array([[1.0, 1.0], [1.0, 1.0]])])
+
+
+# endregion
+
+# region --- ADAM ---
+
+
+def test_adam_matches_reference():
+    w_np = np.array([0.5, -1.0, 2.0], dtype=np.float64)
+    m = np.zeros(3)
+    v = np.zeros(3)
+    lr, b1, b2, eps, wd = 0.01, 0.9, 0.999, 1e-8, 0.1
+
+    w = Array(w_np.tolist())
+    opt = optim.Adam([w], lr=lr, betas=(b1, b2), eps=eps, weight_decay=wd)
+    for t, g_list in enumerate([[0.1, 0.2, -0.3], [0.3, -0.1, 0.2]], start=1):
+        g = np.array(g_list) + wd * w_np
+        m = b1 * m + (1 - b1) * g
+        v = b2 * v + (1 - b2) * g * g
+        m_hat = m / (1 - b1**t)
+        v_hat = v / (1 - b2**t)
+        w_np = w_np - lr * m_hat / (np.sqrt(v_hat) + eps)
+        opt.step([Array(g_list)])
+
+    assert np.allclose(w.list(), w_np, rtol=1e-4, atol=1e-6)
+
+
+# endregion
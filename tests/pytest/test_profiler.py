@@ -0,0 +1,75 @@
+import json
+
+import Forge
+import pytest
+
+# region --- PROFILER ---
+
+
+def test_profiler_records_ops():
+    x = Forge.rand(64, 32)
+    w = Forge.rand(32, 16)
+    with Forge.profiler() as prof:
+        y = Forge.exp(x @ w)
+        s = y.sum(axis=1)
+        s.list()
+
+    names = [e.name for e in prof.events]
+    categories = {e.category for e in prof.events}
+    assert "matmul" in names
+    assert "exp_float32" in names
+    assert {"matmul", "elementwise", "reduction", "alloc"} <= categories
+
+    exp = next(e for e in prof.events if e.name == "exp_float32")
+    assert exp.shapes == [[64, 16], [64, 16]]
+    assert exp.bytes_read == exp.bytes_written == 64 * 16 * 4
+    assert exp.wall_us >= 0
+    assert exp.gpu_us >= 0
+
+
+def test_profiler_allocations_and_copies():
+    x = Forge.rand(8, 6)
+    with Forge.profiler() as prof:
+        x.T.reshape(-1)
+
+    copies = [e for e in prof.events if e.category == "copy"]
+    allocs = [e for e in prof.events if e.category == "alloc"]
+    assert [e.name for e in copies] == ["copy_view_float32"]
+    assert copies[0].bytes_written == 48 * 4
+    assert sum(e.bytes_allocated for e in allocs) == 48 * 4
+
+
+def test_profiler_disabled_records_nothing():
+    x = Forge.rand(4, 4)
+    with Forge.profiler() as prof:
+        pass
+    (x + x).list()
+    assert prof.events == []
+
+
+def test_profiler_summary_and_trace(tmp_path):
+    x = Forge.rand(32, 32)
+    with Forge.profiler() as prof:
+        for _ in range(3):
+            x = x * 0.5
+        x.list()
+
+    rows = prof.summary(sort_by="calls")
+    assert rows[0]["name"] == "mul_scalar_float32"
+    assert rows[0]["calls"] == 3
+    assert rows[0]["bytes"] == 3 * 2 * 32 * 32 * 4
+    assert "mul_scalar_float32" in prof.table()
+    with pytest.raises(ValueError):
+        prof.summary(sort_by="name")
+
+    path = tmp_path / "trace.json"
+    prof.export_chrome_trace(str(path))
+    trace = json.loads(path.read_text())["traceEvents"]
+    host = [e for e in trace if e["ph"] == "X" and e["pid"] == 0]
+    gpu = [e for e in trace if e["ph"] == "X" and e["pid"] == 1]
+    assert [e["name"] for e in host].count("mul_scalar_float32") == 3
+    assert len(gpu) == 3
+    assert all(e["dur"] >= 0 for e in host + gpu)
+
+
+# endregion
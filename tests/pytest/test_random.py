@@ -0,0 +1,134 @@
+import Forge
+import numpy as np
+import pytest
+from Forge import random
+
+# region --- GENERATOR ---
+
+
+def test_same_seed_and_stream_repeat():
+    a = random.Generator(seed=7, stream=3).uniform(1000)
+    b = random.Generator(seed=7, stream=3).uniform(1000)
+    assert a.list() == b.list()
+
+
+def test_streams_are_independent():
+    a = np.array(random.Generator(seed=7, stream=0).uniform(4096).list())
+    b = np.array(random.Generator(seed=7, stream=1).uniform(4096).list())
+    assert not np.array_equal(a, b)
+    assert abs(np.corrcoef(a, b)[0, 1]) < 0.05
+
+
+def test_offset_advances_and_replays():
+    g = random.Generator(seed=1)
+    first = g.uniform(10)
+    assert g.offset == 3
+    g.uniform(10)
+    g.offset = 0
+    assert g.uniform(10).list() == first.list()
+
+
+def test_successive_calls_continue_the_sequence():
+    g = random.Generator(seed=5)
+    parts = g.uniform(8).list() + g.uniform(8).list()
+    assert random.Generator(seed=5).uniform(16).list() == parts
+
+
+def test_set_seed_resets_default_generator():
+    Forge.set_seed(3)
+    a = Forge.rand(64).list()
+    Forge.set_seed(3)
+    assert Forge.rand(64).list() == a
+    assert random.default_generator().offset == 16
+
+
+# endregion
+
+# region --- HOST FILL ---
+
+
+def test_host_fill_matches_device():
+    host = np.zeros(1003, dtype=np.float32)
+    random.Generator(seed=11, stream=2).fill(host)
+    device = random.Generator(seed=11, stream=2).uniform(1003)
+    assert np.array_equal(host, np.array(device.list(), dtype=np.float32))
+
+
+@pytest.mark.parametrize("dist,p", [("bernoulli", 0.3), ("dropout", 0.25)])
+def test_host_fill_matches_device_masks(dist, p):
+    host = np.zeros(517, dtype=np.float32)
+    random.Generator(seed=4).fill(host, dist, p=p)
+    g = random.Generator(seed=4)
+    device = g.bernoulli(517, p=p) if dist == "bernoulli" else g.dropout_mask(517, p=p)
+    assert np.array_equal(host, np.array(device.list(), dtype=np.float32))
+
+
+def test_host_fill_independent_of_thread_count():
+    n = 1 << 20
+    one = random.Generator(seed=9).fill(np.zeros(n, dtype=np.float32), threads=1)
+    many = random.Generator(seed=9).fill(np.zeros(n, dtype=np.float32), threads=7)
+    assert np.array_equal(one, many)
+
+
+def test_host_fill_rejects_unknown_distribution():
+    with pytest.raises(ValueError):
+        random.Generator().fill(np.zeros(4, dtype=np.float32), "poisson")
+
+
+# endregion
+
+# region --- DISTRIBUTIONS ---
+
+
+def test_uniform_range_and_moments():
+    x = np.array(random.Generator(seed=0).uniform(1 << 16).list())
+    assert x.min() >= 0.0 and x.max() < 1.0
+    assert abs(x.mean() - 0.5) < 0.01
+    assert abs(x.var() - 1 / 12) < 0.01
+
+
+def test_normal_moments():
+    x = np.array(random.Generator(seed=0).normal(1 << 16).list())
+    assert np.all(np.isfinite(x))
+    assert abs(x.mean()) < 0.02
+    assert abs(x.var() - 1.0) < 0.03
+
+
+def test_bernoulli_mean():
+    x = np.array(random.Generator(seed=0).bernoulli(1 << 16, p=0.2).list())
+    assert set(np.unique(x)) <= {0.0, 1.0}
+    assert abs(x.mean() - 0.2) < 0.01
+
+
+def test_dropout_mask_keeps_mean():
+    x = np.array(random.Generator(seed=0).dropout_mask(1 << 16, p=0.4).list())
+    assert set(np.unique(x)) <= {0.0, np.float32(1 / 0.6)}
+    assert abs((x == 0).mean() - 0.4) < 0.01
+    assert abs(x.mean() - 1.0) < 0.02
+
+
+def test_dropout_applies_mask():
+    x = Forge.Array(np.ones((4, 256), dtype=np.float32).tolist())
+    y = np.array(random.dropout(x, p=0.5, generator=random.Generator(seed=2)).list())
+    mask = np.array(random.Generator(seed=2).dropout_mask(4, 256, p=0.5).list())
+    assert np.array_equal(y, mask)
+
+
+def test_dtype_and_shape():
+    x = random.Generator().normal((3, 5), dtype="float16")
+    assert x.shape == (3, 5)
+    assert x.dtype == Forge.float16
+
+
+@pytest.mark.parametrize("p", [-0.1, 1.5])
+def test_bernoulli_rejects_bad_p(p):
+    with pytest.raises(ValueError):
+        random.bernoulli(4, p=p)
+
+
+def test_dropout_rejects_p_one():
+    with pytest.raises(ValueError):
+        random.dropout_mask(4, p=1.0)
+
+
+# endregion
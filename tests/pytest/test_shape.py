@@ -1,5 +1,6 @@
+import numpy as np
 import pytest
-from Forge import Array
+from Forge import Array, chunk, concatenate, split, stack
 
 
 # Helper to create a shared 3D array for testing
@@ -71,15 +72,36 @@ def test_reshape(tensor_3d):
 
 
 def test_reshape_on_non_contiguous(tensor_3d):
+    # Every other element is evenly strided, so flattening is still a view
     view_strided = tensor_3d[..., ::2]
     flat = view_strided.reshape(-1)
 
     assert flat.shape == (12,)
+    assert tuple(flat.strides) == (2,)
     expected = [0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20, 22]
     assert flat.list() == expected
     flat[0] = 999
-    assert tensor_3d[0, 0, 0] == 0
-    assert flat[0] == 999
+    assert tensor_3d[0, 0, 0] == 999
+
+
+def test_reshape_sliced_batch_is_view(tensor_3d):
+    # Splitting and merging dims that are each contiguous needs no copy
+    rows = tensor_3d[:, 1:]
+    merged = rows.reshape((2, 8))
+    assert merged.list() == [list(range(4, 12)), list(range(16, 24))]
+    split = rows.reshape((2, 2, 2, 2))
+    assert tuple(split.strides) == (12, 4, 2, 1)
+    merged[1, 0] = 500
+    assert tensor_3d[1, 1, 0] == 500
+
+
+def test_reshape_copies_when_needed(tensor_3d):
+    # Merging rows of a column slice would need two different strides
+    cols = tensor_3d[:, :, 1:3]
+    flat = cols.reshape((2, 6))
+    assert flat.list() == [[1, 2, 5, 6, 9, 10], [13, 14, 17, 18, 21, 22]]
+    flat[0, 0] = 700
+    assert tensor_3d[0, 0, 1] == 1
 
 
 def test_transpose_then_reshape(tensor_3d):
@@ -106,3 +128,91 @@ def test_mutation_propagation(tensor_3d):
 
 
 # endregion
+
+
+# region --- concatenate / stack / split ---
+
+
+def test_concatenate_axes():
+    a = np.arange(6, dtype=np.float32).reshape(2, 3)
+    b = np.arange(100, 109, dtype=np.float32).reshape(3, 3)
+    out = concatenate([Array(a.tolist()), Array(b.tolist())])
+    assert out.shape == (5, 3)
+    assert out.list() == np.concatenate([a, b]).tolist()
+
+    c = np.arange(4, dtype=np.float32).reshape(2, 2)
+    out = concatenate([Array(a.tolist()), Array(c.tolist())], axis=-1)
+    assert out.list() == np.concatenate([a, c], axis=1).tolist()
+
+
+def test_concatenate_strided_inputs(tensor_3d):
+    # Transposed and sliced views are gathered straight into the result
+    t = tensor_3d.T
+    s = tensor_3d[:, ::2].transpose((2, 1, 0))
+    out = concatenate([t, s], axis=1)
+    assert out.shape == (4, 5, 2)
+    for i in range(4):
+        assert out.list()[i] == t.list()[i] + s.list()[i]
+
+    # The result owns its storage
+    out[0, 0, 0] = 500
+    assert tensor_3d[0, 0, 0] == 0
+
+
+def test_concatenate_errors():
+    with pytest.raises(ValueError):
+        concatenate([])
+    with pytest.raises(RuntimeError):
+        concatenate([Array([[1.0, 2.0]]), Array([[1.0, 2.0, 3.0]])])
+    with pytest.raises(RuntimeError):
+        concatenate([Array([1.0]), Array([1])])
+
+
+def test_stack():
+    a = np.arange(6, dtype=np.float32).reshape(2, 3)
+    b = a + 10
+    arrays = [Array(a.tolist()), Array(b.tolist())]
+    assert stack(arrays).shape == (2, 2, 3)
+    assert stack(arrays).list() == np.stack([a, b]).tolist()
+    assert stack(arrays, axis=-1).list() == np.stack([a, b], axis=-1).tolist()
+    with pytest.raises(ValueError):
+        stack([Array([1.0]), Array([1.0, 2.0])])
+
+
+def test_split_views(tensor_3d):
+    parts = split(tensor_3d, 2, axis=2)
+    assert [p.shape for p in parts] == [(2, 3, 2), (2, 3, 2)]
+    assert parts[1].list() == [
+        [[2, 3], [6, 7], [10, 11]],
+        [[14, 15], [18, 19], [22, 23]],
+    ]
+
+    # Parts are views: writes show up in the original
+    parts[1][0, 0, 0] = 99
+    assert tensor_3d[0, 0, 2] == 99
+
+    parts = split(tensor_3d, [1, 2], axis=1)
+    assert [p.shape for p in parts] == [(2, 1, 4), (2, 1, 4), (2, 1, 4)]
+    assert parts[2].list() == [[[8, 9, 10, 11]], [[20, 21, 22, 23]]]
+
+    with pytest.raises(ValueError):
+        split(tensor_3d, 3, axis=2)
+
+
+def test_split_negative_indices():
+    x = np.arange(5, dtype=np.float32)
+    a = Array(x.tolist())
+    for indices in ([-1], [1, -2], [-4, 3]):
+        got = [p.list() for p in split(a, indices)]
+        assert got == [p.tolist() for p in np.split(x, indices)]
+
+
+def test_chunk(tensor_3d):
+    parts = chunk(tensor_3d, 3, axis=-1)
+    assert [p.shape for p in parts] == [(2, 3, 2), (2, 3, 2)]
+    assert concatenate(parts, axis=-1).list() == tensor_3d.list()
+    with pytest.raises(ValueError):
+        chunk(tensor_3d, 0)
+
+
+# endregion